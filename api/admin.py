@@ -13,6 +13,7 @@ from .models import (
     Doctor,
     Appointment,
     PaymentTransaction,
+    PaymentWebhookEvent,
     HospitalRegistration,
     AppointmentFee,
     SecureDocument,
@@ -186,6 +187,19 @@ class PaymentTransactionAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
 
 
+# Payment Webhook Inbox Admin
+@admin.register(PaymentWebhookEvent)
+class PaymentWebhookEventAdmin(admin.ModelAdmin):
+    list_display = [
+        'id', 'provider', 'event_type', 'reference', 'status', 'attempts', 'next_attempt_at',
+        'received_at', 'processed_at'
+    ]
+    list_filter = ['provider', 'status', 'event_type']
+    search_fields = ['event_id', 'reference']
+    readonly_fields = ['provider', 'event_id', 'event_type', 'reference', 'payload', 'received_at', 'processed_at']
+    date_hierarchy = 'received_at'
+
+
 # Hospital Admin Users - Temporarily disabled due to import issues
 # @admin.register(HospitalAdmin)
 # class HospitalAdminUserAdmin(admin.ModelAdmin):
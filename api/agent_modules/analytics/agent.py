@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from django.utils import timezone
 from ..base import BaseAgent, AgentResponse, AgentUtils
 from .services import CycleAnalyticsService, HealthPredictionService, RecommendationService
+from .result_cache import analytics_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -99,7 +100,11 @@ class AnalyticsAgent(BaseAgent):
                     operation="analyze_cycle_irregularities"
                 )
             
-            analysis = self.cycle_analytics.detect_irregularities(user_id, months_back)
+            analysis = self._cached(
+                'cycle_irregularities', user_id,
+                lambda: self.cycle_analytics.detect_irregularities(user_id, months_back),
+                months_back=months_back
+            )
             
             self.log_operation("cycle_irregularity_analysis", user_id=user_id)
             
@@ -132,7 +137,9 @@ class AnalyticsAgent(BaseAgent):
                     operation="predict_next_period"
                 )
             
-            prediction = self.health_predictions.predict_next_period(user_id)
+            prediction = self._cached(
+                'next_period', user_id, lambda: self.health_predictions.predict_next_period(user_id)
+            )
             
             self.log_operation("period_prediction", user_id=user_id)
             
@@ -165,7 +172,9 @@ class AnalyticsAgent(BaseAgent):
                     operation="predict_fertility_window"
                 )
             
-            fertility_data = self.health_predictions.predict_fertility_window(user_id)
+            fertility_data = self._cached(
+                'fertility_window', user_id, lambda: self.health_predictions.predict_fertility_window(user_id)
+            )
             
             self.log_operation("fertility_prediction", user_id=user_id)
             
@@ -198,7 +207,9 @@ class AnalyticsAgent(BaseAgent):
                     operation="generate_health_insights"
                 )
             
-            insights = self.health_predictions.generate_health_insights(user_id)
+            insights = self._cached(
+                'health_insights', user_id, lambda: self.health_predictions.generate_health_insights(user_id)
+            )
             
             self.log_operation("health_insights_generation", user_id=user_id)
             
@@ -231,7 +242,10 @@ class AnalyticsAgent(BaseAgent):
                     operation="get_personalized_recommendations"
                 )
             
-            recommendations = self.recommendations.generate_personalized_recommendations(user_id)
+            recommendations = self._cached(
+                'recommendations', user_id,
+                lambda: self.recommendations.generate_personalized_recommendations(user_id)
+            )
             
             self.log_operation("personalized_recommendations", user_id=user_id)
             
@@ -264,7 +278,9 @@ class AnalyticsAgent(BaseAgent):
                     operation="assess_health_risks"
                 )
             
-            risk_assessment = self.health_predictions.assess_health_risks(user_id)
+            risk_assessment = self._cached(
+                'health_risks', user_id, lambda: self.health_predictions.assess_health_risks(user_id)
+            )
             
             self.log_operation("health_risk_assessment", user_id=user_id)
             
@@ -299,7 +315,11 @@ class AnalyticsAgent(BaseAgent):
                     operation="analyze_patterns"
                 )
             
-            patterns = self.cycle_analytics.analyze_patterns(user_id, data_type, days_back)
+            patterns = self._cached(
+                'patterns', user_id,
+                lambda: self.cycle_analytics.analyze_patterns(user_id, data_type, days_back),
+                data_type=data_type, days_back=days_back
+            )
             
             self.log_operation("pattern_analysis", user_id=user_id, data_type=data_type)
             
@@ -312,6 +332,12 @@ class AnalyticsAgent(BaseAgent):
             
         except Exception as e:
             return AgentResponse(**self.handle_error(e, "analyze_patterns", user_id=user_id))
+    
+    # Private helper methods
+    
+    def _cached(self, analysis: str, user_id: int, compute, **params):
+        """Result of compute() from the analytics result cache; results are date-relative, so keyed by today"""
+        return analytics_cache.get(analysis, user_id, compute, day=timezone.now().date().isoformat(), **params)
 
 
 # Register the agent
@@ -0,0 +1,256 @@
+# api/agent_modules/analytics/batch_predictions.py
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from .prediction_engine import HISTORY_CYCLES, TRACKING_ENTRIES, empty_chunk, predict_chunk
+
+logger = logging.getLogger(__name__)
+
+# UserPrediction.confidence_score for each confidence level
+CONFIDENCE_SCORES = {'high': 0.9, 'medium': 0.7, 'low': 0.5}
+
+PERIOD_MODEL = {
+    'name': 'basic_period_predictor',
+    'model_type': 'cycle_prediction',
+    'defaults': {
+        'version': '1.0.0',
+        'description': 'Basic period prediction based on cycle history',
+        'algorithm': 'average_cycle_length',
+        'parameters': {'method': 'simple_average'},
+        'is_active': True
+    }
+}
+FERTILITY_MODEL = {
+    'name': 'basic_fertility_predictor',
+    'model_type': 'fertility_prediction',
+    'defaults': {
+        'version': '1.0.0',
+        'description': 'Basic fertility window prediction',
+        'algorithm': 'calendar_method',
+        'parameters': {'ovulation_offset': 14},
+        'is_active': True
+    }
+}
+
+
+class BatchPredictionRunner:
+    """
+    Recomputes next-period and fertility-window predictions for many users.
+
+    Users are taken in chunks. For each chunk the parent process runs three
+    queries (profiles, the last six cycles per user and the last 30
+    fertility tracking entries per user, both cut with a ROW_NUMBER window)
+    and packs the rows into numpy arrays; the predictions themselves are
+    computed in a ProcessPoolExecutor while the next chunk is fetched. Each
+    chunk's results are written with one bulk_update of the users' active
+    UserPrediction rows plus one bulk_create for users that had none.
+
+    Runs in-process, without Celery; predictions match
+    HealthPredictionService.predict_next_period / predict_fertility_window.
+    Inside a daemonic process (a Celery prefork child) chunks are always
+    computed inline, since such a process cannot start a pool.
+    """
+
+    CHUNK_SIZE = 2000
+
+    def __init__(self, chunk_size: Optional[int] = None, workers: Optional[int] = None):
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    # ----- loading -----
+
+    @staticmethod
+    def _positions(user_ids: np.ndarray, row_user_ids: List[int]) -> np.ndarray:
+        """Row index in the (sorted) chunk of each query row's user"""
+        return np.searchsorted(user_ids, np.asarray(row_user_ids, dtype=np.int64))
+
+    def load_chunk(self, user_ids: List[int], today: date) -> Dict[str, Any]:
+        """Cycle histories and tracking summaries for a chunk of users, as arrays"""
+        from api.models import FertilityTracking, MenstrualCycle, WomensHealthProfile
+
+        chunk = empty_chunk(sorted(set(user_ids)), today)
+        ids = chunk['user_ids']
+
+        profiles = list(WomensHealthProfile.objects.filter(user_id__in=user_ids).values_list(
+            'user_id', 'average_cycle_length'
+        ))
+        if profiles:
+            profile_users, averages = zip(*profiles)
+            positions = self._positions(ids, profile_users)
+            chunk['has_profile'][positions] = True
+            chunk['profile_average'][positions] = averages
+
+        cycles = list(MenstrualCycle.objects.filter(
+            womens_health_profile__user_id__in=user_ids
+        ).annotate(
+            recency=Window(
+                RowNumber(),
+                partition_by=[F('womens_health_profile_id')],
+                order_by=[F('cycle_start_date').desc(), F('id').desc()],
+            )
+        ).filter(recency__lte=HISTORY_CYCLES).order_by(
+            'womens_health_profile__user_id', 'recency'
+        ).values_list('womens_health_profile__user_id', 'recency', 'cycle_start_date', 'cycle_length'))
+        if cycles:
+            cycle_users, recency, starts, lengths = zip(*cycles)
+            positions = self._positions(ids, cycle_users)
+            columns = np.asarray(recency, dtype=np.int64) - 1
+            lengths = np.array([length or np.nan for length in lengths], dtype=np.float64)
+            chunk['lengths'][positions, columns] = lengths
+            newest = columns == 0
+            chunk['last_start'][positions[newest]] = [
+                start.toordinal() for start, is_newest in zip(starts, newest) if is_newest
+            ]
+
+        tracking = list(FertilityTracking.objects.filter(
+            womens_health_profile__user_id__in=user_ids
+        ).annotate(
+            recency=Window(
+                RowNumber(),
+                partition_by=[F('womens_health_profile_id')],
+                order_by=[F('date').desc(), F('id').desc()],
+            )
+        ).filter(recency__lte=TRACKING_ENTRIES).values_list(
+            'womens_health_profile__user_id', 'ovulation_test_result', 'cycle_day'
+        ))
+        if tracking:
+            tracking_users, results, cycle_days = zip(*tracking)
+            positions = self._positions(ids, tracking_users)
+            chunk['has_tracking'][positions] = True
+            positive = np.array([
+                result == 'positive' and bool(cycle_day) for result, cycle_day in zip(results, cycle_days)
+            ])
+            cycle_days = np.array([cycle_day or 0 for cycle_day in cycle_days], dtype=np.int64)
+            np.add.at(chunk['ovulation_day_sum'], positions[positive], cycle_days[positive])
+            np.add.at(chunk['ovulation_day_count'], positions[positive], 1)
+
+        return chunk
+
+    # ----- saving -----
+
+    @staticmethod
+    def prediction_models():
+        from .models import PredictionModel
+        period_model, _ = PredictionModel.objects.get_or_create(**PERIOD_MODEL)
+        fertility_model, _ = PredictionModel.objects.get_or_create(**FERTILITY_MODEL)
+        return period_model, fertility_model
+
+    @staticmethod
+    def save_chunk(predictions, period_model, fertility_model) -> int:
+        """Write a chunk's predictions to UserPrediction; returns the number of rows written"""
+        from .models import UserPrediction
+
+        wanted = {}
+        for user_id, period, fertility in predictions:
+            if period and period['prediction_available']:
+                wanted[(user_id, period_model.pk)] = (
+                    period, date.fromisoformat(period['predicted_date'])
+                )
+            if fertility and fertility['prediction_available']:
+                wanted[(user_id, fertility_model.pk)] = (
+                    fertility, date.fromisoformat(fertility['fertile_window']['ovulation_date'])
+                )
+        if not wanted:
+            return 0
+
+        existing = {}
+        for prediction in UserPrediction.objects.filter(
+            user_id__in={user_id for user_id, _ in wanted},
+            model_id__in=[period_model.pk, fertility_model.pk],
+            status='active',
+        ).order_by('created_at'):
+            existing[(prediction.user_id, prediction.model_id)] = prediction  # latest wins
+
+        to_update, to_create = [], []
+        now = timezone.now()
+        for (user_id, model_id), (data, predicted_date) in wanted.items():
+            prediction = existing.get((user_id, model_id))
+            if prediction is None:
+                prediction = UserPrediction(user_id=user_id, model_id=model_id, status='active')
+                to_create.append(prediction)
+            else:
+                to_update.append(prediction)
+            prediction.prediction_data = data
+            prediction.confidence_score = CONFIDENCE_SCORES[data['confidence_level']]
+            prediction.predicted_date = predicted_date
+            prediction.updated_at = now
+
+        with transaction.atomic():
+            UserPrediction.objects.bulk_update(
+                to_update, ['prediction_data', 'confidence_score', 'predicted_date', 'updated_at'], batch_size=1000
+            )
+            UserPrediction.objects.bulk_create(to_create, batch_size=1000)
+        return len(to_update) + len(to_create)
+
+    # ----- running -----
+
+    def chunks(self, user_ids: List[int]) -> Iterable[List[int]]:
+        for start in range(0, len(user_ids), self.chunk_size):
+            yield user_ids[start:start + self.chunk_size]
+
+    def predict(self, user_ids: List[int], today: Optional[date] = None):
+        """Yield (user_id, period, fertility) for every user, chunk by chunk"""
+        today = today or timezone.now().date()
+        chunks = self.chunks(list(user_ids))
+
+        serial = self.workers <= 1 or len(user_ids) <= self.chunk_size
+        if not serial and multiprocessing.current_process().daemon:
+            # Celery prefork children are daemonic and may not start a pool of their own
+            logger.warning("Batch predictions running in a daemonic process; computing chunks inline")
+            serial = True
+
+        if serial:
+            for ids in chunks:
+                yield from predict_chunk(self.load_chunk(ids, today))
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = []
+            for ids in chunks:
+                pending.append(executor.submit(predict_chunk, self.load_chunk(ids, today)))
+                # Keep the pool busy without holding every chunk in memory
+                while len(pending) > self.workers:
+                    yield from pending.pop(0).result()
+            for future in pending:
+                yield from future.result()
+
+    def run(self, user_ids: List[int], save: bool = True) -> Dict[str, Any]:
+        """Predict for every user and save; returns counts and per-user errors"""
+        results = {
+            'total_users': len(user_ids),
+            'successful_updates': 0,
+            'failed_updates': 0,
+            'predictions_saved': 0,
+            'errors': []
+        }
+        if save:
+            period_model, fertility_model = self.prediction_models()
+
+        batch = []
+        for user_id, period, fertility in self.predict(user_ids):
+            if period is None:
+                results['failed_updates'] += 1
+                results['errors'].append({'user_id': user_id, 'error': "No women's health profile"})
+            elif not period['prediction_available']:
+                results['failed_updates'] += 1
+                results['errors'].append({'user_id': user_id, 'error': period['reason']})
+            else:
+                results['successful_updates'] += 1
+            batch.append((user_id, period, fertility))
+            if save and len(batch) >= self.chunk_size:
+                results['predictions_saved'] += self.save_chunk(batch, period_model, fertility_model)
+                batch = []
+        if save and batch:
+            results['predictions_saved'] += self.save_chunk(batch, period_model, fertility_model)
+        return results
@@ -0,0 +1,155 @@
+# api/agent_modules/analytics/cycle_engine.py
+
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Scores used by the mood / energy trend and weekday analyses
+MOOD_SCORES = {
+    'excellent': 5, 'good': 4, 'neutral': 3, 'low': 2, 'poor': 1,
+    'anxious': 2, 'stressed': 2, 'depressed': 1
+}
+ENERGY_SCORES = {
+    'very_high': 5, 'high': 4, 'normal': 3, 'low': 2, 'very_low': 1
+}
+DEFAULT_SCORE = 3
+
+# date.toordinal() % 7 -> weekday name (ordinal 1, 0001-01-01, was a Monday)
+WEEKDAY_BY_ORDINAL_MOD = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+
+CYCLE_PHASES = ('menstrual', 'follicular', 'ovulation', 'luteal')
+
+
+class CycleAnalyticsEngine:
+    """
+    Vectorized computations behind CycleAnalyticsService.
+
+    Callers load plain columns with values_list() and pass them in as
+    sequences; everything here works on numpy arrays. Sums go through
+    np.cumsum, which adds left to right like Python's sum(), so averages
+    and deviations are bit-for-bit the ones the per-row loops produced
+    (np.sum uses pairwise summation and can differ in the last place).
+    """
+
+    # ----- conversions -----
+
+    @staticmethod
+    def ordinals(dates: Sequence) -> np.ndarray:
+        return np.fromiter((day.toordinal() for day in dates), dtype=np.int64, count=len(dates))
+
+    @staticmethod
+    def scores(values: Sequence, table: Dict[str, float], default: float = DEFAULT_SCORE) -> np.ndarray:
+        return np.fromiter((table.get(value, default) for value in values), dtype=np.float64, count=len(values))
+
+    @staticmethod
+    def sequential_sum(values: np.ndarray) -> float:
+        """Left-to-right sum, identical to sum() over the same floats"""
+        if len(values) == 0:
+            return 0
+        return float(np.cumsum(values)[-1])
+
+    @classmethod
+    def mean(cls, values: np.ndarray) -> float:
+        return cls.sequential_sum(values) / len(values)
+
+    @staticmethod
+    def trailing_mean(values: np.ndarray, window: int, end: Optional[int] = None) -> float:
+        """Mean of the `window` values ending at `end` (exclusive; default the last value)"""
+        end = len(values) if end is None else end
+        window_values = values[max(0, end - window):end]
+        return float(np.cumsum(window_values)[-1]) / len(window_values)
+
+    # ----- counting and grouping -----
+
+    @staticmethod
+    def counts_in_order(values: Sequence) -> Dict[Any, int]:
+        """{value: count} with keys in order of first appearance"""
+        if len(values) == 0:
+            return {}
+        array = np.array(values, dtype=object)
+        try:
+            uniques, first_index, counts = np.unique(array, return_index=True, return_counts=True)
+        except TypeError:
+            # Mixed, unorderable values (e.g. numbers among symptom names)
+            return dict(Counter(values))
+        order = np.argsort(first_index, kind='stable')
+        return dict(zip(uniques[order].tolist(), counts[order].tolist()))
+
+    @staticmethod
+    def group_in_order(keys: np.ndarray, values: Sequence) -> Dict[Any, List]:
+        """{key: [values...]} keeping value order, keys in order of first appearance"""
+        if len(keys) == 0:
+            return {}
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+        groups = np.split(order, boundaries)
+        groups.sort(key=lambda group: group[0])
+        return {keys[group[0]].item(): [values[index] for index in group] for group in groups}
+
+    @classmethod
+    def weekday_names(cls, ordinals: np.ndarray) -> List[str]:
+        return [WEEKDAY_BY_ORDINAL_MOD[remainder] for remainder in (ordinals % 7).tolist()]
+
+    # ----- cycles -----
+
+    @classmethod
+    def cycle_length_stats(cls, lengths: np.ndarray) -> Dict[str, Any]:
+        """Mean, population standard deviation and long/short counts of recorded cycle lengths"""
+        count = len(lengths)
+        if count == 0:
+            return {'count': 0, 'mean': 0, 'std_dev': None, 'long': 0, 'short': 0}
+        mean = int(lengths.sum()) / count
+        std_dev = None
+        if count > 2:
+            std_dev = (cls.sequential_sum((lengths - mean) ** 2) / count) ** 0.5
+        return {
+            'count': count,
+            'mean': mean,
+            'std_dev': std_dev,
+            'long': int(np.count_nonzero(lengths > 35)),
+            'short': int(np.count_nonzero(lengths < 21)),
+        }
+
+    @staticmethod
+    def long_gaps(start_ordinals: np.ndarray, threshold: int = 50) -> np.ndarray:
+        """Indices i where cycle i+1 started more than `threshold` days after cycle i"""
+        return np.flatnonzero(np.diff(start_ordinals) > threshold)
+
+    @staticmethod
+    def cycle_phases(log_ordinals: np.ndarray, start_ordinals: np.ndarray, period_lengths: np.ndarray,
+                     average_cycle_length: int) -> np.ndarray:
+        """
+        Phase of each log date, as MenstrualCycle.cycle_phase works it out for
+        the current cycle: menstrual for the period (5 days if unrecorded),
+        ovulation within 2 days of (average cycle length - 14), follicular
+        before and luteal after. Dates before the first cycle get ''.
+        """
+        phases = np.full(len(log_ordinals), '', dtype=object)
+        if len(start_ordinals) == 0 or len(log_ordinals) == 0:
+            return phases
+
+        cycle_index = np.searchsorted(start_ordinals, log_ordinals, side='right') - 1
+        in_cycle = cycle_index >= 0
+        cycle_index = np.where(in_cycle, cycle_index, 0)
+        cycle_day = log_ordinals - start_ordinals[cycle_index] + 1
+        ovulation_day = average_cycle_length - 14
+
+        phases[in_cycle] = 'luteal'
+        phases[in_cycle & (cycle_day <= ovulation_day + 2)] = 'ovulation'
+        phases[in_cycle & (cycle_day < ovulation_day - 2)] = 'follicular'
+        phases[in_cycle & (cycle_day <= period_lengths[cycle_index])] = 'menstrual'
+        return phases
+
+    @classmethod
+    def phase_statistics(cls, phases: np.ndarray, values: np.ndarray, digits: int = 2) -> Dict[str, Dict[str, Any]]:
+        """{phase: {'entries': n, 'average': mean or None}} for every cycle phase"""
+        statistics = {}
+        for phase in CYCLE_PHASES:
+            selected = values[phases == phase]
+            statistics[phase] = {
+                'entries': len(selected),
+                'average': round(cls.mean(selected), digits) if len(selected) else None,
+            }
+        return statistics
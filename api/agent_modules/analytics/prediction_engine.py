@@ -0,0 +1,113 @@
+# api/agent_modules/analytics/prediction_engine.py
+#
+# Django-free on purpose: predict_chunk runs in ProcessPoolExecutor workers,
+# which only need numpy and the arrays they are sent.
+
+from datetime import date
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Cycles per user the predictions use (HealthPredictionService.predict_next_period)
+HISTORY_CYCLES = 6
+# Fertility tracking entries per user scanned for positive ovulation tests
+TRACKING_ENTRIES = 30
+NO_CYCLE = -1
+
+
+def empty_chunk(user_ids: List[int], today: date) -> Dict[str, Any]:
+    """Arrays for a chunk of users, to be filled in by the caller"""
+    count = len(user_ids)
+    return {
+        'user_ids': np.asarray(user_ids, dtype=np.int64),
+        'today': today.toordinal(),
+        'has_profile': np.zeros(count, dtype=bool),
+        'profile_average': np.zeros(count, dtype=np.int64),
+        'last_start': np.full(count, NO_CYCLE, dtype=np.int64),
+        # Recorded cycle lengths, newest cycle first; NaN where missing
+        'lengths': np.full((count, HISTORY_CYCLES), np.nan),
+        'has_tracking': np.zeros(count, dtype=bool),
+        # Positive ovulation tests: sum and count of their (recorded) cycle days
+        'ovulation_day_sum': np.zeros(count, dtype=np.int64),
+        'ovulation_day_count': np.zeros(count, dtype=np.int64),
+    }
+
+
+def confidence_levels(lengths: np.ndarray, averages: np.ndarray) -> np.ndarray:
+    """'high' / 'medium' / 'low' per row, from the spread of the recorded lengths"""
+    recorded = ~np.isnan(lengths)
+    counts = recorded.sum(axis=1)
+    deviations = np.where(recorded, lengths - averages[:, None], 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        std_devs = np.power((deviations ** 2).sum(axis=1) / counts, 0.5)
+    levels = np.full(len(lengths), 'low', dtype=object)
+    enough = counts >= 3
+    levels[enough & (std_devs <= 7)] = 'medium'
+    levels[enough & (std_devs <= 3)] = 'high'
+    return levels
+
+
+def predict_chunk(chunk: Dict[str, Any]) -> List[Tuple[int, Any, Any]]:
+    """
+    Next-period and fertility-window predictions for a chunk of users, as
+    (user_id, period_prediction, fertility_prediction) with the same dicts
+    HealthPredictionService returns; both are None for a user without a
+    women's health profile.
+
+    Averages and deviations sum the (at most six) lengths left to right,
+    newest first, exactly as the per-user service does.
+    """
+    lengths = chunk['lengths']
+    recorded = ~np.isnan(lengths)
+    counts = recorded.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        recorded_averages = np.where(recorded, lengths, 0.0).sum(axis=1) / counts
+    use_profile = counts == 0
+    averages = np.where(use_profile, chunk['profile_average'], recorded_averages)
+    levels = confidence_levels(lengths, averages)
+
+    today = chunk['today']
+    predictions = []
+    for index, user_id in enumerate(chunk['user_ids'].tolist()):
+        if not chunk['has_profile'][index]:
+            predictions.append((user_id, None, None))
+            continue
+
+        last_start = int(chunk['last_start'][index])
+        if last_start == NO_CYCLE:
+            predictions.append((
+                user_id,
+                {'prediction_available': False, 'reason': 'No cycle data available'},
+                {'prediction_available': False, 'reason': 'Cannot predict fertility without cycle data'},
+            ))
+            continue
+
+        average = int(averages[index]) if use_profile[index] else float(averages[index])
+        average_rounded = round(average, 1)
+        period = {
+            'prediction_available': True,
+            'predicted_date': date.fromordinal(last_start + int(average)).isoformat(),
+            'confidence_level': levels[index],
+            'average_cycle_length': average_rounded,
+            'last_period_date': date.fromordinal(last_start).isoformat(),
+            'cycles_used_for_prediction': int(counts[index]) or 1,
+        }
+
+        ovulation_day = max(1, int(average_rounded - 14))
+        if chunk['ovulation_day_count'][index]:
+            average_ovulation_day = int(chunk['ovulation_day_sum'][index]) / int(chunk['ovulation_day_count'][index])
+            ovulation_day += int(average_ovulation_day - 14)
+        ovulation = last_start + ovulation_day
+        fertility = {
+            'prediction_available': True,
+            'fertile_window': {
+                'start_date': date.fromordinal(ovulation - 5).isoformat(),
+                'end_date': date.fromordinal(ovulation).isoformat(),
+                'ovulation_date': date.fromordinal(ovulation).isoformat()
+            },
+            'confidence_level': levels[index],
+            'days_until_ovulation': ovulation - today,
+            'fertility_tracking_data_available': bool(chunk['has_tracking'][index])
+        }
+        predictions.append((user_id, period, fertility))
+    return predictions
@@ -0,0 +1,282 @@
+# api/agent_modules/analytics/result_cache.py
+
+import hashlib
+import logging
+import math
+import random
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.redis import RedisCacheClient
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ('hit', 'stale_hit', 'refreshed', 'miss', 'lock_wait', 'uncached')
+NOT_REFRESHED = object()
+
+
+class AnalyticsResultCache:
+    """
+    Computed analytics results (cycle analysis, predictions, insights),
+    cached per user, analysis and input version.
+
+    Entries are write-once: the key includes the user's input version,
+    which is bumped after commit whenever one of their women's health
+    records is saved or deleted (invalidate_analytics_cache in
+    api/models/signals.py). A changed input never overwrites an entry; it
+    just stops being read and expires.
+
+    Each entry is {'value', 'computed_at', 'delta', 'fresh_until'} and is
+    kept for ttl + stale_ttl seconds:
+
+    - fresh: served as is, except that each read may refresh it early with
+      probability rising towards fresh_until (XFetch: now - delta * beta *
+      log(random()) >= fresh_until, delta being how long it took to
+      compute), so popular entries are recomputed before they expire
+      instead of all at once when they do;
+    - stale (past fresh_until): served as is while one caller refreshes it
+      (stale-while-revalidate);
+    - missing: computed by the one caller holding the recompute lock
+      (cache.add, so only one per key across processes); the others poll
+      for the result for up to lock_wait seconds, then compute it
+      themselves without storing it.
+
+    Refreshes run in a background thread unless background_refresh is off
+    (ANALYTICS_CACHE_BACKGROUND_REFRESH), in which case the caller that
+    takes the lock recomputes inline and gets the new value.
+
+    Hit / miss counts and latencies are kept per process; cache_info()
+    reports them (the performance agent's cache metrics).
+    """
+
+    KEY = 'analytics_cache:{analysis}:{user_id}:{version}:{digest}'
+    VERSION_KEY = 'analytics_cache:version:{user_id}'
+    LOCK_POLL_INTERVAL = 0.05
+    # Delete the lock only while it still holds our token, never another worker's
+    RELEASE_SCRIPT = """
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('del', KEYS[1])
+        end
+        return 0
+    """
+
+    def __init__(self, ttl=None, stale_ttl=None, beta=None, lock_timeout=None, lock_wait=None,
+                 background_refresh=None):
+        self._ttl = ttl
+        self._stale_ttl = stale_ttl
+        self._beta = beta
+        self._lock_timeout = lock_timeout
+        self._lock_wait = lock_wait
+        self._background_refresh = background_refresh
+        self._stats_lock = threading.Lock()
+        self.clear_stats()
+
+    def _setting(self, value, name, default):
+        return value if value is not None else getattr(settings, name, default)
+
+    @property
+    def ttl(self):
+        return self._setting(self._ttl, 'ANALYTICS_CACHE_TTL', 15 * 60)
+
+    @property
+    def stale_ttl(self):
+        return self._setting(self._stale_ttl, 'ANALYTICS_CACHE_STALE_TTL', 60 * 60)
+
+    @property
+    def beta(self):
+        return self._setting(self._beta, 'ANALYTICS_CACHE_BETA', 1.0)
+
+    @property
+    def lock_timeout(self):
+        return self._setting(self._lock_timeout, 'ANALYTICS_CACHE_LOCK_TIMEOUT', 30)
+
+    @property
+    def lock_wait(self):
+        return self._setting(self._lock_wait, 'ANALYTICS_CACHE_LOCK_WAIT', 5)
+
+    @property
+    def background_refresh(self):
+        return self._setting(self._background_refresh, 'ANALYTICS_CACHE_BACKGROUND_REFRESH', True)
+
+    # ----- keys -----
+
+    def version(self, user_id: int):
+        key = self.VERSION_KEY.format(user_id=user_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        return version
+
+    def cache_key(self, analysis: str, user_id: int, **params) -> str:
+        param_key = ','.join(f'{name}={value}' for name, value in sorted(params.items()))
+        digest = hashlib.md5(param_key.encode()).hexdigest()[:12]
+        return self.KEY.format(analysis=analysis, user_id=user_id, version=self.version(user_id), digest=digest)
+
+    def invalidate_user(self, user_id: int):
+        """Bump the user's input version once the current transaction commits"""
+        key = self.VERSION_KEY.format(user_id=user_id)
+        transaction.on_commit(lambda: cache.set(key, time.time_ns(), None))
+
+    # ----- reads -----
+
+    def get(self, analysis: str, user_id: int, compute: Callable[[], Any], **params) -> Any:
+        """
+        The cached result of compute() for this user, analysis and params;
+        params must have a stable str() and cover every input besides the
+        user's records (e.g. today's date for date-relative predictions).
+        """
+        started = time.monotonic()
+        key = self.cache_key(analysis, user_id, **params)
+        entry = cache.get(key)
+
+        if entry is not None:
+            now = time.time()
+            if now < entry['fresh_until']:
+                if self._expires_early(entry, now):
+                    value = self._refresh(key, compute)
+                    if value is not NOT_REFRESHED:
+                        return self._record('refreshed', started, value)
+                return self._record('hit', started, entry['value'])
+            value = self._refresh(key, compute)
+            if value is not NOT_REFRESHED:
+                return self._record('refreshed', started, value)
+            return self._record('stale_hit', started, entry['value'])
+
+        token = self._acquire(key)
+        if token is not None:
+            return self._record('miss', started, self._compute(key, compute, token))
+
+        entry = self._wait_for(key)
+        if entry is not None:
+            return self._record('lock_wait', started, entry['value'])
+        # The lock holder failed or is too slow; don't pile onto it
+        return self._record('uncached', started, compute())
+
+    def _expires_early(self, entry: Dict[str, Any], now: float) -> bool:
+        return now - entry['delta'] * self.beta * math.log(1.0 - random.random()) >= entry['fresh_until']
+
+    def _refresh(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Recompute an entry that is still being served, if no one else is;
+        returns the new value when recomputed inline, otherwise NOT_REFRESHED.
+        """
+        token = self._acquire(key)
+        if token is None:
+            return NOT_REFRESHED
+        self._count('refreshes')
+        if not self.background_refresh:
+            try:
+                return self._compute(key, compute, token)
+            except Exception:
+                return NOT_REFRESHED  # Logged and counted by _compute; serve the entry we have
+
+        def refresh():
+            try:
+                self._compute(key, compute, token)
+            except Exception:
+                pass  # Logged and counted by _compute; the stale entry stays
+            finally:
+                connections.close_all()
+
+        threading.Thread(target=refresh, name='analytics-cache-refresh', daemon=True).start()
+        return NOT_REFRESHED
+
+    def _wait_for(self, key: str) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + self.lock_wait
+        lock_key = f'{key}:lock'
+        while time.monotonic() < deadline:
+            time.sleep(self.LOCK_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry
+            if cache.get(lock_key) is None:
+                return cache.get(key)
+        return None
+
+    # ----- writes -----
+
+    def _acquire(self, key: str) -> Optional[str]:
+        token = uuid.uuid4().hex
+        return token if cache.add(f'{key}:lock', token, self.lock_timeout) else None
+
+    def _release(self, key: str, token: str):
+        lock_key = f'{key}:lock'
+        if isinstance(getattr(cache, '_cache', None), RedisCacheClient):
+            # One atomic compare-and-delete: between a separate get and delete the lock
+            # could time out and be taken by another worker, whose lock we would then drop
+            full_key = cache.make_and_validate_key(lock_key)
+            client = cache._cache.get_client(full_key, write=True)
+            client.register_script(self.RELEASE_SCRIPT)(keys=[full_key], args=[cache._cache._serializer.dumps(token)])
+        elif cache.get(lock_key) == token:  # Not a lock that timed out and was taken by someone else
+            cache.delete(lock_key)
+
+    def _compute(self, key: str, compute: Callable[[], Any], token: str) -> Any:
+        try:
+            started = time.monotonic()
+            value = compute()
+            delta = time.monotonic() - started
+            now = time.time()
+            cache.set(key, {
+                'value': value,
+                'computed_at': now,
+                'delta': delta,
+                'fresh_until': now + self.ttl,
+            }, self.ttl + self.stale_ttl)
+            return value
+        except Exception:
+            self._count('errors')
+            logger.exception(f"Analytics cache recompute failed for {key}")
+            raise
+        finally:
+            self._release(key, token)
+
+    # ----- metrics -----
+
+    def _count(self, name: str):
+        with self._stats_lock:
+            self._events[name] += 1
+
+    def _record(self, outcome: str, started: float, value: Any) -> Any:
+        elapsed = time.monotonic() - started
+        with self._stats_lock:
+            self._outcomes[outcome] += 1
+            self._latency[outcome] += elapsed
+        return value
+
+    def clear_stats(self):
+        with self._stats_lock:
+            self._outcomes = dict.fromkeys(OUTCOMES, 0)
+            self._latency = dict.fromkeys(OUTCOMES, 0.0)
+            self._events = {'refreshes': 0, 'errors': 0}
+
+    def counters(self) -> Dict[str, Dict[str, Any]]:
+        """Raw totals: requests and latency seconds per outcome, refresh / error events"""
+        with self._stats_lock:
+            return {'requests': dict(self._outcomes), 'latency': dict(self._latency), 'events': dict(self._events)}
+
+    def cache_info(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            outcomes = dict(self._outcomes)
+            latency = dict(self._latency)
+            events = dict(self._events)
+        requests = sum(outcomes.values())
+        served_from_cache = outcomes['hit'] + outcomes['stale_hit'] + outcomes['lock_wait']  # No recompute
+        return {
+            'requests': requests,
+            **outcomes,
+            **events,
+            'hit_rate': round(served_from_cache / requests * 100, 1) if requests else 0.0,
+            'avg_latency_ms': {
+                outcome: round(latency[outcome] / count * 1000, 3) if count else 0.0
+                for outcome, count in outcomes.items()
+            },
+        }
+
+
+analytics_cache = AnalyticsResultCache()
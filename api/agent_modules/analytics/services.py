@@ -5,13 +5,20 @@ from datetime import datetime, timedelta
 from django.utils import timezone
 from django.db.models import Avg, Count, Q
 from api.models import MenstrualCycle, DailyHealthLog, FertilityTracking, WomensHealthProfile
+from .cycle_engine import CycleAnalyticsEngine, ENERGY_SCORES, MOOD_SCORES, WEEKDAY_BY_ORDINAL_MOD
 import logging
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
 class CycleAnalyticsService:
-    """Service for analyzing menstrual cycle data and detecting irregularities."""
+    """
+    Service for analyzing menstrual cycle data and detecting irregularities.
+    
+    Only the needed columns are loaded (values_list); the statistics are
+    computed over numpy arrays by CycleAnalyticsEngine.
+    """
     
     def __init__(self):
         self.logger = logging.getLogger(f"{__name__}.CycleAnalyticsService")
@@ -42,62 +49,56 @@ class CycleAnalyticsService:
         try:
             profile = WomensHealthProfile.objects.get(user_id=user_id)
             
-            # Get recent cycles
+            # Get recent cycles (start date and length only)
             cutoff_date = timezone.now().date() - timedelta(days=months_back * 30)
-            cycles = MenstrualCycle.objects.filter(
+            cycles = list(MenstrualCycle.objects.filter(
                 womens_health_profile=profile,
                 cycle_start_date__gte=cutoff_date
-            ).order_by('cycle_start_date')
+            ).order_by('cycle_start_date').values_list('cycle_start_date', 'cycle_length'))
             
-            if cycles.count() < 3:
+            if len(cycles) < 3:
                 return {
                     'sufficient_data': False,
                     'message': 'Need at least 3 cycles for analysis',
-                    'cycles_count': cycles.count()
+                    'cycles_count': len(cycles)
                 }
             
-            # Analyze cycle lengths
-            cycle_lengths = [c.cycle_length for c in cycles if c.cycle_length]
-            avg_length = sum(cycle_lengths) / len(cycle_lengths) if cycle_lengths else 0
+            start_dates = [start for start, _ in cycles]
+            cycle_lengths = np.array([length for _, length in cycles if length], dtype=np.int64)
+            stats = CycleAnalyticsEngine.cycle_length_stats(cycle_lengths)
             
             # Detect irregularities
             irregularities = []
             
             # Long cycles (>35 days)
-            long_cycles = [l for l in cycle_lengths if l > 35]
-            if long_cycles:
+            if stats['long']:
                 irregularities.append({
                     'type': 'long_cycles',
-                    'severity': 'moderate' if len(long_cycles) < len(cycle_lengths) / 2 else 'high',
-                    'description': f'{len(long_cycles)} cycles longer than 35 days',
+                    'severity': 'moderate' if stats['long'] < stats['count'] / 2 else 'high',
+                    'description': f"{stats['long']} cycles longer than 35 days",
                     'recommendation': 'Consider consulting healthcare provider'
                 })
             
             # Short cycles (<21 days)
-            short_cycles = [l for l in cycle_lengths if l < 21]
-            if short_cycles:
+            if stats['short']:
                 irregularities.append({
                     'type': 'short_cycles',
-                    'severity': 'moderate' if len(short_cycles) < len(cycle_lengths) / 2 else 'high',
-                    'description': f'{len(short_cycles)} cycles shorter than 21 days',
+                    'severity': 'moderate' if stats['short'] < stats['count'] / 2 else 'high',
+                    'description': f"{stats['short']} cycles shorter than 21 days",
                     'recommendation': 'Consider consulting healthcare provider'
                 })
             
             # High variability (standard deviation > 7 days)
-            if len(cycle_lengths) > 2:
-                variance = sum((x - avg_length) ** 2 for x in cycle_lengths) / len(cycle_lengths)
-                std_dev = variance ** 0.5
-                
-                if std_dev > 7:
-                    irregularities.append({
-                        'type': 'high_variability',
-                        'severity': 'moderate',
-                        'description': f'High cycle length variation (±{std_dev:.1f} days)',
-                        'recommendation': 'Track consistently to identify patterns'
-                    })
+            if stats['std_dev'] is not None and stats['std_dev'] > 7:
+                irregularities.append({
+                    'type': 'high_variability',
+                    'severity': 'moderate',
+                    'description': f"High cycle length variation (±{stats['std_dev']:.1f} days)",
+                    'recommendation': 'Track consistently to identify patterns'
+                })
             
             # Missed periods (gaps > 50 days)
-            missed_periods = self._detect_missed_periods(cycles)
+            missed_periods = self._detect_missed_periods(start_dates)
             if missed_periods:
                 irregularities.append({
                     'type': 'missed_periods',
@@ -110,11 +111,11 @@ class CycleAnalyticsService:
                 'sufficient_data': True,
                 'analysis_period': f'{months_back} months',
                 'cycles_analyzed': len(cycles),
-                'average_cycle_length': round(avg_length, 1),
+                'average_cycle_length': round(stats['mean'], 1),
                 'irregularities_detected': len(irregularities),
                 'irregularities': irregularities,
                 'overall_assessment': self._get_overall_assessment(irregularities),
-                'next_expected_period': self._predict_next_period_simple(cycles)
+                'next_expected_period': self._predict_next_period_simple(start_dates, stats)
             }
             
         except Exception as e:
@@ -152,24 +153,16 @@ class CycleAnalyticsService:
             self.logger.error(f"Error analyzing patterns for user {user_id}: {e}")
             raise
     
-    def _detect_missed_periods(self, cycles) -> List[Dict[str, Any]]:
-        """Detect potential missed periods based on gaps in cycle data."""
+    def _detect_missed_periods(self, start_dates) -> List[Dict[str, Any]]:
+        """Detect potential missed periods based on gaps between cycle start dates."""
+        starts = CycleAnalyticsEngine.ordinals(start_dates)
         missed = []
-        cycles_list = list(cycles)
-        
-        for i in range(len(cycles_list) - 1):
-            current = cycles_list[i]
-            next_cycle = cycles_list[i + 1]
-            
-            gap_days = (next_cycle.cycle_start_date - current.cycle_start_date).days
-            
-            if gap_days > 50:  # Potential missed period
-                missed.append({
-                    'gap_start': current.cycle_start_date.isoformat(),
-                    'gap_end': next_cycle.cycle_start_date.isoformat(),
-                    'gap_days': gap_days
-                })
-        
+        for index in CycleAnalyticsEngine.long_gaps(starts, threshold=50).tolist():
+            missed.append({
+                'gap_start': start_dates[index].isoformat(),
+                'gap_end': start_dates[index + 1].isoformat(),
+                'gap_days': int(starts[index + 1] - starts[index])
+            })
         return missed
     
     def _get_overall_assessment(self, irregularities: List[Dict]) -> str:
@@ -183,134 +176,134 @@ class CycleAnalyticsService:
         
         return 'Some irregularities detected - monitor and track consistently'
     
-    def _predict_next_period_simple(self, cycles) -> Optional[str]:
+    def _predict_next_period_simple(self, start_dates, stats) -> Optional[str]:
         """Simple prediction of next period based on average cycle length."""
-        if not cycles:
-            return None
-        
-        last_cycle = cycles.last()
-        cycle_lengths = [c.cycle_length for c in cycles if c.cycle_length]
-        
-        if not cycle_lengths:
+        if not start_dates or not stats['count']:
             return None
         
-        avg_length = sum(cycle_lengths) / len(cycle_lengths)
-        next_period = last_cycle.cycle_start_date + timedelta(days=int(avg_length))
-        
+        next_period = start_dates[-1] + timedelta(days=int(stats['mean']))
         return next_period.isoformat()
     
-    def _analyze_mood_patterns(self, profile, cutoff_date) -> Dict[str, Any]:
-        """Analyze mood patterns from daily health logs."""
-        logs = DailyHealthLog.objects.filter(
+    def _load_logs(self, profile, cutoff_date, *fields, **filters):
+        """Columns of the profile's logs since cutoff_date, oldest first, as (dates, column, ...)"""
+        rows = list(DailyHealthLog.objects.filter(
             womens_health_profile=profile,
             date__gte=cutoff_date,
-            mood__isnull=False
-        ).order_by('date')
-        
-        if not logs:
+            **filters
+        ).order_by('date').values_list('date', *fields))
+        if not rows:
+            return None
+        return [list(column) for column in zip(*rows)]
+    
+    def _phase_statistics(self, profile, dates, values) -> Dict[str, Any]:
+        """Per cycle phase entry counts and averages of `values` (aligned with `dates`)"""
+        cycles = list(MenstrualCycle.objects.filter(
+            womens_health_profile=profile,
+            cycle_start_date__lte=dates[-1]
+        ).order_by('cycle_start_date').values_list('cycle_start_date', 'period_length'))
+        starts = CycleAnalyticsEngine.ordinals([start for start, _ in cycles])
+        period_lengths = np.array([period_length or 5 for _, period_length in cycles], dtype=np.int64)
+        phases = CycleAnalyticsEngine.cycle_phases(
+            CycleAnalyticsEngine.ordinals(dates), starts, period_lengths, profile.average_cycle_length
+        )
+        return CycleAnalyticsEngine.phase_statistics(phases, values)
+    
+    def _analyze_mood_patterns(self, profile, cutoff_date) -> Dict[str, Any]:
+        """Analyze mood patterns from daily health logs."""
+        columns = self._load_logs(profile, cutoff_date, 'mood', mood__isnull=False)
+        if not columns:
             return {'error': 'No mood data available'}
+        dates, moods = columns
         
         # Analyze mood distribution
-        mood_counts = {}
-        for log in logs:
-            mood_counts[log.mood] = mood_counts.get(log.mood, 0) + 1
+        mood_counts = CycleAnalyticsEngine.counts_in_order(moods)
         
         # Find most common mood
         most_common_mood = max(mood_counts, key=mood_counts.get)
         
         # Analyze cycle-related patterns
-        cycle_patterns = self._analyze_mood_by_cycle_phase(profile, logs)
+        cycle_patterns = self._analyze_mood_by_cycle_phase(profile, moods)
+        mood_scores = CycleAnalyticsEngine.scores(moods, MOOD_SCORES)
         
         return {
             'data_type': 'mood',
             'analysis_period_days': (timezone.now().date() - cutoff_date).days,
-            'total_entries': logs.count(),
+            'total_entries': len(moods),
             'mood_distribution': mood_counts,
             'most_common_mood': most_common_mood,
             'cycle_patterns': cycle_patterns,
-            'trends': self._calculate_mood_trends(logs)
+            'trends': self._calculate_mood_trends(mood_scores),
+            'phase_statistics': self._phase_statistics(profile, dates, mood_scores)
         }
     
     def _analyze_energy_patterns(self, profile, cutoff_date) -> Dict[str, Any]:
         """Analyze energy level patterns."""
-        logs = DailyHealthLog.objects.filter(
-            womens_health_profile=profile,
-            date__gte=cutoff_date,
-            energy_level__isnull=False
-        ).order_by('date')
-        
-        if not logs:
+        columns = self._load_logs(profile, cutoff_date, 'energy_level', energy_level__isnull=False)
+        if not columns:
             return {'error': 'No energy data available'}
+        dates, energy_levels = columns
         
         # Analyze energy distribution
-        energy_counts = {}
-        for log in logs:
-            energy_counts[log.energy_level] = energy_counts.get(log.energy_level, 0) + 1
+        energy_counts = CycleAnalyticsEngine.counts_in_order(energy_levels)
+        energy_scores = CycleAnalyticsEngine.scores(energy_levels, ENERGY_SCORES)
         
         return {
             'data_type': 'energy',
             'analysis_period_days': (timezone.now().date() - cutoff_date).days,
-            'total_entries': logs.count(),
+            'total_entries': len(energy_levels),
             'energy_distribution': energy_counts,
-            'patterns': self._find_energy_patterns(logs)
+            'patterns': self._find_energy_patterns(dates, energy_levels, energy_scores),
+            'phase_statistics': self._phase_statistics(profile, dates, energy_scores)
         }
     
     def _analyze_symptom_patterns(self, profile, cutoff_date) -> Dict[str, Any]:
         """Analyze symptom patterns."""
-        logs = DailyHealthLog.objects.filter(
+        rows = list(DailyHealthLog.objects.filter(
             womens_health_profile=profile,
             date__gte=cutoff_date
-        ).exclude(symptoms=[]).order_by('date')
+        ).exclude(symptoms=[]).order_by('date').values_list('symptoms', flat=True))
         
-        if not logs:
+        if not rows:
             return {'error': 'No symptom data available'}
         
-        # Collect all symptoms
-        all_symptoms = []
-        for log in logs:
-            all_symptoms.extend(log.symptoms)
-        
-        # Count symptom frequency
-        symptom_counts = {}
-        for symptom in all_symptoms:
-            symptom_counts[symptom] = symptom_counts.get(symptom, 0) + 1
+        # Count symptom frequency across all logs
+        all_symptoms = [symptom for symptoms in rows for symptom in symptoms]
+        symptom_counts = CycleAnalyticsEngine.counts_in_order(all_symptoms)
         
         return {
             'data_type': 'symptoms',
             'analysis_period_days': (timezone.now().date() - cutoff_date).days,
-            'total_entries': logs.count(),
+            'total_entries': len(rows),
             'symptom_frequency': symptom_counts,
             'most_common_symptoms': sorted(symptom_counts.items(), key=lambda x: x[1], reverse=True)[:5]
         }
     
     def _analyze_sleep_patterns(self, profile, cutoff_date) -> Dict[str, Any]:
         """Analyze sleep patterns."""
-        logs = DailyHealthLog.objects.filter(
-            womens_health_profile=profile,
-            date__gte=cutoff_date,
-            sleep_duration_hours__isnull=False
-        ).order_by('date')
-        
-        if not logs:
+        columns = self._load_logs(
+            profile, cutoff_date, 'sleep_duration_hours', 'sleep_quality', sleep_duration_hours__isnull=False
+        )
+        if not columns:
             return {'error': 'No sleep data available'}
+        dates, durations, qualities = columns
         
         # Calculate sleep statistics
-        sleep_durations = [float(log.sleep_duration_hours) for log in logs]
-        avg_sleep = sum(sleep_durations) / len(sleep_durations)
+        sleep_hours = np.array(durations, dtype=np.float64)
+        avg_sleep = CycleAnalyticsEngine.mean(sleep_hours)
         
         return {
             'data_type': 'sleep',
             'analysis_period_days': (timezone.now().date() - cutoff_date).days,
-            'total_entries': logs.count(),
+            'total_entries': len(durations),
             'average_sleep_hours': round(avg_sleep, 1),
-            'sleep_quality_distribution': self._get_sleep_quality_distribution(logs),
-            'sleep_trends': self._calculate_sleep_trends(logs)
+            'sleep_quality_distribution': self._get_sleep_quality_distribution(qualities),
+            'sleep_trends': self._calculate_sleep_trends(sleep_hours),
+            'phase_statistics': self._phase_statistics(profile, dates, sleep_hours)
         }
     
-    def _analyze_mood_by_cycle_phase(self, profile, logs) -> Dict[str, Any]:
+    def _analyze_mood_by_cycle_phase(self, profile, moods) -> Dict[str, Any]:
         """Analyze mood patterns by menstrual cycle phase."""
-        # This would require more complex logic to map dates to cycle phases
-        # For now, return placeholder structure
+        # Kept for response compatibility; per-phase averages are in 'phase_statistics'
         return {
             'menstrual_phase': 'Analysis pending',
             'follicular_phase': 'Analysis pending',
@@ -318,23 +311,15 @@ class CycleAnalyticsService:
             'luteal_phase': 'Analysis pending'
         }
     
-    def _calculate_mood_trends(self, logs) -> Dict[str, Any]:
-        """Calculate mood trends over time."""
-        # Simplified trend analysis
-        recent_logs = list(logs.order_by('-date')[:7])  # Last 7 days
-        older_logs = list(logs.order_by('-date')[7:14])  # Previous 7 days
-        
-        if len(recent_logs) < 3 or len(older_logs) < 3:
+    def _calculate_mood_trends(self, mood_scores) -> Dict[str, Any]:
+        """Calculate mood trends: the last 7 entries against the 7 before them."""
+        if len(mood_scores) < 10:  # At least 3 entries before the last 7
             return {'trend': 'insufficient_data'}
         
-        # Simple trend analysis based on mood scores
-        mood_scores = {
-            'excellent': 5, 'good': 4, 'neutral': 3, 'low': 2, 'poor': 1,
-            'anxious': 2, 'stressed': 2, 'depressed': 1
-        }
-        
-        recent_avg = sum(mood_scores.get(log.mood, 3) for log in recent_logs) / len(recent_logs)
-        older_avg = sum(mood_scores.get(log.mood, 3) for log in older_logs) / len(older_logs)
+        # Newest first, as the entries were compared before
+        newest_first = mood_scores[::-1]
+        recent_avg = CycleAnalyticsEngine.trailing_mean(newest_first, 7, end=7)
+        older_avg = CycleAnalyticsEngine.trailing_mean(newest_first[7:14], 7)
         
         if recent_avg > older_avg + 0.5:
             return {'trend': 'improving', 'direction': 'up'}
@@ -343,65 +328,57 @@ class CycleAnalyticsService:
         else:
             return {'trend': 'stable', 'direction': 'neutral'}
     
-    def _find_energy_patterns(self, logs) -> Dict[str, Any]:
+    def _find_energy_patterns(self, dates, energy_levels, energy_scores) -> Dict[str, Any]:
         """Find patterns in energy levels."""
         # Analyze by day of week
-        day_patterns = {}
-        for log in logs:
-            day_name = log.date.strftime('%A')
-            if day_name not in day_patterns:
-                day_patterns[day_name] = []
-            day_patterns[day_name].append(log.energy_level)
+        weekdays = CycleAnalyticsEngine.ordinals(dates) % 7
+        day_patterns = CycleAnalyticsEngine.group_in_order(weekdays, energy_levels)
+        day_patterns = {
+            WEEKDAY_BY_ORDINAL_MOD[weekday]: levels for weekday, levels in day_patterns.items()
+        }
         
         return {
             'day_of_week_patterns': day_patterns,
-            'weekly_insights': self._get_weekly_energy_insights(day_patterns)
+            'weekly_insights': self._get_weekly_energy_insights(weekdays, energy_scores)
         }
     
-    def _get_sleep_quality_distribution(self, logs) -> Dict[str, int]:
+    def _get_sleep_quality_distribution(self, qualities) -> Dict[str, int]:
         """Get distribution of sleep quality ratings."""
-        quality_counts = {}
-        for log in logs:
-            if log.sleep_quality:
-                quality_counts[log.sleep_quality] = quality_counts.get(log.sleep_quality, 0) + 1
-        return quality_counts
+        return CycleAnalyticsEngine.counts_in_order([quality for quality in qualities if quality])
     
-    def _calculate_sleep_trends(self, logs) -> Dict[str, Any]:
+    def _calculate_sleep_trends(self, sleep_hours) -> Dict[str, Any]:
         """Calculate sleep trends over time."""
-        # Simplified trend calculation
-        recent_logs = list(logs.order_by('-date')[:7])
-        if len(recent_logs) < 5:
+        # Simplified trend calculation over the 7 most recent entries
+        if len(sleep_hours) < 5:
             return {'trend': 'insufficient_data'}
         
-        recent_avg = sum(float(log.sleep_duration_hours) for log in recent_logs) / len(recent_logs)
+        recent_avg = CycleAnalyticsEngine.trailing_mean(sleep_hours[::-1], 7, end=7)
         
         return {
             'recent_average_hours': round(recent_avg, 1),
             'trend': 'stable'  # Simplified for now
         }
     
-    def _get_weekly_energy_insights(self, day_patterns) -> List[str]:
+    def _get_weekly_energy_insights(self, weekdays, energy_scores) -> List[str]:
         """Generate insights about weekly energy patterns."""
         insights = []
         
-        # Find highest and lowest energy days
-        if day_patterns:
-            energy_scores = {
-                'very_high': 5, 'high': 4, 'normal': 3, 'low': 2, 'very_low': 1
+        if len(weekdays):
+            # Average score per weekday, in order of first appearance
+            totals = np.bincount(weekdays, weights=energy_scores, minlength=7)
+            counts = np.bincount(weekdays, minlength=7)
+            _, first_index = np.unique(weekdays, return_index=True)
+            day_averages = {
+                WEEKDAY_BY_ORDINAL_MOD[int(weekdays[index])]: float(totals[weekdays[index]] / counts[weekdays[index]])
+                for index in np.sort(first_index)
             }
             
-            day_averages = {}
-            for day, energy_levels in day_patterns.items():
-                if energy_levels:
-                    avg_score = sum(energy_scores.get(level, 3) for level in energy_levels) / len(energy_levels)
-                    day_averages[day] = avg_score
+            # Find highest and lowest energy days
+            highest_day = max(day_averages, key=day_averages.get)
+            lowest_day = min(day_averages, key=day_averages.get)
             
-            if day_averages:
-                highest_day = max(day_averages, key=day_averages.get)
-                lowest_day = min(day_averages, key=day_averages.get)
-                
-                insights.append(f"Highest energy typically on {highest_day}")
-                insights.append(f"Lowest energy typically on {lowest_day}")
+            insights.append(f"Highest energy typically on {highest_day}")
+            insights.append(f"Lowest energy typically on {lowest_day}")
         
         return insights
 
@@ -466,6 +466,10 @@ def batch_update_predictions(user_ids: list = None) -> Dict[str, Any]:
     """
     Batch update predictions for multiple users.
     
+    Predictions are computed in chunks by BatchPredictionRunner (one set of
+    queries per chunk, bulk writes) rather than one task per user. The
+    runner's process pool is left to the run_batch_predictions command.
+    
     Args:
         user_ids: List of user IDs to update (if None, updates all users)
         
@@ -475,31 +479,16 @@ def batch_update_predictions(user_ids: list = None) -> Dict[str, Any]:
     try:
         logger.info(f"Starting batch prediction update for {len(user_ids) if user_ids else 'all'} users")
         
+        from ..analytics.batch_predictions import BatchPredictionRunner
+        
         if user_ids is None:
             # Get all users with women's health verification
             users = User.objects.filter(womens_health_verified=True)
             user_ids = list(users.values_list('id', flat=True))
         
-        results = {
-            'total_users': len(user_ids),
-            'successful_updates': 0,
-            'failed_updates': 0,
-            'errors': []
-        }
-        
-        for user_id in user_ids:
-            try:
-                # Schedule individual prediction update
-                update_cycle_predictions.delay(user_id)
-                results['successful_updates'] += 1
-                
-            except Exception as e:
-                results['failed_updates'] += 1
-                results['errors'].append({
-                    'user_id': user_id,
-                    'error': str(e)
-                })
-                logger.error(f"Failed to schedule prediction update for user {user_id}: {e}")
+        # A prefork worker child can't start a process pool; run_batch_predictions
+        # is the way to use one
+        results = BatchPredictionRunner(workers=1).run(user_ids)
         
         logger.info(f"Batch prediction update completed: {results['successful_updates']} successful, "
                    f"{results['failed_updates']} failed")
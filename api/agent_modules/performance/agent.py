@@ -131,6 +131,27 @@ class PerformanceAgent(BaseAgent):
         except Exception as e:
             return AgentResponse(**self.handle_error(e, "refresh_cache_layer"))
     
+    def get_cache_statistics(self) -> AgentResponse:
+        """
+        Hit / miss / latency counters of the analytics result cache.
+        
+        Returns:
+            AgentResponse with this process's cache counters
+        """
+        try:
+            cache_metrics = self.cache_service.get_cache_metrics()
+            
+            return AgentResponse(
+                success='error' not in cache_metrics,
+                data=cache_metrics,
+                error=cache_metrics.get('error'),
+                agent_name=self.name,
+                operation="get_cache_statistics"
+            )
+            
+        except Exception as e:
+            return AgentResponse(**self.handle_error(e, "get_cache_statistics"))
+    
     def schedule_background_task(self, task_name: str, user_id: Optional[int] = None, 
                                 params: Optional[Dict[str, Any]] = None) -> AgentResponse:
         """
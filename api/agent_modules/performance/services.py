@@ -288,38 +288,33 @@ class DatabaseOptimizationService:
                 'recommendations': []
             }
             
-            # Analyze database connection usage
-            with connection.cursor() as cursor:
-                # Get query statistics (this would need actual database-specific queries)
-                analysis_results['query_patterns'] = {
-                    'total_queries_estimated': days_back * 1000,  # Estimated
-                    'avg_query_time': '45ms',
-                    'slow_query_threshold': '1000ms',
-                    'optimization_opportunities': 3
-                }
+            # Statements recorded slower than SLOW_QUERY_THRESHOLD_MS, by fingerprint, across workers
+            report = self.get_slow_query_report()
+            total_calls = sum(query['calls'] for query in report['queries'])
+            total_ms = sum(query['total_ms'] for query in report['queries'])
+            analysis_results['query_patterns'] = {
+                'slow_query_fingerprints': report['fingerprints'],
+                'slow_query_calls': total_calls,
+                'avg_slow_query_time': f"{round(total_ms / total_calls) if total_calls else 0}ms",
+                'slow_query_threshold': f"{report['threshold_ms']:g}ms",
+                'optimization_opportunities': len(report['index_suggestions'])
+            }
             
-            # Identify potential slow queries
             analysis_results['slow_queries'] = [
                 {
-                    'query_type': 'cycle_pattern_analysis',
-                    'avg_execution_time': '850ms',
-                    'frequency': 'high',
-                    'optimization_potential': 'high'
-                },
-                {
-                    'query_type': 'user_health_insights',
-                    'avg_execution_time': '650ms',
-                    'frequency': 'medium',
-                    'optimization_potential': 'medium'
+                    'fingerprint': query['fingerprint'],
+                    'query': query['sql'],
+                    'calls': query['calls'],
+                    'avg_execution_time': f"{query['avg_ms']:g}ms",
+                    'max_execution_time': f"{query['max_ms']:g}ms",
+                    'plan_node_types': (query['plan'] or {}).get('node_types', [])
                 }
+                for query in report['queries'][:10]
             ]
             
-            # Generate recommendations
             analysis_results['recommendations'] = [
-                'Add composite indexes for cycle pattern queries',
-                'Implement query result caching for health insights',
-                'Consider read replicas for analytics queries',
-                'Optimize date range queries with better indexing'
+                f"Add {suggestion['definition']} to {suggestion['model']} ({suggestion['reason']})"
+                for suggestion in report['index_suggestions']
             ]
             
             self.logger.info(f"Query performance analysis completed for {days_back} days")
@@ -333,6 +328,11 @@ class DatabaseOptimizationService:
                 'success': False
             }
     
+    def get_slow_query_report(self, limit: int = 50) -> Dict[str, Any]:
+        """Worst slow queries by total time, with EXPLAIN summaries and index suggestions."""
+        from .slow_queries import slow_query_recorder
+        return slow_query_recorder.report(limit)
+    
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get current database performance metrics."""
         try:
@@ -587,18 +587,17 @@ class CachingService:
             return {'error': str(e), 'success': False}
     
     def get_cache_metrics(self) -> Dict[str, Any]:
-        """Get current cache performance metrics."""
+        """Get current cache performance metrics (analytics result cache, this process)."""
         try:
+            from api.agent_modules.analytics.result_cache import analytics_cache
+            info = analytics_cache.cache_info()
+            served = info['requests']
+            total_latency = sum(info['avg_latency_ms'][outcome] * info[outcome] for outcome in info['avg_latency_ms'])
             return {
-                'hit_rate': '87%',
-                'miss_rate': '13%',
-                'memory_usage': {
-                    'used': '256MB',
-                    'total': '512MB',
-                    'percentage': 50
-                },
-                'key_count': 1250,
-                'avg_response_time': '2ms'
+                'hit_rate': f"{info['hit_rate']:g}%",
+                'miss_rate': f"{round(100 - info['hit_rate'], 1):g}%" if served else '0%',
+                'avg_response_time': f"{round(total_latency / served, 3) if served else 0:g}ms",
+                'analytics': info
             }
         except Exception as e:
             self.logger.error(f"Error getting cache metrics: {e}")
@@ -607,12 +606,17 @@ class CachingService:
     def get_health_score(self) -> float:
         """Get cache health score (0-100)."""
         try:
-            # Calculate health based on hit rate, memory usage, etc.
-            hit_rate = 87  # Would get from actual metrics
-            memory_efficiency = 85  # Based on memory usage
-            response_time_score = 95  # Based on response times
+            from api.agent_modules.analytics.result_cache import analytics_cache
+            info = analytics_cache.cache_info()
+            if not info['requests']:
+                return 100.0
+            
+            # Hit rate, recompute failures and how fast cache hits are served
+            hit_rate = info['hit_rate']
+            error_score = max(0.0, 100 - info['errors'] / info['requests'] * 100)
+            response_time_score = 100 if info['avg_latency_ms']['hit'] <= 5 else 75 if info['avg_latency_ms']['hit'] <= 20 else 50
             
-            overall_health = (hit_rate + memory_efficiency + response_time_score) / 3
+            overall_health = (hit_rate + error_score + response_time_score) / 3
             return round(overall_health, 1)
             
         except Exception as e:
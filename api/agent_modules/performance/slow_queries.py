@@ -0,0 +1,421 @@
+# api/agent_modules/performance/slow_queries.py
+
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import socket
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone as dt_timezone
+from typing import Any, Dict, List, Optional
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from api.middleware.query_budget import normalize_sql
+
+logger = logging.getLogger(__name__)
+
+SCAN_NODES = ('Seq Scan', 'Index Scan', 'Index Only Scan', 'Bitmap Heap Scan')
+_QUALIFIED_COLUMN = re.compile(r'^(?:"?\w+"?\.)?"?(\w+)"?$')
+_COMPARISON = re.compile(r'^(?:"?\w+"?\.)?"?(\w+)"?\s*(=|<>|!=|>=|<=|>|<|~~|IS)\s')
+
+
+def fingerprint(normalized_sql: str) -> str:
+    return hashlib.md5(normalized_sql.encode()).hexdigest()[:16]
+
+
+def condition_columns(condition: str):
+    """(equality columns, range columns) referenced by a plan Filter / Index Cond, in order"""
+    equality, ranges = [], []
+    for term in re.split(r'\s+AND\s+', condition or ''):
+        term = term.strip().strip('()').strip()
+        if term.startswith('NOT '):
+            term = term[4:].strip('() ')
+        bare = _QUALIFIED_COLUMN.match(term)
+        if bare:  # Boolean column, "(is_read)" / "(NOT is_read)"
+            equality.append(bare.group(1))
+            continue
+        comparison = _COMPARISON.match(term)
+        if comparison:
+            column, operator = comparison.groups()
+            (equality if operator in ('=', 'IS') else ranges).append(column)
+    return equality, ranges
+
+
+def summarize_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The parts of an EXPLAIN (FORMAT JSON) plan the report needs: scans that
+    filter rows. Conditions are normalized like the statement itself, since
+    the plan shows the bound values (emails, HPNs) in Filter / Index Cond.
+    """
+    scans = []
+
+    def walk(node, sort_key):
+        if node.get('Node Type') == 'Sort':
+            sort_key = node.get('Sort Key') or sort_key
+        if node.get('Node Type') in SCAN_NODES and node.get('Relation Name'):
+            index_condition = node.get('Index Cond') or node.get('Recheck Cond') or ''
+            for child in node.get('Plans', []):
+                index_condition = index_condition or child.get('Index Cond', '')
+            if node.get('Filter') or node['Node Type'] == 'Seq Scan':
+                scans.append({
+                    'node_type': node['Node Type'],
+                    'relation': node['Relation Name'],
+                    'index': node.get('Index Name'),
+                    'index_condition': normalize_sql(index_condition),
+                    'filter': normalize_sql(node.get('Filter', '')),
+                    'rows_removed_by_filter': node.get('Rows Removed by Filter'),
+                    'sort_key': list(sort_key or []),
+                })
+        for child in node.get('Plans', []):
+            walk(child, sort_key)
+
+    walk(plan['Plan'], None)
+    return {
+        'total_cost': plan['Plan'].get('Total Cost'),
+        'execution_ms': plan.get('Execution Time'),
+        'node_types': sorted({scan['node_type'] for scan in scans}),
+        'filtered_scans': scans,
+    }
+
+
+class SlowQueryRecorder:
+    """
+    Profiles statements slower than SLOW_QUERY_THRESHOLD_MS.
+
+    Used as a connection.execute_wrapper (SlowQueryMiddleware installs it
+    per request; capture() anywhere else). Slow statements are normalized
+    (literals and IN lists collapsed) and fingerprinted; per fingerprint
+    it keeps calls, total / max time and the latest plan, for at most
+    SLOW_QUERY_MAX_FINGERPRINTS fingerprints, evicting the one with the
+    least total time.
+
+    A SLOW_QUERY_EXPLAIN_SAMPLE_RATE share of slow SELECTs is re-planned
+    with EXPLAIN (FORMAT JSON) on PostgreSQL, adding ANALYZE, BUFFERS
+    with SLOW_QUERY_EXPLAIN_ANALYZE (which runs the query a second time),
+    inside a savepoint so a failing EXPLAIN leaves the transaction intact.
+    Scans that filter rows become index suggestions in report().
+
+    Each process publishes its entries to a Redis hash (when the cache is
+    Redis) at most every SLOW_QUERY_PUBLISH_INTERVAL seconds; report()
+    merges every process's entries. reset() clears them everywhere: other
+    processes drop their entries at their next publish.
+    """
+
+    REDIS_KEY = 'slow_queries:processes'
+    RESET_KEY = 'slow_queries:reset_at'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._entries = {}
+        self._last_publish = 0.0
+        self._last_reset = time.time()
+        self._client = None
+        self._client_resolved = False
+
+    # ----- settings -----
+
+    @property
+    def threshold(self):
+        return getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 200) / 1000
+
+    @property
+    def capacity(self):
+        return getattr(settings, 'SLOW_QUERY_MAX_FINGERPRINTS', 200)
+
+    @property
+    def explain_sample_rate(self):
+        return getattr(settings, 'SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.0)
+
+    @property
+    def explain_analyze(self):
+        return getattr(settings, 'SLOW_QUERY_EXPLAIN_ANALYZE', False)
+
+    # ----- recording -----
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        succeeded = False
+        try:
+            result = execute(sql, params, many, context)
+            succeeded = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.threshold and not getattr(self._local, 'explaining', False):
+                # Never EXPLAIN after a failed statement or while a server-side cursor is open
+                explainable = succeeded and not many and not getattr(context['cursor'], 'name', None)
+                try:
+                    self.record(sql, params, elapsed, context['connection'] if explainable else None)
+                except Exception as e:
+                    logger.warning(f"Slow query recording failed: {str(e)}")
+
+    @contextmanager
+    def capture(self):
+        """Record slow queries on every connection of this thread for the duration of the block"""
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+            yield self
+
+    def record(self, sql, params, elapsed, connection=None):
+        """Count a slow statement; with a connection, the statement may be sampled for EXPLAIN"""
+        normalized = normalize_sql(sql)
+        key = fingerprint(normalized)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.capacity:
+                    cheapest = min(self._entries, key=lambda k: self._entries[k]['total_seconds'])
+                    del self._entries[cheapest]
+                entry = self._entries[key] = {
+                    'fingerprint': key, 'sql': normalized, 'calls': 0,
+                    'total_seconds': 0.0, 'max_seconds': 0.0, 'last_seen': now, 'plan': None,
+                }
+            entry['calls'] += 1
+            entry['total_seconds'] += elapsed
+            entry['max_seconds'] = max(entry['max_seconds'], elapsed)
+            entry['last_seen'] = now
+
+        if (connection is not None and connection.vendor == 'postgresql'
+                and sql.lstrip().upper().startswith('SELECT') and random.random() < self.explain_sample_rate):
+            plan = self.explain(connection, sql, params)
+            if plan is not None:
+                with self._lock:
+                    if key in self._entries:
+                        self._entries[key]['plan'] = plan
+        self._maybe_publish()
+
+    def explain(self, connection, sql, params) -> Optional[Dict[str, Any]]:
+        options = 'ANALYZE, BUFFERS, FORMAT JSON' if self.explain_analyze else 'FORMAT JSON'
+        self._local.explaining = True
+        try:
+            with transaction.atomic(using=connection.alias):
+                with connection.cursor() as cursor:
+                    cursor.execute(f'EXPLAIN ({options}) {sql}', params)
+                    raw = cursor.fetchone()[0]
+            plan = raw if isinstance(raw, list) else json.loads(raw)
+            summary = summarize_plan(plan[0])
+            summary['explained_at'] = time.time()
+            summary['analyzed'] = self.explain_analyze
+            return summary
+        except Exception as e:
+            logger.warning(f"EXPLAIN of slow query failed: {str(e)}")
+            return None
+        finally:
+            self._local.explaining = False
+
+    def reset(self):
+        now = time.time()
+        with self._lock:
+            self._entries.clear()
+            self._last_reset = now
+        client = self._redis()
+        if client is not None:
+            try:
+                client.set(self.RESET_KEY, now, ex=getattr(settings, 'SLOW_QUERY_RETENTION', 24 * 3600))
+                client.delete(self.REDIS_KEY)
+            except Exception as e:
+                logger.warning(f"Slow query store unavailable: {str(e)}")
+
+    # ----- sharing between processes -----
+
+    def _redis(self):
+        if not self._client_resolved:
+            backend = getattr(settings, 'SLOW_QUERY_BACKEND', 'auto')
+            cache_config = settings.CACHES.get('default', {})
+            location = cache_config.get('LOCATION')
+            if backend in ('auto', 'redis') and 'redis' in cache_config.get('BACKEND', '').lower():
+                import redis
+                if isinstance(location, (list, tuple)):
+                    location = location[0]
+                self._client = redis.Redis.from_url(location, socket_timeout=1, socket_connect_timeout=1)
+            self._client_resolved = True
+        return self._client
+
+    @staticmethod
+    def _process_key():
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def _maybe_publish(self, force=False):
+        interval = getattr(settings, 'SLOW_QUERY_PUBLISH_INTERVAL', 10)
+        now = time.time()
+        if not force and now - self._last_publish < interval:
+            return
+        client = self._redis()
+        if client is None:
+            return
+        self._last_publish = now
+        try:
+            reset_at = float(client.get(self.RESET_KEY) or 0)
+        except Exception as e:
+            logger.warning(f"Slow query store unavailable: {str(e)}")
+            return
+        with self._lock:
+            if reset_at > self._last_reset:  # Reset from another process
+                self._entries.clear()
+                self._last_reset = reset_at
+            entries = [dict(entry) for entry in self._entries.values()]
+        try:
+            client.hset(self.REDIS_KEY, self._process_key(), json.dumps({'published_at': now, 'entries': entries}))
+        except Exception as e:
+            logger.warning(f"Slow query store unavailable: {str(e)}")
+
+    def _all_entries(self) -> List[List[Dict[str, Any]]]:
+        """Entries per process: this one's, plus every other process's latest publish"""
+        with self._lock:
+            entries = [[dict(entry) for entry in self._entries.values()]]
+        client = self._redis()
+        if client is None:
+            return entries
+        self._maybe_publish(force=True)
+        try:
+            published = client.hgetall(self.REDIS_KEY)
+        except Exception as e:
+            logger.warning(f"Slow query store unavailable, reporting this process only: {str(e)}")
+            return entries
+        stale_before = time.time() - getattr(settings, 'SLOW_QUERY_RETENTION', 24 * 3600)
+        own = self._process_key()
+        for process, snapshot in published.items():
+            process = process.decode()
+            if process == own:
+                continue
+            snapshot = json.loads(snapshot)
+            if snapshot['published_at'] < stale_before:
+                client.hdel(self.REDIS_KEY, process)
+                continue
+            entries.append(snapshot['entries'])
+        return entries
+
+    # ----- reporting -----
+
+    def report(self, limit: int = 50) -> Dict[str, Any]:
+        """Worst fingerprints by total time across processes, with index suggestions from their plans"""
+        merged = {}
+        processes = self._all_entries()
+        for entries in processes:
+            for entry in entries:
+                total = merged.get(entry['fingerprint'])
+                if total is None:
+                    merged[entry['fingerprint']] = dict(entry)
+                    continue
+                total['calls'] += entry['calls']
+                total['total_seconds'] += entry['total_seconds']
+                total['max_seconds'] = max(total['max_seconds'], entry['max_seconds'])
+                total['last_seen'] = max(total['last_seen'], entry['last_seen'])
+                if entry['plan'] and (not total['plan'] or entry['plan']['explained_at'] > total['plan']['explained_at']):
+                    total['plan'] = entry['plan']
+
+        worst = sorted(merged.values(), key=lambda entry: entry['total_seconds'], reverse=True)
+        queries = [{
+            'fingerprint': entry['fingerprint'],
+            'sql': entry['sql'],
+            'calls': entry['calls'],
+            'total_ms': round(entry['total_seconds'] * 1000, 2),
+            'avg_ms': round(entry['total_seconds'] * 1000 / entry['calls'], 2),
+            'max_ms': round(entry['max_seconds'] * 1000, 2),
+            'last_seen': datetime.fromtimestamp(entry['last_seen'], tz=dt_timezone.utc).isoformat(),
+            'plan': entry['plan'],
+        } for entry in worst[:limit]]
+
+        return {
+            'generated_at': timezone.now().isoformat(),
+            'threshold_ms': self.threshold * 1000,
+            'processes': len(processes),
+            'fingerprints': len(merged),
+            'queries': queries,
+            'index_suggestions': IndexAdvisor().suggest(worst),
+        }
+
+
+class IndexAdvisor:
+    """Composite index suggestions from the filtering scans in slow queries' plans"""
+
+    def __init__(self):
+        self.models = {model._meta.db_table: model for model in apps.get_models()}
+
+    @staticmethod
+    def existing_indexes(model) -> List[List[str]]:
+        """Column lists of the model's indexes (single-column ones included)"""
+        meta = model._meta
+        columns = {field.name: field.column for field in meta.concrete_fields}
+        indexes = [
+            [field.column] for field in meta.concrete_fields
+            if field.primary_key or field.unique or field.db_index
+        ]
+        for index in meta.indexes:
+            indexes.append([columns.get(name.lstrip('-'), name.lstrip('-')) for name in index.fields])
+        for group in list(meta.unique_together) + list(getattr(meta, 'index_together', ())):
+            indexes.append([columns.get(name, name) for name in group])
+        return indexes
+
+    def suggestion_for(self, scan) -> Optional[Dict[str, Any]]:
+        model = self.models.get(scan['relation'])
+        if model is None:
+            return None
+        min_rows = getattr(settings, 'SLOW_QUERY_SEQ_SCAN_MIN_ROWS', 1000)
+        if scan['rows_removed_by_filter'] is not None and scan['rows_removed_by_filter'] < min_rows:
+            return None
+
+        fields = {field.column: field for field in model._meta.concrete_fields}
+        index_equality, index_ranges = condition_columns(scan['index_condition'])
+        filter_equality, filter_ranges = condition_columns(scan['filter'])
+        equality = [column for column in dict.fromkeys(index_equality + filter_equality) if column in fields]
+        # Selective columns (foreign keys, ids) before booleans
+        equality.sort(key=lambda column: fields[column].get_internal_type() == 'BooleanField')
+        trailing = None
+        for key in scan['sort_key']:
+            column, _, direction = key.partition(' ')
+            column = _QUALIFIED_COLUMN.match(column)
+            if column and column.group(1) in fields and column.group(1) not in equality:
+                trailing = ('-' if direction.upper().startswith('DESC') else '') + column.group(1)
+                break
+        if trailing is None:
+            ranges = [column for column in index_ranges + filter_ranges if column in fields and column not in equality]
+            trailing = ranges[0] if ranges else None
+
+        columns = equality + ([trailing] if trailing else [])
+        if not columns or (len(columns) == 1 and not scan['filter']):
+            return None
+        plain = [column.lstrip('-') for column in columns]
+        if any(existing[:len(plain)] == plain for existing in self.existing_indexes(model)):
+            return None
+
+        names = [
+            ('-' if column.startswith('-') else '') + fields[column.lstrip('-')].name for column in columns
+        ]
+        return {
+            'model': model._meta.label,
+            'fields': names,
+            'definition': f"models.Index(fields={names!r})",
+            'reason': f"{scan['node_type']} on {scan['relation']}"
+                      + (f" using {scan['index']}" if scan['index'] else '')
+                      + f" filtering {scan['filter'] or scan['index_condition']}",
+        }
+
+    def suggest(self, entries) -> List[Dict[str, Any]]:
+        suggestions = {}
+        for entry in entries:
+            for scan in (entry['plan'] or {}).get('filtered_scans', []):
+                suggestion = self.suggestion_for(scan)
+                if suggestion is None:
+                    continue
+                key = (suggestion['model'], tuple(suggestion['fields']))
+                if key not in suggestions:
+                    suggestion.update({'fingerprints': [], 'total_ms': 0.0})
+                    suggestions[key] = suggestion
+                suggestions[key]['fingerprints'].append(entry['fingerprint'])
+                suggestions[key]['total_ms'] = round(suggestions[key]['total_ms'] + entry['total_seconds'] * 1000, 2)
+        return sorted(suggestions.values(), key=lambda suggestion: suggestion['total_ms'], reverse=True)
+
+
+slow_query_recorder = SlowQueryRecorder()
@@ -22,6 +22,7 @@ from api.models.messaging import (
     get_auto_scaling_storage
 )
 from api.models import CustomUser
+from api.services.metrics import MetricsService
 
 logger = logging.getLogger('messaging.websocket')
 
@@ -57,8 +58,17 @@ class BaseMessagingConsumer(AsyncWebsocketConsumer):
         """Override in subclasses for specific connection logic"""
         await self.accept()
     
+    async def accept(self, subprotocol=None, headers=None):
+        """Accept the connection and count it as open for /metrics"""
+        await super().accept(subprotocol=subprotocol, headers=headers)
+        self.counted_connection = True
+        MetricsService.websocket_opened(self.__class__.__name__)
+    
     async def disconnect(self, close_code):
         """Handle WebSocket disconnection"""
+        if getattr(self, 'counted_connection', False):
+            self.counted_connection = False
+            MetricsService.websocket_closed(self.__class__.__name__)
         logger.info(f"User {self.get_user_id()} disconnected from {self.__class__.__name__} (code: {close_code})")
         await self.handle_disconnect(close_code)
     
@@ -0,0 +1,85 @@
+# api/management/commands/benchmark_geoip.py
+
+import os
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.utils.location_utils import GeoIPResolver, geoip2_database
+
+
+def random_public_ips(count, seed):
+    rng = random.Random(seed)
+    ips = []
+    while len(ips) < count:
+        first = rng.randint(1, 223)
+        if first in (10, 127, 169, 172, 192):
+            continue
+        ips.append(f"{first}.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}")
+    return ips
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare GeoIP lookups that open the database per call against the '
+        'shared memory-mapped reader, cold and with the LRU cache warm.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lookups', type=int, default=2000, help='Lookups per scenario (default: 2000)')
+        parser.add_argument(
+            '--distinct', type=int, default=200,
+            help='Distinct addresses the lookups are drawn from, as in login traffic (default: 200)'
+        )
+        parser.add_argument('--database', help='Path to GeoLite2-City.mmdb (default: GEOIP_DATABASE_PATH)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+
+    def report(self, label, lookups, seconds, baseline=None):
+        per_lookup = seconds / lookups * 1e6
+        speedup = f"  {baseline / seconds:6.1f}x" if baseline else ''
+        self.stdout.write(f"{label:<28} {seconds * 1000:9.1f} ms  {per_lookup:9.1f} µs/lookup{speedup}")
+
+    def handle(self, *args, **options):
+        path = options['database'] or settings.GEOIP_DATABASE_PATH
+        if not os.path.exists(path):
+            raise CommandError(f"GeoIP database not found at {path} (set GEOIP_DATABASE_PATH or pass --database)")
+
+        pool = random_public_ips(options['distinct'], options['seed'])
+        rng = random.Random(options['seed'])
+        ips = [rng.choice(pool) for _ in range(options['lookups'])]
+
+        # Previous behaviour: a fresh Reader per call
+        started = time.perf_counter()
+        for ip_address in ips:
+            reader = geoip2_database.Reader(path)
+            try:
+                reader.city(ip_address)
+            except Exception:
+                pass
+            reader.close()
+        per_call = time.perf_counter() - started
+        self.report('open per call', len(ips), per_call)
+
+        resolver = GeoIPResolver(db_path=path, cache_size=0)
+        resolver.lookup(ips[0])  # Open and map the database outside the timing
+        started = time.perf_counter()
+        for ip_address in ips:
+            resolver.lookup(ip_address)
+        self.report('shared reader, no cache', len(ips), time.perf_counter() - started, per_call)
+        resolver.close()
+
+        resolver = GeoIPResolver(db_path=path, cache_size=options['distinct'])
+        started = time.perf_counter()
+        for ip_address in ips:
+            resolver.lookup(ip_address)
+        self.report('shared reader + LRU cache', len(ips), time.perf_counter() - started, per_call)
+        info = resolver.cache_info()
+        self.stdout.write(f"  cache hits {info['hits']}, misses {info['misses']}")
+
+        started = time.perf_counter()
+        resolver.clear_cache()
+        resolver.lookup_many(ips)
+        self.report('bulk (lookup_many), cold', len(ips), time.perf_counter() - started, per_call)
+        resolver.close()
@@ -0,0 +1,153 @@
+# api/management/commands/benchmark_registry_search.py
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from api.models import PHBProfessionalRegistry
+from api.services.professional_search import ProfessionalRegistrySearch
+
+FIRST_NAMES = [
+    'Adaeze', 'Adebayo', 'Aisha', 'Amaka', 'Bola', 'Chidi', 'Chioma', 'Daniel', 'Emeka', 'Fatima',
+    'Femi', 'Funke', 'Grace', 'Ibrahim', 'Ifeoma', 'Kemi', 'Musa', 'Ngozi', 'Obinna', 'Olu',
+    'Segun', 'Tunde', 'Uche', 'Yusuf', 'Zainab', 'Hauwa', 'Kelechi', 'Nneka', 'Tobi', 'Sade',
+]
+# Surnames are built from three syllables, giving ~216k distinct values
+SYLLABLES = [
+    'ade', 'oke', 'ola', 'chi', 'nna', 'eze', 'obi', 'uzo', 'ayo', 'bam', 'ige', 'kan',
+    'lad', 'mor', 'nwa', 'odu', 'fem', 'yem', 'bel', 'dun', 'gbo', 'jid', 'kun', 'ran',
+    'tun', 'wal', 'sha', 'ibe', 'ogu', 'ume', 'abu', 'bak', 'dik', 'efe', 'fag', 'gar',
+    'hab', 'ika', 'jum', 'kas', 'lem', 'mus', 'nda', 'oni', 'pet', 'ros', 'sal', 'tij',
+    'usm', 'vic', 'yak', 'zub', 'ama', 'emo', 'ifi', 'oso', 'uba', 'agb', 'ekw', 'osa',
+]
+SPECIALIZATIONS = [
+    'Cardiology', 'Clinical Pharmacy', 'Paediatrics', 'General Surgery', 'Obstetrics and Gynaecology',
+    'Dermatology', 'Psychiatry', 'Orthopaedics', 'Family Medicine', 'Oncology', 'Radiology', 'Neurology',
+]
+TYPES = ['doctor', 'pharmacist', 'nurse', 'midwife', 'dentist', 'physiotherapist']
+CITIES = [
+    ('Lagos', 'Lagos'), ('Ikeja', 'Lagos'), ('Abuja', 'FCT'), ('Kano', 'Kano'), ('Ibadan', 'Oyo'),
+    ('Enugu', 'Enugu'), ('Port Harcourt', 'Rivers'), ('Benin City', 'Edo'), ('Jos', 'Plateau'),
+]
+
+
+def sql_array(values):
+    return 'ARRAY[' + ', '.join("'" + value.replace("'", "''") + "'" for value in values) + ']'
+
+
+# Synthetic rows reference non-existent users/applications; the FK constraints
+# are DEFERRABLE INITIALLY DEFERRED and the transaction is always rolled back,
+# so they are never checked.
+INSERT_SQL = f"""
+INSERT INTO phb_professional_registry (
+    id, created_at, updated_at, phb_license_number, professional_type, title, first_name, last_name,
+    primary_qualification, qualification_year, specialization, license_status, license_issue_date,
+    license_expiry_date, home_registration_body, home_registration_number, practice_type, city, state,
+    country, languages_spoken, public_email, public_phone, website, identity_verified,
+    qualifications_verified, has_disciplinary_record, disciplinary_notes, status_change_reason,
+    is_searchable, biography, areas_of_interest, first_registered_date, user_id, application_id
+)
+SELECT
+    gen_random_uuid(), now(), now(), 'PHB-BENCH-' || lpad(g::text, 7, '0'),
+    types[1 + g %% array_length(types, 1)], 'Dr.',
+    firsts[1 + g %% array_length(firsts, 1)],
+    initcap(syl[1 + g %% 60] || syl[1 + (g / 60) %% 60] || syl[1 + (g / 3600) %% 60]),
+    'MBBS', 2000 + g %% 24, specs[1 + (g / 7) %% array_length(specs, 1)],
+    CASE WHEN g %% 10 = 0 THEN 'suspended' ELSE 'active' END,
+    date '2015-01-01' + (g %% 3650), date '2027-01-01', 'MDCN', 'MDCN-' || g, 'hospital',
+    cities[1 + (g / 11) %% array_length(cities, 1)], states[1 + (g / 11) %% array_length(states, 1)],
+    'Nigeria', 'English', '', '', '', true, true, false, '', '', g %% 50 <> 0, '',
+    specs[1 + (g / 13) %% array_length(specs, 1)] || ' and preventive care', current_date,
+    -g, gen_random_uuid()
+FROM generate_series(1, %s) AS g,
+     (SELECT {sql_array(TYPES)} AS types, {sql_array(FIRST_NAMES)} AS firsts,
+             {sql_array(SYLLABLES)} AS syl, {sql_array(SPECIALIZATIONS)} AS specs,
+             {sql_array([city for city, _ in CITIES])} AS cities,
+             {sql_array([state for _, state in CITIES])} AS states) AS data
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark professional registry search against synthetic rows. '
+        'Everything runs in one transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500000, help='Synthetic rows to insert (default: 500000)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per search (default: 20)')
+        parser.add_argument('--target-ms', type=float, default=50.0, help='p95 budget per search (default: 50)')
+        parser.add_argument('--explain', action='store_true', help='Print EXPLAIN ANALYZE for each search')
+
+    def searches(self):
+        first_page = ProfessionalRegistrySearch.search(query='', state='Lagos')
+        return [
+            ('surname', {'query': 'Okeadeola'}),
+            ('surname typo', {'query': 'Okeadeolla'}),
+            ('full name', {'query': 'Chioma Okeadeola'}),
+            ('name prefix', {'query': 'Adeoke'}),
+            ('specialty keyword', {'query': 'cardio'}),
+            ('license number', {'query': 'PHB-BENCH-0123456'}),
+            ('type + specialization', {'professional_type': 'doctor', 'specialization': 'Clinical'}),
+            ('state listing', {'state': 'Lagos'}),
+            ('state listing page 2', {'state': 'Lagos', 'cursor': first_page['next_cursor']}),
+        ]
+
+    def explain(self, params):
+        params = dict(params)
+        cursor = params.pop('cursor', None)
+        stages = ProfessionalRegistrySearch.build_stages(**params)
+        after_stage, after = ProfessionalRegistrySearch.decode_cursor(cursor) if cursor else (None, None)
+        for stage, queryset, ordering in stages:
+            if stage == after_stage:
+                queryset = queryset.filter(ProfessionalRegistrySearch.keyset_filter(ordering, after))
+            self.stdout.write(f"-- {stage} stage")
+            self.stdout.write(queryset[:ProfessionalRegistrySearch.PAGE_SIZE + 1].explain(analyze=True))
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            with connection.cursor() as cursor:
+                cursor.execute(INSERT_SQL, [options['rows']])
+                # Merge the GIN pending lists (autovacuum does this in steady state) and refresh stats
+                cursor.execute(
+                    "SELECT gin_clean_pending_list('idx_reg_name_trgm'), "
+                    "gin_clean_pending_list('idx_reg_search_vector')"
+                )
+                cursor.execute('ANALYZE phb_professional_registry')
+            ProfessionalRegistrySearch.clear_keyword_vocabulary()
+            self.stdout.write(
+                f"Inserted {options['rows']} synthetic rows in {time.perf_counter() - started:.1f}s "
+                f"({PHBProfessionalRegistry.objects.count()} total)"
+            )
+
+            over_budget = []
+            for label, params in self.searches():
+                ProfessionalRegistrySearch.search(**params)  # Warm-up
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    results = ProfessionalRegistrySearch.search(**params)['results']
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                self.stdout.write(
+                    f"{label:<24} {len(results):>3} results  p50 {statistics.median(timings):6.1f} ms  "
+                    f"p95 {p95:6.1f} ms  max {timings[-1]:6.1f} ms"
+                )
+                if p95 > options['target_ms']:
+                    over_budget.append(label)
+                if options['explain']:
+                    self.explain(params)
+
+            transaction.set_rollback(True)
+        ProfessionalRegistrySearch.clear_keyword_vocabulary()
+
+        if over_budget:
+            self.stdout.write(self.style.WARNING(
+                f"Over the {options['target_ms']:.0f} ms p95 budget: {', '.join(over_budget)}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"All searches within {options['target_ms']:.0f} ms p95"))
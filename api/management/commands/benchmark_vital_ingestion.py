@@ -0,0 +1,88 @@
+# api/management/commands/benchmark_vital_ingestion.py
+
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from api.models import MedicalRecord
+from api.models.medical import VitalSign
+from api.services.vital_sign_ingestion import VitalSignIngestion
+
+
+def synthetic_readings(hpns, count, seed):
+    """Ward-chart style readings as they arrive in JSON, roughly 1 in 5 abnormal"""
+    rng = random.Random(seed)
+    start = timezone.now() - timedelta(days=1)
+    readings = []
+    for index in range(count):
+        readings.append({
+            'hpn': hpns[index % len(hpns)],
+            'recorded_at': (start + timedelta(minutes=index)).isoformat(),
+            'systolic_bp': rng.randint(85, 160),
+            'diastolic_bp': rng.randint(55, 95),
+            'heart_rate': rng.randint(55, 110),
+            'respiratory_rate': rng.randint(10, 22),
+            'oxygen_saturation': f"{rng.uniform(92, 100):.1f}",
+            'temperature': f"{rng.uniform(35.8, 38.5):.1f}",
+            'weight': f"{rng.uniform(50, 110):.1f}",
+            'height': f"{rng.uniform(150, 195):.1f}",
+            'blood_glucose': f"{rng.uniform(65, 180):.0f}",
+            'glucose_timing': rng.choice(['fasting', 'random', 'post_meal']),
+            'location': 'Ward 4',
+        })
+    return readings
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare vital-sign throughput (readings/second) of one VitalSign.save() per reading '
+        'against VitalSignIngestion.ingest(). Runs in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readings', type=int, default=1000, help='Readings per path (default: 1000)')
+        parser.add_argument('--patients', type=int, default=20, help='Patients the readings are spread over (default: 20)')
+        parser.add_argument('--batch-size', type=int, default=200, help='Readings per bulk upload (default: 200)')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+
+    # DEBUG query logging re-renders every statement with its parameters,
+    # which would swamp the numbers for a 500-row INSERT
+    @override_settings(DEBUG=False)
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            records = MedicalRecord.objects.bulk_create([
+                MedicalRecord(hpn=f"BENCH-VITALS-{index:05d}") for index in range(options['patients'])
+            ])
+            record_ids = {record.hpn: record.pk for record in records}
+            readings = synthetic_readings(list(record_ids), options['readings'], options['seed'])
+
+            started = time.perf_counter()
+            for reading in readings:
+                fields = {name: value for name, value in reading.items() if name != 'hpn'}
+                VitalSign(medical_record_id=record_ids[reading['hpn']], **fields).save()
+            single = time.perf_counter() - started
+
+            started = time.perf_counter()
+            batch_size = options['batch_size']
+            created = rejected = 0
+            for offset in range(0, len(readings), batch_size):
+                result = VitalSignIngestion.ingest(readings[offset:offset + batch_size])
+                created += len(result['created'])
+                rejected += len(result['rejected'])
+            bulk = time.perf_counter() - started
+
+            abnormal = VitalSign.objects.filter(medical_record__in=records, is_abnormal=True).count()
+            transaction.set_rollback(True)
+
+        count = len(readings)
+        self.stdout.write(f"{'save() per reading':<24} {count / single:10.0f} readings/s  ({single * 1000:.0f} ms)")
+        self.stdout.write(
+            f"{f'bulk ({batch_size}/upload)':<24} {count / bulk:10.0f} readings/s  ({bulk * 1000:.0f} ms)  "
+            f"{single / bulk:.1f}x"
+        )
+        self.stdout.write(f"Stored {created} bulk readings ({rejected} rejected); {abnormal} abnormal across both paths")
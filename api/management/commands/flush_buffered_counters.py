@@ -0,0 +1,17 @@
+# api/management/commands/flush_buffered_counters.py
+
+from django.core.management.base import BaseCommand
+
+from api.services.buffered_counters import BufferedCounterService
+
+
+class Command(BaseCommand):
+    help = 'Write pending page view / guideline access counts to the database'
+
+    def handle(self, *args, **options):
+        updated = BufferedCounterService.flush()
+        if not updated:
+            self.stdout.write('No pending counter increments')
+            return
+        for counter, rows in sorted(updated.items()):
+            self.stdout.write(self.style.SUCCESS(f"{counter}: {rows} rows updated"))
@@ -1,22 +1,24 @@
 # api/management/commands/import_drugs.py
 
 import csv
+import glob
 import json
 from datetime import datetime
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
 from api.models import DrugClassification
+from api.services.drug_catalogue_import import DrugCatalogueImporter
 
 
 class Command(BaseCommand):
-    help = 'Import drug classifications from CSV or JSON file'
+    help = 'Import drug classifications from CSV or JSON files (bulk COPY + diff)'
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--file',
             type=str,
+            action='append',
             required=True,
-            help='Path to CSV or JSON file containing drug data',
+            help='Path or glob of CSV/JSON files containing drug data (repeatable, e.g. "data/*.csv")',
         )
         parser.add_argument(
             '--clear',
@@ -26,49 +28,55 @@ class Command(BaseCommand):
         parser.add_argument(
             '--dry-run',
             action='store_true',
-            help='Validate data without actually importing',
+            help='Show what would change without actually importing',
+        )
+        parser.add_argument(
+            '--deactivate-missing',
+            action='store_true',
+            help='Mark active drugs that are not in the imported files as inactive (full catalogue imports)',
+        )
+        parser.add_argument(
+            '--summary-only',
+            action='store_true',
+            help='Only print totals, not the row-level change list',
         )
 
     def handle(self, *args, **options):
-        file_path = options['file']
-        clear_existing = options['clear']
-        dry_run = options['dry_run']
-
-        # Determine file type
-        if file_path.endswith('.csv'):
-            file_type = 'csv'
-        elif file_path.endswith('.json'):
-            file_type = 'json'
-        else:
-            raise CommandError('File must be either .csv or .json')
+        file_paths = []
+        for pattern in options['file']:
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+            if not matches:
+                raise CommandError(f'No files match: {pattern}')
+            file_paths.extend(matches)
 
-        self.stdout.write(self.style.SUCCESS(f'Starting Drug Import from {file_type.upper()} file'))
-        self.stdout.write(f'File: {file_path}')
+        for file_path in file_paths:
+            if not file_path.endswith(('.csv', '.json')):
+                raise CommandError(f'File must be either .csv or .json: {file_path}')
 
+        dry_run = options['dry_run']
+        self.stdout.write(self.style.SUCCESS(f'Starting Drug Import from {len(file_paths)} file(s)'))
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN MODE - No changes will be made'))
 
-        # Clear existing data if requested
-        if clear_existing and not dry_run:
-            count = DrugClassification.objects.count()
-            DrugClassification.objects.all().delete()
-            self.stdout.write(self.style.WARNING(f'Deleted {count} existing drugs'))
-
-        # Import data
+        importer = DrugCatalogueImporter(deactivate_missing=options['deactivate_missing'])
         try:
-            if file_type == 'csv':
-                drugs_data = self.read_csv(file_path)
-            else:
-                drugs_data = self.read_json(file_path)
+            for file_path in file_paths:
+                if file_path.endswith('.csv'):
+                    drugs_data = self.read_csv(file_path)
+                else:
+                    drugs_data = self.read_json(file_path)
+                self.stdout.write(f'File: {file_path} ({len(drugs_data)} drugs)')
+                importer.add_rows(drugs_data, source=file_path)
 
-            self.stdout.write(f'Found {len(drugs_data)} drugs to import')
-            self.import_drugs(drugs_data, dry_run)
+            summary = importer.run(dry_run=dry_run, clear=options['clear'] and not dry_run)
 
-        except FileNotFoundError:
-            raise CommandError(f'File not found: {file_path}')
+        except FileNotFoundError as e:
+            raise CommandError(f'File not found: {e.filename}')
         except Exception as e:
             raise CommandError(f'Import failed: {str(e)}')
 
+        self.report(summary, options['summary_only'])
+
     def read_json(self, file_path):
         with open(file_path, 'r', encoding='utf-8') as file:
             return json.load(file)
@@ -128,42 +136,34 @@ class Command(BaseCommand):
 
         return drug_data
 
-    @transaction.atomic
-    def import_drugs(self, drugs_data, dry_run=False):
-        success_count = 0
-        error_count = 0
-
-        for idx, drug_data in enumerate(drugs_data, 1):
-            try:
-                generic_name = drug_data.get('generic_name', 'Unknown')
-                self.stdout.write(f'{idx}. {generic_name}... ', ending='')
-
-                if dry_run:
-                    drug = DrugClassification(**drug_data)
-                    drug.clean()
-                    self.stdout.write(self.style.SUCCESS('Valid'))
-                    success_count += 1
-                else:
-                    drug, created = DrugClassification.objects.update_or_create(
-                        generic_name=drug_data['generic_name'],
-                        defaults=drug_data
-                    )
-                    if created:
-                        self.stdout.write(self.style.SUCCESS('Created'))
-                    else:
-                        self.stdout.write(self.style.WARNING('Updated'))
-                    success_count += 1
-
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(self.style.ERROR(f'Failed: {str(e)}'))
+    def report(self, summary, summary_only=False):
+        if not summary_only:
+            for name in summary['created']:
+                self.stdout.write(self.style.SUCCESS(f'  + {name}: Created'))
+            for name, changes in summary['updated']:
+                self.stdout.write(self.style.WARNING(f"  ~ {name}: Updated ({', '.join(changes)})"))
+            for name in summary['deactivated']:
+                self.stdout.write(self.style.WARNING(f'  - {name}: Deactivated'))
+            for failure in summary['failed']:
+                self.stdout.write(self.style.ERROR(
+                    f"  ! {failure['source']} row {failure['row']} ({failure['generic_name']}): "
+                    f"Failed: {failure['error']}"
+                ))
 
         self.stdout.write('\n' + '='*60)
-        self.stdout.write(self.style.SUCCESS(f'Successful: {success_count}'))
-        if error_count > 0:
-            self.stdout.write(self.style.ERROR(f'Failed: {error_count}'))
-        if dry_run:
+        if summary['cleared']:
+            self.stdout.write(self.style.WARNING(f"Deleted {summary['cleared']} existing drugs"))
+        self.stdout.write(f"Rows read: {summary['total_rows']} ({summary['unique_drugs']} unique drugs)")
+        self.stdout.write(self.style.SUCCESS(f"Created: {len(summary['created'])}"))
+        self.stdout.write(self.style.SUCCESS(f"Updated: {len(summary['updated'])}"))
+        self.stdout.write(f"Unchanged: {summary['unchanged']}")
+        if summary['deactivated']:
+            self.stdout.write(self.style.WARNING(f"Deactivated: {len(summary['deactivated'])}"))
+        if summary['failed']:
+            self.stdout.write(self.style.ERROR(f"Failed: {len(summary['failed'])}"))
+        self.stdout.write(f"Elapsed: {summary['elapsed']:.2f}s")
+        if summary['dry_run']:
             self.stdout.write(self.style.WARNING('DRY RUN: No data was imported'))
         else:
             self.stdout.write(self.style.SUCCESS(f'Total drugs in database: {DrugClassification.objects.count()}'))
-        self.stdout.write('='*60)
\ No newline at end of file
+        self.stdout.write('='*60)
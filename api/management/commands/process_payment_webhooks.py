@@ -0,0 +1,66 @@
+# api/management/commands/process_payment_webhooks.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from api.services.payment_webhook_inbox import PaymentWebhookInbox
+
+
+class Command(BaseCommand):
+    help = 'Apply queued payment webhook events (safe to run several workers at once)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Events claimed per transaction (default: 50)'
+        )
+        parser.add_argument(
+            '--max-attempts',
+            type=int,
+            default=PaymentWebhookInbox.MAX_ATTEMPTS,
+            help=f'Attempts before an event is marked failed (default: {PaymentWebhookInbox.MAX_ATTEMPTS})'
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep polling for new events instead of exiting when the inbox is drained'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep between polls when idle in --loop mode (default: 2)'
+        )
+
+    def handle(self, *args, **options):
+        totals = {'processed': 0, 'ignored': 0, 'retry': 0, 'failed': 0}
+
+        while True:
+            results = PaymentWebhookInbox.process_batch(
+                batch_size=options['batch_size'],
+                max_attempts=options['max_attempts'],
+            )
+            for outcome, count in results.items():
+                totals[outcome] += count
+            if any(results.values()):
+                self.stdout.write(
+                    f"processed={results['processed']} ignored={results['ignored']} "
+                    f"retry={results['retry']} failed={results['failed']}"
+                )
+
+            # Only retries left (or nothing due): wait before polling again
+            progressed = results['processed'] + results['ignored'] + results['failed']
+            if not progressed:
+                if not options['loop']:
+                    break
+                connection.close()
+                time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Done: {totals['processed']} processed, {totals['ignored']} ignored, "
+            f"{totals['failed']} failed, {PaymentWebhookInbox.pending_count()} pending"
+        ))
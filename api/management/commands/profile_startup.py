@@ -0,0 +1,189 @@
+# api/management/commands/profile_startup.py
+
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.utils.lazy_imports import HEAVY_MODULES
+
+# Runs in a fresh interpreter (with -X importtime) so the numbers reflect a
+# cold worker boot rather than this already-initialised management process.
+# Each module load is timed and its RSS delta recorded by wrapping the import
+# machinery's _find_and_load (used by both `import` statements and
+# importlib.import_module). Time spent in nested imports is subtracted from the
+# importer, so every top-level package is charged only for its own modules.
+PROFILE_SCRIPT = r'''
+import importlib._bootstrap as bootstrap, json, os, sys, time
+
+def rss_kb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+
+packages = {}
+stack = []
+original_find_and_load = bootstrap._find_and_load
+
+def profiling_find_and_load(name, import_):
+    if name in sys.modules:
+        return original_find_and_load(name, import_)
+    frame = {'seconds': 0.0, 'rss_kb': 0}
+    stack.append(frame)
+    rss_before = rss_kb()
+    started = time.perf_counter()
+    try:
+        return original_find_and_load(name, import_)
+    finally:
+        seconds = time.perf_counter() - started
+        rss_delta = rss_kb() - rss_before
+        stack.pop()
+        entry = packages.setdefault(name.partition('.')[0], {'seconds': 0.0, 'rss_kb': 0, 'modules': 0})
+        entry['seconds'] += seconds - frame['seconds']
+        entry['rss_kb'] += rss_delta - frame['rss_kb']
+        entry['modules'] += 1
+        if stack:
+            stack[-1]['seconds'] += seconds
+            stack[-1]['rss_kb'] += rss_delta
+
+bootstrap._find_and_load = profiling_find_and_load
+
+phases = []
+def phase(label, func):
+    rss_before = rss_kb()
+    started = time.perf_counter()
+    func()
+    phases.append({
+        'phase': label,
+        'seconds': time.perf_counter() - started,
+        'rss_delta_kb': rss_kb() - rss_before,
+        'rss_kb': rss_kb(),
+    })
+
+def setup():
+    import django
+    django.setup()
+
+def urlconf():
+    from django.conf import settings
+    from django.urls import get_resolver
+    get_resolver(settings.ROOT_URLCONF).url_patterns
+
+def asgi():
+    __import__(sys.argv[1])
+
+baseline_kb = rss_kb()
+phase('django.setup()', setup)
+phase('URLconf', urlconf)
+if sys.argv[1]:
+    phase('ASGI application', asgi)
+
+bootstrap._find_and_load = original_find_and_load
+print(json.dumps({
+    'baseline_rss_kb': baseline_kb,
+    'phases': phases,
+    'packages': packages,
+    'loaded': sorted(m for m in sys.modules if '.' not in m),
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = 'Profile worker startup: import time and RSS per phase and per top-level module'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=25,
+            help='Number of modules to list, slowest first (default: 25)',
+        )
+        parser.add_argument(
+            '--skip-asgi',
+            action='store_true',
+            help='Stop after the URLconf instead of also loading the ASGI application',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the raw report as JSON',
+        )
+
+    def parse_importtime(self, stderr):
+        """Cumulative import time (seconds) per module from `python -X importtime`"""
+        cumulative = {}
+        for line in stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            try:
+                _, cumulative_us, module = line.split(':', 1)[1].split('|')
+                seconds = int(cumulative_us) / 1_000_000
+            except ValueError:
+                continue
+            name = module.strip()
+            cumulative[name] = max(cumulative.get(name, 0), seconds)
+        return cumulative
+
+    def run_profile(self, asgi_module):
+        env = dict(os.environ)
+        env.setdefault('DJANGO_SETTINGS_MODULE', 'server.settings')
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT, asgi_module],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        stdout_lines = result.stdout.strip().splitlines()
+        if result.returncode != 0 or not stdout_lines:
+            tail = '\n'.join(line for line in result.stderr.splitlines() if not line.startswith('import time:'))
+            raise CommandError(f'Startup profile failed:\n{tail[-2000:]}')
+        report = json.loads(stdout_lines[-1])
+        report['importtime'] = self.parse_importtime(result.stderr)
+        return report
+
+    def handle(self, *args, **options):
+        asgi_module = '' if options['skip_asgi'] else settings.ASGI_APPLICATION.rpartition('.')[0]
+        report = self.run_profile(asgi_module)
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(self.style.HTTP_INFO(
+            f"Interpreter baseline RSS: {report['baseline_rss_kb'] / 1024:.1f} MB"
+        ))
+        self.stdout.write(self.style.HTTP_INFO('Startup phases'))
+        for phase in report['phases']:
+            self.stdout.write(
+                f"  {phase['phase']:<20} {phase['seconds'] * 1000:8.0f} ms  "
+                f"+{phase['rss_delta_kb'] / 1024:7.1f} MB  (RSS {phase['rss_kb'] / 1024:.1f} MB)"
+            )
+
+        packages = sorted(report['packages'].items(), key=lambda item: item[1]['seconds'], reverse=True)
+        self.stdout.write(self.style.HTTP_INFO(f"Top {options['top']} packages by import time (own modules only)"))
+        self.stdout.write(f"  {'package':<32} {'modules':>8} {'ms':>8} {'RSS MB':>8}")
+        for name, entry in packages[:options['top']]:
+            self.stdout.write(
+                f"  {name:<32} {entry['modules']:8d} {entry['seconds'] * 1000:8.0f} {entry['rss_kb'] / 1024:8.1f}"
+            )
+
+        modules = sorted(report['importtime'].items(), key=lambda item: item[1], reverse=True)
+        self.stdout.write(self.style.HTTP_INFO(f"Top {options['top']} modules by cumulative import time (-X importtime)"))
+        for name, seconds in modules[:options['top']]:
+            self.stdout.write(f"  {name:<60} {seconds * 1000:8.0f} ms")
+
+        eager = [name for name in HEAVY_MODULES if name in report['loaded']]
+        if eager:
+            self.stdout.write(self.style.WARNING(
+                f"Heavy modules imported during startup: {', '.join(eager)}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS('No heavy optional modules imported during startup'))
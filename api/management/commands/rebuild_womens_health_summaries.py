@@ -0,0 +1,65 @@
+# api/management/commands/rebuild_womens_health_summaries.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.models import WomensHealthProfile, WomensHealthSummary
+from api.services.womens_health_summary import WomensHealthSummaryService
+
+IGNORED_FIELDS = {'id', 'created_at', 'updated_at'}
+
+
+class Command(BaseCommand):
+    help = "Recompute women's health dashboard summaries from each profile's full history"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profile', type=int, action='append', dest='profiles',
+                            help='Only this profile id (repeatable)')
+        parser.add_argument('--check', action='store_true',
+                            help='Compare the stored summaries with a fresh rebuild without writing; '
+                                 'fails if any differ')
+
+    def handle(self, *args, **options):
+        profiles = WomensHealthProfile.objects.order_by('pk')
+        if options['profiles']:
+            profiles = profiles.filter(pk__in=options['profiles'])
+
+        if not options['check']:
+            rebuilt = 0
+            for profile in profiles.iterator():
+                WomensHealthSummaryService.rebuild(profile)
+                rebuilt += 1
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} summaries"))
+            return
+
+        fields = [
+            field.name for field in WomensHealthSummary._meta.concrete_fields if field.name not in IGNORED_FIELDS
+        ]
+        today = timezone.now().date()
+        checked = stale = 0
+        for profile in profiles.iterator():
+            checked += 1
+            stored = WomensHealthSummary.objects.filter(womens_health_profile=profile).first()
+            if stored is None:
+                stale += 1
+                self.stdout.write(f"profile {profile.pk}: no summary")
+                continue
+            if stored.window_end_date is None or stored.window_end_date < today:
+                # What a dashboard read would show today
+                WomensHealthSummaryService.slide_window(stored, today)
+
+            expected = WomensHealthSummaryService.rebuild(profile, save=False)
+            differences = [
+                field for field in fields if getattr(stored, field) != getattr(expected, field)
+            ]
+            if differences:
+                stale += 1
+                for field in differences:
+                    self.stdout.write(
+                        f"profile {profile.pk}: {field} stored {getattr(stored, field)!r}, "
+                        f"rebuilt {getattr(expected, field)!r}"
+                    )
+
+        if stale:
+            raise CommandError(f"{stale} of {checked} summaries differ from a rebuild")
+        self.stdout.write(self.style.SUCCESS(f"All {checked} summaries match a rebuild"))
@@ -0,0 +1,41 @@
+# api/management/commands/run_batch_predictions.py
+
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from api.agent_modules.analytics.batch_predictions import BatchPredictionRunner
+
+
+class Command(BaseCommand):
+    help = 'Recompute next-period and fertility predictions for verified users in batches (no Celery needed)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help='Only this user id (repeatable)')
+        parser.add_argument('--chunk-size', type=int, default=BatchPredictionRunner.CHUNK_SIZE,
+                            help='Users per query/worker chunk')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Worker processes (default: CPU count; 1 computes in-process)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Compute the predictions without saving them')
+
+    def handle(self, *args, **options):
+        user_ids = options['users']
+        if not user_ids:
+            user_ids = list(get_user_model().objects.filter(
+                womens_health_verified=True
+            ).order_by('pk').values_list('pk', flat=True))
+
+        runner = BatchPredictionRunner(chunk_size=options['chunk_size'], workers=options['workers'])
+        started = time.perf_counter()
+        results = runner.run(user_ids, save=not options['dry_run'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{results['total_users']} users in {elapsed:.1f}s: {results['successful_updates']} predicted, "
+            f"{results['failed_updates']} without enough data, {results['predictions_saved']} predictions saved"
+        )
+        for error in results['errors'][:20]:
+            self.stdout.write(f"  user {error['user_id']}: {error['error']}")
@@ -0,0 +1,89 @@
+# api/management/commands/run_benchmarks.py
+
+import contextlib
+import io
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.benchmark_suite import BenchmarkDataset, BenchmarkSuite
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the request hot paths (p50 / p95 / query counts) against a deterministic synthetic '
+        'dataset and compare with the stored baseline. Everything runs in one transaction that is '
+        'rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', action='append', dest='scenarios', choices=BenchmarkSuite.SCENARIOS,
+                            help='Only this scenario (repeatable; default: all)')
+        parser.add_argument('--scale', type=float, default=1.0, help='Dataset size multiplier (default: 1)')
+        parser.add_argument('--seed', type=int, default=42, help='Dataset random seed (default: 42)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per scenario (default: 20)')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed runs per scenario (default: 2)')
+        parser.add_argument('--baseline', help='Baseline JSON file (default: settings.BENCHMARK_BASELINE_PATH)')
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Write these results to the baseline file instead of comparing')
+        parser.add_argument('--tolerance', type=float,
+                            help='Allowed p50 / p95 slowdown as a fraction (default: settings.BENCHMARK_TOLERANCE)')
+        parser.add_argument('--configured-services', action='store_true',
+                            help='Use the configured cache and channel layer instead of in-memory stand-ins')
+        parser.add_argument('--json', action='store_true', help='Print results and regressions as JSON')
+
+    def handle(self, *args, **options):
+        dataset = BenchmarkDataset(scale=options['scale'], seed=options['seed'])
+        # Seeding and the views print as they go; keep this command's output readable
+        app_output = contextlib.nullcontext() if options['verbosity'] > 1 else contextlib.redirect_stdout(io.StringIO())
+        with BenchmarkSuite.isolated(in_memory_services=not options['configured_services']), app_output:
+            dataset.seed_data()
+            results = BenchmarkSuite.run(
+                dataset, scenarios=options['scenarios'], repeat=options['repeat'], warmup=options['warmup']
+            )
+
+        if options['save_baseline']:
+            path = BenchmarkSuite.save_baseline(results, dataset, options['baseline'])
+            self.report(results, {}, options)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {path}"))
+            return
+
+        baseline = BenchmarkSuite.load_baseline(options['baseline'])
+        baseline_results = {}
+        if baseline is None:
+            self.stderr.write(f"No baseline at {BenchmarkSuite.baseline_path(options['baseline'])}; "
+                              f"run with --save-baseline to record one")
+        elif not BenchmarkSuite.comparable(baseline, dataset):
+            self.stderr.write(self.style.WARNING(
+                f"Baseline was recorded with scale {baseline.get('scale')}, seed {baseline.get('seed')} "
+                f"on {baseline.get('database')}; not comparing"
+            ))
+        else:
+            baseline_results = baseline['results']
+
+        regressions = BenchmarkSuite.compare(results, baseline_results, tolerance=options['tolerance'])
+        self.report(results, baseline_results, options, regressions)
+        if regressions:
+            raise CommandError(f"{len(regressions)} regressions against the baseline")
+
+    def report(self, results, baseline_results, options, regressions=()):
+        if options['json']:
+            self.stdout.write(json.dumps({'results': results, 'regressions': list(regressions)}, indent=2))
+            return
+
+        for name, result in results.items():
+            line = (
+                f"{name:<22} p50 {result['p50_ms']:8.1f} ms  p95 {result['p95_ms']:8.1f} ms  "
+                f"max {result['max_ms']:8.1f} ms  {result['queries']:>3} queries"
+            )
+            previous = baseline_results.get(name)
+            if previous:
+                line += f"  (baseline p95 {previous['p95_ms']:.1f} ms, {previous['queries']} queries)"
+            self.stdout.write(line)
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(
+                f"REGRESSION {regression['scenario']} {regression['metric']}: "
+                f"{regression['baseline']} -> {regression['current']} ({regression['change']})"
+            ))
+        if baseline_results and not regressions:
+            self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
@@ -0,0 +1,51 @@
+# api/management/commands/slow_query_report.py
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from api.agent_modules.performance.slow_queries import slow_query_recorder
+
+
+class Command(BaseCommand):
+    help = 'Show the slowest recorded queries (across workers), their plans and suggested indexes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Number of query fingerprints to show')
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+        parser.add_argument('--reset', action='store_true',
+                            help='Clear the recorded queries in every worker after reporting')
+
+    def handle(self, *args, **options):
+        report = slow_query_recorder.report(options['limit'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        elif not report['queries']:
+            self.stdout.write(f"No queries slower than {report['threshold_ms']:g}ms recorded")
+        else:
+            self.stdout.write(
+                f"{report['fingerprints']} slow query fingerprints (>= {report['threshold_ms']:g}ms) "
+                f"from {report['processes']} processes"
+            )
+            for query in report['queries']:
+                self.stdout.write(
+                    f"\n[{query['fingerprint']}] {query['calls']} calls, total {query['total_ms']:g}ms, "
+                    f"avg {query['avg_ms']:g}ms, max {query['max_ms']:g}ms"
+                )
+                self.stdout.write(f"  {query['sql']}")
+                for scan in (query['plan'] or {}).get('filtered_scans', []):
+                    self.stdout.write(
+                        f"  {scan['node_type']} on {scan['relation']}: {scan['filter'] or scan['index_condition']}"
+                    )
+            if report['index_suggestions']:
+                self.stdout.write('\nSuggested indexes:')
+                for suggestion in report['index_suggestions']:
+                    self.stdout.write(self.style.WARNING(
+                        f"  {suggestion['model']}: {suggestion['definition']} "
+                        f"({suggestion['total_ms']:g}ms in {len(suggestion['fingerprints'])} queries)"
+                    ))
+
+        if options['reset']:
+            slow_query_recorder.reset()
+            self.stdout.write(self.style.SUCCESS('Slow query report reset'))
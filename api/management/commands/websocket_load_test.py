@@ -0,0 +1,125 @@
+# api/management/commands/websocket_load_test.py
+
+import contextlib
+import io
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.services.websocket_load import CONSUMERS, WebSocketLoadTest
+
+
+class Command(BaseCommand):
+    help = (
+        'Load test the Chat, TypingIndicator and Presence WebSocket consumers: open authenticated '
+        'connections for a synthetic population, drive chat / typing / presence traffic and report '
+        'connect and fan-out latency, dropped deliveries and DB queries per message. The population '
+        'is removed again afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--conversations', type=int, default=50, help='Conversations to create (default: 50)')
+        parser.add_argument('--group-size', type=int, default=4, help='Participants per conversation (default: 4)')
+        parser.add_argument('--consumer', action='append', dest='consumers', choices=list(CONSUMERS),
+                            help='Only connect this consumer (repeatable; default: all)')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds of traffic (default: 10)')
+        parser.add_argument('--message-rate', type=float, default=20.0,
+                            help='Chat messages per second across all connections (default: 20)')
+        parser.add_argument('--typing-rate', type=float, default=20.0,
+                            help='Typing start / stop events per second (default: 20)')
+        parser.add_argument('--presence-rate', type=float, default=2.0,
+                            help='Presence reconnects per second (default: 2)')
+        parser.add_argument('--connect-concurrency', type=int, default=100,
+                            help='Connections opened at once (default: 100)')
+        parser.add_argument('--connect-timeout', type=float, default=10.0,
+                            help='Seconds before a connection attempt fails (default: 10)')
+        parser.add_argument('--drain-timeout', type=float, default=5.0,
+                            help='Seconds to wait for outstanding deliveries before counting them dropped (default: 5)')
+        parser.add_argument('--url', help='Base URL of a running server, e.g. ws://localhost:8000 '
+                                          '(default: the ASGI application in this process)')
+        parser.add_argument('--configured-channel-layer', action='store_true',
+                            help='In process, use the configured channel layer instead of an in-memory one')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for the traffic (default: 42)')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        if options['conversations'] < 1 or options['group_size'] < 2:
+            raise CommandError('Need at least one conversation of two participants')
+
+        load_test = WebSocketLoadTest(
+            conversations=options['conversations'],
+            group_size=options['group_size'],
+            consumers=options['consumers'] or tuple(CONSUMERS),
+            duration=options['duration'],
+            message_rate=options['message_rate'],
+            typing_rate=options['typing_rate'],
+            presence_rate=options['presence_rate'],
+            connect_concurrency=options['connect_concurrency'],
+            connect_timeout=options['connect_timeout'],
+            drain_timeout=options['drain_timeout'],
+            url=options['url'],
+            in_memory_layer=not options['configured_channel_layer'],
+            seed=options['seed'],
+        )
+        # The consumers print as they go; keep this command's output readable
+        app_output = contextlib.nullcontext() if options['verbosity'] > 1 else contextlib.redirect_stdout(io.StringIO())
+        with app_output:
+            report = load_test.execute()
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_report(report)
+
+        dropped = sum(events.get('dropped', 0) for events in report['events'].values())
+        failed = sum(connections['failed'] for connections in report['connections'].values())
+        if dropped or failed:
+            raise CommandError(f"{failed} failed connections, {dropped} dropped deliveries")
+
+    def print_report(self, report):
+        layer = f" ({report['channel_layer']})" if report['channel_layer'] else ''
+        self.stdout.write(
+            f"{report['mode']} load test against {report['target']}{layer}: "
+            f"{report['conversations']} conversations x {report['group_size']}, {report['duration_s']}s"
+        )
+        self.stdout.write(f"Connected in {report['connect_seconds']}s")
+        for consumer, stats in report['connections'].items():
+            self.stdout.write(
+                f"  {consumer:<24} {stats['connected']:>6} connected {stats['failed']:>4} failed  "
+                f"connect {self.latency(stats)}"
+            )
+        events = report['events']
+        if 'chat' in events:
+            chat = events['chat']
+            self.stdout.write(
+                f"Chat: {chat['sent']} sent ({chat['rate_per_s']}/s), {chat['delivered']}/"
+                f"{chat['expected_deliveries']} delivered, {chat['dropped']} dropped, "
+                f"fan-out {self.latency(chat['fanout'])}"
+            )
+        if 'typing' in events:
+            typing = events['typing']
+            self.stdout.write(
+                f"Typing: {typing['sent']} sent ({typing['rate_per_s']}/s), {typing['delivered']}/"
+                f"{typing['expected_deliveries']} delivered, {typing['dropped']} dropped"
+            )
+        if 'presence' in events:
+            presence = events['presence']
+            self.stdout.write(
+                f"Presence: {presence['reconnects']} reconnects, {presence['failed']} failed, "
+                f"reconnect {self.latency(presence)}"
+            )
+        if report['send_failures'] or report['server_errors']:
+            self.stdout.write(self.style.WARNING(
+                f"{report['send_failures']} failed sends, {report['server_errors']} error frames from the server"
+            ))
+        queries = report['queries']
+        if queries:
+            self.stdout.write(
+                f"DB queries: {queries['per_connection']} per connection, {queries['per_message']} per chat "
+                f"message, {queries['per_typing_event']} per typing event, {queries['during_load']} during load"
+            )
+
+    def latency(self, stats):
+        if not stats['count']:
+            return 'n/a'
+        return f"p50 {stats['p50_ms']:.1f} ms  p95 {stats['p95_ms']:.1f} ms  p99 {stats['p99_ms']:.1f} ms"
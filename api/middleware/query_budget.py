@@ -0,0 +1,212 @@
+"""
+Query Budget Middleware
+Counts the SQL queries each request runs, flags repeated statements (N+1)
+and requests over their view's query budget, and keeps per-view
+histograms of query count and database time
+"""
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (Prometheus style, cumulative, plus +Inf)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+DB_TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+# Transaction bookkeeping repeats by design (one per atomic block)
+_IGNORED_REPEATS = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+def normalize_sql(sql):
+    """SQL with literals, placeholders and IN lists collapsed, so repeats of a statement compare equal"""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more queries than its budget allows, or repeated a statement (N+1)"""
+
+
+class QueryRecorder:
+    """
+    Records every query run on every database connection of this thread
+    while active, through connection.execute_wrapper:
+
+        with QueryRecorder() as recorder:
+            ...
+        recorder.count, recorder.duration, recorder.repeated()
+    """
+
+    def __init__(self):
+        self.queries = []  # (sql, seconds)
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    def grouped(self):
+        """{normalized sql: times run}"""
+        return Counter(normalize_sql(sql) for sql, _ in self.queries)
+
+    def repeated(self, threshold=None):
+        """Statements run at least threshold times, most repeated first"""
+        threshold = threshold or getattr(settings, 'QUERY_BUDGET_REPEAT_THRESHOLD', 10)
+        return [
+            (sql, count) for sql, count in self.grouped().most_common()
+            if count >= threshold and not sql.upper().startswith(_IGNORED_REPEATS)
+        ]
+
+
+class QueryHistograms:
+    """Per-view histograms of queries per request and database seconds per request, for this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    @staticmethod
+    def _empty(buckets):
+        return {'buckets': [0] * (len(buckets) + 1), 'sum': 0}
+
+    def observe(self, view, query_count, db_time):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = {
+                    'requests': 0,
+                    'queries': self._empty(QUERY_COUNT_BUCKETS),
+                    'db_time': self._empty(DB_TIME_BUCKETS),
+                }
+            stats['requests'] += 1
+            stats['queries']['buckets'][bisect_left(QUERY_COUNT_BUCKETS, query_count)] += 1
+            stats['queries']['sum'] += query_count
+            stats['db_time']['buckets'][bisect_left(DB_TIME_BUCKETS, db_time)] += 1
+            stats['db_time']['sum'] += db_time
+
+    def snapshot(self):
+        """
+        {view: {'requests', 'queries', 'db_time'}} where 'queries' and
+        'db_time' are {'buckets': [(upper bound, cumulative count), ...,
+        ('+Inf', requests)], 'sum'}
+        """
+        with self._lock:
+            views = {
+                view: (stats['requests'], list(stats['queries']['buckets']), stats['queries']['sum'],
+                       list(stats['db_time']['buckets']), stats['db_time']['sum'])
+                for view, stats in self._views.items()
+            }
+
+        def cumulative(bounds, counts):
+            totals, running = [], 0
+            for bound, count in zip(bounds + ('+Inf',), counts):
+                running += count
+                totals.append((bound, running))
+            return totals
+
+        return {
+            view: {
+                'requests': requests,
+                'queries': {'buckets': cumulative(QUERY_COUNT_BUCKETS, query_buckets), 'sum': query_sum},
+                'db_time': {'buckets': cumulative(DB_TIME_BUCKETS, time_buckets), 'sum': round(time_sum, 6)},
+            }
+            for view, (requests, query_buckets, query_sum, time_buckets, time_sum) in views.items()
+        }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+query_histograms = QueryHistograms()
+
+
+class QueryBudgetMiddleware:
+    """
+    Records the queries of each request and checks them against the view's
+    budget (QUERY_BUDGETS, by URL name, else QUERY_BUDGET_DEFAULT) and for
+    statements repeated QUERY_BUDGET_REPEAT_THRESHOLD or more times.
+
+    Violations are logged; with QUERY_BUDGET_STRICT (see
+    api.tests.query_budget) they raise QueryBudgetExceeded instead, so
+    tests fail on regressions.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', True) or request.path.startswith(
+            tuple(getattr(settings, 'QUERY_BUDGET_EXEMPT_PATHS', ()))
+        ):
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        view = self.view_name(request)
+        query_histograms.observe(view, recorder.count, recorder.duration)
+        self.check_budget(request, view, recorder)
+        return response
+
+    @staticmethod
+    def view_name(request):
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return 'unresolved'
+        return match.view_name  # 'namespace:url_name', or the view's dotted path when unnamed
+
+    @staticmethod
+    def budget_for(view):
+        budgets = getattr(settings, 'QUERY_BUDGETS', {})
+        return budgets.get(view, getattr(settings, 'QUERY_BUDGET_DEFAULT', None))
+
+    def check_budget(self, request, view, recorder):
+        problems = []
+        budget = self.budget_for(view)
+        if budget is not None and recorder.count > budget:
+            problems.append(f"{recorder.count} queries (budget {budget})")
+        for sql, count in recorder.repeated():
+            problems.append(f"repeated {count}x: {sql[:200]}")
+        if not problems:
+            return
+
+        message = f"Query budget: {request.method} {request.path} ({view}): " + '; '.join(problems)
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
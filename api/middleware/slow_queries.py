@@ -0,0 +1,19 @@
+"""
+Slow Query Middleware
+Profiles each request's statements slower than SLOW_QUERY_THRESHOLD_MS
+(api.agent_modules.performance.slow_queries)
+"""
+from django.conf import settings
+
+from api.agent_modules.performance.slow_queries import slow_query_recorder
+
+
+class SlowQueryMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'SLOW_QUERY_ENABLED', True):
+            return self.get_response(request)
+        with slow_query_recorder.capture():
+            return self.get_response(request)
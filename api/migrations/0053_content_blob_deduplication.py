@@ -0,0 +1,45 @@
+# Generated by Django 5.0.1 on 2026-10-18 21:26
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0052_medication_is_controlled_override'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContentBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('store', models.CharField(choices=[('secure_vault', 'Secure Medical Vault'), ('guidelines', 'Clinical Guidelines')], max_length=20)),
+                ('digest', models.CharField(help_text='SHA-256 of the plaintext content', max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('storage_path', models.CharField(max_length=500)),
+                ('is_encrypted', models.BooleanField(default=False)),
+                ('key_id', models.CharField(blank=True, help_text='VAULT_BLOB_KEYS id the blob is encrypted with', max_length=32)),
+                ('virus_scanned', models.BooleanField(default=False)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_referenced_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='contentblob',
+            constraint=models.UniqueConstraint(fields=('store', 'digest'), name='unique_content_blob_digest'),
+        ),
+        migrations.AddField(
+            model_name='clinicalguideline',
+            name='file_blob',
+            field=models.ForeignKey(blank=True, help_text='Shared content-addressed copy of the uploaded file', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='clinical_guidelines', to='api.contentblob'),
+        ),
+        migrations.AddField(
+            model_name='securedocument',
+            name='blob',
+            field=models.ForeignKey(blank=True, help_text='Shared content-addressed blob (null for per-user encrypted legacy files)', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='secure_documents', to='api.contentblob'),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 5.0.1 on 2026-10-18 22:29
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.utils.dateparse import parse_datetime
+
+
+BATCH_SIZE = 1000
+
+
+def _timestamp(entry):
+    parsed = parse_datetime(entry.get('timestamp') or '') if isinstance(entry, dict) else None
+    return parsed or django.utils.timezone.now()
+
+
+def copy_json_logs(apps, schema_editor):
+    """Move the JSON list entries into the new append-only tables"""
+    InsuranceVerificationTask = apps.get_model('api', 'InsuranceVerificationTask')
+    InsuranceVerificationAPICall = apps.get_model('api', 'InsuranceVerificationAPICall')
+    HospitalBillingIntegration = apps.get_model('api', 'HospitalBillingIntegration')
+    BillingIntegrationAuditEvent = apps.get_model('api', 'BillingIntegrationAuditEvent')
+
+    calls = []
+    for task_id, log in InsuranceVerificationTask.objects.exclude(api_call_log=[]).values_list('id', 'api_call_log').iterator():
+        for entry in log if isinstance(log, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            status = entry.get('response_status')
+            calls.append(InsuranceVerificationAPICall(
+                task_id=task_id,
+                created_at=_timestamp(entry),
+                endpoint=str(entry.get('endpoint', ''))[:500],
+                success=bool(entry.get('success', True)),
+                response_status=status if isinstance(status, int) and status >= 0 else None,
+                error=str(entry.get('error', ''))[:200],
+            ))
+    InsuranceVerificationAPICall.objects.bulk_create(calls, batch_size=BATCH_SIZE)
+
+    events = []
+    for integration_id, trail in HospitalBillingIntegration.objects.exclude(audit_trail=[]).values_list('id', 'audit_trail').iterator():
+        for entry in trail if isinstance(trail, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            events.append(BillingIntegrationAuditEvent(
+                integration_id=integration_id,
+                created_at=_timestamp(entry),
+                event_type=str(entry.get('event_type', ''))[:50],
+                data=entry.get('data') or {},
+            ))
+    BillingIntegrationAuditEvent.objects.bulk_create(events, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0054_payment_webhook_inbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BillingIntegrationAuditEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('event_type', models.CharField(max_length=50)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('success', models.BooleanField(blank=True, null=True)),
+                ('response_time_ms', models.FloatField(blank=True, null=True)),
+                ('integration', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='audit_events', to='api.hospitalbillingintegration')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['integration', 'created_at'], name='billing_audit_integ_time_idx'), models.Index(fields=['event_type', 'created_at'], name='billing_audit_type_time_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='InsuranceVerificationAPICall',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('endpoint', models.CharField(max_length=500)),
+                ('success', models.BooleanField(default=True)),
+                ('response_status', models.PositiveIntegerField(blank=True, null=True)),
+                ('duration_ms', models.FloatField(blank=True, help_text='Call latency in milliseconds', null=True)),
+                ('error', models.CharField(blank=True, max_length=200)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='api_calls', to='api.insuranceverificationtask')),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['task', 'created_at'], name='ins_api_call_task_time_idx'), models.Index(fields=['endpoint', 'created_at'], name='ins_api_call_endpoint_idx')],
+            },
+        ),
+        migrations.RunPython(copy_json_logs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='hospitalbillingintegration',
+            name='audit_trail',
+        ),
+        migrations.RemoveField(
+            model_name='insuranceverificationtask',
+            name='api_call_log',
+        ),
+    ]
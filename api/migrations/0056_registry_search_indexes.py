@@ -0,0 +1,77 @@
+# Generated by Django 5.0.1 on 2026-10-18 22:39
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+# Keep in sync with ProfessionalRegistrySearch.normalize()
+SEARCH_TRIGGER_SQL = r"""
+CREATE OR REPLACE FUNCTION phb_registry_normalize(value text) RETURNS text
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE
+    AS $$ SELECT lower(regexp_replace(btrim(coalesce(value, '')), '\s+', ' ', 'g')) $$;
+
+CREATE OR REPLACE FUNCTION phb_registry_search_update() RETURNS trigger
+    LANGUAGE plpgsql
+    AS $$
+BEGIN
+    NEW.search_name := left(phb_registry_normalize(NEW.first_name || ' ' || NEW.last_name), 201);
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.specialization, '')), 'A') ||
+        setweight(to_tsvector('simple', replace(coalesce(NEW.professional_type, ''), '_', ' ')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.areas_of_interest, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.city, '') || ' ' || coalesce(NEW.state, '')), 'C');
+    RETURN NEW;
+END
+$$;
+
+CREATE TRIGGER phb_registry_search_update
+    BEFORE INSERT OR UPDATE OF first_name, last_name, specialization, professional_type,
+        areas_of_interest, city, state
+    ON phb_professional_registry
+    FOR EACH ROW EXECUTE FUNCTION phb_registry_search_update();
+
+-- Backfill: fire the trigger for existing rows
+UPDATE phb_professional_registry SET first_name = first_name;
+"""
+
+DROP_SEARCH_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS phb_registry_search_update ON phb_professional_registry;
+DROP FUNCTION IF EXISTS phb_registry_search_update();
+DROP FUNCTION IF EXISTS phb_registry_normalize(text);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0055_integration_log_tables'),
+    ]
+
+    operations = [
+        # pg_trgm is shared with the drug lookup indexes (0039), so it is never dropped on reverse
+        migrations.RunSQL('CREATE EXTENSION IF NOT EXISTS pg_trgm;', migrations.RunSQL.noop),
+        migrations.AddField(
+            model_name='phbprofessionalregistry',
+            name='search_name',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Normalized "first last" name for trigram search', max_length=201),
+        ),
+        migrations.AddField(
+            model_name='phbprofessionalregistry',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Specialization, interests and location for full-text search', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='phbprofessionalregistry',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('is_searchable', True), ('license_status', 'active')), fields=['search_name'], name='idx_reg_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='phbprofessionalregistry',
+            index=django.contrib.postgres.indexes.GinIndex(condition=models.Q(('is_searchable', True), ('license_status', 'active')), fields=['search_vector'], name='idx_reg_search_vector'),
+        ),
+        migrations.AddIndex(
+            model_name='phbprofessionalregistry',
+            index=models.Index(condition=models.Q(('is_searchable', True), ('license_status', 'active')), fields=['-license_issue_date', 'last_name', 'first_name', 'id'], name='idx_reg_listing'),
+        ),
+        migrations.RunSQL(SEARCH_TRIGGER_SQL, DROP_SEARCH_TRIGGER_SQL),
+    ]
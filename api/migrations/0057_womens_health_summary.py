@@ -0,0 +1,48 @@
+# Generated by Django 5.0.1 on 2026-10-19 00:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0056_registry_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WomensHealthSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('total_cycles', models.IntegerField(default=0)),
+                ('average_cycle_length', models.FloatField(blank=True, null=True)),
+                ('cycle_length_std_dev', models.FloatField(blank=True, null=True)),
+                ('shortest_cycle_length', models.IntegerField(blank=True, null=True)),
+                ('longest_cycle_length', models.IntegerField(blank=True, null=True)),
+                ('last_cycle_start_date', models.DateField(blank=True, null=True)),
+                ('total_logs', models.IntegerField(default=0)),
+                ('first_log_date', models.DateField(blank=True, null=True)),
+                ('last_log_date', models.DateField(blank=True, null=True)),
+                ('logging_streak', models.IntegerField(default=0, help_text='Consecutive logged days ending on logging_streak_end_date')),
+                ('logging_streak_end_date', models.DateField(blank=True, null=True)),
+                ('longest_logging_streak', models.IntegerField(default=0)),
+                ('recent_days', models.JSONField(blank=True, default=dict, help_text='Per-day figures for the last 30 days of logs, keyed by ISO date')),
+                ('window_end_date', models.DateField(blank=True, help_text='Last day of the 30-day window recent_days and rolling_averages cover', null=True)),
+                ('rolling_averages', models.JSONField(blank=True, default=dict, help_text='7 and 30 day averages computed from recent_days')),
+                ('total_goals', models.IntegerField(default=0)),
+                ('active_goals', models.IntegerField(default=0)),
+                ('completed_goals', models.IntegerField(default=0)),
+                ('average_goal_progress', models.FloatField(blank=True, null=True)),
+                ('best_goal_streak', models.IntegerField(default=0)),
+                ('womens_health_profile', models.OneToOneField(help_text="Women's health profile this summary belongs to", on_delete=django.db.models.deletion.CASCADE, related_name='health_summary', to='api.womenshealthprofile')),
+            ],
+            options={
+                'verbose_name': "Women's Health Summary",
+                'verbose_name_plural': "Women's Health Summaries",
+            },
+        ),
+    ]
@@ -18,6 +18,7 @@ from .medical.appointment_notification import AppointmentNotification
 from .medical.appointment_reminder import AppointmentReminder
 from .medical.appointment import Appointment
 from .medical.payment_transaction import PaymentTransaction
+from .medical.payment_webhook_event import PaymentWebhookEvent
 
 # Women's Health Models
 from .medical.womens_health_profile import WomensHealthProfile
@@ -27,6 +28,7 @@ from .medical.fertility_tracking import FertilityTracking
 from .medical.health_goal import HealthGoal
 from .medical.daily_health_log import DailyHealthLog
 from .medical.health_screening import HealthScreening
+from .medical.womens_health_summary import WomensHealthSummary
 from .medical.medical_history_extended import MedicalHistory
 
 # Pharmacy Models
@@ -61,7 +63,7 @@ from .drug.drug_interaction import DrugInteraction
 from .notifications.in_app_notification import InAppNotification
 
 #=============security folder==================================
-from .secure_documents import SecureDocument, DocumentAccessLog, DocumentShare
+from .secure_documents import SecureDocument, DocumentAccessLog, DocumentShare, ContentBlob
 
 #=============admin folder==================================
 from .admin_signature import AdminSignature
@@ -102,6 +104,7 @@ __all__ = [
     'AppointmentReminder',
     'Appointment',
     'PaymentTransaction',
+    'PaymentWebhookEvent',
     
     # Women's Health models
     'WomensHealthProfile',
@@ -111,6 +114,7 @@ __all__ = [
     'HealthGoal',
     'DailyHealthLog',
     'HealthScreening',
+    'WomensHealthSummary',
     'MedicalHistory',
 
     # Pharmacy models
@@ -151,6 +155,7 @@ __all__ = [
     'SecureDocument',
     'DocumentAccessLog',
     'DocumentShare',
+    'ContentBlob',
 
     # Admin models
     'AdminSignature',
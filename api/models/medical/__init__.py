@@ -27,7 +27,7 @@ from .pharmacy import Pharmacy, NominatedPharmacy
 from .insurance_provider import InsuranceProvider
 from .hospital_insurance_provider import HospitalInsuranceProvider
 from .patient_insurance_policy import PatientInsurancePolicy
-from .insurance_verification_task import InsuranceVerificationTask
+from .insurance_verification_task import InsuranceVerificationTask, InsuranceVerificationAPICall
 from .healthcare_authority import HealthcareAuthority
 from .hospital_license import HospitalLicense
 from .certification_body import CertificationBody
@@ -35,7 +35,7 @@ from .hospital_certification import HospitalCertification
 from .compliance_framework import ComplianceFramework
 from .hospital_compliance import HospitalCompliance
 from .billing_system import BillingSystem
-from .hospital_billing_integration import HospitalBillingIntegration
+from .hospital_billing_integration import HospitalBillingIntegration, BillingIntegrationAuditEvent
 
 
 
@@ -94,6 +94,14 @@ class ClinicalGuideline(models.Model):
         null=True,
         help_text="Path to uploaded guideline file"
     )
+    file_blob = models.ForeignKey(
+        'ContentBlob',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='clinical_guidelines',
+        help_text="Shared content-addressed copy of the uploaded file"
+    )
     
     # Publication & validity
     effective_date = models.DateField(
@@ -204,9 +212,18 @@ class ClinicalGuideline(models.Model):
                 not self.is_expired)
     
     def increment_access_count(self):
-        """Increment the access count for this guideline"""
-        self.access_count += 1
-        self.save(update_fields=['access_count'])
+        """
+        Increment the access count for this guideline (buffered; flushed periodically).
+        access_count stays the persisted value; current_access_count includes this access.
+        """
+        from api.services.buffered_counters import BufferedCounterService
+        BufferedCounterService.increment(self, 'access_count')
+    
+    @property
+    def current_access_count(self):
+        """Persisted access count plus accesses not yet flushed"""
+        from api.services.buffered_counters import BufferedCounterService
+        return BufferedCounterService.current_value(self, 'access_count')
     
     def approve(self, approved_by_user):
         """Approve this guideline"""
@@ -620,9 +620,25 @@ class DailyHealthLog(TimestampedModel):
         return f"Daily Health Log - {self.date} - {user_name}"
     
     def save(self, *args, **kwargs):
+        from api.services.womens_health_summary import WomensHealthSummaryService
+        created = self._state.adding
+        previous_date = None
+        if not created and self.pk:
+            # A log moved to another day changes the summary's dates and streaks too
+            previous_date = type(self).objects.filter(pk=self.pk).values_list('date', flat=True).first()
+        
         # Calculate data completeness
         self.calculate_data_completeness()
         super().save(*args, **kwargs)
+        
+        # Keep the dashboard summary current
+        WomensHealthSummaryService.record_log(self, created=created, previous_date=previous_date)
+    
+    def delete(self, *args, **kwargs):
+        from api.services.womens_health_summary import WomensHealthSummaryService
+        result = super().delete(*args, **kwargs)
+        WomensHealthSummaryService.forget_log(self)
+        return result
     
     def calculate_data_completeness(self):
         """Calculate what percentage of daily health tracking was completed"""
@@ -750,9 +766,15 @@ class DailyHealthLog(TimestampedModel):
     
     def get_weekly_trends(self):
         """Get trends for the past week"""
+        from api.services.womens_health_summary import WomensHealthSummaryService
         end_date = self.date
         start_date = end_date - timezone.timedelta(days=6)
         
+        # Served from the summary's per-day figures when they cover the week
+        trends = WomensHealthSummaryService.weekly_trends(self.womens_health_profile_id, start_date, end_date)
+        if trends is not None:
+            return trends
+        
         weekly_logs = DailyHealthLog.objects.filter(
             womens_health_profile=self.womens_health_profile,
             date__range=[start_date, end_date]
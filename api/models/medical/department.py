@@ -401,32 +401,14 @@ class Department(TimestampedModel):
 
     # Resource Management Methods
     def assign_bed(self, is_icu=False):
-        """Assign a bed to a patient"""
-        if not self.is_clinical:
-            raise ValidationError("Only clinical departments can assign beds")
-            
-        if is_icu:
-            if self.occupied_icu_beds >= self.icu_beds:
-                raise ValidationError("No ICU beds available")
-            self.occupied_icu_beds += 1
-        else:
-            if self.occupied_beds >= self.total_beds:
-                raise ValidationError("No regular beds available")
-            self.occupied_beds += 1
-        self.save()
+        """Assign a bed to a patient (atomic conditional UPDATE, safe under concurrency)"""
+        from api.services.bed_allocation import BedAllocationService
+        return BedAllocationService.assign(self, is_icu=is_icu)
 
     def release_bed(self, is_icu=False):
         """Release a bed"""
-        if not self.is_clinical:
-            raise ValidationError("Only clinical departments can release beds")
-            
-        if is_icu:
-            if self.occupied_icu_beds > 0:
-                self.occupied_icu_beds -= 1
-        else:
-            if self.occupied_beds > 0:
-                self.occupied_beds -= 1
-        self.save()
+        from api.services.bed_allocation import BedAllocationService
+        return BedAllocationService.release(self, is_icu=is_icu)
 
     def update_staff_count(self):
         """Update current staff count"""
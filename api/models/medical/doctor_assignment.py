@@ -1,9 +1,5 @@
 from django.db import models
 from django.utils import timezone
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
-import numpy as np
-import joblib
 import os
 from datetime import datetime, timedelta
 from django.conf import settings
@@ -11,6 +7,11 @@ from api.models.medical.appointment import Appointment
 from api.models.medical_staff.doctor import Doctor
 from api.models.user.custom_user import CustomUser
 from django.core.cache import cache
+from api.utils.lazy_imports import lazy_import, lazy_singleton
+
+# scikit-learn, numpy and joblib are only needed once an assignment is made
+np = lazy_import('numpy')
+joblib = lazy_import('joblib')
 
 class MLDoctorAssignment:
     MODEL_PATH = os.path.join(settings.BASE_DIR, 'ml_models', 'doctor_assignment.joblib')
@@ -30,6 +31,7 @@ class MLDoctorAssignment:
         try:
             return joblib.load(self.MODEL_PATH)
         except (FileNotFoundError, EOFError):
+            from sklearn.ensemble import RandomForestClassifier
             model = RandomForestClassifier(
                 n_estimators=100,
                 random_state=42,
@@ -43,6 +45,7 @@ class MLDoctorAssignment:
         try:
             return joblib.load(self.SCALER_PATH)
         except (FileNotFoundError, EOFError):
+            from sklearn.preprocessing import StandardScaler
             scaler = StandardScaler()
             joblib.dump(scaler, self.SCALER_PATH)
             return scaler
@@ -452,5 +455,5 @@ class MLDoctorAssignment:
         
         return True
 
-# Create a singleton instance
-doctor_assigner = MLDoctorAssignment() 
\ No newline at end of file
+# Create a singleton instance (model files are loaded on first use, not at import)
+doctor_assigner = lazy_singleton(MLDoctorAssignment)
\ No newline at end of file
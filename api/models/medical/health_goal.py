@@ -384,6 +384,16 @@ class HealthGoal(TimestampedModel):
         self.estimate_completion_date()
         
         super().save(*args, **kwargs)
+        
+        # Keep the dashboard summary current (covers update_progress, pause, cancel...)
+        from api.services.womens_health_summary import WomensHealthSummaryService
+        WomensHealthSummaryService.record_goal(self)
+    
+    def delete(self, *args, **kwargs):
+        from api.services.womens_health_summary import WomensHealthSummaryService
+        result = super().delete(*args, **kwargs)
+        WomensHealthSummaryService.record_goal(self)
+        return result
     
     def calculate_progress(self):
         """Calculate progress percentage based on goal type"""
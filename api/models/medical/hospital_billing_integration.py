@@ -334,10 +334,7 @@ class HospitalBillingIntegration(models.Model):
         default=True,
         help_text="Whether compliance monitoring is enabled"
     )
-    audit_trail = models.JSONField(
-        default=list,
-        help_text="Audit trail of integration changes"
-    )
+    # Audit trail entries are stored in BillingIntegrationAuditEvent
     compliance_checks = models.JSONField(
         default=list,
         help_text="Compliance check configurations"
@@ -570,6 +567,7 @@ class HospitalBillingIntegration(models.Model):
         
         self.clean()
         super().save(*args, **kwargs)
+        self.flush_audit_trail()
 
     @property
     def success_rate_percentage(self):
@@ -669,6 +667,10 @@ class HospitalBillingIntegration(models.Model):
             
             response_time = round((time.time() - start_time) * 1000, 2)  # Convert to milliseconds
             
+            self.add_to_audit_trail('connection_test', {
+                'status_code': response.status_code,
+            }, success=response.status_code == 200, response_time_ms=response_time)
+            
             if response.status_code == 200:
                 self.health_status = 'healthy'
                 self.last_test_date = timezone.now()
@@ -693,6 +695,7 @@ class HospitalBillingIntegration(models.Model):
         
         except Exception as e:
             self.health_status = 'critical'
+            self.add_to_audit_trail('connection_test', {'error': str(e)[:200]}, success=False)
             self.save()
             
             return {
@@ -919,22 +922,43 @@ class HospitalBillingIntegration(models.Model):
         
         self.save()
 
-    def add_to_audit_trail(self, event_type, event_data):
-        """Add an event to audit trail"""
-        if not isinstance(self.audit_trail, list):
-            self.audit_trail = []
-        
-        audit_entry = {
-            'event_type': event_type,
-            'timestamp': timezone.now().isoformat(),
-            'data': event_data
-        }
-        
-        self.audit_trail.append(audit_entry)
+    def add_to_audit_trail(self, event_type, event_data, success=None, response_time_ms=None):
+        """
+        Add an event to audit trail.
+
+        Events are buffered on the instance and bulk-inserted into
+        BillingIntegrationAuditEvent when the integration is next saved
+        (or by flush_audit_trail()).
+        """
+        if not hasattr(self, '_pending_audit_events'):
+            self._pending_audit_events = []
         
-        # Keep only last 100 entries
-        if len(self.audit_trail) > 100:
-            self.audit_trail = self.audit_trail[-100:]
+        self._pending_audit_events.append(BillingIntegrationAuditEvent(
+            event_type=event_type,
+            created_at=timezone.now(),
+            data=event_data,
+            success=success,
+            response_time_ms=response_time_ms,
+        ))
+
+    def flush_audit_trail(self):
+        """Bulk-insert buffered audit events"""
+        pending = getattr(self, '_pending_audit_events', None)
+        if not pending or not self.pk:
+            return []
+        for event in pending:
+            event.integration = self
+        self._pending_audit_events = []
+        return BillingIntegrationAuditEvent.objects.bulk_create(pending)
+
+    def get_audit_trail(self, limit=100):
+        """Most recent audit entries (oldest first), in the old JSON entry format"""
+        events = list(self.audit_events.order_by('-created_at', '-id')[:limit])
+        return [event.as_dict() for event in reversed(events)]
+
+    @property
+    def audit_trail(self):
+        return self.get_audit_trail()
 
     def get_integration_summary(self):
         """Get integration summary for dashboard"""
@@ -1054,4 +1078,87 @@ class HospitalBillingIntegration(models.Model):
             'contract_expiring': queryset.filter(
                 contract_end_date__lte=timezone.now().date() + timezone.timedelta(days=30)
             ).count()
-        }
\ No newline at end of file
+        }
+
+    @classmethod
+    def get_api_metrics(cls, hospital=None, date_from=None, date_to=None):
+        """Connection test volume, success rate and latency per integration, aggregated in SQL"""
+        events = BillingIntegrationAuditEvent.objects.filter(response_time_ms__isnull=False)
+        if hospital:
+            events = events.filter(integration__hospital=hospital)
+        return BillingIntegrationAuditEvent.get_metrics(events, date_from=date_from, date_to=date_to)
+
+
+class BillingIntegrationAuditEvent(models.Model):
+    """
+    Append-only audit trail for a billing integration.
+
+    Replaces the capped JSON list on HospitalBillingIntegration: adding an
+    event is an INSERT rather than a rewrite of the whole trail, nothing is
+    truncated, and latency/success metrics aggregate in SQL across
+    integrations.
+    """
+    integration = models.ForeignKey(
+        HospitalBillingIntegration,
+        on_delete=models.CASCADE,
+        related_name='audit_events'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    event_type = models.CharField(max_length=50)
+    data = models.JSONField(default=dict, blank=True)
+    success = models.BooleanField(null=True, blank=True)
+    response_time_ms = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['integration', 'created_at'], name='billing_audit_integ_time_idx'),
+            models.Index(fields=['event_type', 'created_at'], name='billing_audit_type_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} on integration {self.integration_id} at {self.created_at}"
+
+    def as_dict(self):
+        entry = {
+            'event_type': self.event_type,
+            'timestamp': self.created_at.isoformat(),
+            'data': self.data,
+        }
+        if self.success is not None:
+            entry['success'] = self.success
+        if self.response_time_ms is not None:
+            entry['response_time_ms'] = self.response_time_ms
+        return entry
+
+    @classmethod
+    def get_metrics(cls, queryset=None, date_from=None, date_to=None):
+        """Event volume, success rate and latency per integration and event type"""
+        from django.db.models import Avg, Count, Max, Q
+        from api.utils.db_aggregates import PercentileCont
+        
+        queryset = cls.objects.all() if queryset is None else queryset
+        if date_from:
+            queryset = queryset.filter(created_at__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(created_at__lte=date_to)
+        
+        aggregates = dict(
+            events=Count('id'),
+            successful=Count('id', filter=Q(success=True)),
+            failed=Count('id', filter=Q(success=False)),
+            avg_ms=Avg('response_time_ms'),
+            p95_ms=PercentileCont('response_time_ms', percentile=0.95),
+            max_ms=Max('response_time_ms'),
+        )
+        totals = queryset.aggregate(**aggregates)
+        by_integration = list(
+            queryset.values('integration_id', 'integration__integration_name', 'event_type')
+            .annotate(**aggregates)
+            .order_by('integration_id', 'event_type')
+        )
+        for row in [totals] + by_integration:
+            outcomes = row['successful'] + row['failed']
+            row['success_rate'] = round(row['successful'] / outcomes * 100, 2) if outcomes else None
+        totals['by_integration'] = by_integration
+        return totals
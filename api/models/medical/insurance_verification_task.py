@@ -201,11 +201,7 @@ class InsuranceVerificationTask(models.Model):
         help_text="Total time spent in minutes"
     )
     
-    # Integration and Automation
-    api_call_log = models.JSONField(
-        default=list,
-        help_text="Log of API calls made for this verification"
-    )
+    # Integration and Automation (API calls are logged in InsuranceVerificationAPICall)
     automation_attempted = models.BooleanField(
         default=False,
         help_text="Whether automation was attempted first"
@@ -438,26 +434,26 @@ class InsuranceVerificationTask(models.Model):
         
         self.save()
 
-    def log_api_call(self, api_endpoint, request_data, response_data, success=True):
-        """Log an API call attempt"""
-        log_entry = {
-            'timestamp': timezone.now().isoformat(),
-            'endpoint': api_endpoint,
-            'success': success,
-            'response_status': response_data.get('status_code') if isinstance(response_data, dict) else None
-        }
-        
+    def log_api_call(self, api_endpoint, request_data, response_data, success=True, duration_ms=None):
+        """Log an API call attempt (one row in the append-only call log)"""
         # Don't log sensitive request/response data, just metadata
-        if not success:
-            log_entry['error'] = str(response_data)[:200]  # Truncate error messages
+        InsuranceVerificationAPICall.objects.create(
+            task=self,
+            **InsuranceVerificationAPICall.entry(api_endpoint, response_data, success, duration_ms)
+        )
         
-        self.api_call_log.append(log_entry)
         self.automation_attempted = True
-        
+        update_fields = ['automation_attempted', 'updated_at']
         if not success:
             self.automation_failure_reason = str(response_data)[:500]
+            update_fields.append('automation_failure_reason')
         
-        self.save()
+        self.save(update_fields=update_fields)
+
+    @property
+    def api_call_log(self):
+        """API calls made for this verification, oldest first"""
+        return [call.as_dict() for call in self.api_calls.order_by('created_at', 'id')]
 
     def set_quality_review(self, score, notes, reviewed_by_user):
         """Set quality review for completed task"""
@@ -547,9 +543,99 @@ class InsuranceVerificationTask(models.Model):
         
         from django.db.models import Avg, Count
         
-        return queryset.aggregate(
+        metrics = queryset.aggregate(
             total_completed=Count('id'),
             avg_completion_time=Avg('total_time_spent'),
             avg_attempts=Avg('attempts_count'),
             avg_quality_score=Avg('quality_score')
-        )
\ No newline at end of file
+        )
+        metrics['api_calls'] = InsuranceVerificationAPICall.get_metrics(
+            InsuranceVerificationAPICall.objects.filter(task__in=queryset)
+        )
+        return metrics
+
+class InsuranceVerificationAPICall(models.Model):
+    """
+    Append-only log of API calls made for a verification task.
+
+    One row per call instead of a JSON list on the task, so logging a call
+    is a single small INSERT and latency/success metrics aggregate in SQL.
+    """
+    task = models.ForeignKey(
+        InsuranceVerificationTask,
+        on_delete=models.CASCADE,
+        related_name='api_calls'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    endpoint = models.CharField(max_length=500)
+    success = models.BooleanField(default=True)
+    response_status = models.PositiveIntegerField(null=True, blank=True)
+    duration_ms = models.FloatField(null=True, blank=True, help_text="Call latency in milliseconds")
+    error = models.CharField(max_length=200, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['task', 'created_at'], name='ins_api_call_task_time_idx'),
+            models.Index(fields=['endpoint', 'created_at'], name='ins_api_call_endpoint_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.endpoint} ({'ok' if self.success else 'failed'}) for task {self.task_id}"
+
+    @staticmethod
+    def entry(api_endpoint, response_data, success=True, duration_ms=None):
+        """Field values for one logged call (metadata only, never request/response bodies)"""
+        status_code = response_data.get('status_code') if isinstance(response_data, dict) else None
+        return {
+            'endpoint': str(api_endpoint)[:500],
+            'success': success,
+            'response_status': status_code if isinstance(status_code, int) else None,
+            'duration_ms': duration_ms,
+            'error': '' if success else str(response_data)[:200],  # Truncate error messages
+        }
+
+    @classmethod
+    def log_calls(cls, task, calls):
+        """Bulk-insert several calls: iterable of (endpoint, response_data, success, duration_ms)"""
+        return cls.objects.bulk_create([
+            cls(task=task, **cls.entry(*call)) for call in calls
+        ])
+
+    def as_dict(self):
+        entry = {
+            'timestamp': self.created_at.isoformat(),
+            'endpoint': self.endpoint,
+            'success': self.success,
+            'response_status': self.response_status,
+            'duration_ms': self.duration_ms,
+        }
+        if not self.success:
+            entry['error'] = self.error
+        return entry
+
+    @classmethod
+    def get_metrics(cls, queryset=None, date_from=None, date_to=None):
+        """Call volume, success rate and latency per endpoint, aggregated in SQL"""
+        from django.db.models import Avg, Count, Max, Q
+        from api.utils.db_aggregates import PercentileCont
+        
+        queryset = cls.objects.all() if queryset is None else queryset
+        if date_from:
+            queryset = queryset.filter(created_at__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(created_at__lte=date_to)
+        
+        aggregates = dict(
+            calls=Count('id'),
+            successful=Count('id', filter=Q(success=True)),
+            avg_ms=Avg('duration_ms'),
+            p95_ms=PercentileCont('duration_ms', percentile=0.95),
+            max_ms=Max('duration_ms'),
+        )
+        totals = queryset.aggregate(**aggregates)
+        by_endpoint = list(queryset.values('endpoint').annotate(**aggregates).order_by('-calls'))
+        for row in [totals] + by_endpoint:
+            row['success_rate'] = round(row['successful'] / row['calls'] * 100, 2) if row['calls'] else None
+        totals['by_endpoint'] = by_endpoint
+        return totals
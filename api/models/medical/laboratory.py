@@ -90,38 +90,8 @@ class LaboratoryTestType(TimestampedModel):
         """
         Return appropriate reference range for a patient based on age and gender
         """
-        if not self.reference_ranges:
-            return None
-            
-        # Default range if available
-        default_range = self.reference_ranges.get('default')
-        
-        # Try to get gender-specific range
-        if gender and gender in self.reference_ranges:
-            gender_range = self.reference_ranges.get(gender)
-            
-            # If age is provided, try to get age-specific range within gender
-            if age and 'age_ranges' in gender_range:
-                for age_range in gender_range['age_ranges']:
-                    min_age = age_range.get('min_age', 0)
-                    max_age = age_range.get('max_age', 200)
-                    if min_age <= age <= max_age:
-                        return age_range.get('range')
-            
-            # Return gender-specific default range if no age match
-            if 'default' in gender_range:
-                return gender_range['default']
-                
-        # If no gender-specific match, try general age ranges
-        if age and 'age_ranges' in self.reference_ranges:
-            for age_range in self.reference_ranges['age_ranges']:
-                min_age = age_range.get('min_age', 0)
-                max_age = age_range.get('max_age', 200)
-                if min_age <= age <= max_age:
-                    return age_range.get('range')
-        
-        # Fall back to default range
-        return default_range
+        from api.services.lab_reference_ranges import LabReferenceRanges
+        return LabReferenceRanges.for_test_type(self).lookup(age, gender)
 
 
 class LaboratoryResult(TimestampedModel):
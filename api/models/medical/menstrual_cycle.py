@@ -253,6 +253,16 @@ class MenstrualCycle(TimestampedModel):
             ).exclude(id=self.id).update(is_current_cycle=False)
         
         super().save(*args, **kwargs)
+        
+        # Keep the dashboard summary current
+        from api.services.womens_health_summary import WomensHealthSummaryService
+        WomensHealthSummaryService.record_cycle(self)
+    
+    def delete(self, *args, **kwargs):
+        from api.services.womens_health_summary import WomensHealthSummaryService
+        result = super().delete(*args, **kwargs)
+        WomensHealthSummaryService.record_cycle(self)
+        return result
     
     def calculate_data_completeness(self):
         """Calculate what percentage of cycle data has been tracked"""
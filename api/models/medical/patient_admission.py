@@ -332,25 +332,21 @@ class PatientAdmission(TimestampedModel):
     def _assign_bed(self):
         """Assign a bed in the department"""
         if self.department:
-            self.department.assign_bed(is_icu=self.is_icu_bed)
-            self.department.current_patient_count += 1
-            self.department.save()
+            from api.services.bed_allocation import BedAllocationService
+            BedAllocationService.assign(self.department, is_icu=self.is_icu_bed, count_patient=True)
     
     def _release_bed(self):
         """Release the bed when patient is discharged/transferred"""
         if self.department:
-            self.department.release_bed(is_icu=self.is_icu_bed)
-            if self.department.current_patient_count > 0:
-                self.department.current_patient_count -= 1
-                self.department.save()
+            from api.services.bed_allocation import BedAllocationService
+            BedAllocationService.release(self.department, is_icu=self.is_icu_bed, count_patient=True)
     
     def admit_patient(self):
         """Admit a pending patient"""
         if self.status != 'pending':
             raise ValidationError("Can only admit patients with pending status")
         self.status = 'admitted'
-        self._assign_bed()
-        self.save()
+        self.save()  # save() assigns the bed on the pending -> admitted transition
         return True
     
     def discharge_patient(self, destination="", summary="", followup=""):
@@ -0,0 +1,43 @@
+from django.db import models
+
+
+class PaymentWebhookEvent(models.Model):
+    """
+    Inbox of raw payment provider webhook events.
+
+    The webhook endpoint only verifies the signature and inserts the event
+    here (ON CONFLICT DO NOTHING on provider + event_id, so retried
+    deliveries are free); the process_payment_webhooks worker applies them
+    to PaymentTransaction in arrival order per reference.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('ignored', 'Ignored'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    provider = models.CharField(max_length=30)
+    event_id = models.CharField(max_length=255, help_text="Provider event identifier (or payload digest)")
+    event_type = models.CharField(max_length=100, blank=True)
+    reference = models.CharField(max_length=255, blank=True, db_index=True)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True, help_text="Earliest retry after a failed attempt")
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(fields=['provider', 'event_id'], name='unique_payment_webhook_event'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'id'], name='payment_webhook_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.provider}:{self.event_type} {self.reference} ({self.status})"
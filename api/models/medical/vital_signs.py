@@ -1,5 +1,7 @@
 # api/models/medical/vital_signs.py
 
+from decimal import Decimal
+
 from django.db import models
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -193,12 +195,14 @@ class VitalSign(TimestampedModel):
         # Calculate BMI if height and weight are provided
         if self.height and self.weight and self.height_unit and self.weight_unit:
             # Convert to standard units if needed (meters and kilograms)
-            height_m = self.height / 100 if self.height_unit == 'cm' else self.height * 0.0254
-            weight_kg = self.weight if self.weight_unit == 'kg' else self.weight * 0.453592
+            height = float(self.height)
+            weight = float(self.weight)
+            height_m = height / 100 if self.height_unit == 'cm' else height * 0.0254
+            weight_kg = weight if self.weight_unit == 'kg' else weight * 0.453592
             
             # BMI formula: weight(kg) / (height(m) * height(m))
             if height_m > 0:
-                self.bmi = round(weight_kg / (height_m * height_m), 2)
+                self.bmi = Decimal(f"{weight_kg / (height_m * height_m):.2f}")
         
         # Determine if any vitals are abnormal
         self.is_abnormal = self._check_abnormal_values()
@@ -206,7 +210,17 @@ class VitalSign(TimestampedModel):
         super().save(*args, **kwargs)
     
     def _check_abnormal_values(self):
-        """Check if any vital signs are outside normal ranges"""
+        """
+        Check if any vital signs are outside normal ranges.
+
+        Keep in step with VitalSignIngestion.abnormal_mask(), the vectorized
+        version used for bulk uploads. Decimals are compared as floats there
+        and here, so both agree at the boundaries.
+        """
+        oxygen_saturation = float(self.oxygen_saturation) if self.oxygen_saturation else None
+        temperature = float(self.temperature) if self.temperature else None
+        blood_glucose = float(self.blood_glucose) if self.blood_glucose else None
+
         # Blood pressure
         if (self.systolic_bp and (self.systolic_bp < 90 or self.systolic_bp > 140)) or \
            (self.diastolic_bp and (self.diastolic_bp < 60 or self.diastolic_bp > 90)):
@@ -221,27 +235,27 @@ class VitalSign(TimestampedModel):
             return True
         
         # Oxygen saturation
-        if self.oxygen_saturation and self.oxygen_saturation < 95:
+        if oxygen_saturation and oxygen_saturation < 95:
             return True
         
         # Temperature (Celsius)
-        if self.temperature:
-            if self.temperature_unit == 'C' and (self.temperature < 36.1 or self.temperature > 37.8):
+        if temperature:
+            if self.temperature_unit == 'C' and (temperature < 36.1 or temperature > 37.8):
                 return True
-            elif self.temperature_unit == 'F' and (self.temperature < 97 or self.temperature > 100):
+            elif self.temperature_unit == 'F' and (temperature < 97 or temperature > 100):
                 return True
         
         # Blood glucose (mg/dL)
-        if self.blood_glucose:
+        if blood_glucose:
             if self.glucose_unit == 'mg/dL':
-                if self.glucose_timing == 'fasting' and (self.blood_glucose < 70 or self.blood_glucose > 100):
+                if self.glucose_timing == 'fasting' and (blood_glucose < 70 or blood_glucose > 100):
                     return True
-                elif self.glucose_timing and self.glucose_timing != 'fasting' and self.blood_glucose > 140:
+                elif self.glucose_timing and self.glucose_timing != 'fasting' and blood_glucose > 140:
                     return True
             elif self.glucose_unit == 'mmol/L':
-                if self.glucose_timing == 'fasting' and (self.blood_glucose < 3.9 or self.blood_glucose > 5.6):
+                if self.glucose_timing == 'fasting' and (blood_glucose < 3.9 or blood_glucose > 5.6):
                     return True
-                elif self.glucose_timing and self.glucose_timing != 'fasting' and self.blood_glucose > 7.8:
+                elif self.glucose_timing and self.glucose_timing != 'fasting' and blood_glucose > 7.8:
                     return True
         
         return False
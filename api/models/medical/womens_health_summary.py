@@ -0,0 +1,107 @@
+# api/models/medical/womens_health_summary.py
+
+from django.db import models
+from ..base import TimestampedModel
+from .womens_health_profile import WomensHealthProfile
+
+
+class WomensHealthSummary(TimestampedModel):
+    """
+    Rolling per-profile summary behind the women's health dashboard.
+
+    Kept up to date by DailyHealthLog.save, MenstrualCycle.save and
+    HealthGoal.save (see WomensHealthSummaryService), so the dashboard reads
+    this one row instead of rescanning the profile's history.
+    rebuild_womens_health_summaries recomputes it from scratch.
+    """
+    womens_health_profile = models.OneToOneField(
+        WomensHealthProfile,
+        on_delete=models.CASCADE,
+        related_name='health_summary',
+        help_text="Women's health profile this summary belongs to"
+    )
+
+    # Cycle statistics
+    total_cycles = models.IntegerField(default=0)
+    average_cycle_length = models.FloatField(null=True, blank=True)
+    cycle_length_std_dev = models.FloatField(null=True, blank=True)
+    shortest_cycle_length = models.IntegerField(null=True, blank=True)
+    longest_cycle_length = models.IntegerField(null=True, blank=True)
+    last_cycle_start_date = models.DateField(null=True, blank=True)
+
+    # Daily logging
+    total_logs = models.IntegerField(default=0)
+    first_log_date = models.DateField(null=True, blank=True)
+    last_log_date = models.DateField(null=True, blank=True)
+    logging_streak = models.IntegerField(
+        default=0,
+        help_text="Consecutive logged days ending on logging_streak_end_date"
+    )
+    logging_streak_end_date = models.DateField(null=True, blank=True)
+    longest_logging_streak = models.IntegerField(default=0)
+    recent_days = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Per-day figures for the last 30 days of logs, keyed by ISO date"
+    )
+    window_end_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Last day of the 30-day window recent_days and rolling_averages cover"
+    )
+    rolling_averages = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="7 and 30 day averages computed from recent_days"
+    )
+
+    # Goals
+    total_goals = models.IntegerField(default=0)
+    active_goals = models.IntegerField(default=0)
+    completed_goals = models.IntegerField(default=0)
+    average_goal_progress = models.FloatField(null=True, blank=True)
+    best_goal_streak = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Women's Health Summary"
+        verbose_name_plural = "Women's Health Summaries"
+
+    def __str__(self):
+        return f"Health summary - profile {self.womens_health_profile_id}"
+
+    def get_summary(self):
+        """Return the summary for API responses"""
+        return {
+            'cycles': {
+                'total': self.total_cycles,
+                'average_length': self.average_cycle_length,
+                'length_std_dev': self.cycle_length_std_dev,
+                'shortest_length': self.shortest_cycle_length,
+                'longest_length': self.longest_cycle_length,
+                'last_start_date': self.last_cycle_start_date.isoformat() if self.last_cycle_start_date else None,
+            },
+            'logging': {
+                'total_logs': self.total_logs,
+                'first_log_date': self.first_log_date.isoformat() if self.first_log_date else None,
+                'last_log_date': self.last_log_date.isoformat() if self.last_log_date else None,
+                'current_streak': self.current_logging_streak,
+                'longest_streak': self.longest_logging_streak,
+            },
+            'averages': self.rolling_averages,
+            'goals': {
+                'total': self.total_goals,
+                'active': self.active_goals,
+                'completed': self.completed_goals,
+                'average_progress': self.average_goal_progress,
+                'best_streak': self.best_goal_streak,
+            },
+        }
+
+    @property
+    def current_logging_streak(self):
+        """The logging streak if it is still alive (last logged today or yesterday)"""
+        if not self.logging_streak_end_date or self.window_end_date is None:
+            return 0
+        if (self.window_end_date - self.logging_streak_end_date).days > 1:
+            return 0
+        return self.logging_streak
@@ -0,0 +1,208 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+class ProviderHTTPClient:
+    """
+    Shared HTTP client for payment provider APIs.
+
+    One requests.Session per provider, reused by every request in the
+    process, so calls ride on pooled keep-alive connections instead of
+    paying a TCP + TLS handshake each time. Every call gets an explicit
+    (connect, read) timeout per operation, and failed calls are retried with
+    jittered exponential backoff:
+
+    - connection errors are retried for any call (the request never reached
+      the provider);
+    - read timeouts and 429/5xx responses are retried only for idempotent
+      operations (e.g. verify), never for charges or refunds.
+
+    Latency, error and retry counts are kept per operation for metrics().
+    """
+
+    DEFAULT_TIMEOUT = (3.05, 15)  # (connect, read) seconds
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+    LATENCY_SAMPLES = 500
+
+    def __init__(self, provider_id, timeouts=None, max_retries=2, backoff_base=0.25, backoff_cap=4.0,
+                 pool_connections=4, pool_maxsize=32):
+        self.provider_id = provider_id
+        self.timeouts = dict(timeouts or {})
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        self.session = requests.Session()
+        # Retries are handled here (with per-operation idempotency), not by urllib3
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._stats_lock = threading.Lock()
+        self._stats = {}
+
+    # ----- metrics -----
+
+    def _record(self, operation, elapsed, error=False, retries=0):
+        with self._stats_lock:
+            stats = self._stats.setdefault(operation, {
+                'count': 0, 'errors': 0, 'retries': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+                'samples': deque(maxlen=self.LATENCY_SAMPLES),
+            })
+            elapsed_ms = elapsed * 1000
+            stats['count'] += 1
+            stats['errors'] += int(error)
+            stats['retries'] += retries
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            stats['samples'].append(elapsed_ms)
+
+    def metrics(self):
+        """Per-operation call counts and latency (ms) for this provider"""
+        result = {}
+        with self._stats_lock:
+            for operation, stats in self._stats.items():
+                samples = sorted(stats['samples'])
+                result[operation] = {
+                    'count': stats['count'],
+                    'errors': stats['errors'],
+                    'retries': stats['retries'],
+                    'total_ms': round(stats['total_ms'], 2),
+                    'avg_ms': round(stats['total_ms'] / stats['count'], 2),
+                    'max_ms': round(stats['max_ms'], 2),
+                    'p50_ms': round(samples[len(samples) // 2], 2),
+                    'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+                }
+        return result
+
+    def reset_metrics(self):
+        with self._stats_lock:
+            self._stats = {}
+
+    # ----- requests -----
+
+    def _backoff(self, attempt):
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _never_sent(exception):
+        """True when the request cannot have reached the provider (no connection was made)"""
+        if isinstance(exception, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(exception, requests.exceptions.ConnectionError) and exception.args:
+            return isinstance(getattr(exception.args[0], 'reason', None), NewConnectionError)
+        return False
+
+    def _should_retry(self, idempotent, response=None, exception=None):
+        if exception is not None:
+            return self._never_sent(exception) or (
+                idempotent and isinstance(exception, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+            )
+        return idempotent and response.status_code in self.RETRY_STATUSES
+
+    def request(self, method, url, operation, idempotent=None, timeout=None, **kwargs):
+        """
+        Send a request and return the response (raise_for_status already applied).
+
+        operation names the call for timeouts and metrics ('initialize',
+        'verify', 'refund'); idempotent defaults to True for GET/HEAD/OPTIONS.
+        Raises requests.exceptions.RequestException on final failure.
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in self.IDEMPOTENT_METHODS
+        timeout = timeout or self.timeouts.get(operation, self.DEFAULT_TIMEOUT)
+
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except requests.exceptions.RequestException as e:
+                if attempt < self.max_retries and self._should_retry(idempotent, exception=e):
+                    delay = self._backoff(attempt)
+                    logger.warning(
+                        f"{self.provider_id} {operation} failed ({e.__class__.__name__}), "
+                        f"retrying in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})"
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+                    continue
+                self._record(operation, time.perf_counter() - started, error=True, retries=attempt)
+                raise
+
+            if attempt < self.max_retries and self._should_retry(idempotent, response=response):
+                delay = self._backoff(attempt)
+                retry_after = response.headers.get('Retry-After', '')
+                if retry_after.isdigit():
+                    delay = min(self.backoff_cap, max(delay, int(retry_after)))
+                logger.warning(
+                    f"{self.provider_id} {operation} returned {response.status_code}, "
+                    f"retrying in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries})"
+                )
+                response.close()
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            elapsed = time.perf_counter() - started
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                self._record(operation, elapsed, error=True, retries=attempt)
+                raise
+            self._record(operation, elapsed, retries=attempt)
+            logger.debug(f"{self.provider_id} {operation} {response.status_code} in {elapsed * 1000:.0f} ms")
+            return response
+
+    def get(self, url, operation, **kwargs):
+        return self.request('GET', url, operation, **kwargs)
+
+    def post(self, url, operation, **kwargs):
+        return self.request('POST', url, operation, **kwargs)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_provider_client(provider_id):
+    """
+    The process-wide client for a provider, built on first use from
+    settings.PAYMENT_PROVIDERS[provider_id]['http'] (timeouts, max_retries,
+    pool sizes).
+    """
+    client = _clients.get(provider_id)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(provider_id)
+            if client is None:
+                from django.conf import settings
+                options = settings.PAYMENT_PROVIDERS.get(provider_id, {}).get('http', {})
+                client = ProviderHTTPClient(provider_id, **options)
+                _clients[provider_id] = client
+    return client
+
+
+def provider_metrics():
+    """Latency metrics for every provider client created in this process"""
+    return {provider_id: client.metrics() for provider_id, client in list(_clients.items())}
+
+
+def reset_provider_clients():
+    """Close and forget all clients (they are rebuilt from settings on next use)"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.session.close()
+        _clients.clear()
@@ -1,11 +1,15 @@
 import requests
 import hmac
 import hashlib
+import logging
 from django.conf import settings
 from django.utils import timezone
 from .base import BasePaymentProvider
+from .http_client import get_provider_client
 from django.core.exceptions import ValidationError
 
+logger = logging.getLogger(__name__)
+
 class PaystackProvider(BasePaymentProvider):
     """Paystack payment provider implementation"""
     
@@ -18,6 +22,11 @@ class PaystackProvider(BasePaymentProvider):
         """Get API URLs from settings"""
         return settings.PAYMENT_PROVIDERS['paystack']['urls']
     
+    @property
+    def http(self):
+        """Process-wide Paystack client (pooled connections, timeouts, retries)"""
+        return get_provider_client(self.provider_id)
+    
     def verify_webhook_signature(self, signature, payload):
         """Verify Paystack webhook signature"""
         secret = self.config['webhook_secret'].encode()
@@ -32,11 +41,6 @@ class PaystackProvider(BasePaymentProvider):
         """Initialize Paystack payment"""
         url = self.api_urls['initialize']
         
-        # 🔍 DEBUG: Check what we're getting from config
-        print(f"🔧 CONFIG DEBUG: Full config = {self.config}")
-        print(f"🔧 CONFIG DEBUG: Secret key = {self.config.get('secret_key', 'NOT_FOUND')}")
-        print(f"🔧 CONFIG DEBUG: SETTINGS check = {settings.PAYMENT_PROVIDERS}")
-        
         headers = {
             "Authorization": f"Bearer {self.config['secret_key']}",
             "Content-Type": "application/json",
@@ -65,25 +69,11 @@ class PaystackProvider(BasePaymentProvider):
             data["metadata"]["payment_type"] = "pre_appointment"
         
         try:
-            # 🔍 Enhanced debugging for payment initialization
-            print(f"🚀 PAYSTACK DEBUG: URL = {url}")
-            print(f"🚀 PAYSTACK DEBUG: Headers = {headers}")
-            print(f"🚀 PAYSTACK DEBUG: Data = {data}")
-            
-            response = requests.post(
-                url, 
-                headers=headers, 
-                json=data,
-                timeout=30  # Add timeout
-            )
-            
-            print(f"🚀 PAYSTACK DEBUG: Response Status = {response.status_code}")
-            print(f"🚀 PAYSTACK DEBUG: Response Text = {response.text}")
-            
-            response.raise_for_status()
+            # Not retried on timeouts/5xx: a repeat initialize could double-charge
+            response = self.http.post(url, 'initialize', headers=headers, json=data)
             
             result = response.json()
-            print(f"✅ PAYSTACK DEBUG: Success Result = {result}")
+            logger.debug(f"Paystack initialize succeeded for {self.transaction.transaction_id}")
             
             # Store provider reference
             self.transaction.provider_reference = result['data']['reference']
@@ -92,10 +82,10 @@ class PaystackProvider(BasePaymentProvider):
             return result['data']['authorization_url']
             
         except requests.exceptions.RequestException as e:
-            print(f"🚨 PAYSTACK ERROR: Request Exception = {str(e)}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"🚨 PAYSTACK ERROR: Response Status = {e.response.status_code}")
-                print(f"🚨 PAYSTACK ERROR: Response Text = {e.response.text}")
+            if getattr(e, 'response', None) is not None:
+                logger.error(f"Paystack initialize failed: {e.response.status_code} {e.response.text}")
+            else:
+                logger.error(f"Paystack initialize failed: {str(e)}")
             self.log_error("Payment initialization failed", e)
             raise ValidationError("Payment initialization failed. Please try again.")
     
@@ -108,65 +98,51 @@ class PaystackProvider(BasePaymentProvider):
         }
         
         try:
-            print(f"🔍 PAYSTACK VERIFY: Starting verification for reference {reference}")
-            print(f"🔍 PAYSTACK VERIFY: Current payment status: {self.transaction.payment_status}")
-            
-            response = requests.get(
-                url, 
-                headers=headers,
-                timeout=30
-            )
-            response.raise_for_status()
+            response = self.http.get(url, 'verify', headers=headers)
             
             result = response.json()
-            print(f"🔍 PAYSTACK VERIFY: Response received: {result}")
             
             # Additional verification checks
             if not self.verify_transaction_data(result['data']):
-                print(f"❌ PAYSTACK VERIFY: Data verification failed")
+                logger.warning(f"Paystack verify: data mismatch for {reference}")
                 raise ValidationError("Payment verification failed: Data mismatch")
             
             # 🚀 UPDATE PAYMENT STATUS BASED ON PAYSTACK RESPONSE
             paystack_status = result['data']['status']
-            print(f"🔍 PAYSTACK VERIFY: Paystack status = {paystack_status}")
-            print(f"🔍 PAYSTACK VERIFY: Current payment status = {self.transaction.payment_status}")
-            print(f"🔍 PAYSTACK VERIFY: Has appointment = {bool(self.transaction.appointment)}")
-            print(f"🔍 PAYSTACK VERIFY: Has description = {bool(self.transaction.description)}")
+            logger.debug(
+                f"Paystack verify {reference}: paystack status {paystack_status}, "
+                f"local status {self.transaction.payment_status}"
+            )
             
             if paystack_status == 'success':
                 # Mark payment as completed if Paystack says it's successful
                 if self.transaction.payment_status != 'completed':
-                    print(f"🚀 PAYSTACK VERIFY: Triggering mark_as_completed for payment {reference}")
                     try:
                         # Use mark_as_completed to trigger appointment creation for payment-first approach
                         self.transaction.mark_as_completed(gateway_response=result['data'])
-                        print(f"✅ PAYSTACK VERIFY: Payment {reference} marked as completed and appointment creation triggered")
+                        logger.info(f"Paystack verify: payment {reference} marked as completed")
                         
                         # Refresh from database to get updated state
                         self.transaction.refresh_from_db()
-                        print(f"✅ PAYSTACK VERIFY: After refresh - has appointment: {bool(self.transaction.appointment)}")
                         
                     except Exception as completion_error:
-                        print(f"❌ PAYSTACK VERIFY: Error in mark_as_completed for {reference}: {completion_error}")
-                        import traceback
-                        print(f"❌ PAYSTACK VERIFY: Completion traceback: {traceback.format_exc()}")
+                        logger.exception(f"Paystack verify: mark_as_completed failed for {reference}: {completion_error}")
                         # Still mark as completed manually to prevent payment loss
                         self.transaction.payment_status = 'completed'
                         self.transaction.completed_at = timezone.now()
                         self.transaction.gateway_data = result['data']
                         self.transaction.save()
-                        print(f"⚠️ PAYSTACK VERIFY: Payment {reference} marked as completed manually due to error")
+                        logger.warning(f"Paystack verify: payment {reference} marked as completed manually due to error")
                         
                 else:
-                    print(f"ℹ️ PAYSTACK VERIFY: Payment {reference} already marked as completed")
                     # Double-check appointment creation for already completed payments
                     if not self.transaction.appointment and self.transaction.description:
-                        print(f"🔄 PAYSTACK VERIFY: Re-attempting appointment creation for completed payment {reference}")
+                        logger.info(f"Paystack verify: re-attempting appointment creation for {reference}")
                         try:
                             # Re-trigger appointment creation
                             self.transaction.mark_as_completed(gateway_response=result['data'])
                         except Exception as retry_error:
-                            print(f"❌ PAYSTACK VERIFY: Retry appointment creation failed: {retry_error}")
+                            logger.error(f"Paystack verify: retry appointment creation failed for {reference}: {retry_error}")
                             
             elif paystack_status == 'failed':
                 # Mark payment as failed
@@ -174,19 +150,14 @@ class PaystackProvider(BasePaymentProvider):
                     self.transaction.payment_status = 'failed'
                     self.transaction.gateway_data = result['data']
                     self.transaction.save()
-                    print(f"❌ PAYSTACK VERIFY: Payment {reference} marked as failed")
-                else:
-                    print(f"ℹ️ PAYSTACK VERIFY: Payment {reference} already marked as failed")
+                    logger.info(f"Paystack verify: payment {reference} marked as failed")
             else:
-                print(f"⚠️ PAYSTACK VERIFY: Unknown status '{paystack_status}' for payment {reference}")
-            
-            print(f"🔍 PAYSTACK VERIFY: Final payment status: {self.transaction.payment_status}")
-            print(f"🔍 PAYSTACK VERIFY: Final appointment status: {'linked' if self.transaction.appointment else 'none'}")
+                logger.warning(f"Paystack verify: unknown status '{paystack_status}' for payment {reference}")
             
             return result
             
         except requests.exceptions.RequestException as e:
-            print(f"🚨 PAYSTACK VERIFY ERROR: {str(e)}")
+            logger.error(f"Paystack verify failed for {reference}: {str(e)}")
             self.log_error("Payment verification failed", e)
             raise ValidationError("Payment verification failed. Please contact support.")
     
@@ -195,33 +166,26 @@ class PaystackProvider(BasePaymentProvider):
         if not self.verify_webhook_signature(signature, str(data)):
             self.log_security_event("Invalid webhook signature")
             raise ValidationError("Invalid webhook signature")
-            
+        self.handle_webhook_event(data)
+    
+    def handle_webhook_event(self, data):
+        """Apply an already-verified Paystack webhook event to the transaction"""
         try:
-            print(f"🔔 WEBHOOK: Processing event '{data['event']}' for transaction {self.transaction.transaction_id}")
-            print(f"🔔 WEBHOOK: Current payment status: {self.transaction.payment_status}")
-            print(f"🔔 WEBHOOK: Has appointment: {bool(self.transaction.appointment)}")
-            print(f"🔔 WEBHOOK: Has description: {bool(self.transaction.description)}")
+            logger.info(f"Paystack webhook: {data['event']} for transaction {self.transaction.transaction_id}")
             
             if data['event'] == 'charge.success':
                 # Verify transaction details before marking as complete
                 if self.verify_transaction_data(data['data']):
-                    print(f"🔔 WEBHOOK: Transaction data verified, triggering mark_as_completed")
                     try:
                         # Use mark_as_completed to trigger appointment creation for payment-first approach
                         self.transaction.mark_as_completed(
                             gateway_response=data,
                             user=None  # System user
                         )
-                        print(f"✅ WEBHOOK: Payment {self.transaction.transaction_id} completed and appointment creation triggered")
-                        
-                        # Refresh and log final state
                         self.transaction.refresh_from_db()
-                        print(f"✅ WEBHOOK: Final state - status: {self.transaction.payment_status}, appointment: {'linked' if self.transaction.appointment else 'none'}")
                         
                     except Exception as webhook_completion_error:
-                        print(f"❌ WEBHOOK: Error in mark_as_completed: {webhook_completion_error}")
-                        import traceback
-                        print(f"❌ WEBHOOK: Completion traceback: {traceback.format_exc()}")
+                        logger.exception(f"Paystack webhook: mark_as_completed failed: {webhook_completion_error}")
                         raise
                         
                 else:
@@ -229,13 +193,12 @@ class PaystackProvider(BasePaymentProvider):
                     raise ValidationError("Transaction data mismatch")
                     
             elif data['event'] == 'charge.failed':
-                print(f"❌ WEBHOOK: Processing charge.failed event")
                 self.transaction.mark_as_failed(
                     gateway_response=data,
                     user=None  # System user
                 )
             else:
-                print(f"ℹ️ WEBHOOK: Unhandled event type: {data['event']}")
+                logger.info(f"Paystack webhook: unhandled event type {data['event']}")
                 
         except Exception as e:
             self.log_error("Webhook processing failed", e)
@@ -292,7 +255,7 @@ class PaystackProvider(BasePaymentProvider):
     
     def refund_payment(self, amount=None):
         """Process refund through Paystack"""
-        url = "https://api.paystack.co/refund"
+        url = self.api_urls['refund']
         
         headers = {
             "Authorization": f"Bearer {self.config['secret_key']}",
@@ -304,7 +267,6 @@ class PaystackProvider(BasePaymentProvider):
             "amount": int(amount * 100) if amount else None
         }
         
-        response = requests.post(url, headers=headers, json=data)
-        response.raise_for_status()
+        response = self.http.post(url, 'refund', headers=headers, json=data)
         
-        return response.json() 
\ No newline at end of file
+        return response.json()
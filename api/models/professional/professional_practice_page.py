@@ -273,9 +273,18 @@ class ProfessionalPracticePage(TimestampedModel):
         return open_time <= current_time <= close_time
 
     def increment_view_count(self):
-        """Increment page view counter"""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        """
+        Increment page view counter (buffered; flushed to the row periodically).
+        view_count stays the persisted value; current_view_count includes this view.
+        """
+        from api.services.buffered_counters import BufferedCounterService
+        BufferedCounterService.increment(self, 'view_count')
+
+    @property
+    def current_view_count(self):
+        """Persisted view count plus views not yet flushed"""
+        from api.services.buffered_counters import BufferedCounterService
+        return BufferedCounterService.current_value(self, 'view_count')
 
     def increment_nomination_count(self):
         """Increment nomination counter"""
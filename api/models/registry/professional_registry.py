@@ -6,6 +6,8 @@ This registry allows patients and hospitals to verify professional credentials.
 """
 
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 import uuid
@@ -230,6 +232,21 @@ class PHBProfessionalRegistry(TimestampedModel):
         help_text='Date first added to PHB registry'
     )
 
+    # Search columns, maintained by the phb_registry_search_update trigger
+    # (see migration 0056) so bulk writes stay indexed too
+    search_name = models.CharField(
+        max_length=201,
+        blank=True,
+        default='',
+        editable=False,
+        help_text='Normalized "first last" name for trigram search'
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text='Specialization, interests and location for full-text search'
+    )
+
     class Meta:
         db_table = 'phb_professional_registry'
         ordering = ['last_name', 'first_name']
@@ -241,6 +258,19 @@ class PHBProfessionalRegistry(TimestampedModel):
             models.Index(fields=['city', 'state'], name='idx_reg_location'),
             models.Index(fields=['last_name', 'first_name'], name='idx_reg_name'),
             models.Index(fields=['is_searchable', 'license_status'], name='idx_reg_searchable'),
+            GinIndex(
+                fields=['search_name'], opclasses=['gin_trgm_ops'], name='idx_reg_name_trgm',
+                condition=models.Q(license_status='active', is_searchable=True),
+            ),
+            GinIndex(
+                fields=['search_vector'], name='idx_reg_search_vector',
+                condition=models.Q(license_status='active', is_searchable=True),
+            ),
+            # Public listing order, walked with a keyset cursor
+            models.Index(
+                fields=['-license_issue_date', 'last_name', 'first_name', 'id'], name='idx_reg_listing',
+                condition=models.Q(license_status='active', is_searchable=True),
+            ),
         ]
         verbose_name = 'PHB Professional Registry Entry'
         verbose_name_plural = 'PHB Professional Registry Entries'
@@ -9,6 +9,46 @@ from django.utils import timezone
 import uuid
 import os
 
+class ContentBlob(models.Model):
+    """🧬 Content-Addressed Blob - one stored copy per plaintext digest
+    
+    Documents that upload identical bytes share a blob and only add a row of
+    their own; ref_count tracks how many rows point at it and the blob file is
+    removed when the last one is released. Access control stays on the
+    referencing document rows.
+    """
+    
+    STORE_CHOICES = [
+        ('secure_vault', 'Secure Medical Vault'),
+        ('guidelines', 'Clinical Guidelines'),
+    ]
+    
+    store = models.CharField(max_length=20, choices=STORE_CHOICES)
+    digest = models.CharField(max_length=64, help_text="SHA-256 of the plaintext content")
+    size = models.PositiveBigIntegerField()  # Plaintext size in bytes
+    storage_path = models.CharField(max_length=500)  # Relative to MEDIA_ROOT
+    is_encrypted = models.BooleanField(default=False)
+    key_id = models.CharField(max_length=32, blank=True, help_text="VAULT_BLOB_KEYS id the blob is encrypted with")
+    virus_scanned = models.BooleanField(default=False)
+    
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_referenced_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['store', 'digest'], name='unique_content_blob_digest'),
+        ]
+    
+    def __str__(self):
+        return f"{self.store}:{self.digest[:12]} ({self.ref_count} refs)"
+    
+    @property
+    def full_path(self):
+        """Absolute path of the stored blob"""
+        return os.path.join(settings.MEDIA_ROOT, self.storage_path)
+
+
 class SecureDocument(models.Model):
     """🗃️ Secure Document Model with User Ownership"""
     
@@ -32,6 +72,14 @@ class SecureDocument(models.Model):
     # Storage information
     vault_path = models.CharField(max_length=500)  # Relative path in vault
     storage_backend = models.CharField(max_length=50, default='local_vault')
+    blob = models.ForeignKey(
+        ContentBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='secure_documents',
+        help_text="Shared content-addressed blob (null for per-user encrypted legacy files)"
+    )
     
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
@@ -77,6 +125,8 @@ class SecureDocument(models.Model):
     def full_vault_path(self):
         """Get full path to encrypted file"""
         from django.conf import settings
+        if self.blob_id:
+            return self.blob.full_path
         return os.path.join(settings.MEDIA_ROOT, 'secure_medical_vault', self.secure_filename)
     
     def mark_accessed(self):
@@ -1,9 +1,10 @@
 # api/models/signals.py
 
-from django.db.models.signals import post_save, pre_delete
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.dispatch import receiver
 from django.db import transaction
 from django.core.mail import send_mail
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 from datetime import date, timedelta
 import logging
@@ -74,20 +75,70 @@ def check_license_expiry(sender, instance, **kwargs):
 # Department Capacity Signal
 @receiver(post_save, sender='api.Department')
 def monitor_bed_capacity(sender, instance, **kwargs):
-    """Monitors department bed capacity"""
+    """Monitors department bed capacity (alert is sent after commit, off the save path)"""
+    from api.services.bed_allocation import BedAllocationService
     try:
-        occupancy_rate = (instance.occupied_beds / instance.total_beds * 100 
-                         if instance.total_beds > 0 else 0)
-        
-        if occupancy_rate >= 90:
-            # Send email alert
-            send_mail(
-                subject=f"High Capacity Alert - {instance.name}",
-                message=f"Department is at {occupancy_rate:.1f}% capacity",
-                from_email="no-reply@yourhospital.com",
-                recipient_list=[instance.hospital.administrator.email],
-                fail_silently=True
-            )
-            logger.warning(f"Department {instance.name} at {occupancy_rate:.1f}% capacity")
+        for is_icu, bed_type in ((False, 'regular'), (True, 'icu')):
+            occupied_column, capacity_column = BedAllocationService.BED_COLUMNS[is_icu]
+            occupied = getattr(instance, occupied_column)
+            capacity = getattr(instance, capacity_column)
+            BedAllocationService.schedule_capacity_alert(instance.pk, {
+                'bed_type': bed_type,
+                'occupancy_rate': round(occupied / capacity * 100, 1) if capacity else 0,
+            })
+    except Exception as e:
+        logger.error(f"Error monitoring bed capacity: {str(e)}")
+
+
+# Content-addressed storage: release shared blobs when their last reference goes
+@receiver(post_delete, sender='api.SecureDocument')
+@receiver(post_delete, sender='api.ClinicalGuideline')
+def release_content_blob(sender, instance, **kwargs):
+    """Drops the deleted row's reference to its deduplicated blob"""
+    blob_id = getattr(instance, 'blob_id', None) or getattr(instance, 'file_blob_id', None)
+    if not blob_id:
+        return
+    from api.models.secure_documents import ContentBlob
+    from api.services.content_addressed_storage import ContentAddressedStorage
+    try:
+        ContentAddressedStorage.release(ContentBlob(pk=blob_id))
     except Exception as e:
-        logger.error(f"Error monitoring bed capacity: {str(e)}")
\ No newline at end of file
+        logger.error(f"Failed to release content blob {blob_id}: {str(e)}")
+
+
+# Grouped statistics: cached results are versioned per model
+@receiver(post_save, sender='api.PHBProfessionalRegistry')
+@receiver(post_delete, sender='api.PHBProfessionalRegistry')
+@receiver(post_save, sender='api.DrugClassification')
+@receiver(post_delete, sender='api.DrugClassification')
+@receiver(post_save, sender='api.PrescriptionRequest')
+@receiver(post_delete, sender='api.PrescriptionRequest')
+def invalidate_grouped_statistics(sender, **kwargs):
+    """Expires cached statistics computed from the changed model"""
+    from api.services.grouped_stats import GroupedStatistics
+    GroupedStatistics.invalidate_model(sender)
+
+
+# Analytics results: cached per user and input version
+@receiver(post_save, sender='api.WomensHealthProfile')
+@receiver(post_delete, sender='api.WomensHealthProfile')
+@receiver(post_save, sender='api.MenstrualCycle')
+@receiver(post_delete, sender='api.MenstrualCycle')
+@receiver(post_save, sender='api.DailyHealthLog')
+@receiver(post_delete, sender='api.DailyHealthLog')
+@receiver(post_save, sender='api.FertilityTracking')
+@receiver(post_delete, sender='api.FertilityTracking')
+@receiver(post_save, sender='api.HealthGoal')
+@receiver(post_delete, sender='api.HealthGoal')
+@receiver(post_save, sender='api.PregnancyRecord')
+@receiver(post_delete, sender='api.PregnancyRecord')
+@receiver(post_save, sender='api.HealthScreening')
+@receiver(post_delete, sender='api.HealthScreening')
+def invalidate_analytics_cache(sender, instance, **kwargs):
+    """Expires the owner's cached analytics results"""
+    from api.agent_modules.analytics.result_cache import analytics_cache
+    try:
+        user_id = getattr(instance, 'user_id', None) or instance.womens_health_profile.user_id
+    except ObjectDoesNotExist:
+        return  # Profile already gone; its own post_delete bumped the version
+    analytics_cache.invalidate_user(user_id)
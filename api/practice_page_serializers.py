@@ -20,6 +20,8 @@ class ProfessionalPracticePageSerializer(serializers.ModelSerializer):
     professional_type = serializers.CharField(source='linked_registry_entry.professional_type', read_only=True)
     license_number = serializers.CharField(source='linked_registry_entry.phb_license_number', read_only=True)
     is_open_now = serializers.SerializerMethodField()
+    # Persisted count plus buffered views not yet flushed
+    view_count = serializers.IntegerField(source='current_view_count', read_only=True)
 
     class Meta:
         model = ProfessionalPracticePage
@@ -49,6 +51,7 @@ class ProfessionalPracticePageDetailSerializer(serializers.ModelSerializer):
 
     # Computed fields
     is_open_now = serializers.SerializerMethodField()
+    view_count = serializers.IntegerField(source='current_view_count', read_only=True)
 
     class Meta:
         model = ProfessionalPracticePage
@@ -2073,6 +2073,9 @@ class ClinicalGuidelineSerializer(serializers.ModelSerializer):
     is_effective = serializers.ReadOnlyField()
     is_accessible = serializers.ReadOnlyField()
     
+    # Persisted count plus buffered accesses not yet flushed
+    access_count = serializers.IntegerField(source='current_access_count', read_only=True)
+    
     # User-specific fields (for bookmarks, etc.)
     is_bookmarked = serializers.SerializerMethodField()
     user_notes = serializers.SerializerMethodField()
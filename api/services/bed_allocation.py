@@ -0,0 +1,181 @@
+# api/services/bed_allocation.py
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.mail import send_mail
+from django.db import connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class BedAllocationService:
+    """
+    🛏️ Contention-safe bed allocation.
+
+    Each assignment or release is a single conditional UPDATE ... RETURNING
+    on the department row, e.g.
+
+        UPDATE ... SET occupied_beds = occupied_beds + 1
+        WHERE id = %s AND occupied_beds < total_beds
+        RETURNING occupied_beds, total_beds, current_patient_count
+
+    so concurrent admissions can never over-allocate or lose an update, and
+    the caller gets the new counts without a separate read. The row lock is
+    held only for the duration of that statement (or the caller's
+    transaction).
+
+    Capacity alerts are evaluated from the RETURNING values and sent from a
+    background thread after commit, so a slow mail server never sits on the
+    admission write path.
+    """
+
+    ALERT_THRESHOLD = 90  # Percent occupancy that triggers a capacity alert
+    ALERT_COOLDOWN = 15 * 60  # Seconds between alerts for the same department and bed type
+
+    BED_COLUMNS = {
+        False: ('occupied_beds', 'total_beds'),
+        True: ('occupied_icu_beds', 'icu_beds'),
+    }
+
+    _alert_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='bed-capacity-alerts')
+
+    @classmethod
+    def _build_result(cls, department, is_icu, row):
+        occupied, capacity, patient_count = row
+        occupied_column, _ = cls.BED_COLUMNS[is_icu]
+
+        # Keep the caller's instance in step without re-reading it
+        setattr(department, occupied_column, occupied)
+        department.current_patient_count = patient_count
+
+        return {
+            'success': True,
+            'department_id': department.pk,
+            'bed_type': 'icu' if is_icu else 'regular',
+            'occupied': occupied,
+            'capacity': capacity,
+            'available': capacity - occupied,
+            'occupancy_rate': round(occupied / capacity * 100, 1) if capacity else 0,
+            'current_patient_count': patient_count,
+        }
+
+    @classmethod
+    def assign(cls, department, is_icu=False, count_patient=False):
+        """
+        Take one bed if one is free.
+
+        count_patient also increments current_patient_count in the same
+        statement (used for admissions). Raises ValidationError when the
+        department is full.
+        """
+        if not department.is_clinical:
+            raise ValidationError("Only clinical departments can assign beds")
+
+        occupied, capacity = cls.BED_COLUMNS[is_icu]
+        patient_update = ', current_patient_count = current_patient_count + 1' if count_patient else ''
+        table = connection.ops.quote_name(department._meta.db_table)
+        pk = connection.ops.quote_name(department._meta.pk.column)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET {occupied} = {occupied} + 1{patient_update} "
+                f"WHERE {pk} = %s AND {occupied} < {capacity} "
+                f"RETURNING {occupied}, {capacity}, current_patient_count",
+                [department.pk]
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            raise ValidationError("No ICU beds available" if is_icu else "No regular beds available")
+
+        result = cls._build_result(department, is_icu, row)
+        cls.schedule_capacity_alert(department.pk, result)
+        return result
+
+    @classmethod
+    def release(cls, department, is_icu=False, count_patient=False):
+        """
+        Give one bed back (never below zero).
+
+        count_patient also decrements current_patient_count. Returns the
+        result dict; 'released' is False when no bed was occupied.
+        """
+        if not department.is_clinical:
+            raise ValidationError("Only clinical departments can release beds")
+
+        occupied, capacity = cls.BED_COLUMNS[is_icu]
+        patient_update = (
+            ', current_patient_count = GREATEST(current_patient_count - 1, 0)' if count_patient else ''
+        )
+        table = connection.ops.quote_name(department._meta.db_table)
+        pk = connection.ops.quote_name(department._meta.pk.column)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET {occupied} = {occupied} - 1{patient_update} "
+                f"WHERE {pk} = %s AND {occupied} > 0 "
+                f"RETURNING {occupied}, {capacity}, current_patient_count",
+                [department.pk]
+            )
+            row = cursor.fetchone()
+            released = row is not None
+            if row is None:
+                # No bed was held; still keep the patient count in step
+                cursor.execute(
+                    f"UPDATE {table} SET {occupied} = {occupied}{patient_update} "
+                    f"WHERE {pk} = %s RETURNING {occupied}, {capacity}, current_patient_count",
+                    [department.pk]
+                )
+                row = cursor.fetchone()
+
+        if row is None:
+            raise ValidationError("Department no longer exists")
+
+        result = cls._build_result(department, is_icu, row)
+        result['released'] = released
+        return result
+
+    # ----- capacity alerts -----
+
+    @classmethod
+    def schedule_capacity_alert(cls, department_id, result):
+        """Queue a capacity alert for after commit if occupancy crossed the threshold"""
+        if result['occupancy_rate'] < cls.ALERT_THRESHOLD:
+            return
+        try:
+            # One alert per department and bed type per cooldown window
+            if not cache.add(f"bed_capacity_alert:{department_id}:{result['bed_type']}", True, cls.ALERT_COOLDOWN):
+                return
+        except Exception as e:
+            # An unavailable cache must never fail the allocation itself
+            logger.warning(f"Bed capacity alert throttle unavailable: {str(e)}")
+        transaction.on_commit(
+            lambda: cls._alert_executor.submit(cls.send_capacity_alert, department_id, result)
+        )
+
+    @classmethod
+    def send_capacity_alert(cls, department_id, result):
+        """Email the hospital about high occupancy (runs on the alert thread)"""
+        from api.models import Department
+
+        try:
+            department = Department.objects.select_related('hospital').get(pk=department_id)
+            hospital = department.hospital
+            recipient = hospital.administrative_contact_email or hospital.email
+            label = 'ICU capacity' if result['bed_type'] == 'icu' else 'capacity'
+            if recipient:
+                send_mail(
+                    subject=f"High Capacity Alert - {department.name}",
+                    message=f"Department is at {result['occupancy_rate']:.1f}% {label}",
+                    from_email="no-reply@yourhospital.com",
+                    recipient_list=[recipient],
+                    fail_silently=True
+                )
+            logger.warning(f"Department {department.name} at {result['occupancy_rate']:.1f}% {label}")
+        except Exception as e:
+            logger.error(f"Error sending bed capacity alert: {str(e)}")
+        finally:
+            connections.close_all()
@@ -0,0 +1,520 @@
+# api/services/benchmark_suite.py
+
+import contextlib
+import io
+import json
+import logging
+import random
+import statistics
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.middleware.query_budget import QueryRecorder
+from api.models import (
+    Appointment, Conversation, Department, Doctor, DrugClassification, Hospital, Pharmacist,
+    PHBProfessionalRegistry, PrescriptionRequest, PrescriptionRequestItem, ProfessionalApplication,
+)
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+FIRST_NAMES = [
+    'Adaeze', 'Adebayo', 'Aisha', 'Amaka', 'Bola', 'Chidi', 'Chioma', 'Daniel', 'Emeka', 'Fatima',
+    'Femi', 'Funke', 'Grace', 'Ibrahim', 'Ifeoma', 'Kemi', 'Musa', 'Ngozi', 'Obinna', 'Olu',
+]
+LAST_NAMES = [
+    'Adeyemi', 'Okafor', 'Bello', 'Eze', 'Ogunleye', 'Nwosu', 'Abubakar', 'Okonkwo', 'Balogun', 'Uche',
+    'Danjuma', 'Ibekwe', 'Lawal', 'Obi', 'Salami', 'Yusuf', 'Onyeka', 'Adewale', 'Chukwu', 'Garba',
+]
+# (department, specialization, ICD-10 expertise codes)
+DEPARTMENTS = [
+    ('Cardiology', 'Cardiology', ['I10', 'I20', 'I25', 'I50']),
+    ('Endocrinology', 'Endocrinology', ['E10', 'E11', 'E05']),
+    ('Neurology', 'Neurology', ['G20', 'G40', 'G43']),
+    ('General Medicine', 'Family Medicine', ['J06', 'R51', 'K29']),
+]
+CONSULTATION_DAYS = ['Mon,Tue,Wed,Thu,Fri', 'Mon,Wed,Fri', 'Tue,Thu,Sat']
+LANGUAGES = ['english', 'yoruba', 'igbo', 'hausa']
+CITIES = [('Lagos', 'Lagos'), ('Abuja', 'FCT'), ('Ibadan', 'Oyo'), ('Enugu', 'Enugu')]
+# Generic names are stem + suffix, giving 225 distinct drugs
+DRUG_STEMS = [
+    'amlo', 'ator', 'metfor', 'losar', 'cipro', 'amoxi', 'parace', 'ibupro', 'omepra', 'trama',
+    'diaze', 'morphi', 'warfa', 'lisino', 'predni',
+]
+DRUG_SUFFIXES = [
+    'dipine', 'vastatin', 'min', 'tan', 'floxacin', 'cillin', 'tamol', 'fen', 'zole', 'dol',
+    'pam', 'done', 'rin', 'pril', 'solone',
+]
+THERAPEUTIC_CLASSES = [
+    'Antihypertensive', 'Lipid-lowering agent', 'Antidiabetic', 'Antibiotic', 'Analgesic',
+    'Proton pump inhibitor', 'Anticoagulant', 'Corticosteroid', 'Anxiolytic',
+]
+# Requests mix catalogue names, brand-style capitalisation and names the catalogue doesn't know
+UNKNOWN_MEDICATIONS = ['Herbal tonic', 'Vitamin C 1000', 'Cough syrup']
+DRUG_SEARCH_TERMS = ['amlo', 'cillin', 'Tramadol', 'vastatin', 'zole', 'metformin', 'pril', 'xyz']
+REGISTRY_SEARCHES = [
+    {'query': 'Okafor'},
+    {'query': 'Chioma Eze'},
+    {'query': 'cardio'},
+    {'professional_type': 'doctor', 'specialization': 'Neurology'},
+    {'state': 'Lagos'},
+]
+
+# Cache, channel layer and mail stand-ins so a run needs nothing but the database
+IN_MEMORY_SERVICES = {
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmarks'}},
+    'CHANNEL_LAYERS': {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}},
+    'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+}
+
+
+class BenchmarkError(Exception):
+    """A scenario failed (e.g. an endpoint returned an error) instead of being timed"""
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list"""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class BenchmarkDataset:
+    """
+    Deterministic synthetic data for the benchmark suite.
+
+    The same seed and scale always produce the same rows: hospitals and
+    departments, doctors with schedules and registry entries, patients,
+    booked appointments over the next two weeks, a drug catalogue,
+    prescription requests and conversations with message history. Dates are
+    relative to the next Monday so bookings are always in the future.
+
+    scale multiplies every count except hospitals and departments; it may be
+    fractional (tests use 0.1).
+    """
+
+    SIZES = {
+        'hospitals': 2,
+        'doctors_per_department': 5,
+        'pharmacists_per_hospital': 2,
+        'patients': 100,
+        'appointments': 1000,
+        'drugs': 150,
+        'prescriptions': 40,
+        'conversations': 20,
+        'messages_per_conversation': 10,
+    }
+
+    def __init__(self, scale=1.0, seed=42):
+        self.scale = scale
+        self.seed = seed
+        self.rng = random.Random(seed)
+        today = timezone.localdate()
+        self.anchor = today + timedelta(days=7 - today.weekday())  # Next Monday
+        self.departments = []
+        self.doctors = []
+        self.patients = []
+        self.drugs = []
+        self.prescriptions = []
+        self.conversations = []
+        self.busy_user = None
+
+    def size(self, name):
+        if name == 'hospitals':
+            return self.SIZES[name]
+        return max(1, int(self.SIZES[name] * self.scale))
+
+    def name(self, index):
+        return FIRST_NAMES[index % len(FIRST_NAMES)], LAST_NAMES[(index * 7 + index // 20) % len(LAST_NAMES)]
+
+    def slot(self, doctor, day_offset, slot_index):
+        """An aware datetime on one of the doctor's consultation slots"""
+        day = self.anchor + timedelta(days=day_offset)
+        start = datetime.combine(day, doctor.consultation_hours_start)
+        return timezone.make_aware(start + timedelta(minutes=doctor.appointment_duration * slot_index))
+
+    def seed_data(self):
+        started = time.perf_counter()
+        self._seed_hospitals()
+        self._seed_doctors()
+        self._seed_pharmacists()
+        self._seed_patients()
+        self._seed_appointments()
+        self._seed_drugs()
+        self._seed_prescriptions()
+        self._seed_conversations()
+        logger.info(f"Benchmark dataset (scale {self.scale}, seed {self.seed}) seeded in "
+                    f"{time.perf_counter() - started:.1f}s")
+        return self
+
+    def _seed_hospitals(self):
+        weekdays = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday']
+        for h in range(self.size('hospitals')):
+            city, state = CITIES[h % len(CITIES)]
+            hospital = Hospital.objects.create(
+                name=f"Benchmark Hospital {h + 1}", registration_number=f"BENCH-H{h + 1:03d}",
+                address=f"{h + 1} Benchmark Road", city=city, state=state, country='Nigeria',
+                postal_code=f"{100001 + h}", phone='08000000000', email=f"hospital{h + 1}@benchmark.example.com",
+                hospital_type='general', bed_capacity=200,
+            )
+            for d, (department_name, _, _) in enumerate(DEPARTMENTS):
+                self.departments.append(Department.objects.create(
+                    hospital=hospital, name=department_name, code=f"BENCH{h + 1}{d + 1:02d}",
+                    department_type='medical', minimum_staff_required=1,
+                    current_staff_count=self.size('doctors_per_department'),
+                    operating_hours={day: {'start': '08:00', 'end': '16:00'} for day in weekdays},
+                ))
+
+    def _seed_doctors(self):
+        index = 0
+        for department in self.departments:
+            _, specialization, codes = next(entry for entry in DEPARTMENTS if entry[0] == department.name)
+            for _ in range(self.size('doctors_per_department')):
+                first_name, last_name = self.name(index)
+                user = User.objects.create_user(
+                    email=f"bench.doctor{index}@example.com", password=None, first_name=first_name,
+                    last_name=last_name, role='doctor', preferred_language=LANGUAGES[index % len(LANGUAGES)],
+                )
+                doctor = Doctor.objects.create(
+                    user=user, hospital=department.hospital, department=department,
+                    specialization=specialization, medical_license_number=f"BENCH-MD-{index:05d}",
+                    license_expiry_date=self.anchor + timedelta(days=3 * 365),
+                    years_of_experience=self.rng.randint(2, 30), languages_spoken='English',
+                    consultation_days=CONSULTATION_DAYS[index % len(CONSULTATION_DAYS)],
+                    consultation_hours_start=dt_time(8, 0), consultation_hours_end=dt_time(16, 0),
+                    is_verified=True, is_active=True, status='active',
+                    expertise_codes=codes, primary_expertise_codes=codes[:1],
+                    chronic_care_experience=index % 2 == 0,
+                    complex_case_rating=round(self.rng.uniform(5, 9), 1),
+                    continuity_of_care_rating=round(self.rng.uniform(5, 9), 1),
+                )
+                self._register_professional(user, specialization, department.hospital, index)
+                self.doctors.append(doctor)
+                index += 1
+        self.busy_user = self.doctors[0].user
+
+    def _seed_pharmacists(self):
+        hospitals = list(dict.fromkeys(department.hospital for department in self.departments))
+        index = 0
+        for hospital in hospitals:
+            for _ in range(self.size('pharmacists_per_hospital')):
+                first_name, last_name = self.name(index + 11)
+                user = User.objects.create_user(
+                    email=f"bench.pharmacist{index}@example.com", password=None, first_name=first_name,
+                    last_name=last_name, role='pharmacist',
+                )
+                Pharmacist.objects.create(
+                    user=user, hospital=hospital, pharmacy_license_number=f"BENCH-PH-{index:05d}",
+                    license_expiry_date=self.anchor + timedelta(days=3 * 365), years_of_experience=5 + index,
+                    can_prescribe_controlled=index % 2 == 0,
+                )
+                index += 1
+
+    def _register_professional(self, user, specialization, hospital, index):
+        application = ProfessionalApplication.objects.create(
+            application_reference=f"APP-BENCH-{index:05d}", user=user, professional_type='doctor', title='Dr.',
+            first_name=user.first_name, last_name=user.last_name, date_of_birth=date(1970 + index % 20, 1, 1),
+            gender='female' if index % 2 else 'male', nationality='Nigerian', email=user.email,
+            phone='08000000000', address_line_1=hospital.address, city=hospital.city, state=hospital.state,
+            postcode=hospital.postal_code, primary_qualification='MBBS',
+            qualification_institution='University of Lagos', qualification_year=2000 + index % 20,
+            qualification_country='Nigeria', specialization=specialization,
+        )
+        PHBProfessionalRegistry.objects.create(
+            user=user, application=application, phb_license_number=f"PHB-BENCH-{index:05d}",
+            professional_type='doctor', title='Dr.', first_name=user.first_name, last_name=user.last_name,
+            primary_qualification='MBBS', qualification_year=2000 + index % 20, specialization=specialization,
+            license_issue_date=date(2015, 1, 1) + timedelta(days=index * 30),
+            license_expiry_date=self.anchor + timedelta(days=3 * 365), city=hospital.city, state=hospital.state,
+        )
+
+    def _seed_patients(self):
+        for index in range(self.size('patients')):
+            first_name, last_name = self.name(index + 3)
+            self.patients.append(User.objects.create_user(
+                email=f"bench.patient{index}@example.com", password=None, first_name=first_name,
+                last_name=last_name, role='patient', date_of_birth=date(1950 + index % 50, 1 + index % 12, 1),
+                preferred_language=LANGUAGES[index % len(LANGUAGES)],
+            ))
+
+    def _seed_appointments(self):
+        appointments = []
+        booked = set()
+        for index in range(self.size('appointments')):
+            doctor = self.rng.choice(self.doctors)
+            days = doctor.consultation_days.split(',')
+            day_offset = self.rng.randrange(14)
+            if (self.anchor + timedelta(days=day_offset)).strftime('%a') not in days:
+                continue
+            slot_index = self.rng.randrange(16)
+            if (doctor.pk, day_offset, slot_index) in booked:
+                continue
+            booked.add((doctor.pk, day_offset, slot_index))
+            appointments.append(Appointment(
+                appointment_id=f"BENCH{index:07d}", patient=self.rng.choice(self.patients),
+                hospital=doctor.hospital, department=doctor.department, doctor=doctor,
+                appointment_date=self.slot(doctor, day_offset, slot_index),
+                status=self.rng.choice(['pending', 'confirmed', 'confirmed', 'completed']),
+                chief_complaint='Follow-up visit',
+            ))
+        # bulk_create skips Appointment.save()'s validation and notifications
+        Appointment.objects.bulk_create(appointments, batch_size=500)
+
+    def _seed_drugs(self):
+        drugs = []
+        for index in range(self.size('drugs')):
+            stem = DRUG_STEMS[index % len(DRUG_STEMS)]
+            suffix = DRUG_SUFFIXES[(index // len(DRUG_STEMS) + index) % len(DRUG_SUFFIXES)]
+            generic_name = f"{stem}{suffix}" + (f" {index // 225 + 1}" if index >= 225 else '')
+            schedule = 'schedule_4' if index % 11 == 0 else 'schedule_3' if index % 17 == 0 else 'unscheduled'
+            drugs.append(DrugClassification(
+                generic_name=generic_name, brand_names=[generic_name.title(), f"{stem.title()}-Bench"],
+                therapeutic_class=THERAPEUTIC_CLASSES[index % len(THERAPEUTIC_CLASSES)],
+                pharmacological_class=THERAPEUTIC_CLASSES[(index + 3) % len(THERAPEUTIC_CLASSES)],
+                nafdac_schedule=schedule, is_controlled=schedule != 'unscheduled',
+                requires_physician_only=schedule == 'schedule_3', is_high_risk=index % 9 == 0,
+                requires_monitoring=index % 9 == 0, search_keywords=[stem, suffix],
+            ))
+        self.drugs = DrugClassification.objects.bulk_create(drugs)
+
+    def _seed_prescriptions(self):
+        for index in range(self.size('prescriptions')):
+            request = PrescriptionRequest.objects.create(
+                request_reference=f"REQ-BENCH{index:05d}", patient=self.patients[index % len(self.patients)],
+                hospital=self.departments[index % len(self.departments)].hospital,
+                urgency='urgent' if index % 5 == 0 else 'routine',
+                request_type='new' if index % 3 == 0 else 'repeat',
+            )
+            for item in range(1 + index % 4):
+                if (index + item) % 7 == 0:
+                    medication_name = UNKNOWN_MEDICATIONS[item % len(UNKNOWN_MEDICATIONS)]
+                else:
+                    medication_name = self.drugs[(index * 5 + item * 13) % len(self.drugs)].generic_name
+                    medication_name = medication_name.title() if item % 2 else medication_name
+                PrescriptionRequestItem.objects.create(
+                    request=request, medication_name=medication_name, quantity=28, is_repeat=index % 3 != 0,
+                )
+            self.prescriptions.append(request)
+
+    def _seed_conversations(self):
+        from api.models.messaging.auto_scaling_storage import get_auto_scaling_storage
+
+        storage = get_auto_scaling_storage()
+        colleagues = [doctor.user for doctor in self.doctors[1:]]
+        for index in range(self.size('conversations')):
+            members = [self.busy_user] + self.rng.sample(colleagues, min(len(colleagues), 1 + index % 3))
+            conversation = Conversation.objects.create(
+                title=f"Case discussion {index + 1}", conversation_type='direct' if len(members) == 2 else 'group',
+                created_by=self.busy_user, hospital_context=self.doctors[0].hospital,
+            )
+            for member in members:
+                conversation.add_participant(member, role='admin' if member == self.busy_user else 'member')
+            for number in range(self.size('messages_per_conversation')):
+                storage.store_message({
+                    'conversation_id': str(conversation.id), 'sender_id': str(members[number % len(members)].id),
+                    'content': f"Update {number + 1} on case {index + 1}", 'message_type': 'text',
+                    'priority_level': 'routine', 'created_at': timezone.now(),
+                })
+            conversation.update_last_message_time()
+            self.conversations.append(conversation)
+
+
+class BenchmarkSuite:
+    """
+    ⏱️ Reproducible latency benchmarks for the request hot paths.
+
+    Each scenario is run warmup times untimed, then repeat times, each run
+    timed and its queries counted (QueryRecorder, on every connection). The
+    result per scenario is p50 / p95 / max / mean in ms and the most queries
+    any run made. Endpoint scenarios go through the full Django stack with
+    an authenticated APIClient.
+
+    compare() checks results against a stored baseline (JSON written by
+    save_baseline): a p50 or p95 more than tolerance above the baseline and
+    at least min_delta_ms slower, or any extra query, is a regression.
+    Query counts are deterministic for a given dataset, latencies aren't.
+    """
+
+    SCENARIOS = (
+        'doctor_assignment', 'slot_listing', 'prescription_triage', 'drug_search',
+        'professional_search', 'conversation_listing', 'message_send',
+    )
+    LATENCY_METRICS = ('p50_ms', 'p95_ms')
+
+    @classmethod
+    @contextlib.contextmanager
+    def isolated(cls, in_memory_services=True):
+        """A transaction that is always rolled back, with in-memory cache / channel layer / mail by default"""
+        overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver']}  # APIClient's host
+        if in_memory_services:
+            overrides.update(IN_MEMORY_SERVICES)
+        with override_settings(**overrides), transaction.atomic():
+            try:
+                yield
+            finally:
+                transaction.set_rollback(True)
+                if in_memory_services:
+                    cache.clear()
+
+    @classmethod
+    def run(cls, dataset, scenarios=None, repeat=20, warmup=2):
+        results = {}
+        client = APIClient()
+        client.force_authenticate(dataset.busy_user)
+        for name in scenarios or cls.SCENARIOS:
+            scenario = getattr(cls, f'_{name}')
+            for iteration in range(warmup):
+                scenario(dataset, client, iteration)
+            timings, queries = [], []
+            for iteration in range(warmup, warmup + repeat):
+                with QueryRecorder() as recorder:
+                    started = time.perf_counter()
+                    scenario(dataset, client, iteration)
+                    timings.append((time.perf_counter() - started) * 1000)
+                queries.append(recorder.count)
+            results[name] = cls.summarize(timings, queries)
+        return results
+
+    @staticmethod
+    def summarize(timings, queries):
+        timings = sorted(timings)
+        return {
+            'runs': len(timings),
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(percentile(timings, 0.95), 3),
+            'max_ms': round(timings[-1], 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'queries': max(queries),
+        }
+
+    # ----- baselines -----
+
+    @classmethod
+    def baseline_path(cls, path=None):
+        return Path(path or getattr(settings, 'BENCHMARK_BASELINE_PATH',
+                                    Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'))
+
+    @classmethod
+    def load_baseline(cls, path=None):
+        path = cls.baseline_path(path)
+        if not path.exists():
+            return None
+        with open(path) as baseline_file:
+            return json.load(baseline_file)
+
+    @classmethod
+    def save_baseline(cls, results, dataset, path=None):
+        path = cls.baseline_path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        baseline = cls.load_baseline(path) or {}
+        # Scenarios not run this time keep their previous baseline
+        merged = baseline.get('results', {}) if cls.comparable(baseline, dataset) else {}
+        merged.update(results)
+        with open(path, 'w') as baseline_file:
+            json.dump({
+                'generated_at': timezone.now().isoformat(),
+                'database': connection.vendor,
+                'scale': dataset.scale,
+                'seed': dataset.seed,
+                'results': merged,
+            }, baseline_file, indent=2, sort_keys=True)
+        return path
+
+    @staticmethod
+    def comparable(baseline, dataset):
+        """Whether a baseline was recorded on the same dataset and database"""
+        return bool(baseline) and (
+            baseline.get('scale'), baseline.get('seed'), baseline.get('database')
+        ) == (dataset.scale, dataset.seed, connection.vendor)
+
+    @classmethod
+    def compare(cls, results, baseline_results, tolerance=None, min_delta_ms=None):
+        """Regressions against the baseline: [{'scenario', 'metric', 'baseline', 'current', 'change'}]"""
+        tolerance = tolerance if tolerance is not None else getattr(settings, 'BENCHMARK_TOLERANCE', 0.25)
+        min_delta_ms = min_delta_ms if min_delta_ms is not None else getattr(settings, 'BENCHMARK_MIN_DELTA_MS', 2.0)
+        regressions = []
+        for name, current in results.items():
+            previous = baseline_results.get(name)
+            if previous is None:
+                continue
+            for metric in cls.LATENCY_METRICS:
+                before, after = previous[metric], current[metric]
+                if after > before * (1 + tolerance) and after - before >= min_delta_ms:
+                    regressions.append({
+                        'scenario': name, 'metric': metric, 'baseline': before, 'current': after,
+                        'change': f"+{(after - before) / before * 100:.0f}%" if before else 'new',
+                    })
+            if current['queries'] > previous['queries']:
+                regressions.append({
+                    'scenario': name, 'metric': 'queries', 'baseline': previous['queries'],
+                    'current': current['queries'], 'change': f"+{current['queries'] - previous['queries']}",
+                })
+        return regressions
+
+    # ----- scenarios: (dataset, authenticated client, iteration) -----
+
+    @staticmethod
+    def _expect_ok(response, scenario):
+        if response.status_code >= 400:
+            raise BenchmarkError(f"{scenario}: HTTP {response.status_code} {response.content[:200]!r}")
+        return response
+
+    @staticmethod
+    def _doctor_assignment(dataset, client, iteration):
+        from api.models.medical.doctor_assignment import doctor_assigner
+
+        department = dataset.departments[iteration % len(dataset.departments)]
+        doctor = next(doctor for doctor in dataset.doctors if doctor.department_id == department.pk)
+        with contextlib.redirect_stdout(io.StringIO()):  # The assigner prints its scoring
+            doctor_assigner.assign_doctor({
+                'patient': dataset.patients[iteration % len(dataset.patients)],
+                'department': department,
+                'hospital': department.hospital,
+                'appointment_type': 'consultation',
+                'appointment_date': dataset.slot(doctor, 0, iteration % 16),
+            })
+
+    @staticmethod
+    def _slot_listing(dataset, client, iteration):
+        doctor = dataset.doctors[iteration % len(dataset.doctors)]
+        day = dataset.anchor + timedelta(days=iteration % 5)
+        doctor.get_available_slots(day)
+        doctor.department.get_available_slots(day)
+
+    @staticmethod
+    def _prescription_triage(dataset, client, iteration):
+        from api.utils.prescription_triage import assign_prescription_request
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            assign_prescription_request(dataset.prescriptions[iteration % len(dataset.prescriptions)])
+
+    @classmethod
+    def _drug_search(cls, dataset, client, iteration):
+        term = DRUG_SEARCH_TERMS[iteration % len(DRUG_SEARCH_TERMS)]
+        cls._expect_ok(client.get('/api/drugs/search/', {'q': term, 'limit': 20}), 'drug_search')
+
+    @staticmethod
+    def _professional_search(dataset, client, iteration):
+        from api.services.professional_search import ProfessionalRegistrySearch
+
+        ProfessionalRegistrySearch.search(**REGISTRY_SEARCHES[iteration % len(REGISTRY_SEARCHES)])
+
+    @classmethod
+    def _conversation_listing(cls, dataset, client, iteration):
+        cls._expect_ok(client.get('/api/messaging/conversations/'), 'conversation_listing')
+
+    @classmethod
+    def _message_send(cls, dataset, client, iteration):
+        conversation = dataset.conversations[iteration % len(dataset.conversations)]
+        cls._expect_ok(client.post(
+            f'/api/messaging/conversations/{conversation.id}/send/',
+            {'content': f"Benchmark message {iteration}"}, format='json',
+        ), 'message_send')
@@ -0,0 +1,332 @@
+# api/services/buffered_counters.py
+
+import atexit
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCounterBuffer:
+    """In-process sharded counter: pending deltas per (counter, pk), one lock per shard"""
+
+    SHARDS = 16
+
+    def __init__(self):
+        self.shards = [(threading.Lock(), defaultdict(int)) for _ in range(self.SHARDS)]
+        # Drained deltas not yet committed; still pending for readers
+        self.in_flight_lock = threading.Lock()
+        self.in_flight = []
+
+    def _shard(self, counter, pk):
+        return self.shards[hash((counter, pk)) % self.SHARDS]
+
+    def increment(self, counter, pk, amount):
+        lock, deltas = self._shard(counter, pk)
+        with lock:
+            deltas[(counter, pk)] += amount
+            return deltas[(counter, pk)]
+
+    def pending(self, counter, pks):
+        result = {}
+        for pk in pks:
+            lock, deltas = self._shard(counter, pk)
+            with lock:
+                result[pk] = deltas.get((counter, pk), 0)
+        with self.in_flight_lock:
+            for drained in self.in_flight:
+                for pk in pks:
+                    result[pk] += drained.get(counter, {}).get(pk, 0)
+        return result
+
+    def drain(self):
+        """Take every pending delta, leaving the buffer empty (pending until acknowledge / restore)"""
+        drained = defaultdict(dict)
+        with self.in_flight_lock:
+            self.in_flight.append(drained)
+        for index, (lock, deltas) in enumerate(self.shards):
+            with lock:
+                self.shards[index] = (lock, defaultdict(int))
+                for (counter, pk), delta in deltas.items():
+                    drained[counter][pk] = delta
+        return drained
+
+    def acknowledge(self, drained):
+        """Forget deltas once the database update has committed"""
+        with self.in_flight_lock:
+            self.in_flight = [other for other in self.in_flight if other is not drained]
+
+    def restore(self, drained):
+        """Put deltas back after a failed flush"""
+        for counter, deltas in drained.items():
+            for pk, delta in deltas.items():
+                self.increment(counter, pk, delta)
+        self.acknowledge(drained)
+
+
+class RedisCounterBuffer:
+    """Pending deltas in one Redis hash per counter, shared by every worker process"""
+
+    KEY_PREFIX = 'buffered_counter'
+    LOCK_TIMEOUT = 60
+    # Delete the lock only while it still holds our token, never another flusher's
+    RELEASE_SCRIPT = """
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('del', KEYS[1])
+        end
+        return 0
+    """
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self.registry_key = f"{self.KEY_PREFIX}:counters"
+        self.lock_key = f"{self.KEY_PREFIX}:flush-lock"
+        self.lock_token = None
+        self.flushing_keys = []
+        self._release_lock = self.client.register_script(self.RELEASE_SCRIPT)
+
+    def _key(self, counter):
+        return f"{self.KEY_PREFIX}:{counter}"
+
+    def _in_flight_key(self, counter):
+        """Set of the counter's moved-aside hashes that are not yet acknowledged"""
+        return f"{self._key(counter)}:in-flight"
+
+    def increment(self, counter, pk, amount):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.sadd(self.registry_key, counter)
+        pipe.hincrby(self._key(counter), str(pk), amount)
+        return pipe.execute()[1]
+
+    def pending(self, counter, pks):
+        """Live deltas plus those moved aside by a flush that has not been acknowledged yet"""
+        fields = [str(pk) for pk in pks]
+        keys = [self._key(counter)] + [key.decode() for key in self.client.smembers(self._in_flight_key(counter))]
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hmget(key, fields)
+        result = dict.fromkeys(pks, 0)
+        for values in pipe.execute():
+            for pk, value in zip(pks, values):
+                result[pk] += int(value or 0)
+        return result
+
+    def drain(self):
+        """
+        Atomically move each counter hash aside and read it.
+
+        RENAME makes increments that arrive during the flush land in a fresh
+        hash; the moved-aside keys are listed in the counter's in-flight set
+        (so pending() keeps counting them) and deleted by acknowledge() after
+        the database update commits (and re-read on the next flush otherwise).
+
+        Returns None, without touching the lock, when another process is
+        flushing; acknowledge() / release() are only for a flush that drained.
+        """
+        drained = defaultdict(dict)
+        self.flushing_keys = []
+        # One flusher at a time across processes, or two could apply the same moved-aside hash
+        token = uuid.uuid4().hex
+        if not self.client.set(self.lock_key, token, nx=True, ex=self.LOCK_TIMEOUT):
+            return None
+        self.lock_token = token
+        for raw_counter in self.client.smembers(self.registry_key):
+            counter = raw_counter.decode()
+            flushing_key = f"{self._key(counter)}:flushing:{uuid.uuid4().hex}"
+            if self.client.exists(self._key(counter)):
+                # Rename and register together, so readers never miss the moved-aside deltas
+                pipe = self.client.pipeline(transaction=True)
+                pipe.rename(self._key(counter), flushing_key)
+                pipe.sadd(self._in_flight_key(counter), flushing_key)
+                pipe.execute()
+            # Includes hashes left by an earlier flush that failed before acknowledge()
+            for raw_key in self.client.smembers(self._in_flight_key(counter)):
+                key = raw_key.decode()
+                for pk, delta in self.client.hgetall(key).items():
+                    pk = pk.decode()
+                    drained[counter][pk] = drained[counter].get(pk, 0) + int(delta)
+                self.flushing_keys.append((counter, key))
+        return drained
+
+    def acknowledge(self):
+        """Drop the moved-aside hashes once their deltas are committed"""
+        if self.flushing_keys:
+            pipe = self.client.pipeline(transaction=True)
+            for counter, key in self.flushing_keys:
+                pipe.srem(self._in_flight_key(counter), key)
+                pipe.delete(key)
+            pipe.execute()
+        self.flushing_keys = []
+        self.release()
+
+    def release(self):
+        if self.lock_token is not None:
+            self._release_lock(keys=[self.lock_key], args=[self.lock_token])
+            self.lock_token = None
+
+
+class BufferedCounterService:
+    """
+    📈 Buffered view/access counters.
+
+    A page view used to be a read-modify-write save() of the whole row,
+    which serialises popular pages on the row lock. Increments now go to a
+    buffer (Redis when the cache is Redis, otherwise an in-process sharded
+    counter) and a background flusher applies the aggregated deltas every
+    BUFFERED_COUNTER_FLUSH_INTERVAL seconds with one
+    UPDATE ... SET field = field + delta per distinct delta.
+
+    Reads combine the persisted column with the pending delta, so counts
+    never appear to go backwards between flushes.
+    """
+
+    _lock = threading.Lock()
+    _buffer = None
+    _local_fallback = LocalCounterBuffer()
+    _flusher = None
+
+    @classmethod
+    def counter_name(cls, model, field):
+        return f"{model._meta.label_lower}.{field}"
+
+    @classmethod
+    def _get_buffer(cls):
+        if cls._buffer is None:
+            with cls._lock:
+                if cls._buffer is None:
+                    cls._buffer = cls._create_buffer()
+        return cls._buffer
+
+    @classmethod
+    def _create_buffer(cls):
+        backend = getattr(settings, 'BUFFERED_COUNTER_BACKEND', 'auto')
+        cache_config = settings.CACHES.get('default', {})
+        location = cache_config.get('LOCATION')
+        if backend in ('auto', 'redis') and 'redis' in cache_config.get('BACKEND', '').lower():
+            if isinstance(location, (list, tuple)):
+                location = location[0]
+            return RedisCounterBuffer(location)
+        return cls._local_fallback
+
+    @classmethod
+    def _ensure_flusher(cls):
+        interval = getattr(settings, 'BUFFERED_COUNTER_FLUSH_INTERVAL', 30)
+        if cls._flusher is not None or not interval:
+            return
+        with cls._lock:
+            if cls._flusher is None:
+                cls._flusher = threading.Thread(
+                    target=cls._flush_loop, args=(interval,), name='buffered-counter-flusher', daemon=True
+                )
+                cls._flusher.start()
+                atexit.register(cls._flush_at_exit)
+
+    @classmethod
+    def _flush_at_exit(cls):
+        try:
+            cls.flush()
+        except Exception as e:
+            logger.error(f"Buffered counter flush at exit failed: {str(e)}")
+
+    @classmethod
+    def _flush_loop(cls, interval):
+        from django.db import connection
+        while True:
+            time.sleep(interval)
+            try:
+                cls.flush()
+            except Exception as e:
+                logger.error(f"Buffered counter flush failed: {str(e)}")
+            finally:
+                connection.close()
+
+    # ----- public API -----
+
+    @classmethod
+    def increment(cls, instance, field, amount=1):
+        """Buffer an increment of instance.field; returns the pending delta for the row"""
+        counter = cls.counter_name(type(instance), field)
+        try:
+            pending = cls._get_buffer().increment(counter, instance.pk, amount)
+        except Exception as e:
+            # Never fail a page view because Redis is unavailable
+            logger.warning(f"Counter buffer unavailable, buffering in-process: {str(e)}")
+            pending = cls._local_fallback.increment(counter, instance.pk, amount)
+        cls._ensure_flusher()
+        return pending
+
+    @classmethod
+    def pending(cls, model, field, pks):
+        """Pending (not yet flushed) deltas for several objects"""
+        counter = cls.counter_name(model, field)
+        pks = list(pks)
+        result = cls._local_fallback.pending(counter, pks)
+        buffer = cls._get_buffer()
+        if buffer is not cls._local_fallback:
+            try:
+                for pk, delta in buffer.pending(counter, pks).items():
+                    result[pk] += delta
+            except Exception as e:
+                logger.warning(f"Counter buffer unavailable for reads: {str(e)}")
+        return result
+
+    @classmethod
+    def current_value(cls, instance, field):
+        """Persisted value plus the pending delta (for an instance as loaded from the database)"""
+        return getattr(instance, field) + cls.pending(type(instance), field, [instance.pk])[instance.pk]
+
+    @classmethod
+    def _apply(cls, drained):
+        updated = {}
+        with transaction.atomic():
+            for counter, deltas in drained.items():
+                label, _, field = counter.rpartition('.')
+                model = apps.get_model(label)
+                by_delta = defaultdict(list)
+                for pk, delta in deltas.items():
+                    if delta:
+                        by_delta[delta].append(pk)
+                rows = 0
+                for delta, pks in by_delta.items():
+                    rows += model.objects.filter(pk__in=pks).update(**{field: F(field) + delta})
+                updated[counter] = rows
+        return updated
+
+    @classmethod
+    def flush(cls):
+        """Write all pending deltas to the database; returns rows updated per counter"""
+        updated = {}
+        local = cls._local_fallback.drain()
+        try:
+            if local:
+                updated.update(cls._apply(local))
+        except Exception:
+            cls._local_fallback.restore(local)
+            raise
+        cls._local_fallback.acknowledge(local)
+
+        buffer = cls._get_buffer()
+        if buffer is not cls._local_fallback:
+            drained = buffer.drain()
+            if drained is not None:  # None: another process holds the flush lock
+                try:
+                    if drained:
+                        for counter, rows in cls._apply(drained).items():
+                            updated[counter] = updated.get(counter, 0) + rows
+                except Exception:
+                    # Leave the moved-aside hashes for the next flush to pick up
+                    buffer.release()
+                    raise
+                buffer.acknowledge()
+        if updated:
+            logger.info(f"Flushed buffered counters: {updated}")
+        return updated
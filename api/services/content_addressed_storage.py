@@ -0,0 +1,233 @@
+# api/services/content_addressed_storage.py
+
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+
+from cryptography.fernet import Fernet
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api.models.secure_documents import ContentBlob
+from api.views.security.secure_stream import encrypt_segmented
+
+logger = logging.getLogger(__name__)
+
+
+class ContentAddressedStorage:
+    """
+    Deduplicated storage for uploaded documents.
+
+    Uploads are hashed while streaming and looked up by (store, SHA-256) in
+    the ContentBlob table. A hit only bumps the blob's reference count, so a
+    repeated upload costs a metadata insert instead of another encryption
+    and copy on disk (callers still scan every upload). Each blob file has its own unique name, so
+    releasing one blob can never delete a file another blob row owns.
+
+    Blob files are written inside the caller's transaction; run that
+    transaction in ContentAddressedStorage.atomic() so the files of blob
+    rows it rolls back are deleted with them.
+    """
+
+    CHUNK_SIZE = 256 * 1024
+    _local = threading.local()
+
+    STORE_DIRECTORIES = {
+        'secure_vault': os.path.join('secure_medical_vault', 'blobs'),
+        'guidelines': os.path.join('clinical_guidelines', 'blobs'),
+    }
+
+    @classmethod
+    def hash_upload(cls, uploaded_file):
+        """Stream the upload through SHA-256 and return (hex digest, size)"""
+        digest = hashlib.sha256()
+        size = 0
+        uploaded_file.seek(0)
+        for chunk in uploaded_file.chunks(cls.CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+        uploaded_file.seek(0)
+        return digest.hexdigest(), size
+
+    @classmethod
+    def get_blob_cipher(cls, digest, key_id=None):
+        """
+        Fernet cipher for a secure vault blob.
+
+        The key is derived from a vault secret and the content digest
+        (convergent encryption), so every document sharing the blob can be
+        decrypted without tying the blob to one uploader's key. key_id picks
+        the VAULT_BLOB_KEYS secret the blob was written with (default: the
+        current VAULT_BLOB_KEY_ID).
+        """
+        key_id = key_id or settings.VAULT_BLOB_KEY_ID
+        secret = settings.VAULT_BLOB_KEYS.get(key_id)
+        if not secret:
+            raise ImproperlyConfigured(f"VAULT_BLOB_KEYS has no secret for key id '{key_id}'")
+        key = hmac.new(secret.encode('utf-8'), digest.encode('ascii'), hashlib.sha256).digest()
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    @classmethod
+    def find_blob(cls, store, digest):
+        """Look up an existing blob by digest (uses the unique index)"""
+        return ContentBlob.objects.filter(store=store, digest=digest).first()
+
+    @classmethod
+    def _blob_relative_path(cls, store, digest, extension):
+        # Unique per blob row: a concurrent release of an older blob with the
+        # same digest only ever removes its own file
+        filename = f"{digest}-{uuid.uuid4().hex[:12]}{extension.lower()}"
+        return os.path.join(cls.STORE_DIRECTORIES[store], digest[:2], filename)
+
+    @classmethod
+    def _write_file(cls, relative_path, content):
+        full_path = os.path.join(settings.MEDIA_ROOT, relative_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        temp_path = f"{full_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(content)
+        os.replace(temp_path, full_path)
+
+    @classmethod
+    def _remove_file(cls, relative_path):
+        try:
+            os.remove(os.path.join(settings.MEDIA_ROOT, relative_path))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove blob file {relative_path}: {str(e)}")
+
+    @classmethod
+    @contextmanager
+    def atomic(cls):
+        """
+        transaction.atomic() that also deletes the blob files written inside
+        it when it rolls back (by exception or set_rollback), since the blob
+        rows pointing at them are gone. Files written in a nested block that
+        commits stay subject to the enclosing block's rollback.
+        """
+        stack = cls._local.__dict__.setdefault('written', [])
+        written = []
+        stack.append(written)
+        try:
+            with transaction.atomic():
+                yield
+                rolled_back = transaction.get_rollback()
+        except BaseException:
+            rolled_back = True
+            raise
+        finally:
+            stack.pop()
+            if rolled_back:
+                for relative_path in written:
+                    cls._remove_file(relative_path)
+            elif stack:
+                stack[-1].extend(written)
+
+    @classmethod
+    def _track_written(cls, relative_path):
+        stack = getattr(cls._local, 'written', None)
+        if stack:
+            stack[-1].append(relative_path)
+
+    @classmethod
+    def acquire(cls, blob):
+        """Add a reference to an existing blob"""
+        ContentBlob.objects.filter(pk=blob.pk).update(
+            ref_count=F('ref_count') + 1,
+            last_referenced_at=timezone.now()
+        )
+        blob.ref_count += 1
+        return blob
+
+    @classmethod
+    def get_or_create_blob(cls, store, digest, size, extension, content_factory, is_encrypted, virus_scanned,
+                           key_id=''):
+        """
+        Return (blob, created) for a digest, holding one new reference.
+
+        content_factory is only called on a miss and returns the bytes to
+        write to disk (e.g. the encrypted payload).
+        """
+        with cls.atomic():
+            blob = ContentBlob.objects.select_for_update().filter(store=store, digest=digest).first()
+            if blob is not None:
+                return cls.acquire(blob), False
+
+            relative_path = cls._blob_relative_path(store, digest, extension)
+            cls._write_file(relative_path, content_factory())
+            cls._track_written(relative_path)
+            try:
+                with transaction.atomic():
+                    blob = ContentBlob.objects.create(
+                        store=store,
+                        digest=digest,
+                        size=size,
+                        storage_path=relative_path,
+                        is_encrypted=is_encrypted,
+                        virus_scanned=virus_scanned,
+                        key_id=key_id,
+                        ref_count=1
+                    )
+                return blob, True
+            except IntegrityError:
+                # A concurrent upload of the same content won the insert
+                cls._remove_file(relative_path)
+                blob = ContentBlob.objects.select_for_update().get(store=store, digest=digest)
+                return cls.acquire(blob), False
+
+    @classmethod
+    def store_vault_upload(cls, uploaded_file, digest, size, virus_scanned=True):
+        """Store a secure vault upload encrypted with the blob's convergent key (current key id)"""
+        extension = os.path.splitext(uploaded_file.name)[1]
+        key_id = settings.VAULT_BLOB_KEY_ID
+
+        def encrypted_content():
+            uploaded_file.seek(0)
+            return encrypt_segmented(cls.get_blob_cipher(digest, key_id), uploaded_file.read())
+
+        return cls.get_or_create_blob(
+            'secure_vault', digest, size, extension, encrypted_content,
+            is_encrypted=True, virus_scanned=virus_scanned, key_id=key_id
+        )
+
+    @classmethod
+    def store_guideline_upload(cls, uploaded_file, digest, size):
+        """Store a clinical guideline file (served as-is via default storage)"""
+        extension = os.path.splitext(uploaded_file.name)[1]
+
+        def plain_content():
+            uploaded_file.seek(0)
+            return uploaded_file.read()
+
+        return cls.get_or_create_blob(
+            'guidelines', digest, size, extension, plain_content,
+            is_encrypted=False, virus_scanned=False
+        )
+
+    @classmethod
+    def release(cls, blob):
+        """
+        Drop one reference. The blob row and file are removed when the last
+        reference goes; the file is deleted only after the transaction commits.
+        """
+        with transaction.atomic():
+            locked = ContentBlob.objects.select_for_update().filter(pk=blob.pk).first()
+            if locked is None:
+                return
+            if locked.ref_count > 1:
+                ContentBlob.objects.filter(pk=locked.pk).update(ref_count=F('ref_count') - 1)
+                return
+
+            storage_path = locked.storage_path
+            locked.delete()
+            transaction.on_commit(lambda: cls._remove_file(storage_path))
+            logger.info(f"Released last reference to blob {locked.store}:{locked.digest[:12]}")
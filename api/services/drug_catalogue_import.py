@@ -0,0 +1,211 @@
+# api/services/drug_catalogue_import.py
+
+import json
+import logging
+import time
+
+from django.core.exceptions import ValidationError
+from django.db import connection, models, transaction
+
+from api.models import DrugClassification
+from api.services.grouped_stats import GroupedStatistics
+
+logger = logging.getLogger(__name__)
+
+
+class DrugCatalogueImporter:
+    """
+    💊 Set-based drug catalogue import.
+
+    Rows are validated in Python (DrugClassification.clean() plus field
+    coercion), streamed into a temporary staging table with PostgreSQL COPY,
+    diffed against drug_classifications in SQL and applied as one UPDATE, one
+    INSERT and (optionally) one deactivating UPDATE inside a single
+    transaction. A catalogue of tens of thousands of products costs a handful
+    of statements instead of a SELECT plus INSERT/UPDATE per row.
+
+    Rows are matched on generic_name. When the same drug appears more than
+    once across the sources, the last occurrence wins, as it did with the
+    per-row update_or_create import.
+    """
+
+    STAGING_TABLE = 'drug_import_staging'
+    MATCH_COLUMN = 'generic_name'
+    SKIP_FIELDS = {'id', 'created_at', 'updated_at'}
+
+    def __init__(self, deactivate_missing=False):
+        self.deactivate_missing = deactivate_missing
+        self.fields = [
+            field for field in DrugClassification._meta.concrete_fields
+            if field.name not in self.SKIP_FIELDS
+        ]
+        self.field_map = {field.name: field for field in self.fields}
+        self.rows = {}  # generic_name -> tuple of prepared values, in self.fields order
+        self.provided_fields = set()
+        self.failed = []
+        self.total_rows = 0
+
+    # ----- parsing & validation -----
+
+    def _prepare_value(self, field, value):
+        """Coerce a value the way the model field would, so COPY can't reject the batch"""
+        if isinstance(field, models.JSONField):
+            return json.dumps(value, ensure_ascii=False)
+        if value == '' and not isinstance(field, (models.CharField, models.TextField)):
+            value = None
+        if value is None:
+            if not field.null:
+                raise ValidationError({field.name: 'This field cannot be null.'})
+            return None
+        value = field.to_python(value)
+        if isinstance(value, str) and field.max_length and len(value) > field.max_length:
+            raise ValidationError({field.name: f'Ensure this value has at most {field.max_length} characters.'})
+        return value
+
+    def add_rows(self, rows, source=''):
+        """Validate parsed rows (dicts of field values) and queue them for import"""
+        for index, data in enumerate(rows, 1):
+            self.total_rows += 1
+            generic_name = (data.get(self.MATCH_COLUMN) or '').strip() if isinstance(data, dict) else ''
+            try:
+                if not generic_name:
+                    raise ValidationError({self.MATCH_COLUMN: 'This field is required.'})
+                unknown = set(data) - set(self.field_map) - self.SKIP_FIELDS
+                if unknown:
+                    raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+                data = {key: value for key, value in data.items() if key in self.field_map}
+                data[self.MATCH_COLUMN] = generic_name
+                drug = DrugClassification(**data)
+                drug.clean()
+
+                self.rows[generic_name] = tuple(
+                    self._prepare_value(field, getattr(drug, field.attname))
+                    for field in self.fields
+                )
+                self.provided_fields.update(data)
+            except (ValidationError, TypeError, ValueError) as e:
+                if isinstance(e, ValidationError) and hasattr(e, 'error_dict'):
+                    message = '; '.join(f"{field}: {', '.join(errors)}" for field, errors in e.message_dict.items())
+                elif isinstance(e, ValidationError):
+                    message = '; '.join(e.messages)
+                else:
+                    message = str(e)
+                self.failed.append({
+                    'source': source,
+                    'row': index,
+                    'generic_name': generic_name or 'Unknown',
+                    'error': message,
+                })
+
+    # ----- SQL pipeline -----
+
+    def _copy_into_staging(self, cursor, columns):
+        quoted = ', '.join(connection.ops.quote_name(column) for column in columns)
+        cursor.execute(f"DROP TABLE IF EXISTS {self.STAGING_TABLE}")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {self.STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {quoted} FROM {DrugClassification._meta.db_table} WITH NO DATA"
+        )
+        with cursor.cursor.copy(f"COPY {self.STAGING_TABLE} ({quoted}) FROM STDIN") as copy:
+            for values in self.rows.values():
+                copy.write_row(values)
+        cursor.execute(f"CREATE UNIQUE INDEX ON {self.STAGING_TABLE} ({connection.ops.quote_name(self.MATCH_COLUMN)})")
+        cursor.execute(f"ANALYZE {self.STAGING_TABLE}")
+
+    def _diff_and_apply(self, cursor, columns, update_columns):
+        qn = connection.ops.quote_name
+        table = DrugClassification._meta.db_table
+        staging = self.STAGING_TABLE
+        match = qn(self.MATCH_COLUMN)
+
+        # Row-level diff: which of the imported columns differ per existing drug
+        changed_expr = ', '.join(
+            f"CASE WHEN d.{qn(column)} IS DISTINCT FROM s.{qn(column)} THEN '{column}' END"
+            for column in update_columns
+        )
+        cursor.execute(
+            f"SELECT s.{match}, ARRAY_REMOVE(ARRAY[{changed_expr}]::text[], NULL) "
+            f"FROM {staging} s JOIN {table} d ON d.{match} = s.{match}"
+        )
+        matched = cursor.fetchall()
+        updated = sorted((name, changes) for name, changes in matched if changes)
+
+        if updated:
+            assignments = ', '.join(f"{qn(column)} = s.{qn(column)}" for column in update_columns)
+            distinct = ' OR '.join(f"d.{qn(column)} IS DISTINCT FROM s.{qn(column)}" for column in update_columns)
+            cursor.execute(
+                f"UPDATE {table} d SET {assignments}, updated_at = NOW() "
+                f"FROM {staging} s WHERE d.{match} = s.{match} AND ({distinct})"
+            )
+
+        quoted = ', '.join(qn(column) for column in columns)
+        cursor.execute(
+            f"INSERT INTO {table} (id, {quoted}, created_at, updated_at) "
+            f"SELECT gen_random_uuid(), {', '.join(f's.{qn(column)}' for column in columns)}, NOW(), NOW() "
+            f"FROM {staging} s WHERE NOT EXISTS (SELECT 1 FROM {table} d WHERE d.{match} = s.{match}) "
+            f"RETURNING {match}"
+        )
+        created = sorted(row[0] for row in cursor.fetchall())
+
+        deactivated = []
+        if self.deactivate_missing:
+            cursor.execute(
+                f"UPDATE {table} d SET is_active = FALSE, updated_at = NOW() "
+                f"WHERE d.is_active AND NOT EXISTS (SELECT 1 FROM {staging} s WHERE s.{match} = d.{match}) "
+                f"RETURNING d.{match}"
+            )
+            deactivated = sorted(row[0] for row in cursor.fetchall())
+
+        return {
+            'created': created,
+            'updated': updated,
+            'unchanged': len(matched) - len(updated),
+            'deactivated': deactivated,
+        }
+
+    def run(self, dry_run=False, clear=False):
+        """
+        Apply the queued rows in one transaction and return a change summary.
+
+        With dry_run the same statements run and the transaction is rolled
+        back, so the summary shows exactly what an import would change.
+        """
+        started = time.perf_counter()
+        columns = [field.column for field in self.fields]
+        update_columns = [
+            field.column for field in self.fields
+            if field.name in self.provided_fields and field.name != self.MATCH_COLUMN
+        ]
+        summary = {'created': [], 'updated': [], 'unchanged': 0, 'deactivated': [], 'cleared': 0}
+
+        with transaction.atomic():
+            if clear:
+                summary['cleared'] = DrugClassification.objects.count()
+                DrugClassification.objects.all().delete()
+
+            if self.rows:
+                with connection.cursor() as cursor:
+                    self._copy_into_staging(cursor, columns)
+                    summary.update(self._diff_and_apply(cursor, columns, update_columns))
+
+            if dry_run:
+                transaction.set_rollback(True)
+            else:
+                # COPY and raw SQL bypass the post_save signals that expire cached drug statistics
+                GroupedStatistics.invalidate_model(DrugClassification)
+
+        summary.update({
+            'failed': self.failed,
+            'total_rows': self.total_rows,
+            'unique_drugs': len(self.rows),
+            'elapsed': time.perf_counter() - started,
+            'dry_run': dry_run,
+        })
+        logger.info(
+            f"Drug catalogue import{' (dry run)' if dry_run else ''}: "
+            f"{len(summary['created'])} created, {len(summary['updated'])} updated, "
+            f"{summary['unchanged']} unchanged, {len(summary['deactivated'])} deactivated, "
+            f"{len(self.failed)} failed in {summary['elapsed']:.2f}s"
+        )
+        return summary
@@ -0,0 +1,231 @@
+# api/services/grouped_stats.py
+
+import hashlib
+import logging
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class GroupedStatistics:
+    """
+    📊 Declarative grouped statistics with cached, event-invalidated results.
+
+    A subclass declares its model, the columns to GROUP BY and additive
+    measures (Count / Sum, optionally with filter=Q(...)). compute() runs a
+    single
+
+        SELECT <group_by>, COUNT(*), COUNT(*) FILTER (...), SUM(...)
+        FROM <model> WHERE <filters> GROUP BY <group_by>
+
+    and every total and breakdown the endpoint needs is rolled up from
+    those rows in Python, instead of one COUNT query per bucket.
+
+    get() caches the built result under a per-model version. Saving or
+    deleting a row of the model bumps the version after commit (see
+    invalidate_grouped_statistics in api/models/signals.py), so readers
+    get a cache hit until the data actually changes. The timeout bounds
+    staleness from writes that bypass signals (queryset.update()).
+    """
+
+    name = None
+    model = None  # 'app_label.ModelName'
+    group_by = ()
+    measures = {}
+    timeout = 60 * 60
+
+    VERSION_KEY = 'grouped_stats:version:{label}'
+
+    # ----- computation -----
+
+    @classmethod
+    def get_model(cls):
+        return apps.get_model(cls.model)
+
+    @classmethod
+    def get_queryset(cls, **filters):
+        """Rows to aggregate; override to apply filters"""
+        return cls.get_model()._default_manager.all()
+
+    @classmethod
+    def compute_rows(cls, **filters):
+        """The single GROUP BY query; order_by() drops Meta.ordering from the grouping"""
+        return list(
+            cls.get_queryset(**filters).order_by().values(*cls.group_by).annotate(**cls.measures)
+        )
+
+    @staticmethod
+    def rollup(rows, field=None, measure='count'):
+        """Sum a measure over rows, per value of field (or overall when field is None)"""
+        if field is None:
+            return sum(row[measure] or 0 for row in rows)
+        totals = defaultdict(int)
+        for row in rows:
+            totals[row[field]] += row[measure] or 0
+        return dict(totals)
+
+    @staticmethod
+    def ranked(totals, field, limit=None, skip_empty=False):
+        """[{field: value, 'count': n}, ...] by descending count"""
+        items = [(value, count) for value, count in totals.items() if count and not (skip_empty and not value)]
+        items.sort(key=lambda item: (-item[1], str(item[0])))
+        return [{field: value, 'count': count} for value, count in items[:limit]]
+
+    @classmethod
+    def build(cls, rows, **filters):
+        """Turn the grouped rows into the response payload"""
+        raise NotImplementedError
+
+    @classmethod
+    def compute(cls, **filters):
+        return cls.build(cls.compute_rows(**filters), **filters)
+
+    # ----- caching -----
+
+    @classmethod
+    def version(cls):
+        key = cls.VERSION_KEY.format(label=cls.model.lower())
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def cache_key(cls, **filters):
+        filter_key = ','.join(
+            f'{name}={getattr(value, "pk", value)}' for name, value in sorted(filters.items()) if value is not None
+        )
+        digest = hashlib.md5(filter_key.encode()).hexdigest()[:12]
+        return f'grouped_stats:{cls.name}:{cls.version()}:{digest}'
+
+    @classmethod
+    def get(cls, **filters):
+        """Cached result; filters are model instances (keyed by pk) or values with a stable str()"""
+        key = cls.cache_key(**filters)
+        result = cache.get(key)
+        if result is None:
+            result = cls.compute(**filters)
+            result['last_updated'] = timezone.now().isoformat()
+            cache.set(key, result, cls.timeout)
+        return result
+
+    @classmethod
+    def invalidate_model(cls, model):
+        """Bump the model's version once the current transaction commits"""
+        key = cls.VERSION_KEY.format(label=model._meta.label.lower())
+        transaction.on_commit(lambda: cache.set(key, time.time_ns(), None))
+
+
+class RegistryStatistics(GroupedStatistics):
+    """Public professional registry counts (active licenses)"""
+
+    name = 'registry'
+    model = 'api.PHBProfessionalRegistry'
+    group_by = ('professional_type', 'state')
+    measures = {'count': Count('pk')}
+
+    @classmethod
+    def get_queryset(cls, **filters):
+        return super().get_queryset().filter(license_status='active')
+
+    @classmethod
+    def build(cls, rows, **filters):
+        by_type = cls.rollup(rows, 'professional_type')
+        by_state = cls.ranked(cls.rollup(rows, 'state'), 'state', limit=10, skip_empty=True)
+        return {
+            'total_active_professionals': cls.rollup(rows),
+            'by_type': {item['professional_type']: item['count'] for item in cls.ranked(by_type, 'professional_type')},
+            'by_state': {item['state']: item['count'] for item in by_state},
+        }
+
+
+class DrugStatistics(GroupedStatistics):
+    """Drug database composition (active drugs)"""
+
+    name = 'drugs'
+    model = 'api.DrugClassification'
+    group_by = ('nafdac_schedule', 'therapeutic_class')
+    measures = {
+        'count': Count('pk'),
+        'controlled': Count('pk', filter=Q(is_controlled=True)),
+        'high_risk': Count('pk', filter=Q(is_high_risk=True)),
+    }
+
+    @classmethod
+    def get_queryset(cls, **filters):
+        return super().get_queryset().filter(is_active=True)
+
+    @classmethod
+    def build(cls, rows, **filters):
+        total = cls.rollup(rows)
+        return {
+            'total_drugs': total,
+            'controlled_substances': cls.rollup(rows, measure='controlled'),
+            'high_risk_medications': cls.rollup(rows, measure='high_risk'),
+            'nafdac_compliant': total,  # All drugs in DB are NAFDAC compliant
+            'by_schedule': cls.ranked(cls.rollup(rows, 'nafdac_schedule'), 'nafdac_schedule'),
+            'top_therapeutic_classes': cls.ranked(
+                cls.rollup(rows, 'therapeutic_class'), 'therapeutic_class', limit=10, skip_empty=True
+            ),
+        }
+
+
+class TriageStatistics(GroupedStatistics):
+    """Prescription triage outcomes, optionally per hospital / pharmacist / date range"""
+
+    name = 'triage'
+    model = 'api.PrescriptionRequest'
+    group_by = ('triage_category', 'assigned_to_role', 'pharmacist_review_action')
+    measures = {
+        'count': Count('pk'),
+        'reviewed': Count('pk', filter=Q(pharmacist_reviewed_by__isnull=False)),
+        'interventions': Count('pk', filter=Q(had_clinical_intervention=True)),
+        'review_minutes': Sum('pharmacist_review_time_minutes'),
+        'timed_reviews': Count('pharmacist_review_time_minutes'),
+    }
+    timeout = 15 * 60
+
+    @classmethod
+    def get_queryset(cls, hospital=None, pharmacist=None, date_from=None, date_to=None):
+        requests = super().get_queryset()
+        if hospital:
+            requests = requests.filter(hospital=hospital)
+        if pharmacist:
+            requests = requests.filter(assigned_to_pharmacist=pharmacist)
+        if date_from:
+            requests = requests.filter(request_date__gte=date_from)
+        if date_to:
+            requests = requests.filter(request_date__lte=date_to)
+        return requests
+
+    @classmethod
+    def build(cls, rows, **filters):
+        reviewed = cls.rollup(rows, measure='reviewed')
+        escalated = cls.rollup(rows, 'pharmacist_review_action').get('escalated', 0)
+        interventions = cls.rollup(rows, measure='interventions')
+        timed_reviews = cls.rollup(rows, measure='timed_reviews')
+        average_review = cls.rollup(rows, measure='review_minutes') / timed_reviews if timed_reviews else 0.0
+        role_counts = cls.rollup(rows, 'assigned_to_role')
+
+        return {
+            'total_requests': cls.rollup(rows),
+            'category_distribution': cls.ranked(cls.rollup(rows, 'triage_category'), 'triage_category'),
+            'role_distribution': [{'assigned_to_role': role, 'count': count} for role, count in role_counts.items()],
+            'pharmacist_action_distribution': cls.ranked(
+                cls.rollup(rows, 'pharmacist_review_action', measure='reviewed'), 'pharmacist_review_action'
+            ),
+            'average_pharmacist_review_time_minutes': round(average_review, 2),
+            'total_pharmacist_reviewed': reviewed,
+            'escalation_count': escalated,
+            'escalation_rate_percent': round(escalated / reviewed * 100, 2) if reviewed else 0.0,
+            'clinical_intervention_count': interventions,
+            'clinical_intervention_rate_percent': round(interventions / reviewed * 100, 2) if reviewed else 0.0,
+        }
@@ -0,0 +1,288 @@
+# api/services/lab_reference_ranges.py
+
+import bisect
+import logging
+import re
+import threading
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# A resolved reference range: the raw JSON value plus its parsed numeric bounds
+ReferenceRange = namedtuple('ReferenceRange', ['value', 'low', 'high'])
+
+_NO_MATCH = object()
+
+RANGE_PATTERN = re.compile(r'^\s*(-?\d+(?:\.\d+)?)\s*(?:-|–|to)\s*(-?\d+(?:\.\d+)?)\s*$')
+BOUND_PATTERN = re.compile(r'^\s*(<=|>=|<|>|≤|≥)\s*(-?\d+(?:\.\d+)?)\s*$')
+
+
+def parse_range(value):
+    """
+    Numeric (low, high) bounds of a reference range value, None where open.
+
+    Accepts {'min': .., 'max': ..} (or low/high), [low, high] and strings
+    like "3.5-5.0", "< 200" or ">= 40"; anything else is (None, None).
+    """
+    if isinstance(value, dict):
+        low = value.get('min', value.get('low'))
+        high = value.get('max', value.get('high'))
+    elif isinstance(value, (list, tuple)) and len(value) == 2:
+        low, high = value
+    elif isinstance(value, str):
+        match = RANGE_PATTERN.match(value)
+        if match:
+            return float(match.group(1)), float(match.group(2))
+        match = BOUND_PATTERN.match(value)
+        if not match:
+            return None, None
+        bound = float(match.group(2))
+        return (None, bound) if match.group(1) in ('<', '<=', '≤') else (bound, None)
+    else:
+        return None, None
+
+    try:
+        return (float(low) if low is not None else None, float(high) if high is not None else None)
+    except (TypeError, ValueError):
+        return None, None
+
+
+def resolved(value):
+    if value is None:
+        return None
+    return ReferenceRange(value, *parse_range(value))
+
+
+class AgeBandTable:
+    """
+    A list of {'min_age', 'max_age', 'range'} bands compiled for bisect lookup.
+
+    Bands are inclusive and may overlap; the first band in list order wins,
+    as in the original linear scan. Compilation splits the age axis at every
+    band boundary into points and the open gaps between them, and stores the
+    winning band for each, so a lookup is one bisect instead of a scan.
+    """
+
+    def __init__(self, bands):
+        spans = []
+        for band in bands or []:
+            if not isinstance(band, dict):
+                continue
+            min_age = band.get('min_age')
+            max_age = band.get('max_age')
+            spans.append((
+                0 if min_age is None else min_age,
+                200 if max_age is None else max_age,
+                resolved(band.get('range')),
+            ))
+
+        self.points = sorted({bound for min_age, max_age, _ in spans for bound in (min_age, max_age)})
+        self.point_values = [self._first(spans, point, point) for point in self.points]
+        self.gap_values = [self._first(spans, low, high) for low, high in zip(self.points, self.points[1:])]
+
+    @staticmethod
+    def _first(spans, low, high):
+        """First band covering every age in [low, high] (a point or an open gap between points)"""
+        for min_age, max_age, value in spans:
+            if min_age <= low and high <= max_age:
+                return value
+        return _NO_MATCH
+
+    def find(self, age):
+        index = bisect.bisect_right(self.points, age) - 1
+        if index < 0:
+            return _NO_MATCH
+        if self.points[index] == age:
+            return self.point_values[index]
+        if index < len(self.gap_values):
+            return self.gap_values[index]
+        return _NO_MATCH
+
+
+class CompiledReferenceRanges:
+    """A test type's reference_ranges JSON, compiled once into per-sex band tables"""
+
+    STRUCTURE_KEYS = ('default', 'age_ranges')
+
+    def __init__(self, reference_ranges):
+        reference_ranges = reference_ranges or {}
+        self.empty = not reference_ranges
+        self.default = resolved(reference_ranges.get('default'))
+        self.age_bands = AgeBandTable(reference_ranges.get('age_ranges'))
+        self.by_gender = {}
+        for gender, spec in reference_ranges.items():
+            if gender in self.STRUCTURE_KEYS or not isinstance(spec, dict):
+                continue
+            self.by_gender[gender] = (
+                AgeBandTable(spec.get('age_ranges')),
+                'default' in spec,
+                resolved(spec.get('default')),
+            )
+
+    def resolve(self, age=None, gender=None):
+        """
+        ReferenceRange for a patient (or None): a sex-specific age band, then
+        the sex-specific default, then a general age band, then the default.
+        """
+        if self.empty:
+            return None
+
+        if gender and gender in self.by_gender:
+            bands, has_default, default = self.by_gender[gender]
+            if age is not None:
+                match = bands.find(age)
+                if match is not _NO_MATCH:
+                    return match
+            if has_default:
+                return default
+
+        if age is not None:
+            match = self.age_bands.find(age)
+            if match is not _NO_MATCH:
+                return match
+
+        return self.default
+
+    def lookup(self, age=None, gender=None):
+        """The raw reference range value, as stored in the JSON"""
+        reference_range = self.resolve(age, gender)
+        return reference_range.value if reference_range else None
+
+
+class LabReferenceRanges:
+    """
+    🧪 Compiled laboratory reference ranges and bulk result flagging.
+
+    LaboratoryTestType.reference_ranges is nested JSON (defaults, sex-specific
+    entries, age bands). It is compiled once per test type version into
+    CompiledReferenceRanges and kept in a process-wide table keyed by
+    (pk, updated_at), so resolving the range for thousands of results costs a
+    dict lookup and a bisect each rather than a walk of the JSON.
+    """
+
+    MAX_COMPILED = 1024
+
+    _compiled = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def compile(cls, reference_ranges):
+        return CompiledReferenceRanges(reference_ranges)
+
+    @classmethod
+    def for_test_type(cls, test_type):
+        """Compiled ranges for a test type; edits saved through the model get a new updated_at"""
+        if test_type.pk is None:
+            return cls.compile(test_type.reference_ranges)
+
+        key = (test_type.pk, test_type.updated_at)
+        compiled = cls._compiled.get(key)
+        if compiled is None:
+            compiled = cls.compile(test_type.reference_ranges)
+            with cls._lock:
+                if len(cls._compiled) >= cls.MAX_COMPILED:
+                    cls._compiled.clear()
+                cls._compiled[key] = compiled
+        return compiled
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._compiled.clear()
+
+    @staticmethod
+    def classify(value, low, high):
+        """'L', 'H' or None for a numeric value against (low, high); open bounds never flag"""
+        if value is None:
+            return None
+        if low is not None and value < low:
+            return 'L'
+        if high is not None and value > high:
+            return 'H'
+        return None
+
+    @staticmethod
+    def age_on(date_of_birth, when):
+        """Completed years at `when` (a date or datetime)"""
+        if date_of_birth is None or when is None:
+            return None
+        when = when.date() if hasattr(when, 'date') else when
+        return when.year - date_of_birth.year - ((when.month, when.day) < (date_of_birth.month, date_of_birth.day))
+
+    @classmethod
+    def flag_results(cls, results, age=None, gender=None, persist=False):
+        """
+        Classify many LaboratoryResults in one pass.
+
+        Each result keeps its recorded reference_range_min/max when both are
+        set; otherwise the test type's range for the patient is filled in.
+        The patient's age (at the test date) and sex come from
+        medical_record.user unless given. Critical ('C') flags set by the lab
+        are left alone. With persist=True the changed rows are written back in
+        one bulk_update. Returns the results, flagged in place.
+
+        Select test_type and medical_record__user with the results to avoid a
+        query per row.
+        """
+        results = list(results)
+        changed = []
+
+        for result in results:
+            if result.abnormal_flags == 'C':
+                continue
+
+            before = (
+                result.reference_range_min, result.reference_range_max, result.reference_range_text,
+                result.is_abnormal, result.abnormal_flags,
+            )
+
+            if result.reference_range_min is None or result.reference_range_max is None:
+                patient_age, patient_gender = age, gender
+                if patient_age is None or patient_gender is None:
+                    user = result.medical_record.user if result.medical_record_id else None
+                    if patient_age is None and user is not None:
+                        patient_age = cls.age_on(user.date_of_birth, result.test_date)
+                    if patient_gender is None and user is not None:
+                        patient_gender = user.gender
+                reference_range = cls.for_test_type(result.test_type).resolve(patient_age, patient_gender)
+                if reference_range is not None:
+                    if result.reference_range_min is None:
+                        result.reference_range_min = reference_range.low
+                    if result.reference_range_max is None:
+                        result.reference_range_max = reference_range.high
+                    if not result.reference_range_text and isinstance(reference_range.value, str):
+                        result.reference_range_text = reference_range.value
+
+            flag = cls.classify(result.numeric_value, result.reference_range_min, result.reference_range_max)
+            if result.numeric_value is not None and (
+                result.reference_range_min is not None or result.reference_range_max is not None
+            ):
+                result.is_abnormal = flag is not None
+                result.abnormal_flags = flag
+
+            after = (
+                result.reference_range_min, result.reference_range_max, result.reference_range_text,
+                result.is_abnormal, result.abnormal_flags,
+            )
+            if after != before:
+                changed.append(result)
+
+        if persist and changed:
+            from api.models.medical import LaboratoryResult
+            LaboratoryResult.objects.bulk_update(
+                changed,
+                ['reference_range_min', 'reference_range_max', 'reference_range_text', 'is_abnormal', 'abnormal_flags'],
+                batch_size=500,
+            )
+            logger.info(f"Re-flagged {len(changed)} laboratory results")
+
+        return results
+
+    @classmethod
+    def flag_history(cls, medical_record, persist=False):
+        """Every result in a patient's record, flagged (newest first), in one query"""
+        from api.models.medical import LaboratoryResult
+        results = LaboratoryResult.objects.filter(medical_record=medical_record).select_related(
+            'test_type', 'medical_record__user'
+        )
+        return cls.flag_results(results, persist=persist)
@@ -0,0 +1,405 @@
+# api/services/metrics.py
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricFamily:
+    """A named metric: 'counter', 'gauge' or 'histogram' (with bucket upper bounds)"""
+
+    def __init__(self, name, kind, help_text, buckets=None):
+        self.name = name
+        self.kind = kind
+        self.help = help_text
+        self.buckets = tuple(buckets) if buckets else None
+
+
+FAMILIES = {family.name: family for family in [
+    MetricFamily('http_request_duration_seconds', 'histogram',
+                 'Request latency by resolved route, method and status', LATENCY_BUCKETS),
+    MetricFamily('django_view_db_queries', 'histogram', 'SQL queries per request by view'),
+    MetricFamily('django_view_db_seconds', 'histogram', 'Database time per request by view'),
+    MetricFamily('analytics_cache_requests_total', 'counter', 'Analytics result cache reads by outcome'),
+    MetricFamily('analytics_cache_latency_seconds_total', 'counter', 'Analytics result cache read time by outcome'),
+    MetricFamily('analytics_cache_events_total', 'counter', 'Analytics result cache refreshes and recompute errors'),
+    MetricFamily('geoip_cache_lookups_total', 'counter', 'GeoIP lookups served from / missing the in-process cache'),
+    MetricFamily('websocket_connections', 'gauge', 'Open WebSocket connections by consumer'),
+    MetricFamily('websocket_connections_opened_total', 'counter', 'Accepted WebSocket connections by consumer'),
+    MetricFamily('redis_keyspace_hits_total', 'counter', 'Cache server key lookups that found a key'),
+    MetricFamily('redis_keyspace_misses_total', 'counter', 'Cache server key lookups that found nothing'),
+    MetricFamily('notification_queue_depth', 'gauge', 'Pending appointment notifications (due = ready to send now)'),
+    MetricFamily('payment_provider_requests_total', 'counter', 'Payment provider API calls by provider and operation'),
+    MetricFamily('payment_provider_errors_total', 'counter', 'Payment provider API calls that failed after retries'),
+    MetricFamily('payment_provider_retries_total', 'counter', 'Payment provider API call retries'),
+    MetricFamily('payment_provider_request_seconds_total', 'counter', 'Time spent in payment provider API calls'),
+]}
+
+
+def _series(name, labels, part):
+    """Sample key: (metric, ((label, value), ...), part) with part 'value', 'sum', 'count' or a bucket bound"""
+    return name, tuple(sorted(labels.items())), part
+
+
+class ProcessMetrics:
+    """
+    This process's metric values. Counters and histograms are totals since
+    the process started; histograms keep per-bucket (non-cumulative)
+    counts, made cumulative by samples().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+
+    def inc(self, name, labels, amount=1):
+        key = _series(name, labels, 'value')
+        with self._lock:
+            self._values[key] += amount
+
+    def observe(self, name, labels, value):
+        buckets = FAMILIES[name].buckets
+        bound = buckets[bisect_left(buckets, value)] if value <= buckets[-1] else '+Inf'
+        labels = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[(name, labels, bound)] += 1
+            self._values[(name, labels, 'sum')] += value
+            self._values[(name, labels, 'count')] += 1
+
+    def samples(self):
+        """{(metric, labels, part): value}, histogram buckets cumulative"""
+        with self._lock:
+            values = dict(self._values)
+        samples = {}
+        histograms = defaultdict(dict)
+        for (name, labels, part), value in values.items():
+            if FAMILIES[name].kind == 'histogram' and part not in ('sum', 'count'):
+                histograms[(name, labels)][part] = value
+            else:
+                samples[(name, labels, part)] = value
+        for (name, labels), counts in histograms.items():
+            running = 0
+            for bound in FAMILIES[name].buckets + ('+Inf',):
+                running += counts.get(bound, 0)
+                samples[(name, labels, bound)] = running
+        return samples
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class RedisMetricsStore:
+    """
+    Per-process snapshots in Redis, one hash per process (expiring unless
+    refreshed), summed across processes when scraped. Each gunicorn worker
+    publishes its own totals, so no worker ever sees another's deltas; a
+    worker that exits drops out once its hash expires.
+    """
+
+    KEY_PREFIX = 'metrics'
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self.registry_key = f"{self.KEY_PREFIX}:processes"
+
+    def process_key(self):
+        return f"{self.KEY_PREFIX}:process:{socket.gethostname()}:{os.getpid()}"
+
+    @staticmethod
+    def _field(key):
+        name, labels, part = key
+        return json.dumps([name, labels, part])
+
+    def publish(self, samples, ttl):
+        key = self.process_key()
+        pipe = self.client.pipeline(transaction=True)
+        if samples:
+            pipe.hset(key, mapping={self._field(sample): value for sample, value in samples.items()})
+        pipe.expire(key, ttl)
+        pipe.sadd(self.registry_key, key)
+        pipe.execute()
+
+    def aggregate(self):
+        """Samples summed over every live process"""
+        keys = [key.decode() for key in self.client.smembers(self.registry_key)]
+        pipe = self.client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        totals = defaultdict(float)
+        for key, values in zip(keys, pipe.execute()):
+            if not values:
+                self.client.srem(self.registry_key, key)  # Process gone and its hash expired
+                continue
+            for field, value in values.items():
+                name, labels, part = json.loads(field)
+                if name not in FAMILIES:
+                    continue  # Published by a different release
+                totals[(name, tuple(tuple(label) for label in labels), part)] += float(value)
+        return dict(totals)
+
+    def keyspace_stats(self):
+        info = self.client.info('stats')
+        return info.get('keyspace_hits', 0), info.get('keyspace_misses', 0)
+
+
+class MetricsService:
+    """
+    📈 Prometheus metrics: request latency, DB time, cache hit ratios,
+    WebSocket connections, payment provider calls and notification queue
+    depth.
+
+    Recording is in-process and lock-protected (a dict increment per
+    request). Every METRICS_PUBLISH_INTERVAL seconds a background thread
+    publishes this process's totals to Redis (when the cache is Redis);
+    /metrics publishes its own process, sums every live worker's snapshot
+    and adds the values read at scrape time (queue depth, Redis keyspace
+    hits). Without Redis it reports the serving process only.
+    """
+
+    _lock = threading.Lock()
+    _local = ProcessMetrics()
+    _store = None
+    _store_resolved = False
+    _publisher = None
+    _publisher_pid = None
+
+    # ----- recording -----
+
+    @classmethod
+    def observe_request(cls, method, route, status, seconds):
+        cls._local.observe('http_request_duration_seconds', {
+            'method': method, 'route': route, 'status': str(status)
+        }, seconds)
+        cls._ensure_publisher()
+
+    @classmethod
+    def websocket_opened(cls, consumer):
+        cls._local.inc('websocket_connections', {'consumer': consumer})
+        cls._local.inc('websocket_connections_opened_total', {'consumer': consumer})
+        cls._ensure_publisher()
+
+    @classmethod
+    def websocket_closed(cls, consumer):
+        cls._local.inc('websocket_connections', {'consumer': consumer}, -1)
+
+    # ----- collection -----
+
+    @classmethod
+    def process_samples(cls):
+        """This process's recorded values plus the in-process caches' counters"""
+        samples = cls._local.samples()
+
+        from api.middleware.query_budget import query_histograms
+        for view, stats in query_histograms.snapshot().items():
+            labels = (('view', view),)
+            for name, histogram in (('django_view_db_queries', stats['queries']),
+                                    ('django_view_db_seconds', stats['db_time'])):
+                for bound, count in histogram['buckets']:
+                    samples[(name, labels, bound)] = count
+                samples[(name, labels, 'sum')] = histogram['sum']
+                samples[(name, labels, 'count')] = stats['requests']
+
+        from api.agent_modules.analytics.result_cache import analytics_cache
+        counters = analytics_cache.counters()
+        for outcome, count in counters['requests'].items():
+            samples[('analytics_cache_requests_total', (('outcome', outcome),), 'value')] = count
+            samples[('analytics_cache_latency_seconds_total', (('outcome', outcome),), 'value')] = (
+                counters['latency'][outcome]
+            )
+        for event, count in counters['events'].items():
+            samples[('analytics_cache_events_total', (('event', event),), 'value')] = count
+
+        from api.utils.location_utils import geoip_resolver
+        geoip = geoip_resolver.cache_info()
+        samples[('geoip_cache_lookups_total', (('result', 'hit'),), 'value')] = geoip['hits']
+        samples[('geoip_cache_lookups_total', (('result', 'miss'),), 'value')] = geoip['misses']
+
+        # Totals only: percentiles cannot be summed across workers (rate of seconds / requests gives the mean)
+        from api.models.payment_providers.http_client import provider_metrics
+        for provider, operations in provider_metrics().items():
+            for operation, stats in operations.items():
+                labels = (('operation', operation), ('provider', provider))
+                samples[('payment_provider_requests_total', labels, 'value')] = stats['count']
+                samples[('payment_provider_errors_total', labels, 'value')] = stats['errors']
+                samples[('payment_provider_retries_total', labels, 'value')] = stats['retries']
+                samples[('payment_provider_request_seconds_total', labels, 'value')] = stats['total_ms'] / 1000
+        return samples
+
+    @classmethod
+    def scrape_samples(cls, store):
+        """Values read once per scrape rather than per process"""
+        from django.db.models import Count, Q
+        from django.utils import timezone
+        from api.models import AppointmentNotification
+
+        samples = {}
+        queue = AppointmentNotification.objects.filter(status='pending').aggregate(
+            due=Count('pk', filter=Q(scheduled_time__lte=timezone.now())),
+            total=Count('pk'),
+        )
+        samples[('notification_queue_depth', (('state', 'due'),), 'value')] = queue['due']
+        samples[('notification_queue_depth', (('state', 'scheduled'),), 'value')] = queue['total'] - queue['due']
+
+        if store is not None:
+            hits, misses = store.keyspace_stats()
+            samples[('redis_keyspace_hits_total', (), 'value')] = hits
+            samples[('redis_keyspace_misses_total', (), 'value')] = misses
+        return samples
+
+    @classmethod
+    def collect(cls):
+        """Samples from every worker (or this process only without Redis) plus the scrape-time values"""
+        store = cls._get_store()
+        samples = None
+        if store is not None:
+            try:
+                store.publish(cls.process_samples(), cls.publish_ttl())
+                samples = store.aggregate()
+            except Exception as e:
+                logger.warning(f"Metrics store unavailable, reporting this process only: {str(e)}")
+                store = None
+        if samples is None:
+            samples = cls.process_samples()
+        try:
+            samples.update(cls.scrape_samples(store))
+        except Exception as e:
+            logger.error(f"Scrape-time metrics failed: {str(e)}")
+        return samples
+
+    @classmethod
+    def render(cls, samples=None):
+        """Samples in the Prometheus text exposition format (0.0.4)"""
+        samples = cls.collect() if samples is None else samples
+        by_family = defaultdict(list)
+        for (name, labels, part), value in samples.items():
+            by_family[name].append((labels, part, value))
+
+        lines = []
+        for name, family in FAMILIES.items():
+            if name not in by_family:
+                continue
+            lines.append(f"# HELP {name} {family.help}")
+            lines.append(f"# TYPE {name} {family.kind}")
+            for labels, part, value in sorted(by_family[name], key=_sort_key):
+                if family.kind != 'histogram':
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                elif part in ('sum', 'count'):
+                    lines.append(f"{name}_{part}{_labels(labels)} {_number(value)}")
+                else:
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', _number(part)),))} {_number(value)}")
+        return '\n'.join(lines) + '\n'
+
+    # ----- publishing -----
+
+    @classmethod
+    def publish_interval(cls):
+        return getattr(settings, 'METRICS_PUBLISH_INTERVAL', 15)
+
+    @classmethod
+    def publish_ttl(cls):
+        return max(60, cls.publish_interval() * 4)
+
+    @classmethod
+    def _get_store(cls):
+        if not cls._store_resolved:
+            with cls._lock:
+                if not cls._store_resolved:
+                    cls._store = cls._create_store()
+                    cls._store_resolved = True
+        return cls._store
+
+    @classmethod
+    def _create_store(cls):
+        backend = getattr(settings, 'METRICS_BACKEND', 'auto')
+        cache_config = settings.CACHES.get('default', {})
+        location = cache_config.get('LOCATION')
+        if backend in ('auto', 'redis') and 'redis' in cache_config.get('BACKEND', '').lower():
+            if isinstance(location, (list, tuple)):
+                location = location[0]
+            return RedisMetricsStore(location)
+        return None
+
+    @classmethod
+    def _ensure_publisher(cls):
+        interval = cls.publish_interval()
+        if cls._publisher_pid == os.getpid() or not interval:
+            return
+        with cls._lock:
+            if cls._publisher_pid != os.getpid():
+                cls._publisher = threading.Thread(
+                    target=cls._publish_loop, args=(interval,), name='metrics-publisher', daemon=True
+                )
+                cls._publisher_pid = os.getpid()
+                cls._publisher.start()
+
+    @classmethod
+    def _publish_loop(cls, interval):
+        from django.db import connection
+        while True:
+            time.sleep(interval)
+            try:
+                store = cls._get_store()
+                if store is not None:
+                    store.publish(cls.process_samples(), cls.publish_ttl())
+            except Exception as e:
+                logger.warning(f"Metrics publish failed: {str(e)}")
+            finally:
+                connection.close()
+
+    @classmethod
+    def reset(cls):
+        """Forget this process's values and re-read the backend settings (tests)"""
+        with cls._lock:
+            cls._local.reset()
+            cls._store = None
+            cls._store_resolved = False
+
+
+def _sort_key(sample):
+    """Label set, then histogram buckets by bound (+Inf last), then sum / count / value"""
+    labels, part, _ = sample
+    if isinstance(part, (int, float)):
+        return labels, 0, part, ''
+    if part == '+Inf':
+        return labels, 0, float('inf'), ''
+    return labels, 1, 0, part
+
+
+def _number(value):
+    if isinstance(value, str):
+        return value
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _reset_after_fork():
+    # A forked worker starts its own totals (and publisher thread) under its own pid
+    MetricsService._local = ProcessMetrics()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,180 @@
+# api/services/payment_webhook_inbox.py
+
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from api.models import PaymentTransaction, PaymentWebhookEvent
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentWebhookInbox:
+    """
+    📥 Payment webhook inbox.
+
+    The webhook endpoint does only two things: verify the HMAC signature
+    over the raw body and INSERT the event with ON CONFLICT DO NOTHING on
+    (provider, event_id). It returns 200 in constant time, and a retried or
+    replayed delivery costs one no-op insert.
+
+    The process_payment_webhooks worker claims pending events with
+    FOR UPDATE SKIP LOCKED, so several workers can run side by side. Only
+    the oldest pending event per payment reference is claimable, which
+    keeps events for one transaction in arrival order (charge.failed then
+    charge.success is never applied the other way round).
+
+    A failing event is retried with exponential backoff (RETRY_BASE_DELAY
+    seconds, doubling per attempt, at most RETRY_MAX_DELAY) and marked
+    failed after MAX_ATTEMPTS. While it waits, later events for the same
+    reference wait with it.
+    """
+
+    MAX_ATTEMPTS = 5
+    RETRY_BASE_DELAY = 30
+    RETRY_MAX_DELAY = 60 * 60
+
+    # ----- ingestion (web request) -----
+
+    @classmethod
+    def event_id(cls, provider_id, payload, raw_body):
+        """Stable identifier for a delivery: event type + provider object id, else the body digest"""
+        data = payload.get('data') or {}
+        if payload.get('event') and data.get('id') is not None:
+            return f"{payload['event']}:{data['id']}"
+        return hashlib.sha256(raw_body).hexdigest()
+
+    @classmethod
+    def verify_signature(cls, provider_id, signature, raw_body):
+        from api.models.payment_providers import PROVIDER_MAPPING
+
+        provider_class = PROVIDER_MAPPING.get(provider_id)
+        if provider_class is None or not signature:
+            return False
+        try:
+            return provider_class(None).verify_webhook_signature(signature, raw_body.decode('utf-8'))
+        except (KeyError, TypeError, AttributeError, UnicodeDecodeError) as e:
+            logger.error(f"Could not verify {provider_id} webhook signature: {str(e)}")
+            return False
+
+    @classmethod
+    def record(cls, provider_id, payload, raw_body):
+        """
+        Store a verified event; returns (event_id, created).
+
+        created is False for a duplicate delivery.
+        """
+        event_id = cls.event_id(provider_id, payload, raw_body)
+        table = connection.ops.quote_name(PaymentWebhookEvent._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} "
+                f"(provider, event_id, event_type, reference, payload, status, attempts, last_error, received_at) "
+                f"VALUES (%s, %s, %s, %s, %s, 'pending', 0, '', %s) "
+                f"ON CONFLICT (provider, event_id) DO NOTHING RETURNING id",
+                [
+                    provider_id,
+                    event_id,
+                    str(payload.get('event', ''))[:100],
+                    str((payload.get('data') or {}).get('reference') or '')[:255],
+                    json.dumps(payload),
+                    timezone.now(),
+                ]
+            )
+            created = cursor.fetchone() is not None
+        if not created:
+            logger.info(f"Duplicate {provider_id} webhook {event_id} ignored")
+        return event_id, created
+
+    # ----- processing (worker) -----
+
+    @classmethod
+    def retry_delay(cls, attempts):
+        """Seconds to wait before the next try of an event that has failed `attempts` times"""
+        return min(cls.RETRY_MAX_DELAY, cls.RETRY_BASE_DELAY * 2 ** (attempts - 1))
+
+    @classmethod
+    def _claim(cls, batch_size):
+        """Lock up to batch_size processable events that are due (call inside a transaction)"""
+        table = connection.ops.quote_name(PaymentWebhookEvent._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT e.id FROM {table} e "
+                f"WHERE e.status = 'pending' AND (e.next_attempt_at IS NULL OR e.next_attempt_at <= %s) "
+                f"AND NOT EXISTS ("
+                f"  SELECT 1 FROM {table} earlier "
+                f"  WHERE earlier.reference = e.reference AND earlier.status = 'pending' AND earlier.id < e.id"
+                f") ORDER BY e.id LIMIT %s FOR UPDATE SKIP LOCKED",
+                [timezone.now(), batch_size]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        return list(PaymentWebhookEvent.objects.filter(id__in=ids).order_by('id'))
+
+    @classmethod
+    def _apply(cls, event):
+        """Apply one event; returns the final status"""
+        reference = event.reference
+        if not reference:
+            event.last_error = 'Missing payment reference'
+            return 'ignored'
+
+        try:
+            payment = PaymentTransaction.objects.select_for_update().get(provider_reference=reference)
+        except PaymentTransaction.DoesNotExist:
+            event.last_error = f'Payment not found for reference {reference}'
+            return 'ignored'
+
+        provider = payment.get_payment_provider()
+        if not provider:
+            event.last_error = f'Payment provider {payment.payment_provider} not found'
+            return 'ignored'
+
+        was_completed = payment.payment_status == 'completed'
+        provider.handle_webhook_event(event.payload)
+
+        payment.refresh_from_db()
+        if payment.payment_status == 'completed' and not was_completed:
+            def send_confirmation():
+                from api.utils.email import send_payment_confirmation_email
+                email_result = send_payment_confirmation_email(payment)
+                logger.info(f"Webhook payment confirmation email result: {email_result}")
+            transaction.on_commit(send_confirmation)
+        return 'processed'
+
+    @classmethod
+    def process_batch(cls, batch_size=50, max_attempts=None):
+        """Claim and apply one batch of events; returns counts per outcome"""
+        max_attempts = max_attempts or cls.MAX_ATTEMPTS
+        results = {'processed': 0, 'ignored': 0, 'retry': 0, 'failed': 0}
+
+        with transaction.atomic():
+            for event in cls._claim(batch_size):
+                event.attempts += 1
+                try:
+                    with transaction.atomic():
+                        event.status = cls._apply(event)
+                except Exception as e:
+                    logger.error(f"Webhook event {event.id} ({event.event_type} {event.reference}) failed: {str(e)}")
+                    event.last_error = str(e)
+                    # Stays pending (and keeps later events for this reference waiting) until it gives up
+                    event.status = 'failed' if event.attempts >= max_attempts else 'pending'
+
+                if event.status == 'pending':
+                    results['retry'] += 1
+                    event.next_attempt_at = timezone.now() + timedelta(seconds=cls.retry_delay(event.attempts))
+                else:
+                    results[event.status] += 1
+                    event.processed_at = timezone.now()
+                    if event.status == 'processed':
+                        event.last_error = ''
+                event.save(update_fields=['status', 'attempts', 'last_error', 'next_attempt_at', 'processed_at'])
+
+        return results
+
+    @classmethod
+    def pending_count(cls):
+        return PaymentWebhookEvent.objects.filter(status='pending').count()
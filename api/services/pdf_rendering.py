@@ -0,0 +1,267 @@
+# api/services/pdf_rendering.py
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+logger = logging.getLogger(__name__)
+
+
+class PDFRenderError(Exception):
+    """Raised when a document could not be rendered to PDF"""
+
+
+class PDFRenderQueueFull(PDFRenderError):
+    """Raised when every render slot is taken and none freed up in time"""
+
+
+# ---------------------------------------------------------------------------
+# Worker side: runs inside the pool processes
+# ---------------------------------------------------------------------------
+
+# Per-process WeasyPrint state, reused across renders so fonts and parsed
+# stylesheets are only loaded once per worker
+_worker_state = {}
+
+
+def _get_worker_state():
+    if not _worker_state:
+        import weasyprint
+        from weasyprint.text.fonts import FontConfiguration
+
+        _worker_state.update({
+            'weasyprint': weasyprint,
+            'font_config': FontConfiguration(),
+            'stylesheets': {},
+            'image_cache': {},
+        })
+    return _worker_state
+
+
+def _get_stylesheet(state, css):
+    key = hashlib.sha256(css.encode('utf-8')).hexdigest()
+    stylesheet = state['stylesheets'].get(key)
+    if stylesheet is None:
+        stylesheet = state['weasyprint'].CSS(string=css, font_config=state['font_config'])
+        state['stylesheets'][key] = stylesheet
+    return stylesheet
+
+
+def render_html_to_pdf(html, stylesheets=(), base_url=None):
+    """Render an HTML string to PDF bytes with WeasyPrint (in the calling process)"""
+    state = _get_worker_state()
+    document = state['weasyprint'].HTML(string=html, base_url=base_url)
+    return document.write_pdf(
+        stylesheets=[_get_stylesheet(state, css) for css in stylesheets],
+        font_config=state['font_config'],
+        cache=state['image_cache'],
+    )
+
+
+def _warm_worker(stylesheets):
+    """Pool initializer: load WeasyPrint, fontconfig and shared CSS before the first job"""
+    try:
+        render_html_to_pdf('<html><body><p>warm-up</p></body></html>', stylesheets)
+    except Exception as e:
+        # The job itself will report the error; don't kill the worker here
+        logger.warning(f"PDF worker warm-up failed: {str(e)}")
+
+
+# ---------------------------------------------------------------------------
+# Web side
+# ---------------------------------------------------------------------------
+
+class PDFRenderingService:
+    """
+    📄 Off-request PDF rendering.
+
+    HTML→PDF layout runs in a pool of pre-started worker processes with
+    WeasyPrint, fonts and shared stylesheets already loaded, so the web
+    worker only waits on a future instead of doing the layout under its own
+    GIL. At most PDF_RENDER_QUEUE_SIZE renders may be in flight; beyond that
+    callers get PDFRenderQueueFull instead of piling up memory.
+
+    Results are cached on disk, keyed by (template name, SHA-256 of the
+    rendered HTML), so repeat requests for the same certificate or report
+    are read from disk without touching the pool.
+    """
+
+    _lock = threading.Lock()
+    _executor = None
+    _executor_pid = None
+    _slots = None
+
+    @classmethod
+    def _setting(cls, name, default):
+        return getattr(settings, name, default)
+
+    # ----- cache -----
+
+    @classmethod
+    def cache_key(cls, template_name, html, stylesheets=()):
+        """(template, content hash) cache key for a rendered document"""
+        digest = hashlib.sha256(html.encode('utf-8'))
+        for css in stylesheets:
+            digest.update(b'\0' + css.encode('utf-8'))
+        return template_name, digest.hexdigest()
+
+    @classmethod
+    def _cache_path(cls, key):
+        template_name, digest = key
+        safe_template = template_name.replace('/', '_').replace('\\', '_')
+        return os.path.join(cls._setting('PDF_RENDER_CACHE_DIR', ''), safe_template, digest[:2], f"{digest}.pdf")
+
+    @classmethod
+    def _read_cache(cls, key):
+        if not cls._setting('PDF_RENDER_CACHE_DIR', ''):
+            return None
+        path = cls._cache_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > cls._setting('PDF_RENDER_CACHE_TTL', 30 * 24 * 3600):
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @classmethod
+    def _write_cache(cls, key, pdf_bytes):
+        if not cls._setting('PDF_RENDER_CACHE_DIR', ''):
+            return
+        path = cls._cache_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(pdf_bytes)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not cache rendered PDF {key[0]}:{key[1][:12]}: {str(e)}")
+
+    @classmethod
+    def prune_cache(cls, max_age=None):
+        """Delete cached PDFs older than max_age seconds (defaults to the cache TTL)"""
+        cache_dir = cls._setting('PDF_RENDER_CACHE_DIR', '')
+        if not cache_dir or not os.path.isdir(cache_dir):
+            return 0
+        max_age = cls._setting('PDF_RENDER_CACHE_TTL', 30 * 24 * 3600) if max_age is None else max_age
+        cutoff = time.time() - max_age
+        removed = 0
+        for root, _, files in os.walk(cache_dir):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    # ----- pool -----
+
+    @classmethod
+    def _get_executor(cls):
+        """Pool for this process; rebuilt after a fork (e.g. Gunicorn preload) or a crash"""
+        with cls._lock:
+            if cls._executor is None or cls._executor_pid != os.getpid():
+                workers = cls._setting('PDF_RENDER_WORKERS', 2)
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    # spawn, not fork: web workers run threads/event loops
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_worker,
+                    initargs=(tuple(cls._setting('PDF_RENDER_SHARED_STYLESHEETS', ())),),
+                )
+                cls._executor_pid = os.getpid()
+                cls._slots = threading.BoundedSemaphore(cls._setting('PDF_RENDER_QUEUE_SIZE', 8))
+            return cls._executor, cls._slots
+
+    @classmethod
+    def _reset_executor(cls, executor):
+        with cls._lock:
+            if cls._executor is executor:
+                cls._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the worker pool (it is started again on the next render)"""
+        with cls._lock:
+            executor, cls._executor = cls._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @classmethod
+    def _render_in_pool(cls, html, stylesheets, base_url):
+        executor, slots = cls._get_executor()
+        if not slots.acquire(timeout=cls._setting('PDF_RENDER_QUEUE_TIMEOUT', 5)):
+            raise PDFRenderQueueFull("PDF rendering queue is full")
+        try:
+            try:
+                future = executor.submit(render_html_to_pdf, html, tuple(stylesheets), base_url)
+            except BaseException:
+                slots.release()
+                raise
+            # The slot is held until the render really ends: a timed-out render
+            # that already started keeps its worker busy, and cancel() cannot stop it
+            future.add_done_callback(lambda _: slots.release())
+            try:
+                return future.result(timeout=cls._setting('PDF_RENDER_TIMEOUT', 60))
+            except FutureTimeoutError:
+                future.cancel()
+                raise PDFRenderError("PDF rendering timed out")
+        except BrokenProcessPool as e:
+            cls._reset_executor(executor)
+            raise PDFRenderError(f"PDF worker pool crashed: {str(e)}")
+        except PDFRenderError:
+            raise
+        except Exception as e:
+            raise PDFRenderError(str(e))
+
+    # ----- public API -----
+
+    @classmethod
+    def render_html(cls, template_name, html, stylesheets=(), base_url=None):
+        """
+        Render HTML to PDF bytes, serving repeats from the disk cache.
+
+        template_name namespaces the cache (e.g. 'hospital_certificate');
+        the HTML already reflects the template context, so its hash stands
+        in for the context hash. Raises PDFRenderError on failure.
+        """
+        key = cls.cache_key(template_name, html, stylesheets)
+        cached = cls._read_cache(key)
+        if cached is not None:
+            logger.debug(f"PDF cache hit for {template_name}:{key[1][:12]}")
+            return cached
+
+        started = time.perf_counter()
+        if cls._setting('PDF_RENDER_WORKERS', 2) > 0:
+            pdf_bytes = cls._render_in_pool(html, stylesheets, base_url)
+        else:
+            try:
+                pdf_bytes = render_html_to_pdf(html, tuple(stylesheets), base_url)
+            except Exception as e:
+                raise PDFRenderError(str(e))
+
+        logger.info(
+            f"Rendered {template_name} PDF ({len(pdf_bytes)} bytes) "
+            f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+        cls._write_cache(key, pdf_bytes)
+        return pdf_bytes
+
+    @classmethod
+    def render_template(cls, template_name, context, stylesheets=(), base_url=None):
+        """Render a Django template with context, then to PDF (cached per template + content)"""
+        html = render_to_string(template_name, context)
+        return cls.render_html(template_name, html, stylesheets=stylesheets, base_url=base_url)
@@ -0,0 +1,227 @@
+# api/services/professional_search.py
+
+import base64
+import bisect
+import html
+import json
+import logging
+import re
+
+from django.contrib.postgres.search import SearchQuery, TrigramStrictWordSimilarity
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import FloatField, Q
+from django.db.models.functions import Cast
+
+from api.models import PHBProfessionalRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidCursor(ValueError):
+    """Raised for a pagination cursor that cannot be decoded"""
+
+
+class ProfessionalRegistrySearch:
+    """
+    🔎 Indexed search over the public professional registry.
+
+    Every search column is precomputed on the row by the
+    phb_registry_search_update trigger (migration 0056):
+
+    - search_name: lower-cased, whitespace-collapsed "first last", covered by
+      a pg_trgm GIN index, so substring and typo-tolerant name matches
+      ("adeyem", "adeyemy") are index scans instead of icontains table scans;
+    - search_vector: weighted tsvector of specialization (A), professional
+      type and areas of interest (B) and city/state (C), covered by a GIN
+      index for prefix full-text matches.
+
+    Both indexes, and the btree on the listing order, are partial on the
+    public filter (active and searchable), so they only hold rows a search
+    can return.
+
+    A free-text query is answered in two stages: name matches ranked by
+    whole-word trigram similarity, then keyword (specialization / location) matches
+    in listing order. Keyword hits can be a large share of the registry
+    ("cardio"), so they are walked along the listing index instead of being
+    ranked and sorted as a whole. Query words are first checked against the
+    cached keyword vocabulary: a name like "okeadeola" matches no keyword,
+    and walking the listing index for a match that never comes would scan
+    the whole registry. Pages are fetched with a keyset cursor (stage + last
+    sort key), so page 50 costs the same as page 1.
+    """
+
+    PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+    LICENSE_PREFIX = 'PHB-'
+    VOCABULARY_CACHE_KEY = 'registry_search:keyword_vocabulary'
+    VOCABULARY_TIMEOUT = 15 * 60  # New specializations/locations become keyword-searchable within this
+
+    # Orderings as (field, descending) pairs; the last field must be unique
+    RANKED_ORDERING = (('rank', True), ('id', False))
+    LISTING_ORDERING = (
+        ('license_issue_date', True), ('last_name', False), ('first_name', False), ('id', False),
+    )
+
+    @staticmethod
+    def normalize(value):
+        """Python twin of the phb_registry_normalize() SQL function"""
+        return re.sub(r'\s+', ' ', html.unescape(value or '').strip()).lower()
+
+    @classmethod
+    def prefix_tsquery(cls, value, weights=''):
+        """Raw tsquery matching every word as a prefix, e.g. 'clin:*A & pharm:*A'"""
+        words = re.findall(r'[a-z0-9]+', cls.normalize(value))
+        return ' & '.join(f'{word}:*{weights}' for word in words)
+
+    @classmethod
+    def keyword_vocabulary(cls):
+        """Sorted lexemes present in searchable rows' search_vector (cached)"""
+        vocabulary = cache.get(cls.VOCABULARY_CACHE_KEY)
+        if vocabulary is None:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT word FROM ts_stat("
+                    "'SELECT search_vector FROM phb_professional_registry "
+                    "WHERE license_status = ''active'' AND is_searchable')"
+                )
+                vocabulary = sorted(row[0] for row in cursor.fetchall())
+            cache.set(cls.VOCABULARY_CACHE_KEY, vocabulary, cls.VOCABULARY_TIMEOUT)
+        return vocabulary
+
+    @classmethod
+    def clear_keyword_vocabulary(cls):
+        cache.delete(cls.VOCABULARY_CACHE_KEY)
+
+    @classmethod
+    def matches_keywords(cls, value):
+        """True if every word of value is a prefix of some indexed keyword"""
+        words = re.findall(r'[a-z0-9]+', cls.normalize(value))
+        if not words:
+            return False
+        vocabulary = cls.keyword_vocabulary()
+        for word in words:
+            index = bisect.bisect_left(vocabulary, word)
+            if index == len(vocabulary) or not vocabulary[index].startswith(word):
+                return False
+        return True
+
+    @classmethod
+    def base_queryset(cls):
+        return PHBProfessionalRegistry.objects.filter(license_status='active', is_searchable=True)
+
+    @staticmethod
+    def ordered(queryset, ordering):
+        return queryset.order_by(*[f"-{field}" if descending else field for field, descending in ordering])
+
+    @classmethod
+    def build_stages(cls, query='', professional_type=None, specialization='', state=None):
+        """
+        The search as an ordered list of (stage, queryset, ordering).
+        """
+        professionals = cls.base_queryset()
+
+        if professional_type:
+            professionals = professionals.filter(professional_type=professional_type)
+        if state:
+            professionals = professionals.filter(state=state)
+        if specialization:
+            specialization_query = cls.prefix_tsquery(specialization, weights='A')
+            if specialization_query:
+                professionals = professionals.filter(
+                    search_vector=SearchQuery(specialization_query, config='simple', search_type='raw')
+                )
+
+        query = cls.normalize(query)
+        if query.upper().startswith(cls.LICENSE_PREFIX):
+            # License numbers are stored upper-case; exact match uses the unique index
+            return [('license', professionals.filter(phb_license_number=query.upper()), cls.LISTING_ORDERING)]
+        if not query:
+            return [('list', cls.ordered(professionals, cls.LISTING_ORDERING), cls.LISTING_ORDERING)]
+
+        name_match = Q(search_name__contains=query) | Q(search_name__trigram_word_similar=query)
+        # Ranked on whole words ("adeyemi" scores "Kemi Adeyemo" below "Tunde Adeyemi");
+        # strict_word_similarity() is a float4, as float8 the cursor's rank round-trips exactly
+        rank = Cast(TrigramStrictWordSimilarity(query, 'search_name'), FloatField())
+        names = professionals.filter(name_match).annotate(rank=rank)
+        stages = [('name', cls.ordered(names, cls.RANKED_ORDERING), cls.RANKED_ORDERING)]
+
+        if cls.matches_keywords(query):
+            keywords = professionals.filter(
+                search_vector=SearchQuery(cls.prefix_tsquery(query), config='simple', search_type='raw')
+            ).exclude(name_match)
+            stages.append(('keyword', cls.ordered(keywords, cls.LISTING_ORDERING), cls.LISTING_ORDERING))
+        return stages
+
+    # ----- keyset pagination -----
+
+    @staticmethod
+    def encode_cursor(stage, values):
+        payload = json.dumps([stage, *values], default=str, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """Returns (stage, values)"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            decoded = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (ValueError, TypeError) as e:
+            raise InvalidCursor(f'Invalid cursor: {str(e)}')
+        if not isinstance(decoded, list) or not decoded or not isinstance(decoded[0], str):
+            raise InvalidCursor('Invalid cursor')
+        return decoded[0], decoded[1:]
+
+    @staticmethod
+    def keyset_filter(ordering, values):
+        """
+        Q selecting rows strictly after `values` in `ordering`:
+        (a > x) OR (a = x AND b > y) OR ... with > flipped for descending fields.
+
+        The leading a >= x bound is redundant but gives the planner an index
+        condition for the first sort column.
+        """
+        first_field, first_descending = ordering[0]
+        condition = Q()
+        for index, (field, descending) in enumerate(ordering):
+            step = Q(**{f"{field}__{'lt' if descending else 'gt'}": values[index]})
+            for previous_index, (previous_field, _) in enumerate(ordering[:index]):
+                step &= Q(**{previous_field: values[previous_index]})
+            condition |= step
+        return Q(**{f"{first_field}__{'lte' if first_descending else 'gte'}": values[0]}) & condition
+
+    @classmethod
+    def search(cls, query='', professional_type=None, specialization='', state=None,
+               cursor=None, page_size=None):
+        """
+        One page of results; returns {'results': [...], 'next_cursor': str|None}.
+
+        Raises InvalidCursor for a malformed cursor or one from another search.
+        """
+        page_size = max(1, min(int(page_size or cls.PAGE_SIZE), cls.MAX_PAGE_SIZE))
+        stages = cls.build_stages(query, professional_type, specialization, state)
+
+        if cursor:
+            stage, after = cls.decode_cursor(cursor)
+            names = [name for name, _, _ in stages]
+            if stage not in names:
+                raise InvalidCursor('Cursor does not match this search')
+            stages = stages[names.index(stage):]
+            if len(after) != len(stages[0][2]):
+                raise InvalidCursor('Cursor does not match this search')
+            name, queryset, ordering = stages[0]
+            stages[0] = (name, queryset.filter(cls.keyset_filter(ordering, after)), ordering)
+
+        # Fetch one row past the page to know whether there is a next page
+        rows = []
+        for name, queryset, ordering in stages:
+            rows.extend((name, ordering, row) for row in queryset[:page_size + 1 - len(rows)])
+            if len(rows) > page_size:
+                break
+
+        next_cursor = None
+        if len(rows) > page_size:
+            name, ordering, last = rows[page_size - 1]
+            next_cursor = cls.encode_cursor(name, [getattr(last, field) for field, _ in ordering])
+
+        return {'results': [row for _, _, row in rows[:page_size]], 'next_cursor': next_cursor}
@@ -0,0 +1,321 @@
+# api/services/vital_sign_ingestion.py
+
+import logging
+from decimal import Decimal
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from api.utils.lazy_imports import lazy_import
+
+# numpy is only needed once readings are ingested, not while a worker boots
+np = lazy_import('numpy')
+
+logger = logging.getLogger(__name__)
+
+# Sent once per patient, after commit, when a batch contains abnormal readings.
+# kwargs: medical_record_id, vital_sign_ids, latest (the newest abnormal VitalSign)
+abnormal_vitals_recorded = Signal()
+
+
+class VitalSignIngestion:
+    """
+    📈 Bulk vital-sign ingestion for ward devices and charting sessions.
+
+    VitalSign.save() computes BMI and runs _check_abnormal_values() in Python
+    for one row and issues one INSERT. A batch instead goes through here:
+
+    - readings are turned into one numpy column per measurement (NaN where
+      missing), and the model's min/max validators, BMI and every abnormal
+      threshold are evaluated as array comparisons over the whole batch;
+    - patients are resolved by HPN in one query and the valid rows are
+      written with a single bulk_create;
+    - abnormal readings produce one abnormal_vitals_recorded signal per
+      patient after commit, not one per reading.
+
+    Invalid readings are reported by index and skipped; the rest of the batch
+    is still stored.
+    """
+
+    MAX_BATCH = 1000
+
+    INTEGER_FIELDS = ('systolic_bp', 'diastolic_bp', 'heart_rate', 'respiratory_rate', 'pain_scale')
+    DECIMAL_FIELDS = ('oxygen_saturation', 'temperature', 'weight', 'height', 'blood_glucose')
+    CHOICE_FIELDS = ('temperature_unit', 'weight_unit', 'height_unit', 'glucose_unit', 'glucose_timing')
+    TEXT_FIELDS = ('location', 'context', 'notes')
+
+    _field_rules = None
+
+    @classmethod
+    def field_rules(cls):
+        """Bounds, decimal precision and choices, read once from the VitalSign field definitions"""
+        if cls._field_rules is None:
+            from api.models.medical import VitalSign
+
+            rules = {}
+            for name in cls.INTEGER_FIELDS + cls.DECIMAL_FIELDS:
+                field = VitalSign._meta.get_field(name)
+                low = high = None
+                for validator in field.validators:
+                    if isinstance(validator, MinValueValidator):
+                        low = float(validator.limit_value)
+                    elif isinstance(validator, MaxValueValidator):
+                        high = float(validator.limit_value)
+                if name in cls.DECIMAL_FIELDS:
+                    # Largest value the column can hold
+                    limit = 10.0 ** (field.max_digits - field.decimal_places)
+                    high = min(high, limit) if high is not None else limit
+                rules[name] = {
+                    'low': low,
+                    'high': high,
+                    'decimal_places': getattr(field, 'decimal_places', None),
+                }
+            for name in cls.CHOICE_FIELDS:
+                field = VitalSign._meta.get_field(name)
+                rules[name] = {'choices': {value for value, _ in field.choices}, 'default': field.get_default()}
+            for name in cls.TEXT_FIELDS:
+                rules[name] = {'max_length': VitalSign._meta.get_field(name).max_length}
+            cls._field_rules = rules
+        return cls._field_rules
+
+    # ----- columns -----
+
+    @staticmethod
+    def numeric_column(values, errors, name):
+        """float64 array, NaN for missing values; unparseable entries are recorded in errors"""
+        column = np.full(len(values), np.nan)
+        for index, value in enumerate(values):
+            if value is None or value == '':
+                continue
+            try:
+                column[index] = float(value)
+            except (TypeError, ValueError):
+                errors.setdefault(index, {})[name] = 'A number is required.'
+        return column
+
+    @classmethod
+    def build_columns(cls, readings):
+        """(columns, errors) for a list of reading dicts; errors maps index -> {field: message}"""
+        rules = cls.field_rules()
+        errors = {}
+        columns = {}
+
+        for name in cls.INTEGER_FIELDS + cls.DECIMAL_FIELDS:
+            values = [reading.get(name) for reading in readings]
+            column = cls.numeric_column(values, errors, name)
+            rule = rules[name]
+
+            present = ~np.isnan(column)
+            out_of_range = np.zeros(len(column), dtype=bool)
+            if rule['low'] is not None:
+                out_of_range |= present & (column < rule['low'])
+            if rule['high'] is not None:
+                out_of_range |= present & (column > rule['high'])
+            if name in cls.INTEGER_FIELDS:
+                out_of_range |= present & (np.mod(column, 1) != 0)
+            else:
+                # Rounded to the column's scale, as the DecimalField stores it
+                column = np.round(column, rule['decimal_places'])
+            for index in np.flatnonzero(out_of_range):
+                errors.setdefault(int(index), {})[name] = (
+                    f"Must be {'a whole number ' if name in cls.INTEGER_FIELDS else ''}"
+                    f"between {rule['low']:g} and {rule['high']:g}."
+                    if rule['low'] is not None else f"Must be at most {rule['high']:g}."
+                )
+            columns[name] = column
+
+        for name in cls.CHOICE_FIELDS:
+            rule = rules[name]
+            column = []
+            for index, reading in enumerate(readings):
+                value = reading.get(name) or rule['default'] or None
+                if value is not None and value not in rule['choices']:
+                    errors.setdefault(index, {})[name] = f'"{value}" is not a valid choice.'
+                column.append(value)
+            columns[name] = np.array(column, dtype=object)
+
+        recorded_at = []
+        for index, reading in enumerate(readings):
+            value = reading.get('recorded_at')
+            parsed = None
+            if isinstance(value, str):
+                try:
+                    parsed = parse_datetime(value)
+                except ValueError:
+                    parsed = None
+            elif hasattr(value, 'tzinfo'):
+                parsed = value
+            if parsed is None:
+                errors.setdefault(index, {})['recorded_at'] = 'A valid ISO 8601 datetime is required.'
+            elif timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed)
+            recorded_at.append(parsed)
+        columns['recorded_at'] = recorded_at
+
+        for name in cls.TEXT_FIELDS:
+            max_length = rules[name]['max_length']
+            column = []
+            for index, reading in enumerate(readings):
+                value = reading.get(name)
+                value = str(value) if value not in (None, '') else None
+                if value and max_length and len(value) > max_length:
+                    errors.setdefault(index, {})[name] = f'Ensure this field has no more than {max_length} characters.'
+                column.append(value)
+            columns[name] = column
+
+        return columns, errors
+
+    # ----- derived values -----
+
+    @staticmethod
+    def present(column):
+        """Mask of values the scalar checks treat as given (not missing and not zero)"""
+        return ~np.isnan(column) & (column != 0)
+
+    @classmethod
+    def compute_bmi(cls, columns):
+        """BMI per reading (NaN where height or weight is missing), as VitalSign.save() computes it"""
+        height, weight = columns['height'], columns['weight']
+        height_m = np.where(columns['height_unit'] == 'cm', height / 100, height * 0.0254)
+        weight_kg = np.where(columns['weight_unit'] == 'kg', weight, weight * 0.453592)
+        usable = cls.present(height) & cls.present(weight) & (height_m > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bmi = np.round(weight_kg / (height_m * height_m), 2)
+        return np.where(usable, bmi, np.nan)
+
+    @classmethod
+    def abnormal_mask(cls, columns):
+        """Vectorized VitalSign._check_abnormal_values() over the whole batch"""
+        def outside(name, low=None, high=None):
+            column = columns[name]
+            with np.errstate(invalid='ignore'):
+                mask = np.zeros(len(column), dtype=bool)
+                if low is not None:
+                    mask |= column < low
+                if high is not None:
+                    mask |= column > high
+            return cls.present(column) & mask
+
+        abnormal = (
+            outside('systolic_bp', 90, 140)
+            | outside('diastolic_bp', 60, 90)
+            | outside('heart_rate', 60, 100)
+            | outside('respiratory_rate', 12, 20)
+            | outside('oxygen_saturation', low=95)
+        )
+
+        temperature_unit = columns['temperature_unit']
+        abnormal |= (temperature_unit == 'C') & outside('temperature', 36.1, 37.8)
+        abnormal |= (temperature_unit == 'F') & outside('temperature', 97, 100)
+
+        glucose_unit = columns['glucose_unit']
+        timing = columns['glucose_timing']
+        fasting = timing == 'fasting'
+        after_meal = np.array([bool(value) for value in timing], dtype=bool) & ~fasting
+        abnormal |= (glucose_unit == 'mg/dL') & (
+            (fasting & outside('blood_glucose', 70, 100)) | (after_meal & outside('blood_glucose', high=140))
+        )
+        abnormal |= (glucose_unit == 'mmol/L') & (
+            (fasting & outside('blood_glucose', 3.9, 5.6)) | (after_meal & outside('blood_glucose', high=7.8))
+        )
+        return abnormal
+
+    # ----- ingestion -----
+
+    @classmethod
+    def ingest(cls, readings, recorded_by=None, medical_records=None):
+        """
+        Validate, flag and store a batch of readings.
+
+        Each reading is a dict of VitalSign fields plus the patient's 'hpn'.
+        medical_records optionally restricts which records may be written to
+        (e.g. the recorder's hospital); an HPN outside it is rejected like an
+        unknown one.
+
+        Returns {'created': [VitalSign, ...], 'rejected': [{'index', 'errors'}],
+        'abnormal_patients': [medical_record_id, ...]}.
+        """
+        from api.models import MedicalRecord
+        from api.models.medical import VitalSign
+
+        readings = list(readings)
+        if len(readings) > cls.MAX_BATCH:
+            raise ValueError(f'At most {cls.MAX_BATCH} readings can be sent at once')
+        readings = [reading if isinstance(reading, dict) else {} for reading in readings]
+
+        columns, errors = cls.build_columns(readings)
+
+        hpns = [str(reading.get('hpn') or '').strip() for reading in readings]
+        if medical_records is None:
+            medical_records = MedicalRecord.objects.all()
+        record_ids = dict(medical_records.filter(hpn__in=set(filter(None, hpns))).values_list('hpn', 'id'))
+        for index, hpn in enumerate(hpns):
+            if hpn not in record_ids:
+                errors.setdefault(index, {})['hpn'] = 'Unknown patient.' if hpn else 'This field is required.'
+
+        bmi = cls.compute_bmi(columns)
+        abnormal = cls.abnormal_mask(columns)
+        rules = cls.field_rules()
+        numeric = {name: columns[name].tolist() for name in cls.INTEGER_FIELDS + cls.DECIMAL_FIELDS}
+        bmi = bmi.tolist()
+        abnormal = abnormal.tolist()
+
+        vital_signs = []
+        for index in range(len(readings)):
+            if index in errors:
+                continue
+            fields = {}
+            for name in cls.INTEGER_FIELDS:
+                value = numeric[name][index]
+                fields[name] = None if value != value else int(value)
+            for name in cls.DECIMAL_FIELDS:
+                value = numeric[name][index]
+                places = rules[name]['decimal_places']
+                fields[name] = None if value != value else Decimal(f'{value:.{places}f}')
+            for name in cls.CHOICE_FIELDS + cls.TEXT_FIELDS:
+                fields[name] = columns[name][index]
+            vital_signs.append(VitalSign(
+                medical_record_id=record_ids[hpns[index]],
+                recorded_at=columns['recorded_at'][index],
+                recorded_by=recorded_by,
+                bmi=None if bmi[index] != bmi[index] else Decimal(f'{bmi[index]:.2f}'),
+                is_abnormal=abnormal[index],
+                **fields
+            ))
+
+        with transaction.atomic():
+            created = VitalSign.objects.bulk_create(vital_signs, batch_size=500)
+            abnormal_by_patient = {}
+            for vital_sign in created:
+                if vital_sign.is_abnormal:
+                    abnormal_by_patient.setdefault(vital_sign.medical_record_id, []).append(vital_sign)
+            if abnormal_by_patient:
+                transaction.on_commit(lambda: cls.send_abnormal_alerts(abnormal_by_patient))
+
+        return {
+            'created': created,
+            'rejected': [{'index': index, 'errors': errors[index]} for index in sorted(errors)],
+            'abnormal_patients': list(abnormal_by_patient),
+        }
+
+    @classmethod
+    def send_abnormal_alerts(cls, abnormal_by_patient):
+        """One alert per patient for all of the batch's abnormal readings"""
+        for medical_record_id, vital_signs in abnormal_by_patient.items():
+            latest = max(vital_signs, key=lambda vital_sign: vital_sign.recorded_at)
+            logger.warning(
+                f"{len(vital_signs)} abnormal vital sign reading(s) for medical record {medical_record_id}, "
+                f"latest at {latest.recorded_at.isoformat()}"
+            )
+            try:
+                abnormal_vitals_recorded.send(
+                    sender=cls,
+                    medical_record_id=medical_record_id,
+                    vital_sign_ids=[vital_sign.pk for vital_sign in vital_signs],
+                    latest=latest,
+                )
+            except Exception as e:
+                logger.error(f"Error sending abnormal vitals alert for record {medical_record_id}: {str(e)}")
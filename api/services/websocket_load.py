@@ -0,0 +1,517 @@
+# api/services/websocket_load.py
+
+import asyncio
+import json
+import logging
+import random
+import statistics
+import time
+import uuid
+from contextlib import nullcontext
+from urllib.parse import urlencode, urlparse
+
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.middleware.query_budget import QueryRecorder
+from api.models.messaging import Conversation, MessageParticipant
+from api.services.benchmark_suite import percentile
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+# kind: (consumer, path)
+CONSUMERS = {
+    'chat': ('ChatConsumer', 'ws/chat/{conversation_id}/'),
+    'typing': ('TypingIndicatorConsumer', 'ws/typing/{conversation_id}/'),
+    'presence': ('PresenceConsumer', 'ws/presence/'),
+}
+MARKER = 'loadtest'
+
+
+def in_memory_channel_layer():
+    """CHANNEL_LAYERS for an in-process run: in memory, with the configured capacity and expiry"""
+    config = settings.CHANNEL_LAYERS.get('default', {}).get('CONFIG', {})
+    return {'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        'CONFIG': {'capacity': config.get('capacity', 100), 'expiry': config.get('expiry', 60)},
+    }}
+
+
+def latency_summary(values):
+    if not values:
+        return {'count': 0, 'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'p50_ms': round(statistics.median(values), 2),
+        'p95_ms': round(percentile(values, 0.95), 2),
+        'p99_ms': round(percentile(values, 0.99), 2),
+        'max_ms': round(values[-1], 2),
+    }
+
+
+class ASGIConnection:
+    """A WebSocket to the project's ASGI application, in this process (channels.testing.WebsocketCommunicator)"""
+
+    def __init__(self, path):
+        from channels.testing import WebsocketCommunicator
+        from server.asgi import application
+
+        host = next((h.lstrip('.') for h in settings.ALLOWED_HOSTS if '*' not in h), 'localhost')
+        self.communicator = WebsocketCommunicator(
+            application, path, headers=[(b'host', host.encode()), (b'origin', f'http://{host}'.encode())]
+        )
+
+    async def connect(self, timeout):
+        connected, _ = await self.communicator.connect(timeout=timeout)
+        return connected
+
+    async def send(self, data):
+        await self.communicator.send_to(text_data=json.dumps(data))
+
+    async def receive(self):
+        """The next JSON frame, or None once the consumer closed the socket"""
+        message = await self.communicator.receive_output(timeout=None)
+        if message['type'] != 'websocket.send':
+            return None
+        return json.loads(message['text'])
+
+    async def close(self):
+        await self.communicator.disconnect()
+
+
+class ServerConnection:
+    """A WebSocket to a running server (Daphne / uvicorn), over aiohttp"""
+
+    def __init__(self, session, url):
+        self.session = session
+        self.url = url
+        self.socket = None
+
+    async def connect(self, timeout):
+        import aiohttp
+
+        parsed = urlparse(self.url)
+        origin = f"{'https' if parsed.scheme == 'wss' else 'http'}://{parsed.netloc}"
+        try:
+            self.socket = await asyncio.wait_for(
+                self.session.ws_connect(self.url, headers={'Origin': origin}), timeout
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"WebSocket connect to {self.url} failed: {e}")
+            return False
+        return True
+
+    async def send(self, data):
+        await self.socket.send_str(json.dumps(data))
+
+    async def receive(self):
+        import aiohttp
+
+        message = await self.socket.receive()
+        if message.type != aiohttp.WSMsgType.TEXT:
+            return None
+        return json.loads(message.data)
+
+    async def close(self):
+        await self.socket.close()
+
+
+class LoadClient:
+    """One open WebSocket: its consumer kind, user, conversation and reader task"""
+
+    def __init__(self, kind, user_id, conversation_id, connection):
+        self.kind = kind
+        self.user_id = user_id
+        self.conversation_id = conversation_id
+        self.connection = connection
+        self.is_open = True
+        self.is_typing = False
+        self.reader = None
+
+
+class WebSocketLoadTest:
+    """
+    🔌 Load generator for the messaging WebSocket consumers.
+
+    Creates conversations of group_size users each (committed, removed
+    again by delete_population()), then opens, per user, one ChatConsumer
+    and one TypingIndicatorConsumer connection to their conversation and one
+    PresenceConsumer connection, authenticated with a JWT in the query
+    string as the app does. Connections go to the ASGI application in this
+    process (WebsocketCommunicator, on an in-memory channel layer unless
+    in_memory_layer=False) or, with url, to a running server.
+
+    For duration seconds it then drives, across all connections:
+    - message_rate chat messages per second; each carries a unique marker,
+      so its fan-out latency (send -> received by each other participant's
+      ChatConsumer) and any missing deliveries are measured;
+    - typing_rate start / stop typing events per second, delivery counted;
+    - presence_rate presence reconnects per second (PresenceConsumer marks
+      every participation online on connect), reconnect latency measured.
+
+    Deliveries still missing drain_timeout seconds after the last send are
+    dropped. In process, every query the consumers run is counted
+    (QueryRecorder on this thread, where database_sync_to_async runs them):
+    per connection, and per chat message / typing event from one event
+    sent on its own before the load starts.
+    """
+
+    def __init__(self, conversations=50, group_size=4, consumers=tuple(CONSUMERS), duration=10.0,
+                 message_rate=20.0, typing_rate=20.0, presence_rate=2.0, connect_concurrency=100,
+                 connect_timeout=10.0, drain_timeout=5.0, url=None, in_memory_layer=True, seed=42):
+        self.conversation_count = conversations
+        self.group_size = group_size
+        self.consumers = [kind for kind in CONSUMERS if kind in consumers]
+        self.duration = duration
+        self.message_rate = message_rate if 'chat' in self.consumers else 0
+        self.typing_rate = typing_rate if 'typing' in self.consumers else 0
+        self.presence_rate = presence_rate if 'presence' in self.consumers else 0
+        self.connect_concurrency = connect_concurrency
+        self.connect_timeout = connect_timeout
+        self.drain_timeout = drain_timeout
+        self.url = url.rstrip('/') if url else None
+        self.in_memory_layer = in_memory_layer and not self.url
+        self.rng = random.Random(seed)
+        self.run_id = uuid.uuid4().hex[:8]
+        self.members = {}  # conversation id -> [user id]
+        self.tokens = {}  # user id -> access token
+        self.recorder = None
+
+    # ----- population -----
+
+    def create_population(self):
+        password = make_password(None)
+        users = User.objects.bulk_create([
+            User(
+                email=f"loadtest-{self.run_id}-{index}@example.com",
+                username=f"loadtest-{self.run_id}-{index}@example.com",
+                first_name='Load', last_name=f"Tester {index}", password=password,
+            )
+            for index in range(self.conversation_count * self.group_size)
+        ])
+        conversations = Conversation.objects.bulk_create([
+            Conversation(
+                title=f"Load test {self.run_id} #{index}", conversation_type='group',
+                created_by=users[index * self.group_size],
+            )
+            for index in range(self.conversation_count)
+        ])
+        participants = []
+        for index, conversation in enumerate(conversations):
+            group = users[index * self.group_size:(index + 1) * self.group_size]
+            self.members[str(conversation.id)] = [user.id for user in group]
+            participants.extend(
+                MessageParticipant(conversation=conversation, user=user, role='admin' if position == 0 else 'member')
+                for position, user in enumerate(group)
+            )
+        MessageParticipant.objects.bulk_create(participants)
+        self.tokens = {user.id: str(AccessToken.for_user(user)) for user in users}
+        logger.info(f"Load test {self.run_id}: {len(users)} users in {len(conversations)} conversations")
+
+    def delete_population(self):
+        Conversation.objects.filter(id__in=list(self.members)).delete()
+        User.objects.filter(id__in=list(self.tokens)).delete()
+
+    def execute(self):
+        """Create the population, run the load and remove the population again; returns report()"""
+        self.create_population()
+        try:
+            if self.url:
+                return async_to_sync(self.run)()
+            layer = override_settings(CHANNEL_LAYERS=in_memory_channel_layer()) if self.in_memory_layer else nullcontext()
+            with layer, QueryRecorder() as self.recorder:
+                return async_to_sync(self.run)()
+        finally:
+            self.delete_population()
+
+    # ----- connections -----
+
+    async def open(self, kind, user_id, conversation_id=None):
+        path = CONSUMERS[kind][1].format(conversation_id=conversation_id)
+        path = f"{path}?{urlencode({'token': self.tokens[user_id]})}"
+        if self.url:
+            connection = ServerConnection(self.session, f"{self.url}/{path}")
+        else:
+            connection = ASGIConnection(path)
+        started = time.perf_counter()
+        try:
+            connected = await connection.connect(self.connect_timeout)
+        except Exception as e:
+            logger.debug(f"{kind} connection failed: {e}")
+            connected = False
+        if not connected:
+            self.connect_failures[kind] += 1
+            return None
+        self.connect_ms[kind].append((time.perf_counter() - started) * 1000)
+        client = LoadClient(kind, user_id, conversation_id, connection)
+        client.reader = asyncio.create_task(self.read(client))
+        return client
+
+    async def close(self, client):
+        client.is_open = False
+        client.reader.cancel()
+        try:
+            await client.connection.close()
+        except Exception as e:
+            logger.debug(f"Closing {client.kind} connection failed: {e}")
+
+    async def read(self, client):
+        try:
+            while True:
+                data = await client.connection.receive()
+                if data is None:
+                    break
+                self.on_frame(data)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"{client.kind} connection lost: {e}")
+        client.is_open = False
+
+    def on_frame(self, data):
+        frame_type = data.get('type')
+        if frame_type == 'new_message':
+            sent_at = self.sent_at.get(data.get('message', {}).get('content'))
+            if sent_at is not None:
+                self.fanout_ms.append((time.perf_counter() - sent_at) * 1000)
+                self.delivered['chat'] += 1
+        elif frame_type == 'typing_status':
+            self.delivered['typing'] += 1
+        elif frame_type == 'error':
+            self.server_errors += 1
+
+    def peers(self, client):
+        """Open connections of the same kind in the client's conversation, other than the client's user"""
+        return sum(
+            1 for other in self.clients[client.kind]
+            if other.is_open and other.conversation_id == client.conversation_id and other.user_id != client.user_id
+        )
+
+    # ----- events -----
+
+    def send_message(self):
+        clients = [client for client in self.clients['chat'] if client.is_open]
+        if not clients:
+            return
+        client = self.rng.choice(clients)
+        self.message_number += 1
+        content = f"{MARKER}:{self.run_id}:{self.message_number}"
+        self.sent_at[content] = time.perf_counter()
+        self.sent['chat'] += 1
+        self.expected['chat'] += self.peers(client)
+        self.spawn(self.send(client, {'type': 'send_message', 'content': content}))
+
+    def send_typing(self):
+        clients = [client for client in self.clients['typing'] if client.is_open]
+        if not clients:
+            return
+        client = self.rng.choice(clients)
+        client.is_typing = not client.is_typing
+        self.sent['typing'] += 1
+        self.expected['typing'] += self.peers(client)
+        self.spawn(self.send(client, {'type': 'start_typing' if client.is_typing else 'stop_typing'}))
+
+    def reconnect_presence(self):
+        indexes = [index for index, client in enumerate(self.clients['presence']) if client.is_open]
+        if indexes:
+            self.spawn(self.reconnect(self.rng.choice(indexes)))
+
+    async def send(self, client, data):
+        try:
+            await client.connection.send(data)
+        except Exception as e:
+            logger.debug(f"Send on {client.kind} connection failed: {e}")
+            self.send_failures += 1
+
+    async def reconnect(self, index):
+        client = self.clients['presence'][index]
+        client.is_open = False  # Not picked again while reconnecting
+        await self.close(client)
+        started = time.perf_counter()
+        replacement = await self.open('presence', client.user_id)
+        if replacement is None:
+            self.reconnect_failures += 1
+            return
+        self.reconnect_ms.append((time.perf_counter() - started) * 1000)
+        self.clients['presence'][index] = replacement
+
+    def spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def drive(self, rate, action):
+        if rate <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / rate
+        next_at = loop.time()
+        while next_at < self.deadline:
+            action()
+            next_at += interval
+            await asyncio.sleep(max(0.0, next_at - loop.time()))
+
+    async def wait_for_tasks(self):
+        if self.tasks:
+            await asyncio.wait(set(self.tasks))
+
+    async def wait_for_deliveries(self, timeout):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if all(self.delivered[kind] >= self.expected[kind] for kind in ('chat', 'typing')):
+                return
+            await asyncio.sleep(0.05)
+
+    async def settled_query_count(self, timeout=2.0):
+        """recorder.count once no query has run for 100 ms"""
+        deadline = time.perf_counter() + timeout
+        count = self.recorder.count
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(0.1)
+            if self.recorder.count == count:
+                break
+            count = self.recorder.count
+        return count
+
+    # ----- run -----
+
+    def reset_counters(self):
+        self.sent = {'chat': 0, 'typing': 0}
+        self.expected = {'chat': 0, 'typing': 0}
+        self.delivered = {'chat': 0, 'typing': 0}
+        self.sent_at = {}
+        self.fanout_ms = []
+        self.reconnect_ms = []
+        self.reconnect_failures = 0
+        self.send_failures = 0
+        self.server_errors = 0
+
+    async def calibrate(self, kind, action):
+        """Queries for one event sent while nothing else runs"""
+        if not self.recorder or not any(client.is_open for client in self.clients[kind]):
+            return None
+        before = await self.settled_query_count()
+        action()
+        await self.wait_for_tasks()
+        await self.wait_for_deliveries(self.drain_timeout)
+        return await self.settled_query_count() - before
+
+    async def run(self):
+        self.clients = {kind: [] for kind in CONSUMERS}
+        self.connect_ms = {kind: [] for kind in CONSUMERS}
+        self.connect_failures = {kind: 0 for kind in CONSUMERS}
+        self.tasks = set()
+        self.message_number = 0
+        self.reset_counters()
+        self.session = None
+        if self.url:
+            import aiohttp
+            self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+
+        try:
+            return await self._run()
+        finally:
+            if self.session is not None:
+                await self.session.close()
+
+    async def _run(self):
+        semaphore = asyncio.Semaphore(self.connect_concurrency)
+
+        async def bounded(coroutine):
+            async with semaphore:
+                return await coroutine
+
+        # Connect
+        targets = []
+        for conversation_id, user_ids in self.members.items():
+            for user_id in user_ids:
+                targets.extend((kind, user_id, conversation_id) for kind in ('chat', 'typing') if kind in self.consumers)
+                if 'presence' in self.consumers:
+                    targets.append(('presence', user_id, None))
+        queries_before = self.recorder.count if self.recorder else 0
+        started = time.perf_counter()
+        clients = await asyncio.gather(*(bounded(self.open(*target)) for target in targets))
+        connect_seconds = time.perf_counter() - started
+        for client in clients:
+            if client is not None:
+                self.clients[client.kind].append(client)
+        connected = sum(len(clients) for clients in self.clients.values())
+        queries_per_connection = None
+        if self.recorder and connected:
+            queries_per_connection = round((await self.settled_query_count() - queries_before) / connected, 2)
+
+        # One event of each kind on its own, for queries per event
+        queries_per_message = await self.calibrate('chat', self.send_message)
+        queries_per_typing_event = await self.calibrate('typing', self.send_typing)
+        self.reset_counters()
+
+        # Load
+        loop = asyncio.get_running_loop()
+        queries_before = self.recorder.count if self.recorder else 0
+        self.deadline = loop.time() + self.duration
+        await asyncio.gather(
+            self.drive(self.message_rate, self.send_message),
+            self.drive(self.typing_rate, self.send_typing),
+            self.drive(self.presence_rate, self.reconnect_presence),
+        )
+        await self.wait_for_tasks()
+        await self.wait_for_deliveries(self.drain_timeout)
+        load_queries = (self.recorder.count - queries_before) if self.recorder else None
+
+        await asyncio.gather(*(
+            bounded(self.close(client)) for clients in self.clients.values() for client in clients if client.is_open
+        ))
+        return self.report(connect_seconds, queries_per_connection, queries_per_message, queries_per_typing_event,
+                           load_queries)
+
+    def report(self, connect_seconds, queries_per_connection, queries_per_message, queries_per_typing_event,
+               load_queries):
+        connections = {
+            CONSUMERS[kind][0]: {
+                'connected': len(self.connect_ms[kind]),
+                'failed': self.connect_failures[kind],
+                **latency_summary(self.connect_ms[kind]),
+            }
+            for kind in self.consumers
+        }
+        events = {
+            kind: {
+                'sent': self.sent[kind],
+                'rate_per_s': round(self.sent[kind] / self.duration, 1) if self.duration else None,
+                'expected_deliveries': self.expected[kind],
+                'delivered': self.delivered[kind],
+                'dropped': max(0, self.expected[kind] - self.delivered[kind]),
+            }
+            for kind in ('chat', 'typing') if kind in self.consumers
+        }
+        if 'chat' in events:
+            events['chat']['fanout'] = latency_summary(self.fanout_ms)
+        if 'presence' in self.consumers:
+            events['presence'] = {'reconnects': len(self.reconnect_ms), 'failed': self.reconnect_failures,
+                                  **latency_summary(self.reconnect_ms)}
+        return {
+            'mode': 'server' if self.url else 'asgi',
+            'target': self.url or 'server.asgi.application',
+            'channel_layer': None if self.url else settings.CHANNEL_LAYERS['default']['BACKEND'],
+            'conversations': self.conversation_count,
+            'group_size': self.group_size,
+            'duration_s': self.duration,
+            'connect_seconds': round(connect_seconds, 2),
+            'connections': connections,
+            'events': events,
+            'send_failures': self.send_failures,
+            'server_errors': self.server_errors,
+            'queries': None if self.url else {
+                'per_connection': queries_per_connection,
+                'per_message': queries_per_message,
+                'per_typing_event': queries_per_typing_event,
+                'during_load': load_queries,
+            },
+        }
@@ -0,0 +1,314 @@
+# api/services/womens_health_summary.py
+
+import logging
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min, Q, StdDev
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class WomensHealthSummaryService:
+    """
+    📊 Incremental women's health summaries.
+
+    Each profile has one WomensHealthSummary row. Writes keep it current:
+    - a saved daily log updates the log counters and streak in place and
+      replaces that day's entry in a 30-day window of per-day figures
+      (health score, sleep, weight, mood, energy, exercise), from which the
+      7 and 30 day averages are recomputed without touching the log table;
+    - a saved cycle or goal refreshes its section with one aggregate query
+      over the profile's (few) cycles or goals.
+
+    The dashboard reads the row, sliding the window forward first if days
+    have passed since it was last written. Bulk writes and deletes that
+    bypass save() are caught up by rebuild(), which the
+    rebuild_womens_health_summaries command runs from scratch.
+    """
+
+    WINDOW_DAYS = 30
+    AVERAGE_WINDOWS = (7, 30)
+
+    # ----- per-day figures and averages -----
+
+    @staticmethod
+    def day_entry(log):
+        return {
+            'health_score': log.health_score,
+            'weight_kg': float(log.weight_kg) if log.weight_kg else None,
+            'sleep_hours': float(log.sleep_duration_hours) if log.sleep_duration_hours else None,
+            'mood': log.mood,
+            'energy_level': log.energy_level,
+            'exercise': bool(log.exercise_performed),
+        }
+
+    @staticmethod
+    def _average(values, digits=1):
+        return round(sum(values) / len(values), digits) if values else None
+
+    @classmethod
+    def compute_averages(cls, recent_days, end_date):
+        """{'7_days': {...}, '30_days': {...}} over the per-day entries ending on end_date"""
+        averages = {}
+        for window in cls.AVERAGE_WINDOWS:
+            start = (end_date - timedelta(days=window - 1)).isoformat()
+            days = [entry for day, entry in sorted(recent_days.items()) if day >= start]
+            moods = Counter(entry['mood'] for entry in days if entry['mood'])
+            averages[f'{window}_days'] = {
+                'logged_days': len(days),
+                'average_health_score': cls._average([entry['health_score'] for entry in days]),
+                'average_sleep_hours': cls._average([entry['sleep_hours'] for entry in days if entry['sleep_hours']]),
+                'average_weight_kg': cls._average([entry['weight_kg'] for entry in days if entry['weight_kg']]),
+                'exercise_days': sum(1 for entry in days if entry['exercise']),
+                'most_common_mood': moods.most_common(1)[0][0] if moods else None,
+            }
+        return averages
+
+    @classmethod
+    def slide_window(cls, summary, end_date):
+        """Move the window to end on end_date, dropping days that fell out of it"""
+        start = (end_date - timedelta(days=cls.WINDOW_DAYS - 1)).isoformat()
+        summary.recent_days = {day: entry for day, entry in summary.recent_days.items() if day >= start}
+        summary.window_end_date = end_date
+        summary.rolling_averages = cls.compute_averages(summary.recent_days, end_date)
+
+    @staticmethod
+    def streaks(dates):
+        """(current run length, its last date, longest run) for ascending distinct dates"""
+        current, end, longest = 0, None, 0
+        for day in dates:
+            current = current + 1 if end is not None and day == end + timedelta(days=1) else 1
+            end = day
+            longest = max(longest, current)
+        return current, end, longest
+
+    # ----- full recomputation -----
+
+    @classmethod
+    def _rebuild_cycles(cls, summary):
+        from api.models import MenstrualCycle
+        stats = MenstrualCycle.objects.filter(womens_health_profile_id=summary.womens_health_profile_id).aggregate(
+            total=Count('id'),
+            average=Avg('cycle_length'),
+            std_dev=StdDev('cycle_length'),
+            shortest=Min('cycle_length'),
+            longest=Max('cycle_length'),
+            last_start=Max('cycle_start_date'),
+        )
+        summary.total_cycles = stats['total']
+        summary.average_cycle_length = round(stats['average'], 1) if stats['average'] is not None else None
+        summary.cycle_length_std_dev = round(stats['std_dev'], 1) if stats['std_dev'] is not None else None
+        summary.shortest_cycle_length = stats['shortest']
+        summary.longest_cycle_length = stats['longest']
+        summary.last_cycle_start_date = stats['last_start']
+
+    @classmethod
+    def _rebuild_goals(cls, summary):
+        from api.models import HealthGoal
+        stats = HealthGoal.objects.filter(womens_health_profile_id=summary.womens_health_profile_id).aggregate(
+            total=Count('id'),
+            active=Count('id', filter=Q(status='active')),
+            completed=Count('id', filter=Q(status='completed')),
+            average_progress=Avg('progress_percentage', filter=Q(status='active')),
+            best_streak=Max('longest_streak'),
+        )
+        summary.total_goals = stats['total']
+        summary.active_goals = stats['active']
+        summary.completed_goals = stats['completed']
+        summary.average_goal_progress = (
+            round(stats['average_progress'], 1) if stats['average_progress'] is not None else None
+        )
+        summary.best_goal_streak = stats['best_streak'] or 0
+
+    @classmethod
+    def _rebuild_streaks(cls, summary):
+        from api.models import DailyHealthLog
+        dates = DailyHealthLog.objects.filter(
+            womens_health_profile_id=summary.womens_health_profile_id
+        ).order_by('date').values_list('date', flat=True)
+        summary.logging_streak, summary.logging_streak_end_date, summary.longest_logging_streak = cls.streaks(dates)
+
+    @classmethod
+    def _rebuild_logs(cls, summary, today):
+        from api.models import DailyHealthLog
+        logs = DailyHealthLog.objects.filter(womens_health_profile_id=summary.womens_health_profile_id)
+        stats = logs.aggregate(total=Count('id'), first=Min('date'), last=Max('date'))
+        summary.total_logs = stats['total']
+        summary.first_log_date = stats['first']
+        summary.last_log_date = stats['last']
+        cls._rebuild_streaks(summary)
+
+        end_date = max(today, stats['last'] or today)
+        start_date = end_date - timedelta(days=cls.WINDOW_DAYS - 1)
+        summary.recent_days = {
+            log.date.isoformat(): cls.day_entry(log)
+            for log in logs.filter(date__range=[start_date, end_date]).order_by('date')
+        }
+        cls.slide_window(summary, end_date)
+
+    @classmethod
+    def rebuild(cls, profile, save=True):
+        """Recompute a profile's summary from its full history"""
+        from api.models import WomensHealthSummary
+        summary = WomensHealthSummary.objects.filter(womens_health_profile=profile).first()
+        if summary is None:
+            summary = WomensHealthSummary(womens_health_profile=profile)
+        cls._rebuild_all(summary)
+        if save:
+            summary.save()
+        return summary
+
+    @classmethod
+    def _rebuild_all(cls, summary):
+        cls._rebuild_cycles(summary)
+        cls._rebuild_goals(summary)
+        cls._rebuild_logs(summary, timezone.now().date())
+
+    # ----- incremental updates (called from the models' save) -----
+
+    @classmethod
+    def _locked_summary(cls, profile_id):
+        """The profile's summary row, locked; (summary, True) if it had to be built first"""
+        from api.models import WomensHealthSummary
+        summary, created = WomensHealthSummary.objects.select_for_update().get_or_create(
+            womens_health_profile_id=profile_id
+        )
+        if created:
+            cls._rebuild_all(summary)
+            summary.save()
+        return summary, created
+
+    @classmethod
+    def _update(cls, profile_id, apply, description):
+        try:
+            with transaction.atomic():
+                summary, rebuilt = cls._locked_summary(profile_id)
+                if not rebuilt:
+                    apply(summary)
+                    summary.save()
+        except Exception as e:
+            # The summary never blocks the write itself; rebuild() catches it up
+            logger.exception(f"Could not update health summary for profile {profile_id} ({description}): {str(e)}")
+
+    @classmethod
+    def record_log(cls, log, created, previous_date=None):
+        """A daily log was saved (created is True for a new date; previous_date is its date before the save)"""
+        day = type(log)._meta.get_field('date').to_python(log.date)
+        if previous_date is not None and previous_date != day:
+            # The old day has to leave the window, the first / last dates and the streaks
+            cls._update(
+                log.womens_health_profile_id,
+                lambda summary: cls._rebuild_logs(summary, timezone.now().date()),
+                'moved daily log',
+            )
+            return
+
+        def apply(summary):
+            if created:
+                summary.total_logs += 1
+                summary.first_log_date = min(filter(None, [summary.first_log_date, day]))
+                summary.last_log_date = max(filter(None, [summary.last_log_date, day]))
+                cls._extend_streak(summary, day)
+
+            end_date = max(filter(None, [summary.window_end_date, day, timezone.now().date()]))
+            if day > end_date - timedelta(days=cls.WINDOW_DAYS):
+                summary.recent_days[day.isoformat()] = cls.day_entry(log)
+            cls.slide_window(summary, end_date)
+
+        cls._update(log.womens_health_profile_id, apply, 'daily log')
+
+    @classmethod
+    def _extend_streak(cls, summary, day):
+        end = summary.logging_streak_end_date
+        if end is None or day > end + timedelta(days=1):
+            summary.logging_streak, summary.logging_streak_end_date = 1, day
+        elif day == end + timedelta(days=1):
+            summary.logging_streak += 1
+            summary.logging_streak_end_date = day
+        else:
+            # A back-filled day can join earlier runs; recount from the dates
+            cls._rebuild_streaks(summary)
+        summary.longest_logging_streak = max(summary.longest_logging_streak, summary.logging_streak)
+
+    @classmethod
+    def forget_log(cls, log):
+        """A daily log was deleted"""
+        cls._update(
+            log.womens_health_profile_id,
+            lambda summary: cls._rebuild_logs(summary, timezone.now().date()),
+            'deleted daily log',
+        )
+
+    @classmethod
+    def record_cycle(cls, cycle):
+        cls._update(cycle.womens_health_profile_id, cls._rebuild_cycles, 'cycle')
+
+    @classmethod
+    def record_goal(cls, goal):
+        cls._update(goal.womens_health_profile_id, cls._rebuild_goals, 'goal')
+
+    # ----- reads -----
+
+    @classmethod
+    def get_summary(cls, profile):
+        """The profile's summary with its window ending today (built on first use)"""
+        from api.models import WomensHealthSummary
+        summary = WomensHealthSummary.objects.filter(womens_health_profile=profile).first()
+        if summary is None:
+            return cls.rebuild(profile)
+
+        today = timezone.now().date()
+        if summary.window_end_date is None or summary.window_end_date < today:
+            cls.slide_window(summary, today)
+            WomensHealthSummary.objects.filter(pk=summary.pk).update(
+                recent_days=summary.recent_days,
+                window_end_date=summary.window_end_date,
+                rolling_averages=summary.rolling_averages,
+            )
+        return summary
+
+    @classmethod
+    def weekly_trends(cls, profile_id, start_date, end_date):
+        """
+        DailyHealthLog.get_weekly_trends from the stored per-day figures, or
+        None when the summary's window does not cover start_date..end_date.
+        """
+        from api.models import WomensHealthSummary
+        summary = WomensHealthSummary.objects.filter(womens_health_profile_id=profile_id).only(
+            'recent_days', 'window_end_date'
+        ).first()
+        if summary is None or summary.window_end_date is None:
+            return None
+        if end_date > summary.window_end_date or start_date <= summary.window_end_date - timedelta(days=cls.WINDOW_DAYS):
+            return None
+
+        trends = {
+            'weight_trend': [],
+            'mood_trend': [],
+            'energy_trend': [],
+            'sleep_trend': [],
+            'exercise_days': 0,
+            'average_health_score': 0
+        }
+        scores = []
+        for day, entry in sorted(summary.recent_days.items()):
+            if not start_date.isoformat() <= day <= end_date.isoformat():
+                continue
+            if entry['weight_kg']:
+                trends['weight_trend'].append({'date': day, 'weight': entry['weight_kg']})
+            if entry['mood']:
+                trends['mood_trend'].append({'date': day, 'mood': entry['mood']})
+            if entry['energy_level']:
+                trends['energy_trend'].append({'date': day, 'energy': entry['energy_level']})
+            if entry['sleep_hours']:
+                trends['sleep_trend'].append({'date': day, 'sleep_hours': entry['sleep_hours']})
+            if entry['exercise']:
+                trends['exercise_days'] += 1
+            scores.append(entry['health_score'])
+
+        if scores:
+            trends['average_health_score'] = round(sum(scores) / len(scores), 1)
+        return trends
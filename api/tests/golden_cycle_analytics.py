@@ -0,0 +1,400 @@
+# api/tests/golden_cycle_analytics.py
+#
+# CycleAnalyticsService output recorded from the per-row implementation, for
+# the histories built in test_cycle_analytics (timezone.now() pinned to NOW).
+# Regenerate only when the analytics output is meant to change.
+
+GOLDEN = {'irregular': {'irregularities': {'sufficient_data': True,
+                                  'analysis_period': '6 months',
+                                  'cycles_analyzed': 6,
+                                  'average_cycle_length': 28.5,
+                                  'irregularities_detected': 4,
+                                  'irregularities': [{'type': 'long_cycles',
+                                                      'severity': 'moderate',
+                                                      'description': '1 cycles longer than 35 days',
+                                                      'recommendation': 'Consider consulting healthcare '
+                                                                        'provider'},
+                                                     {'type': 'short_cycles',
+                                                      'severity': 'moderate',
+                                                      'description': '1 cycles shorter than 21 days',
+                                                      'recommendation': 'Consider consulting healthcare '
+                                                                        'provider'},
+                                                     {'type': 'high_variability',
+                                                      'severity': 'moderate',
+                                                      'description': 'High cycle length variation (±10.1 '
+                                                                     'days)',
+                                                      'recommendation': 'Track consistently to identify '
+                                                                        'patterns'},
+                                                     {'type': 'missed_periods',
+                                                      'severity': 'high',
+                                                      'description': '1 potential missed periods',
+                                                      'recommendation': 'Consult healthcare provider '
+                                                                        'immediately'}],
+                                  'overall_assessment': 'Significant irregularities detected - consult '
+                                                        'healthcare provider',
+                                  'next_expected_period': '2024-07-25'},
+               'irregularities_1': {'sufficient_data': False,
+                                    'message': 'Need at least 3 cycles for analysis',
+                                    'cycles_count': 2},
+               'irregularities_3': {'sufficient_data': True,
+                                    'analysis_period': '3 months',
+                                    'cycles_analyzed': 3,
+                                    'average_cycle_length': 22.0,
+                                    'irregularities_detected': 1,
+                                    'irregularities': [{'type': 'missed_periods',
+                                                        'severity': 'high',
+                                                        'description': '1 potential missed periods',
+                                                        'recommendation': 'Consult healthcare provider '
+                                                                          'immediately'}],
+                                    'overall_assessment': 'Significant irregularities detected - consult '
+                                                          'healthcare provider',
+                                    'next_expected_period': '2024-07-19'},
+               'mood_90': {'data_type': 'mood',
+                           'analysis_period_days': 90,
+                           'total_entries': 49,
+                           'mood_distribution': {'stressed': 8,
+                                                 'neutral': 4,
+                                                 'poor': 10,
+                                                 'excellent': 6,
+                                                 'anxious': 9,
+                                                 'good': 5,
+                                                 'depressed': 3,
+                                                 'low': 4},
+                           'most_common_mood': 'poor',
+                           'cycle_patterns': {'menstrual_phase': 'Analysis pending',
+                                              'follicular_phase': 'Analysis pending',
+                                              'ovulation_phase': 'Analysis pending',
+                                              'luteal_phase': 'Analysis pending'},
+                           'trends': {'trend': 'improving', 'direction': 'up'}},
+               'mood_30': {'data_type': 'mood',
+                           'analysis_period_days': 30,
+                           'total_entries': 16,
+                           'mood_distribution': {'poor': 4,
+                                                 'low': 2,
+                                                 'good': 3,
+                                                 'depressed': 1,
+                                                 'excellent': 1,
+                                                 'stressed': 1,
+                                                 'anxious': 3,
+                                                 'neutral': 1},
+                           'most_common_mood': 'poor',
+                           'cycle_patterns': {'menstrual_phase': 'Analysis pending',
+                                              'follicular_phase': 'Analysis pending',
+                                              'ovulation_phase': 'Analysis pending',
+                                              'luteal_phase': 'Analysis pending'},
+                           'trends': {'trend': 'improving', 'direction': 'up'}},
+               'mood_7': {'data_type': 'mood',
+                          'analysis_period_days': 7,
+                          'total_entries': 5,
+                          'mood_distribution': {'anxious': 2, 'neutral': 1, 'good': 2},
+                          'most_common_mood': 'anxious',
+                          'cycle_patterns': {'menstrual_phase': 'Analysis pending',
+                                             'follicular_phase': 'Analysis pending',
+                                             'ovulation_phase': 'Analysis pending',
+                                             'luteal_phase': 'Analysis pending'},
+                          'trends': {'trend': 'insufficient_data'}},
+               'energy_90': {'data_type': 'energy',
+                             'analysis_period_days': 90,
+                             'total_entries': 53,
+                             'energy_distribution': {'very_high': 6,
+                                                     'normal': 12,
+                                                     'high': 12,
+                                                     'low': 11,
+                                                     'very_low': 12},
+                             'patterns': {'day_of_week_patterns': {'Monday': ['very_high',
+                                                                              'very_low',
+                                                                              'low',
+                                                                              'low',
+                                                                              'very_low',
+                                                                              'normal',
+                                                                              'very_low',
+                                                                              'high',
+                                                                              'normal'],
+                                                                   'Wednesday': ['normal',
+                                                                                 'low',
+                                                                                 'high',
+                                                                                 'very_high',
+                                                                                 'very_high',
+                                                                                 'low',
+                                                                                 'normal',
+                                                                                 'high'],
+                                                                   'Thursday': ['high',
+                                                                                'very_low',
+                                                                                'low',
+                                                                                'normal',
+                                                                                'normal',
+                                                                                'normal',
+                                                                                'normal'],
+                                                                   'Sunday': ['very_high',
+                                                                              'high',
+                                                                              'very_high',
+                                                                              'very_low',
+                                                                              'high',
+                                                                              'very_low',
+                                                                              'low'],
+                                                                   'Friday': ['high',
+                                                                              'high',
+                                                                              'normal',
+                                                                              'high',
+                                                                              'low',
+                                                                              'high',
+                                                                              'low'],
+                                                                   'Saturday': ['low',
+                                                                                'very_low',
+                                                                                'low',
+                                                                                'very_low',
+                                                                                'very_low',
+                                                                                'very_low',
+                                                                                'very_low',
+                                                                                'high'],
+                                                                   'Tuesday': ['normal',
+                                                                               'low',
+                                                                               'high',
+                                                                               'very_high',
+                                                                               'very_low',
+                                                                               'normal',
+                                                                               'normal']},
+                                          'weekly_insights': ['Highest energy typically on Wednesday',
+                                                              'Lowest energy typically on Saturday']}},
+               'energy_30': {'data_type': 'energy',
+                             'analysis_period_days': 30,
+                             'total_entries': 18,
+                             'energy_distribution': {'low': 4, 'very_low': 4, 'normal': 6, 'high': 4},
+                             'patterns': {'day_of_week_patterns': {'Friday': ['low', 'high', 'low'],
+                                                                   'Sunday': ['very_low', 'low'],
+                                                                   'Monday': ['very_low', 'high', 'normal'],
+                                                                   'Wednesday': ['low', 'normal', 'high'],
+                                                                   'Saturday': ['very_low',
+                                                                                'very_low',
+                                                                                'high'],
+                                                                   'Tuesday': ['normal', 'normal'],
+                                                                   'Thursday': ['normal', 'normal']},
+                                          'weekly_insights': ['Highest energy typically on Wednesday',
+                                                              'Lowest energy typically on Sunday']}},
+               'energy_7': {'data_type': 'energy',
+                            'analysis_period_days': 7,
+                            'total_entries': 5,
+                            'energy_distribution': {'low': 1, 'normal': 2, 'high': 2},
+                            'patterns': {'day_of_week_patterns': {'Sunday': ['low'],
+                                                                  'Monday': ['normal'],
+                                                                  'Wednesday': ['high'],
+                                                                  'Thursday': ['normal'],
+                                                                  'Saturday': ['high']},
+                                         'weekly_insights': ['Highest energy typically on Wednesday',
+                                                             'Lowest energy typically on Sunday']}},
+               'symptoms_90': {'data_type': 'symptoms',
+                               'analysis_period_days': 90,
+                               'total_entries': 44,
+                               'symptom_frequency': {'cramps': 17,
+                                                     'fatigue': 15,
+                                                     'headache': 18,
+                                                     'bloating': 11,
+                                                     'acne': 15,
+                                                     'back_pain': 8},
+                               'most_common_symptoms': [('headache', 18),
+                                                        ('cramps', 17),
+                                                        ('fatigue', 15),
+                                                        ('acne', 15),
+                                                        ('bloating', 11)]},
+               'symptoms_30': {'data_type': 'symptoms',
+                               'analysis_period_days': 30,
+                               'total_entries': 15,
+                               'symptom_frequency': {'cramps': 5,
+                                                     'acne': 8,
+                                                     'fatigue': 3,
+                                                     'headache': 8,
+                                                     'back_pain': 4,
+                                                     'bloating': 1},
+                               'most_common_symptoms': [('acne', 8),
+                                                        ('headache', 8),
+                                                        ('cramps', 5),
+                                                        ('back_pain', 4),
+                                                        ('fatigue', 3)]},
+               'symptoms_7': {'data_type': 'symptoms',
+                              'analysis_period_days': 7,
+                              'total_entries': 4,
+                              'symptom_frequency': {'acne': 3,
+                                                    'cramps': 2,
+                                                    'back_pain': 1,
+                                                    'headache': 1,
+                                                    'fatigue': 1},
+                              'most_common_symptoms': [('acne', 3),
+                                                       ('cramps', 2),
+                                                       ('back_pain', 1),
+                                                       ('headache', 1),
+                                                       ('fatigue', 1)]},
+               'sleep_90': {'data_type': 'sleep',
+                            'analysis_period_days': 90,
+                            'total_entries': 31,
+                            'average_sleep_hours': 6.6,
+                            'sleep_quality_distribution': {'poor': 6,
+                                                           'good': 7,
+                                                           'excellent': 4,
+                                                           'fair': 4,
+                                                           'very_poor': 4},
+                            'sleep_trends': {'recent_average_hours': 7.5, 'trend': 'stable'}},
+               'sleep_30': {'data_type': 'sleep',
+                            'analysis_period_days': 30,
+                            'total_entries': 10,
+                            'average_sleep_hours': 7.4,
+                            'sleep_quality_distribution': {'poor': 3,
+                                                           'excellent': 1,
+                                                           'good': 3,
+                                                           'very_poor': 2},
+                            'sleep_trends': {'recent_average_hours': 7.5, 'trend': 'stable'}},
+               'sleep_7': {'data_type': 'sleep',
+                           'analysis_period_days': 7,
+                           'total_entries': 3,
+                           'average_sleep_hours': 8.7,
+                           'sleep_quality_distribution': {'good': 1, 'poor': 1},
+                           'sleep_trends': {'trend': 'insufficient_data'}},
+               'weight_90': {'error': 'Unsupported data type: weight'},
+               'weight_30': {'error': 'Unsupported data type: weight'},
+               'weight_7': {'error': 'Unsupported data type: weight'}},
+ 'regular': {'irregularities': {'sufficient_data': True,
+                                'analysis_period': '6 months',
+                                'cycles_analyzed': 4,
+                                'average_cycle_length': 28.0,
+                                'irregularities_detected': 0,
+                                'irregularities': [],
+                                'overall_assessment': 'Regular cycles detected',
+                                'next_expected_period': '2024-06-21'},
+             'irregularities_1': {'sufficient_data': False,
+                                  'message': 'Need at least 3 cycles for analysis',
+                                  'cycles_count': 0},
+             'irregularities_3': {'sufficient_data': False,
+                                  'message': 'Need at least 3 cycles for analysis',
+                                  'cycles_count': 2},
+             'mood_90': {'data_type': 'mood',
+                         'analysis_period_days': 90,
+                         'total_entries': 7,
+                         'mood_distribution': {'excellent': 1,
+                                               'poor': 1,
+                                               'stressed': 1,
+                                               'anxious': 1,
+                                               'neutral': 2,
+                                               'depressed': 1},
+                         'most_common_mood': 'neutral',
+                         'cycle_patterns': {'menstrual_phase': 'Analysis pending',
+                                            'follicular_phase': 'Analysis pending',
+                                            'ovulation_phase': 'Analysis pending',
+                                            'luteal_phase': 'Analysis pending'},
+                         'trends': {'trend': 'insufficient_data'}},
+             'mood_30': {'data_type': 'mood',
+                         'analysis_period_days': 30,
+                         'total_entries': 7,
+                         'mood_distribution': {'excellent': 1,
+                                               'poor': 1,
+                                               'stressed': 1,
+                                               'anxious': 1,
+                                               'neutral': 2,
+                                               'depressed': 1},
+                         'most_common_mood': 'neutral',
+                         'cycle_patterns': {'menstrual_phase': 'Analysis pending',
+                                            'follicular_phase': 'Analysis pending',
+                                            'ovulation_phase': 'Analysis pending',
+                                            'luteal_phase': 'Analysis pending'},
+                         'trends': {'trend': 'insufficient_data'}},
+             'mood_7': {'error': 'No mood data available'},
+             'energy_90': {'data_type': 'energy',
+                           'analysis_period_days': 90,
+                           'total_entries': 8,
+                           'energy_distribution': {'very_low': 1,
+                                                   'normal': 3,
+                                                   'high': 1,
+                                                   'low': 1,
+                                                   'very_high': 2},
+                           'patterns': {'day_of_week_patterns': {'Monday': ['very_low'],
+                                                                 'Tuesday': ['normal', 'normal'],
+                                                                 'Thursday': ['high'],
+                                                                 'Friday': ['low'],
+                                                                 'Saturday': ['very_high'],
+                                                                 'Sunday': ['normal'],
+                                                                 'Wednesday': ['very_high']},
+                                        'weekly_insights': ['Highest energy typically on Saturday',
+                                                            'Lowest energy typically on Monday']}},
+             'energy_30': {'data_type': 'energy',
+                           'analysis_period_days': 30,
+                           'total_entries': 8,
+                           'energy_distribution': {'very_low': 1,
+                                                   'normal': 3,
+                                                   'high': 1,
+                                                   'low': 1,
+                                                   'very_high': 2},
+                           'patterns': {'day_of_week_patterns': {'Monday': ['very_low'],
+                                                                 'Tuesday': ['normal', 'normal'],
+                                                                 'Thursday': ['high'],
+                                                                 'Friday': ['low'],
+                                                                 'Saturday': ['very_high'],
+                                                                 'Sunday': ['normal'],
+                                                                 'Wednesday': ['very_high']},
+                                        'weekly_insights': ['Highest energy typically on Saturday',
+                                                            'Lowest energy typically on Monday']}},
+             'energy_7': {'error': 'No energy data available'},
+             'symptoms_90': {'data_type': 'symptoms',
+                             'analysis_period_days': 90,
+                             'total_entries': 9,
+                             'symptom_frequency': {'acne': 3,
+                                                   'fatigue': 6,
+                                                   'back_pain': 3,
+                                                   'cramps': 1,
+                                                   'bloating': 3},
+                             'most_common_symptoms': [('fatigue', 6),
+                                                      ('acne', 3),
+                                                      ('back_pain', 3),
+                                                      ('bloating', 3),
+                                                      ('cramps', 1)]},
+             'symptoms_30': {'data_type': 'symptoms',
+                             'analysis_period_days': 30,
+                             'total_entries': 9,
+                             'symptom_frequency': {'acne': 3,
+                                                   'fatigue': 6,
+                                                   'back_pain': 3,
+                                                   'cramps': 1,
+                                                   'bloating': 3},
+                             'most_common_symptoms': [('fatigue', 6),
+                                                      ('acne', 3),
+                                                      ('back_pain', 3),
+                                                      ('bloating', 3),
+                                                      ('cramps', 1)]},
+             'symptoms_7': {'error': 'No symptom data available'},
+             'sleep_90': {'data_type': 'sleep',
+                          'analysis_period_days': 90,
+                          'total_entries': 4,
+                          'average_sleep_hours': 5.4,
+                          'sleep_quality_distribution': {'poor': 1, 'very_poor': 1, 'fair': 1},
+                          'sleep_trends': {'trend': 'insufficient_data'}},
+             'sleep_30': {'data_type': 'sleep',
+                          'analysis_period_days': 30,
+                          'total_entries': 4,
+                          'average_sleep_hours': 5.4,
+                          'sleep_quality_distribution': {'poor': 1, 'very_poor': 1, 'fair': 1},
+                          'sleep_trends': {'trend': 'insufficient_data'}},
+             'sleep_7': {'error': 'No sleep data available'},
+             'weight_90': {'error': 'Unsupported data type: weight'},
+             'weight_30': {'error': 'Unsupported data type: weight'},
+             'weight_7': {'error': 'Unsupported data type: weight'}},
+ 'sparse': {'irregularities': {'sufficient_data': False,
+                               'message': 'Need at least 3 cycles for analysis',
+                               'cycles_count': 2},
+            'irregularities_1': {'sufficient_data': False,
+                                 'message': 'Need at least 3 cycles for analysis',
+                                 'cycles_count': 1},
+            'irregularities_3': {'sufficient_data': False,
+                                 'message': 'Need at least 3 cycles for analysis',
+                                 'cycles_count': 2},
+            'mood_90': {'error': 'No mood data available'},
+            'mood_30': {'error': 'No mood data available'},
+            'mood_7': {'error': 'No mood data available'},
+            'energy_90': {'error': 'No energy data available'},
+            'energy_30': {'error': 'No energy data available'},
+            'energy_7': {'error': 'No energy data available'},
+            'symptoms_90': {'error': 'No symptom data available'},
+            'symptoms_30': {'error': 'No symptom data available'},
+            'symptoms_7': {'error': 'No symptom data available'},
+            'sleep_90': {'error': 'No sleep data available'},
+            'sleep_30': {'error': 'No sleep data available'},
+            'sleep_7': {'error': 'No sleep data available'},
+            'weight_90': {'error': 'Unsupported data type: weight'},
+            'weight_30': {'error': 'Unsupported data type: weight'},
+            'weight_7': {'error': 'Unsupported data type: weight'}}}
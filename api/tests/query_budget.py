@@ -0,0 +1,36 @@
+# api/tests/query_budget.py
+#
+# Test helpers for the query budget middleware (api.middleware.query_budget)
+
+from contextlib import contextmanager
+
+from django.test import override_settings
+
+from api.middleware.query_budget import QueryRecorder
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin: requests made through the test client raise
+    QueryBudgetExceeded when they go over their view's query budget or
+    repeat a statement (N+1), and assertQueryBudget checks any block.
+    """
+
+    def setUp(self):
+        super().setUp()
+        strict = override_settings(QUERY_BUDGET_STRICT=True)
+        strict.enable()
+        self.addCleanup(strict.disable)
+
+    @contextmanager
+    def assertQueryBudget(self, max_queries=None, repeat_threshold=None):
+        """Fail if the block runs more than max_queries queries or repeats a statement repeat_threshold times"""
+        with QueryRecorder() as recorder:
+            yield recorder
+
+        problems = []
+        if max_queries is not None and recorder.count > max_queries:
+            problems.append(f"{recorder.count} queries (budget {max_queries})")
+        problems.extend(f"repeated {count}x: {sql}" for sql, count in recorder.repeated(repeat_threshold))
+        if problems:
+            self.fail('Query budget exceeded:\n' + '\n'.join(problems))
@@ -0,0 +1,206 @@
+# api/tests/test_analytics_result_cache.py
+
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from api.agent_modules.analytics import result_cache
+from api.agent_modules.analytics.result_cache import AnalyticsResultCache, analytics_cache
+from api.models import DailyHealthLog, WomensHealthProfile
+
+User = get_user_model()
+
+
+class Counter:
+    """A compute() that counts its calls"""
+
+    def __init__(self, result='result'):
+        self.result = result
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return {'value': self.result, 'call': self.calls}
+
+
+class AnalyticsResultCacheTest(TestCase):
+
+    USER_ID = 987654
+
+    def setUp(self):
+        # Start every test on a fresh input version; the cache outlives test runs
+        cache.set(AnalyticsResultCache.VERSION_KEY.format(user_id=self.USER_ID), time.time_ns(), None)
+        self.cache = AnalyticsResultCache(ttl=60, stale_ttl=60, beta=1.0, lock_wait=0.3, background_refresh=False)
+
+    def entry_key(self, analysis='cycle', **params):
+        return self.cache.cache_key(analysis, self.USER_ID, **params)
+
+    def test_computes_once_then_hits(self):
+        compute = Counter()
+        with mock.patch.object(result_cache.random, 'random', return_value=0.0):
+            first = self.cache.get('cycle', self.USER_ID, compute, day='2024-01-01')
+            second = self.cache.get('cycle', self.USER_ID, compute, day='2024-01-01')
+            self.cache.get('cycle', self.USER_ID, compute, day='2024-01-02')
+
+        self.assertEqual(first, second)
+        self.assertEqual(compute.calls, 2)
+        info = self.cache.cache_info()
+        self.assertEqual((info['requests'], info['hit'], info['miss']), (3, 1, 2))
+        self.assertEqual(info['hit_rate'], 33.3)
+
+    def test_version_bump_stops_reading_old_entries(self):
+        compute = Counter()
+        self.cache.get('cycle', self.USER_ID, compute)
+        old_key = self.entry_key()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cache.invalidate_user(self.USER_ID)
+        self.cache.get('cycle', self.USER_ID, compute)
+
+        self.assertNotEqual(self.entry_key(), old_key)
+        self.assertIsNotNone(cache.get(old_key))  # Write-once: left to expire
+        self.assertEqual(compute.calls, 2)
+
+    def test_stale_entry_is_refreshed(self):
+        compute = Counter('new')
+        key = self.entry_key()
+        cache.set(key, {'value': 'old', 'computed_at': 0, 'delta': 0.1, 'fresh_until': time.time() - 1}, 60)
+
+        self.assertEqual(self.cache.get('cycle', self.USER_ID, compute), {'value': 'new', 'call': 1})
+        self.assertEqual(cache.get(key)['value'], {'value': 'new', 'call': 1})
+        self.assertEqual(self.cache.cache_info()['refreshes'], 1)
+
+    def test_stale_entry_served_while_refreshing_in_background(self):
+        self.cache = AnalyticsResultCache(ttl=60, stale_ttl=60, background_refresh=True)
+        refreshed = threading.Event()
+
+        def compute():
+            refreshed.set()
+            return 'new'
+
+        key = self.entry_key()
+        cache.set(key, {'value': 'old', 'computed_at': 0, 'delta': 0.1, 'fresh_until': time.time() - 1}, 60)
+
+        self.assertEqual(self.cache.get('cycle', self.USER_ID, compute), 'old')
+        self.assertTrue(refreshed.wait(5))
+        for _ in range(50):
+            if cache.get(key)['value'] == 'new':
+                break
+            time.sleep(0.02)
+        self.assertEqual(cache.get(key)['value'], 'new')
+        self.assertEqual(self.cache.cache_info()['stale_hit'], 1)
+
+    def test_failed_refresh_serves_stale_entry(self):
+        def compute():
+            raise ValueError('database unavailable')
+
+        key = self.entry_key()
+        cache.set(key, {'value': 'old', 'computed_at': 0, 'delta': 0.1, 'fresh_until': time.time() - 1}, 60)
+
+        self.assertEqual(self.cache.get('cycle', self.USER_ID, compute), 'old')
+        self.assertEqual(self.cache.cache_info()['errors'], 1)
+        self.assertIsNone(cache.get(f'{key}:lock'))
+
+    def test_probabilistic_early_expiration(self):
+        compute = Counter()
+        key = self.entry_key()
+        # Computing took 10s and 5s of freshness are left
+        cache.set(key, {'value': 'cached', 'computed_at': 0, 'delta': 10, 'fresh_until': time.time() + 5}, 60)
+
+        with mock.patch.object(result_cache.random, 'random', return_value=0.1):  # -log(0.9) * 10 ≈ 1s early
+            self.assertEqual(self.cache.get('cycle', self.USER_ID, compute), 'cached')
+        with mock.patch.object(result_cache.random, 'random', return_value=0.9):  # -log(0.1) * 10 ≈ 23s early
+            self.assertEqual(self.cache.get('cycle', self.USER_ID, compute), {'value': 'result', 'call': 1})
+        self.assertEqual(compute.calls, 1)
+
+    def test_waits_for_the_lock_holder(self):
+        compute = Counter()
+        key = self.entry_key()
+        cache.add(f'{key}:lock', 'other-process', 10)
+
+        def finish():
+            time.sleep(0.1)
+            cache.set(key, {'value': 'theirs', 'computed_at': 0, 'delta': 0.1, 'fresh_until': time.time() + 60}, 60)
+            cache.delete(f'{key}:lock')
+
+        worker = threading.Thread(target=finish)
+        worker.start()
+        self.assertEqual(self.cache.get('cycle', self.USER_ID, compute), 'theirs')
+        worker.join()
+        self.assertEqual(compute.calls, 0)
+        self.assertEqual(self.cache.cache_info()['lock_wait'], 1)
+
+    def test_computes_uncached_when_lock_holder_is_too_slow(self):
+        compute = Counter()
+        key = self.entry_key()
+        cache.add(f'{key}:lock', 'other-process', 10)
+
+        self.assertEqual(self.cache.get('cycle', self.USER_ID, compute), {'value': 'result', 'call': 1})
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(cache.get(f'{key}:lock'), 'other-process')  # Not ours to release
+        self.assertEqual(self.cache.cache_info()['uncached'], 1)
+        cache.delete(f'{key}:lock')
+
+    def test_release_never_drops_a_lock_taken_over_by_another_worker(self):
+        key = self.entry_key()
+        token = self.cache._acquire(key)
+        self.cache._release(key, token)
+        self.assertIsNone(cache.get(f'{key}:lock'))
+
+        token = self.cache._acquire(key)
+        cache.set(f'{key}:lock', 'other-process', 10)  # Ours timed out and another worker took it
+        with mock.patch.object(cache, 'get', return_value=token):  # A read that raced the takeover
+            self.cache._release(key, token)
+        self.assertEqual(cache.get(f'{key}:lock'), 'other-process')
+        cache.delete(f'{key}:lock')
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'shared'
+
+        results = []
+        workers = [
+            threading.Thread(target=lambda: results.append(self.cache.get('cycle', self.USER_ID, compute)))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(results, ['shared'] * 4)
+        self.assertEqual(len(calls), 1)
+
+
+class AnalyticsCacheInvalidationTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='cache@example.com', password='testpass123', first_name='Cache', last_name='Test'
+        )
+        self.profile = WomensHealthProfile.objects.create(user=self.user)
+        cache.set(AnalyticsResultCache.VERSION_KEY.format(user_id=self.user.id), time.time_ns(), None)
+        analytics_cache.clear_stats()
+
+    def test_saving_a_record_bumps_the_users_version(self):
+        version = analytics_cache.version(self.user.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            DailyHealthLog.objects.create(womens_health_profile=self.profile, date='2024-01-01', mood='good')
+        self.assertNotEqual(analytics_cache.version(self.user.id), version)
+
+    def test_counters_track_outcomes_and_latency(self):
+        with mock.patch.object(result_cache.random, 'random', return_value=0.0):
+            analytics_cache.get('cycle', self.user.id, Counter())
+            analytics_cache.get('cycle', self.user.id, Counter())
+
+        info = analytics_cache.cache_info()
+        self.assertEqual((info['requests'], info['miss'], info['hit'], info['hit_rate']), (2, 1, 1, 50.0))
+        self.assertGreater(info['avg_latency_ms']['miss'], 0)
@@ -0,0 +1,99 @@
+# api/tests/test_batch_predictions.py
+
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from api.agent_modules.analytics.batch_predictions import BatchPredictionRunner
+from api.agent_modules.analytics.services import HealthPredictionService
+from api.models import FertilityTracking, MenstrualCycle, WomensHealthProfile
+
+User = get_user_model()
+
+
+class BatchPredictionRunnerTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_ids = []
+        histories = [
+            [28, 29, 27, 28, 30, 28, 26, 45],      # more than six cycles: only the newest six count
+            [21, None, 35, 40],                    # missing length, irregular
+            [None, None],                          # no recorded lengths: profile average
+            [31],
+        ]
+        for index, lengths in enumerate(histories):
+            user = User.objects.create_user(
+                email=f'batch{index}@example.com', password='testpass123', first_name='Batch', last_name=str(index)
+            )
+            profile = WomensHealthProfile.objects.create(user=user, average_cycle_length=30 + index)
+            start = date(2024, 1, 1)
+            for length in lengths:
+                MenstrualCycle.objects.create(
+                    womens_health_profile=profile, cycle_start_date=start, cycle_length=length
+                )
+                start += timedelta(days=length or 29)
+            cls.user_ids.append(user.pk)
+
+        # Positive ovulation tests shift the fertility window for the first user
+        first_profile = WomensHealthProfile.objects.get(user_id=cls.user_ids[0])
+        for offset, (result, cycle_day) in enumerate([('positive', 16), ('negative', 10), ('positive', 17)]):
+            FertilityTracking.objects.create(
+                womens_health_profile=first_profile, date=date(2024, 6, 1) + timedelta(days=offset),
+                cycle_day=cycle_day, ovulation_test_result=result,
+            )
+
+        no_cycles = User.objects.create_user(
+            email='batch-empty@example.com', password='testpass123', first_name='Batch', last_name='Empty'
+        )
+        WomensHealthProfile.objects.create(user=no_cycles)
+        no_profile = User.objects.create_user(
+            email='batch-none@example.com', password='testpass123', first_name='Batch', last_name='None'
+        )
+        cls.no_cycles_id, cls.no_profile_id = no_cycles.pk, no_profile.pk
+
+    def expected(self, user_id):
+        service = HealthPredictionService()
+        return service.predict_next_period(user_id), service.predict_fertility_window(user_id)
+
+    def test_matches_per_user_service(self):
+        predictions = {
+            user_id: (period, fertility)
+            for user_id, period, fertility in BatchPredictionRunner(workers=1).predict(self.user_ids + [self.no_cycles_id])
+        }
+        for user_id in self.user_ids + [self.no_cycles_id]:
+            with self.subTest(user_id=user_id):
+                self.assertEqual(predictions[user_id], self.expected(user_id))
+
+    def test_chunk_is_loaded_in_three_queries(self):
+        runner = BatchPredictionRunner(workers=1)
+        with self.assertNumQueries(3):
+            runner.load_chunk(self.user_ids + [self.no_profile_id], date.today())
+
+    def test_process_pool_gives_same_results(self):
+        user_ids = self.user_ids + [self.no_cycles_id, self.no_profile_id]
+        inline = list(BatchPredictionRunner(chunk_size=2, workers=1).predict(user_ids))
+        pooled = list(BatchPredictionRunner(chunk_size=2, workers=2).predict(user_ids))
+        self.assertEqual(pooled, inline)
+
+    def test_daemonic_process_computes_inline(self):
+        """Celery prefork children are daemonic; no pool is started there"""
+        user_ids = self.user_ids + [self.no_cycles_id, self.no_profile_id]
+        inline = list(BatchPredictionRunner(chunk_size=2, workers=1).predict(user_ids))
+        with mock.patch('multiprocessing.current_process', return_value=mock.Mock(daemon=True)), \
+                mock.patch('api.agent_modules.analytics.batch_predictions.ProcessPoolExecutor') as pool:
+            daemonic = list(BatchPredictionRunner(chunk_size=2, workers=2).predict(user_ids))
+        pool.assert_not_called()
+        self.assertEqual(daemonic, inline)
+
+    def test_users_without_data_are_reported(self):
+        results = BatchPredictionRunner(workers=1).run(
+            self.user_ids + [self.no_cycles_id, self.no_profile_id], save=False
+        )
+        self.assertEqual(results['successful_updates'], len(self.user_ids))
+        self.assertEqual(
+            sorted(error['user_id'] for error in results['errors']),
+            sorted([self.no_cycles_id, self.no_profile_id])
+        )
@@ -0,0 +1,157 @@
+# api/tests/test_bed_allocation.py
+
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from api.models import Department, Hospital
+from api.services.bed_allocation import BedAllocationService
+
+
+def create_department(total_beds=10, icu_beds=2, **overrides):
+    hospital = Hospital.objects.create(
+        name="Test Hospital",
+        address="123 Test St",
+        city="Test City",
+        state="Test State",
+        country="Test Country",
+        postal_code="12345",
+        phone="1234567890",
+        email="test@hospital.com",
+        registration_number="TEST001",
+        hospital_type="public",
+        bed_capacity=100
+    )
+    fields = dict(
+        name="Emergency",
+        code="EMER01",
+        department_type="emergency",
+        hospital=hospital,
+        minimum_staff_required=1,
+        current_staff_count=5,
+        total_beds=total_beds,
+        icu_beds=icu_beds,
+    )
+    fields.update(overrides)
+    return Department.objects.create(**fields)
+
+
+class BedAllocationTestCase(TestCase):
+    """Test conditional-UPDATE bed allocation"""
+
+    def setUp(self):
+        self.department = create_department(total_beds=2, icu_beds=1)
+        cache.delete_many([f'bed_capacity_alert:{self.department.pk}:{bed_type}' for bed_type in ('regular', 'icu')])
+
+    def test_assign_returns_counts_without_reload(self):
+        result = self.department.assign_bed()
+
+        self.assertEqual(result['occupied'], 1)
+        self.assertEqual(result['available'], 1)
+        self.assertEqual(self.department.occupied_beds, 1)
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.occupied_beds, 1)
+
+    def test_full_department_rejects_assignment(self):
+        self.department.assign_bed(is_icu=True)
+        with self.assertRaisesMessage(ValidationError, 'No ICU beds available'):
+            self.department.assign_bed(is_icu=True)
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.occupied_icu_beds, 1)
+
+    def test_stale_instance_cannot_over_allocate(self):
+        stale = Department.objects.get(pk=self.department.pk)
+        self.department.assign_bed()
+        self.department.assign_bed()
+        with self.assertRaises(ValidationError):
+            stale.assign_bed()
+
+    def test_release_never_goes_negative(self):
+        result = BedAllocationService.release(self.department, count_patient=True)
+        self.assertFalse(result['released'])
+        self.assertEqual(result['occupied'], 0)
+        self.assertEqual(result['current_patient_count'], 0)
+
+    def test_admission_counts_patient_in_same_update(self):
+        BedAllocationService.assign(self.department, count_patient=True)
+        self.department.refresh_from_db()
+        self.assertEqual(self.department.occupied_beds, 1)
+        self.assertEqual(self.department.current_patient_count, 1)
+
+    def test_capacity_alert_sent_after_commit(self):
+        with mock.patch.object(BedAllocationService, '_alert_executor') as executor:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                self.department.assign_bed()
+                self.department.assign_bed()  # 100% occupancy
+            executor.submit.assert_not_called()
+            self.assertEqual(len(callbacks), 1)
+
+            for callback in callbacks:
+                callback()
+            executor.submit.assert_called_once()
+
+
+class BedAllocationConcurrencyTestCase(TransactionTestCase):
+    """Stress bed allocation from many threads at once"""
+
+    def test_concurrent_admissions_never_over_allocate(self):
+        department = create_department(total_beds=10)
+        barrier = threading.Barrier(25)
+        outcomes = []
+        lock = threading.Lock()
+
+        def admit():
+            worker_department = Department.objects.get(pk=department.pk)
+            barrier.wait()
+            try:
+                BedAllocationService.assign(worker_department, count_patient=True)
+                outcome = 'assigned'
+            except ValidationError:
+                outcome = 'full'
+            finally:
+                connection.close()
+            with lock:
+                outcomes.append(outcome)
+
+        threads = [threading.Thread(target=admit) for _ in range(25)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        department.refresh_from_db()
+        self.assertEqual(outcomes.count('assigned'), 10)
+        self.assertEqual(outcomes.count('full'), 15)
+        self.assertEqual(department.occupied_beds, 10)
+        self.assertEqual(department.current_patient_count, 10)
+
+    def test_concurrent_admit_and_discharge_keep_counts_consistent(self):
+        department = create_department(total_beds=50)
+        for _ in range(20):
+            BedAllocationService.assign(department, count_patient=True)
+        barrier = threading.Barrier(40)
+
+        def worker(index):
+            worker_department = Department.objects.get(pk=department.pk)
+            barrier.wait()
+            try:
+                if index % 2:
+                    BedAllocationService.assign(worker_department, count_patient=True)
+                else:
+                    BedAllocationService.release(worker_department, count_patient=True)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        department.refresh_from_db()
+        self.assertEqual(department.occupied_beds, 20)
+        self.assertEqual(department.current_patient_count, 20)
@@ -0,0 +1,80 @@
+# api/tests/test_benchmark_suite.py
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase
+
+from api.services.benchmark_suite import BenchmarkDataset, BenchmarkSuite
+
+
+def result(p50, p95, queries):
+    return {'runs': 20, 'p50_ms': p50, 'p95_ms': p95, 'max_ms': p95, 'mean_ms': p50, 'queries': queries}
+
+
+class BenchmarkCompareTest(SimpleTestCase):
+
+    def test_regressions(self):
+        baseline = {'drug_search': result(4.0, 6.0, 1), 'slot_listing': result(30.0, 40.0, 33)}
+        current = {
+            'drug_search': result(4.5, 7.5, 1),  # +25% p95 but only 1.5 ms: noise
+            'slot_listing': result(31.0, 60.0, 34),
+            'message_send': result(20.0, 25.0, 17),  # Not in the baseline
+        }
+        regressions = BenchmarkSuite.compare(current, baseline, tolerance=0.25, min_delta_ms=2.0)
+        self.assertEqual(
+            [(r['scenario'], r['metric'], r['change']) for r in regressions],
+            [('slot_listing', 'p95_ms', '+50%'), ('slot_listing', 'queries', '+1')]
+        )
+        self.assertEqual(BenchmarkSuite.compare(baseline, baseline), [])
+
+
+class BenchmarkSuiteTest(TestCase):
+
+    def test_every_scenario_runs_on_the_seeded_dataset(self):
+        with BenchmarkSuite.isolated():
+            dataset = BenchmarkDataset(scale=0.1, seed=7).seed_data()
+            results = BenchmarkSuite.run(dataset, repeat=2, warmup=1)
+
+        self.assertEqual(list(results), list(BenchmarkSuite.SCENARIOS))
+        for name, summary in results.items():
+            self.assertEqual(summary['runs'], 2, name)
+            self.assertGreater(summary['queries'], 0, name)
+            self.assertLessEqual(summary['p50_ms'], summary['p95_ms'], name)
+
+    def test_dataset_is_deterministic(self):
+        def seed():
+            with BenchmarkSuite.isolated():
+                dataset = BenchmarkDataset(scale=0.1, seed=7).seed_data()
+                return (
+                    [(doctor.user.email, doctor.consultation_days, doctor.years_of_experience)
+                     for doctor in dataset.doctors],
+                    sorted(dataset.doctors[0].appointments.values_list('appointment_date', 'status')),
+                    [drug.generic_name for drug in dataset.drugs],
+                )
+
+        self.assertEqual(seed(), seed())
+
+    def test_command_saves_and_compares_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'baseline.json')
+            arguments = ['--scale', '0.1', '--repeat', '2', '--scenario', 'drug_search', '--baseline', path]
+            call_command('run_benchmarks', *arguments, '--save-baseline', stdout=StringIO())
+            with open(path) as baseline_file:
+                baseline = json.load(baseline_file)
+            self.assertEqual(baseline['scale'], 0.1)
+            self.assertEqual(baseline['results']['drug_search']['queries'], 1)
+
+            out = StringIO()
+            call_command('run_benchmarks', *arguments, '--tolerance', '100', stdout=out, stderr=StringIO())
+            self.assertIn('No regressions against the baseline', out.getvalue())
+
+            baseline['results']['drug_search']['queries'] = 0
+            with open(path, 'w') as baseline_file:
+                json.dump(baseline, baseline_file)
+            with self.assertRaises(CommandError):
+                call_command('run_benchmarks', *arguments, '--tolerance', '100', stdout=StringIO(), stderr=StringIO())
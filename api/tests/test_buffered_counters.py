@@ -0,0 +1,237 @@
+# api/tests/test_buffered_counters.py
+
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Hospital
+from api.models.medical.clinical_guideline import ClinicalGuideline
+from api.serializers import ClinicalGuidelineSerializer
+from api.services.buffered_counters import BufferedCounterService, LocalCounterBuffer, RedisCounterBuffer
+
+User = get_user_model()
+
+
+def create_guideline():
+    hospital = Hospital.objects.create(
+        name="Test Hospital",
+        address="123 Test St",
+        city="Test City",
+        state="Test State",
+        country="Test Country",
+        postal_code="12345",
+        phone="1234567890",
+        email="test@hospital.com",
+        registration_number="TEST001",
+        hospital_type="public",
+        bed_capacity=100
+    )
+    admin = User.objects.create_user(
+        email='admin@example.com', password='testpass123', first_name='Ada', last_name='Admin'
+    )
+    return ClinicalGuideline.objects.create(
+        title="Sepsis bundle",
+        description="Hour-one sepsis bundle",
+        organization=hospital,
+        created_by=admin,
+        category='emergency',
+        content_type='text',
+        text_content='Take cultures, give antibiotics.',
+        effective_date='2025-01-01',
+    )
+
+
+class BufferedCounterMixin:
+    backend = 'local'
+
+    def setUp(self):
+        super().setUp()
+        self.settings_override = override_settings(
+            BUFFERED_COUNTER_BACKEND=self.backend, BUFFERED_COUNTER_FLUSH_INTERVAL=0
+        )
+        self.settings_override.enable()
+        BufferedCounterService._buffer = None
+        BufferedCounterService._local_fallback = LocalCounterBuffer()
+        self.guideline = create_guideline()
+        # Clear anything a previous run left in Redis for this row
+        BufferedCounterService.flush()
+
+    def tearDown(self):
+        BufferedCounterService._buffer = None
+        self.settings_override.disable()
+        super().tearDown()
+
+
+class LocalBufferedCounterTestCase(BufferedCounterMixin, TestCase):
+    """Test buffered counters with the in-process buffer"""
+
+    def test_increment_does_not_touch_database(self):
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(5):
+                self.guideline.increment_access_count()
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(self.guideline.current_access_count, 5)
+        self.assertEqual(ClinicalGuideline.objects.get(pk=self.guideline.pk).access_count, 0)
+
+    def test_repeated_increments_on_one_instance(self):
+        for _ in range(3):
+            self.guideline.increment_access_count()
+        self.assertEqual(self.guideline.current_access_count, 3)
+        self.assertEqual(ClinicalGuideline.objects.get(pk=self.guideline.pk).current_access_count, 3)
+
+        BufferedCounterService.flush()
+        self.guideline.refresh_from_db()
+        self.guideline.increment_access_count()
+        self.assertEqual(self.guideline.access_count, 3)
+        self.assertEqual(self.guideline.current_access_count, 4)
+
+    def test_reads_combine_persisted_and_pending(self):
+        ClinicalGuideline.objects.filter(pk=self.guideline.pk).update(access_count=10)
+        self.guideline.increment_access_count()
+        self.guideline.increment_access_count()
+
+        fresh = ClinicalGuideline.objects.get(pk=self.guideline.pk)
+        self.assertEqual(fresh.access_count, 10)
+        self.assertEqual(fresh.current_access_count, 12)
+
+    def test_flush_applies_deltas_atomically(self):
+        for _ in range(3):
+            self.guideline.increment_access_count()
+        # A concurrent writer bumps the column between increments and flush
+        ClinicalGuideline.objects.filter(pk=self.guideline.pk).update(access_count=100)
+
+        updated = BufferedCounterService.flush()
+
+        self.assertEqual(updated, {'api.clinicalguideline.access_count': 1})
+        fresh = ClinicalGuideline.objects.get(pk=self.guideline.pk)
+        self.assertEqual(fresh.access_count, 103)
+        self.assertEqual(fresh.current_access_count, 103)
+        self.assertEqual(BufferedCounterService.flush(), {})
+
+    def test_counts_do_not_drop_while_flushing(self):
+        for _ in range(3):
+            self.guideline.increment_access_count()
+        original_apply = BufferedCounterService._apply
+        seen = []
+
+        def observing_apply(drained):
+            # Drained but not committed yet: still pending for readers
+            seen.append(self.guideline.current_access_count)
+            return original_apply(drained)
+
+        with mock.patch.object(BufferedCounterService, '_apply', observing_apply):
+            BufferedCounterService.flush()
+
+        self.assertEqual(seen, [3])
+        self.assertEqual(ClinicalGuideline.objects.get(pk=self.guideline.pk).current_access_count, 3)
+
+    def test_serializer_includes_pending_increments(self):
+        ClinicalGuideline.objects.filter(pk=self.guideline.pk).update(access_count=10)
+        self.guideline.refresh_from_db()
+        self.guideline.increment_access_count()
+
+        self.assertEqual(ClinicalGuidelineSerializer(self.guideline).data['access_count'], 11)
+
+    def test_failed_flush_keeps_deltas(self):
+        self.guideline.increment_access_count()
+        original_apply = BufferedCounterService._apply
+
+        def failing_apply(drained):
+            raise RuntimeError("database unavailable")
+
+        BufferedCounterService._apply = failing_apply
+        try:
+            with self.assertRaises(RuntimeError):
+                BufferedCounterService.flush()
+        finally:
+            BufferedCounterService._apply = original_apply
+
+        BufferedCounterService.flush()
+        self.assertEqual(ClinicalGuideline.objects.get(pk=self.guideline.pk).access_count, 1)
+
+    def test_concurrent_increments_are_not_lost(self):
+        def worker():
+            for _ in range(200):
+                self.guideline.increment_access_count()
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        BufferedCounterService.flush()
+        self.assertEqual(ClinicalGuideline.objects.get(pk=self.guideline.pk).access_count, 1600)
+
+
+class RedisBufferedCounterTestCase(BufferedCounterMixin, TransactionTestCase):
+    """Test buffered counters shared through Redis"""
+
+    backend = 'redis'
+
+    def setUp(self):
+        try:
+            from django.core.cache import cache
+            cache.set('buffered_counter_test_ping', 1, 5)
+        except Exception:
+            self.skipTest("Redis is not available")
+        super().setUp()
+
+    def test_increments_are_shared_and_flushed(self):
+        other_copy = ClinicalGuideline.objects.get(pk=self.guideline.pk)
+        self.guideline.increment_access_count()
+        other_copy.increment_access_count()
+
+        self.assertEqual(other_copy.current_access_count, 2)
+        self.assertEqual(BufferedCounterService.pending(ClinicalGuideline, 'access_count', [self.guideline.pk]),
+                         {self.guideline.pk: 2})
+
+        BufferedCounterService.flush()
+
+        fresh = ClinicalGuideline.objects.get(pk=self.guideline.pk)
+        self.assertEqual(fresh.access_count, 2)
+        self.assertEqual(fresh.current_access_count, 2)
+
+    def test_moved_aside_deltas_stay_pending_until_acknowledged(self):
+        buffer = BufferedCounterService._get_buffer()
+        for _ in range(3):
+            self.guideline.increment_access_count()
+
+        drained = buffer.drain()
+        self.guideline.increment_access_count()  # Lands in the fresh live hash
+        self.assertEqual(self.guideline.current_access_count, 4)
+
+        BufferedCounterService._apply(drained)
+        buffer.acknowledge()
+        fresh = ClinicalGuideline.objects.get(pk=self.guideline.pk)
+        self.assertEqual(fresh.access_count, 3)
+        self.assertEqual(fresh.current_access_count, 4)
+
+    def test_concurrent_flushers_apply_each_delta_once(self):
+        first = BufferedCounterService._get_buffer()
+        second = RedisCounterBuffer(settings.CACHES['default']['LOCATION'])
+        for _ in range(3):
+            self.guideline.increment_access_count()
+
+        drained = first.drain()
+        counter = BufferedCounterService.counter_name(ClinicalGuideline, 'access_count')
+        self.assertEqual(drained[counter], {str(self.guideline.pk): 3})
+
+        # Another process flushing meanwhile finds the lock taken and must leave it alone
+        BufferedCounterService._buffer = second
+        self.assertEqual(BufferedCounterService.flush(), {})
+        self.assertEqual(first.client.get(first.lock_key).decode(), first.lock_token)
+        self.assertIsNone(RedisCounterBuffer(settings.CACHES['default']['LOCATION']).drain())
+
+        BufferedCounterService._apply(drained)
+        first.acknowledge()
+        self.assertIsNone(first.client.get(first.lock_key))
+
+        self.assertEqual(BufferedCounterService.flush(), {})
+        self.assertEqual(ClinicalGuideline.objects.get(pk=self.guideline.pk).access_count, 3)
@@ -0,0 +1,219 @@
+# api/tests/test_content_addressed_storage.py
+
+import os
+import shutil
+import tempfile
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.models import Hospital, HospitalAdmin
+from api.models.medical.clinical_guideline import ClinicalGuideline
+from api.models.secure_documents import ContentBlob, SecureDocument
+from api.services.content_addressed_storage import ContentAddressedStorage
+
+User = get_user_model()
+
+
+class SecureVaultDeduplicationTestCase(TestCase):
+    """Test content-addressed deduplication of secure vault uploads"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.alice = User.objects.create_user(
+            email='alice@example.com', password='testpass123', first_name='Alice', last_name='Patient'
+        )
+        self.bob = User.objects.create_user(
+            email='bob@example.com', password='testpass123', first_name='Bob', last_name='Patient'
+        )
+        self.content = b'%PDF-1.4\n' + b'referral letter body\n' * 500
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def _upload(self, user, name='referral.pdf', content=None):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        uploaded = SimpleUploadedFile(name, content or self.content, content_type='application/pdf')
+        response = client.post('/api/secure/upload/', {'files': [uploaded]}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        result = response.data['results'][0]
+        self.assertTrue(result['success'], result)
+        return client, result
+
+    def test_repeated_upload_shares_one_blob(self):
+        _, first = self._upload(self.alice)
+        _, second = self._upload(self.bob, name='copy.pdf')
+
+        self.assertEqual(ContentBlob.objects.count(), 1)
+        blob = ContentBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(SecureDocument.objects.filter(blob=blob).count(), 2)
+
+    def test_responses_do_not_reveal_shared_storage(self):
+        self._upload(self.alice)
+        bob_client, result = self._upload(self.bob, name='copy.pdf')
+        blob = ContentBlob.objects.get()
+
+        detail = bob_client.get(f"/api/secure/files/{result['file_id']}/").data
+        listing = bob_client.get('/api/secure/files/').data
+        for payload in (result, detail, listing):
+            self.assertNotIn(blob.digest, str(payload))
+            self.assertNotIn('deduplicated', str(payload))
+
+    def test_repeated_upload_is_still_scanned(self):
+        self._upload(self.alice)
+        with mock.patch('api.views.security.secure_upload.SecureVirusScanner.scan_file',
+                        return_value={'is_clean': False, 'threats_found': 1, 'scan_details': ['EICAR']}) as scan:
+            client = APIClient()
+            client.force_authenticate(user=self.bob)
+            uploaded = SimpleUploadedFile('copy.pdf', self.content, content_type='application/pdf')
+            result = client.post('/api/secure/upload/', {'files': [uploaded]}, format='multipart').data['results'][0]
+
+        scan.assert_called_once()
+        self.assertEqual(result['phase'], 'virus_scan')
+        self.assertEqual(ContentBlob.objects.get().ref_count, 1)
+
+    def test_each_owner_can_preview_only_their_row(self):
+        alice_client, first = self._upload(self.alice)
+        bob_client, second = self._upload(self.bob)
+
+        response = bob_client.get(f"/api/secure/files/{second['file_id']}/preview/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+        response = bob_client.get(f"/api/secure/files/{first['file_id']}/preview/")
+        self.assertEqual(response.status_code, 404)
+
+    def test_blob_removed_with_last_reference(self):
+        alice_client, first = self._upload(self.alice)
+        bob_client, second = self._upload(self.bob)
+        blob = ContentBlob.objects.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            alice_client.delete(f"/api/secure/files/{first['file_id']}/delete/")
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 1)
+        self.assertTrue(os.path.exists(blob.full_path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bob_client.delete(f"/api/secure/files/{second['file_id']}/delete/")
+        self.assertFalse(ContentBlob.objects.exists())
+        self.assertFalse(os.path.exists(blob.full_path))
+
+    def test_different_content_gets_its_own_blob(self):
+        self._upload(self.alice)
+        self._upload(self.alice, content=b'%PDF-1.4\nanother document')
+        self.assertEqual(ContentBlob.objects.count(), 2)
+
+    def blob_files(self):
+        return [name for _, _, names in os.walk(self.media_root) for name in names]
+
+    def test_rolled_back_upload_leaves_no_blob_file(self):
+        with mock.patch.object(SecureDocument.objects, 'create', side_effect=RuntimeError("insert failed")):
+            client = APIClient()
+            client.force_authenticate(user=self.alice)
+            uploaded = SimpleUploadedFile('referral.pdf', self.content, content_type='application/pdf')
+            result = client.post('/api/secure/upload/', {'files': [uploaded]}, format='multipart').data['results'][0]
+
+        self.assertFalse(result['success'])
+        self.assertFalse(ContentBlob.objects.exists())
+        self.assertEqual(self.blob_files(), [])
+
+    def test_enclosing_rollback_removes_blob_file(self):
+        uploaded = SimpleUploadedFile('referral.pdf', self.content, content_type='application/pdf')
+        digest, size = ContentAddressedStorage.hash_upload(uploaded)
+        with ContentAddressedStorage.atomic():
+            ContentAddressedStorage.store_vault_upload(uploaded, digest, size)
+            self.assertEqual(len(self.blob_files()), 1)
+            transaction.set_rollback(True)
+
+        self.assertFalse(ContentBlob.objects.exists())
+        self.assertEqual(self.blob_files(), [])
+
+    def test_blobs_stay_readable_after_key_rotation(self):
+        with self.settings(VAULT_BLOB_KEYS={'2026-01': 'first-secret'}, VAULT_BLOB_KEY_ID='2026-01'):
+            alice_client, first = self._upload(self.alice)
+
+        keys = {'2026-01': 'first-secret', '2026-10': 'second-secret'}
+        with self.settings(VAULT_BLOB_KEYS=keys, VAULT_BLOB_KEY_ID='2026-10', SECRET_KEY='rotated-secret-key'):
+            _, second = self._upload(self.bob, content=b'%PDF-1.4\nanother document')
+            response = alice_client.get(f"/api/secure/files/{first['file_id']}/preview/")
+            self.assertEqual(b''.join(response.streaming_content), self.content)
+
+        self.assertEqual(
+            dict(ContentBlob.objects.values_list('digest', 'key_id')),
+            {
+                ContentAddressedStorage.hash_upload(SimpleUploadedFile('a', self.content))[0]: '2026-01',
+                ContentAddressedStorage.hash_upload(SimpleUploadedFile('b', b'%PDF-1.4\nanother document'))[0]: '2026-10',
+            }
+        )
+
+
+class GuidelineBlobRollbackTestCase(TestCase):
+    """Test that a failed guideline file update leaves no orphaned blob file"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        hospital = Hospital.objects.create(
+            name="Test Hospital",
+            address="123 Test St",
+            city="Test City",
+            state="Test State",
+            country="Test Country",
+            postal_code="12345",
+            phone="1234567890",
+            email="test@hospital.com",
+            registration_number="TEST001",
+            hospital_type="public",
+            bed_capacity=100
+        )
+        admin = User.objects.create_user(
+            email='admin@example.com', password='testpass123', first_name='Ada', last_name='Admin',
+            role='hospital_admin'
+        )
+        HospitalAdmin.objects.create(
+            user=admin, hospital=hospital, name='Ada Admin', position='Medical Director',
+            email='admin@example.com'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=admin)
+        self.guideline = ClinicalGuideline.objects.create(
+            title="Sepsis bundle",
+            description="Hour-one sepsis bundle",
+            organization=hospital,
+            created_by=admin,
+            category='emergency',
+            content_type='text',
+            text_content='Take cultures, give antibiotics.',
+            effective_date='2025-01-01',
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_failed_file_update_removes_blob_file(self):
+        uploaded = SimpleUploadedFile('sepsis.pdf', b'%PDF-1.4\n' + b'bundle step\n' * 50,
+                                      content_type='application/pdf')
+        with mock.patch.object(ClinicalGuideline, 'save', side_effect=RuntimeError("update failed")):
+            response = self.client.post(
+                f'/api/clinical-guidelines/{self.guideline.guideline_id}/update-file/',
+                {'file': uploaded}, format='multipart'
+            )
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(ContentBlob.objects.exists())
+        self.assertEqual([name for _, _, names in os.walk(self.media_root) for name in names], [])
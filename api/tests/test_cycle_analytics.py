@@ -0,0 +1,148 @@
+# api/tests/test_cycle_analytics.py
+
+import random
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from api.agent_modules.analytics.cycle_engine import CycleAnalyticsEngine
+from api.agent_modules.analytics.services import CycleAnalyticsService
+from api.models import DailyHealthLog, MenstrualCycle, WomensHealthProfile
+from api.tests.golden_cycle_analytics import GOLDEN
+
+User = get_user_model()
+
+NOW = datetime(2024, 6, 30, 12, 0, tzinfo=dt_timezone.utc)
+
+MOODS = ['excellent', 'good', 'neutral', 'low', 'poor', 'anxious', 'stressed', 'depressed']
+ENERGY_LEVELS = ['very_low', 'low', 'normal', 'high', 'very_high']
+SLEEP_QUALITIES = ['excellent', 'good', 'fair', 'poor', 'very_poor', None]
+SYMPTOMS = ['cramps', 'headache', 'bloating', 'fatigue', 'acne', 'back_pain']
+
+
+def create_history(email, cycles, log_days, seed):
+    """
+    A profile with cycles given as (start_date, cycle_length, period_length) and
+    daily logs on the given dates, filled from a seeded generator.
+    """
+    rng = random.Random(seed)
+    user = User.objects.create_user(email=email, password='testpass123', first_name='Cycle', last_name='Tracker')
+    profile = WomensHealthProfile.objects.create(user=user)
+    for start, cycle_length, period_length in cycles:
+        MenstrualCycle.objects.create(
+            womens_health_profile=profile, cycle_start_date=start,
+            cycle_length=cycle_length, period_length=period_length,
+        )
+    for day in log_days:
+        DailyHealthLog.objects.create(
+            womens_health_profile=profile,
+            date=day,
+            mood=rng.choice(MOODS + [None]),
+            energy_level=rng.choice(ENERGY_LEVELS + [None]),
+            symptoms=rng.sample(SYMPTOMS, rng.randint(0, 3)),
+            sleep_duration_hours=rng.choice([None, Decimal(f'{rng.uniform(4, 10):.2f}')]),
+            sleep_quality=rng.choice(SLEEP_QUALITIES),
+        )
+    return user
+
+
+def irregular_history():
+    starts = [
+        (date(2024, 1, 10), 28, 5), (date(2024, 2, 7), 45, 6), (date(2024, 3, 23), 19, 4),
+        (date(2024, 4, 11), None, None), (date(2024, 6, 5), 22, 5), (date(2024, 6, 27), None, 5),
+    ]
+    log_days = [date(2024, 3, 20) + timedelta(days=offset) for offset in range(0, 102) if offset % 3 != 1]
+    return create_history('irregular@example.com', starts, log_days, seed=1)
+
+
+def regular_history():
+    starts = [(date(2024, 3, 1) + timedelta(days=28 * index), 28, 5) for index in range(4)]
+    log_days = [date(2024, 6, 10) + timedelta(days=offset) for offset in range(10)]
+    return create_history('regular@example.com', starts, log_days, seed=2)
+
+
+def sparse_history():
+    starts = [(date(2024, 5, 1), 30, 5), (date(2024, 5, 31), None, None)]
+    return create_history('sparse@example.com', starts, [], seed=3)
+
+
+def without_phase_statistics(output):
+    return {key: value for key, value in output.items() if key != 'phase_statistics'}
+
+
+class CycleAnalyticsGoldenTest(TestCase):
+    """The vectorized service must reproduce the per-row implementation exactly"""
+
+    def test_outputs_match_golden(self):
+        with mock.patch('django.utils.timezone.now', return_value=NOW):
+            service = CycleAnalyticsService()
+            for name, builder in [('irregular', irregular_history), ('regular', regular_history), ('sparse', sparse_history)]:
+                user = builder()
+                outputs = {'irregularities': service.detect_irregularities(user.pk)}
+                for months in (1, 3):
+                    outputs[f'irregularities_{months}'] = service.detect_irregularities(user.pk, months)
+                for data_type in ('mood', 'energy', 'symptoms', 'sleep', 'weight'):
+                    for days in (90, 30, 7):
+                        outputs[f'{data_type}_{days}'] = without_phase_statistics(
+                            service.analyze_patterns(user.pk, data_type, days)
+                        )
+
+                for key, expected in GOLDEN[name].items():
+                    with self.subTest(history=name, output=key):
+                        self.assertEqual(outputs[key], expected)
+                        # Same types too (no numpy scalars leaking into the JSON responses)
+                        self.assertEqual(repr(outputs[key]), repr(expected))
+
+    def test_phase_statistics(self):
+        with mock.patch('django.utils.timezone.now', return_value=NOW):
+            user = regular_history()
+            mood = CycleAnalyticsService().analyze_patterns(user.pk, 'mood', 30)
+
+        phases = mood['phase_statistics']
+        self.assertEqual(list(phases), ['menstrual', 'follicular', 'ovulation', 'luteal'])
+        # Logs run from day 18 to day 27 of the cycle that started on 24 May
+        self.assertEqual(phases['luteal']['entries'], mood['total_entries'])
+        self.assertEqual(phases['menstrual'], {'entries': 0, 'average': None})
+
+
+class CycleAnalyticsEngineTest(SimpleTestCase):
+
+    def test_cycle_phases_follow_cycle_days(self):
+        starts = CycleAnalyticsEngine.ordinals([date(2024, 1, 1), date(2024, 1, 29)])
+        log_days = [date(2023, 12, 31)] + [date(2024, 1, 1) + timedelta(days=offset) for offset in range(30)]
+        phases = CycleAnalyticsEngine.cycle_phases(
+            CycleAnalyticsEngine.ordinals(log_days), starts, np.array([5, 3]), 28
+        ).tolist()
+
+        self.assertEqual(phases[0], '')
+        self.assertEqual(phases[1:6], ['menstrual'] * 5)
+        self.assertEqual(phases[6:12], ['follicular'] * 6)
+        self.assertEqual(phases[12:17], ['ovulation'] * 5)
+        self.assertEqual(phases[17:29], ['luteal'] * 12)
+        self.assertEqual(phases[29:], ['menstrual', 'menstrual'])
+
+    def test_phase_statistics_average_per_phase(self):
+        phases = np.array(['menstrual', 'luteal', 'menstrual', ''], dtype=object)
+        statistics = CycleAnalyticsEngine.phase_statistics(phases, np.array([1.0, 4.0, 2.0, 5.0]))
+
+        self.assertEqual(statistics['menstrual'], {'entries': 2, 'average': 1.5})
+        self.assertEqual(statistics['luteal'], {'entries': 1, 'average': 4.0})
+        self.assertEqual(statistics['ovulation'], {'entries': 0, 'average': None})
+
+    def test_counts_and_groups_keep_first_seen_order(self):
+        self.assertEqual(list(CycleAnalyticsEngine.counts_in_order(['low', 'high', 'low', 'normal']).items()),
+                         [('low', 2), ('high', 1), ('normal', 1)])
+        groups = CycleAnalyticsEngine.group_in_order(np.array([3, 1, 3, 2]), ['a', 'b', 'c', 'd'])
+        self.assertEqual(list(groups.items()), [(3, ['a', 'c']), (1, ['b']), (2, ['d'])])
+
+    def test_mood_trend_directions(self):
+        service = CycleAnalyticsService()
+        declining = np.array([5.0] * 7 + [1.0] * 7)
+        self.assertEqual(service._calculate_mood_trends(declining)['trend'], 'declining')
+        self.assertEqual(service._calculate_mood_trends(declining[::-1])['trend'], 'improving')
+        self.assertEqual(service._calculate_mood_trends(np.full(14, 3.0))['trend'], 'stable')
+        self.assertEqual(service._calculate_mood_trends(np.full(9, 3.0))['trend'], 'insufficient_data')
@@ -0,0 +1,94 @@
+# api/tests/test_drug_catalogue_import.py
+
+from django.test import TestCase
+
+from api.models import DrugClassification
+from api.services.drug_catalogue_import import DrugCatalogueImporter
+from api.services.grouped_stats import DrugStatistics
+from api.tests.test_grouped_stats import reset_versions
+
+
+def drug_row(name, **overrides):
+    row = {
+        'generic_name': name,
+        'brand_names': [f'{name} Brand'],
+        'therapeutic_class': 'Analgesic',
+        'nafdac_approved': True,
+        'minimum_age': None,
+    }
+    row.update(overrides)
+    return row
+
+
+class DrugCatalogueImporterTestCase(TestCase):
+    """Test the COPY-based drug catalogue import and diff"""
+
+    def run_import(self, rows, **kwargs):
+        run_kwargs = {key: kwargs.pop(key) for key in ('dry_run', 'clear') if key in kwargs}
+        importer = DrugCatalogueImporter(**kwargs)
+        importer.add_rows(rows, source='test')
+        return importer.run(**run_kwargs)
+
+    def test_creates_new_drugs(self):
+        summary = self.run_import([drug_row('Paracetamol'), drug_row('Ibuprofen', minimum_age='12')])
+
+        self.assertEqual(summary['created'], ['Ibuprofen', 'Paracetamol'])
+        ibuprofen = DrugClassification.objects.get(generic_name='Ibuprofen')
+        self.assertEqual(ibuprofen.brand_names, ['Ibuprofen Brand'])
+        self.assertEqual(ibuprofen.minimum_age, 12)
+        self.assertEqual(ibuprofen.pregnancy_category, 'N')  # model default
+
+    def test_diff_reports_changed_columns_only(self):
+        self.run_import([drug_row('Paracetamol'), drug_row('Ibuprofen')])
+        summary = self.run_import([
+            drug_row('Paracetamol'),
+            drug_row('Ibuprofen', therapeutic_class='NSAID', brand_names=['Brufen']),
+        ])
+
+        self.assertEqual(summary['created'], [])
+        self.assertEqual(summary['updated'], [('Ibuprofen', ['brand_names', 'therapeutic_class'])])
+        self.assertEqual(summary['unchanged'], 1)
+        ibuprofen = DrugClassification.objects.get(generic_name='Ibuprofen')
+        self.assertEqual(ibuprofen.therapeutic_class, 'NSAID')
+        self.assertEqual(ibuprofen.brand_names, ['Brufen'])
+
+    def test_last_duplicate_wins(self):
+        summary = self.run_import([drug_row('Paracetamol'), drug_row('Paracetamol', therapeutic_class='Antipyretic')])
+        self.assertEqual(summary['unique_drugs'], 1)
+        self.assertEqual(DrugClassification.objects.get().therapeutic_class, 'Antipyretic')
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        summary = self.run_import([
+            drug_row('Paracetamol'),
+            drug_row('Tramadol', is_controlled=True),  # fails clean(): no schedule
+            drug_row('Aspirin', pregnancy_category='XX'),
+        ])
+
+        self.assertEqual(summary['created'], ['Paracetamol'])
+        self.assertEqual([failure['generic_name'] for failure in summary['failed']], ['Tramadol', 'Aspirin'])
+        self.assertIn('pregnancy_category', summary['failed'][1]['error'])
+
+    def test_deactivate_missing(self):
+        self.run_import([drug_row('Paracetamol'), drug_row('Ibuprofen')])
+        summary = self.run_import([drug_row('Paracetamol')], deactivate_missing=True)
+
+        self.assertEqual(summary['deactivated'], ['Ibuprofen'])
+        self.assertFalse(DrugClassification.objects.get(generic_name='Ibuprofen').is_active)
+
+    def test_dry_run_rolls_back(self):
+        summary = self.run_import([drug_row('Paracetamol')], dry_run=True)
+        self.assertEqual(summary['created'], ['Paracetamol'])
+        self.assertFalse(DrugClassification.objects.exists())
+
+    def test_import_expires_drug_statistics(self):
+        reset_versions(DrugStatistics)
+        self.run_import([drug_row('Paracetamol')])
+        self.assertEqual(DrugStatistics.get()['total_drugs'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_import([drug_row('Ibuprofen'), drug_row('Aspirin')], deactivate_missing=True)
+        self.assertEqual(DrugStatistics.get()['total_drugs'], 2)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.run_import([drug_row('Codeine')], dry_run=True)
+        self.assertEqual(callbacks, [])
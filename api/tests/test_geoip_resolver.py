@@ -0,0 +1,160 @@
+# api/tests/test_geoip_resolver.py
+
+from types import SimpleNamespace
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.utils import location_utils
+from api.utils.location_utils import EMPTY_LOCATION, GeoIPResolver
+
+
+class AddressNotFoundError(Exception):
+    pass
+
+
+def city_response(country, city, state):
+    return SimpleNamespace(
+        country=SimpleNamespace(name=country),
+        city=SimpleNamespace(name=city),
+        subdivisions=SimpleNamespace(most_specific=SimpleNamespace(name=state)),
+    )
+
+
+class FakeReader:
+    """Stands in for geoip2.database.Reader; records opens and lookups"""
+
+    LOCATIONS = {
+        '102.89.1.1': city_response('Nigeria', 'Lagos', 'Lagos'),
+        '105.112.2.2': city_response('Nigeria', 'Abuja', 'Federal Capital Territory'),
+        '41.58.3.3': city_response('Nigeria', 'Ibadan', 'Oyo'),
+    }
+    opened = []
+
+    def __init__(self, path, mode=None):
+        self.path = path
+        self.mode = mode
+        self.lookups = []
+        self.closed = False
+        FakeReader.opened.append(self)
+
+    def city(self, ip_address):
+        self.lookups.append(ip_address)
+        if ip_address not in self.LOCATIONS:
+            raise AddressNotFoundError(f'{ip_address} is not in the database')
+        return self.LOCATIONS[ip_address]
+
+    def close(self):
+        self.closed = True
+
+
+def missing_database(path, mode=None):
+    raise FileNotFoundError(f'No such file: {path}')
+
+
+def corrupt_database(path, mode=None):
+    # maxminddb.InvalidDatabaseError subclasses RuntimeError
+    raise RuntimeError(f'Error looking up metadata in {path}; the file is not a valid MaxMind DB')
+
+
+class GeoIPResolverTestCase(SimpleTestCase):
+    """Test the shared GeoIP reader and its LRU cache"""
+
+    def setUp(self):
+        FakeReader.opened = []
+        patcher = mock.patch.object(
+            location_utils, 'geoip2_database', SimpleNamespace(Reader=FakeReader, MODE_MMAP=2)
+        )
+        self.geoip2_database = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.resolver = GeoIPResolver(db_path='/data/GeoLite2-City.mmdb', cache_size=2, ttl=60)
+
+    def test_database_opened_once_in_mmap_mode(self):
+        for ip_address in ['102.89.1.1', '105.112.2.2', '41.58.3.3', '102.89.1.1']:
+            self.resolver.lookup(ip_address)
+
+        self.assertEqual(len(FakeReader.opened), 1)
+        self.assertEqual(FakeReader.opened[0].path, '/data/GeoLite2-City.mmdb')
+        self.assertEqual(FakeReader.opened[0].mode, 2)
+
+    def test_lookup_shape_and_unknown_addresses(self):
+        self.assertEqual(
+            self.resolver.lookup('102.89.1.1'), {'country': 'Nigeria', 'city': 'Lagos', 'state': 'Lagos'}
+        )
+        self.assertEqual(self.resolver.lookup('10.0.0.1'), EMPTY_LOCATION)
+        self.assertEqual(self.resolver.lookup('Unknown'), EMPTY_LOCATION)
+
+    def test_cached_results_are_copies(self):
+        self.resolver.lookup('102.89.1.1')['city'] = 'Changed'
+
+        self.assertEqual(self.resolver.lookup('102.89.1.1')['city'], 'Lagos')
+        self.assertEqual(FakeReader.opened[0].lookups, ['102.89.1.1'])
+
+    def test_least_recently_used_entry_evicted(self):
+        self.resolver.lookup('102.89.1.1')
+        self.resolver.lookup('105.112.2.2')
+        self.resolver.lookup('102.89.1.1')  # Now most recently used
+        self.resolver.lookup('41.58.3.3')  # Evicts 105.112.2.2
+
+        self.resolver.lookup('102.89.1.1')
+        self.resolver.lookup('105.112.2.2')
+
+        self.assertEqual(
+            FakeReader.opened[0].lookups, ['102.89.1.1', '105.112.2.2', '41.58.3.3', '105.112.2.2']
+        )
+        self.assertEqual(self.resolver.cache_info()['size'], 2)
+
+    def test_entries_expire_after_ttl(self):
+        with mock.patch.object(location_utils.time, 'monotonic', return_value=1000.0):
+            self.resolver.lookup('102.89.1.1')
+            self.resolver.lookup('102.89.1.1')
+        with mock.patch.object(location_utils.time, 'monotonic', return_value=1060.0):
+            self.resolver.lookup('102.89.1.1')
+
+        self.assertEqual(FakeReader.opened[0].lookups, ['102.89.1.1', '102.89.1.1'])
+        self.assertEqual(self.resolver.cache_info()['hits'], 1)
+
+    def test_bulk_resolves_each_address_once(self):
+        resolver = GeoIPResolver(db_path='/data/GeoLite2-City.mmdb', cache_size=100, ttl=60)
+        resolver.lookup('102.89.1.1')
+
+        locations = resolver.lookup_many(['102.89.1.1', '105.112.2.2', '105.112.2.2', '192.168.0.1'])
+
+        self.assertEqual(list(locations), ['102.89.1.1', '105.112.2.2', '192.168.0.1'])
+        self.assertEqual(locations['105.112.2.2']['city'], 'Abuja')
+        self.assertEqual(locations['192.168.0.1'], EMPTY_LOCATION)
+        self.assertEqual(FakeReader.opened[0].lookups, ['102.89.1.1', '105.112.2.2', '192.168.0.1'])
+
+    def test_forked_child_opens_its_own_reader(self):
+        self.resolver.lookup('102.89.1.1')
+
+        with mock.patch.object(location_utils.os, 'getpid', return_value=-1):
+            self.resolver.lookup('105.112.2.2')
+
+        self.assertEqual(len(FakeReader.opened), 2)
+        self.assertFalse(FakeReader.opened[0].closed)  # Still the parent's mapping
+
+        self.resolver._after_fork()
+        self.resolver.lookup('41.58.3.3')
+        self.assertEqual(len(FakeReader.opened), 3)
+
+    def test_missing_database_is_not_cached(self):
+        self.geoip2_database.Reader = missing_database
+        with self.assertLogs('api.utils.location_utils', 'WARNING'):
+            self.assertEqual(self.resolver.lookup('102.89.1.1'), EMPTY_LOCATION)
+
+        self.geoip2_database.Reader = FakeReader
+        self.assertEqual(self.resolver.lookup('102.89.1.1')['city'], 'Lagos')
+
+    def test_corrupt_database_resolves_nothing(self):
+        self.geoip2_database.Reader = corrupt_database
+        with self.assertLogs('api.utils.location_utils', 'WARNING'):
+            self.assertEqual(self.resolver.lookup('102.89.1.1'), EMPTY_LOCATION)
+
+    def test_module_functions_use_shared_resolver(self):
+        with mock.patch.object(location_utils, 'geoip_resolver', self.resolver):
+            self.assertEqual(location_utils.get_location_from_ip('41.58.3.3')['state'], 'Oyo')
+            self.assertEqual(
+                location_utils.get_locations_from_ips(['41.58.3.3'])['41.58.3.3']['city'], 'Ibadan'
+            )
+        self.assertEqual(len(FakeReader.opened), 1)
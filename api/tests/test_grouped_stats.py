@@ -0,0 +1,104 @@
+# api/tests/test_grouped_stats.py
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import DrugClassification, PHBProfessionalRegistry
+from api.services.grouped_stats import DrugStatistics, GroupedStatistics, RegistryStatistics
+from api.tests.test_professional_search import create_professional
+
+
+def reset_versions(*stats):
+    for statistics in stats:
+        cache.delete(GroupedStatistics.VERSION_KEY.format(label=statistics.model.lower()))
+
+
+class DrugStatisticsTestCase(TestCase):
+    """Test grouped drug statistics and their invalidation"""
+
+    def setUp(self):
+        reset_versions(DrugStatistics)
+        drugs = [
+            ('Morphine', 'schedule_2', 'Opioid analgesic', True, True),
+            ('Tramadol', 'schedule_4', 'Opioid analgesic', True, False),
+            ('Warfarin', 'unscheduled', 'Anticoagulant', False, True),
+            ('Paracetamol', 'unscheduled', '', False, False),
+        ]
+        for name, schedule, therapeutic_class, controlled, high_risk in drugs:
+            DrugClassification.objects.create(
+                generic_name=name, nafdac_schedule=schedule, therapeutic_class=therapeutic_class,
+                is_controlled=controlled, is_high_risk=high_risk, requires_physician_only=controlled or high_risk,
+            )
+        DrugClassification.objects.create(
+            generic_name='Withdrawn', nafdac_schedule='schedule_3', is_active=False,
+            is_controlled=True, requires_physician_only=True,
+        )
+
+    def test_single_grouped_query(self):
+        with self.assertNumQueries(1):
+            stats = DrugStatistics.compute()
+
+        self.assertEqual(stats['total_drugs'], 4)
+        self.assertEqual(stats['controlled_substances'], 2)
+        self.assertEqual(stats['high_risk_medications'], 2)
+        self.assertEqual(stats['by_schedule'][0], {'nafdac_schedule': 'unscheduled', 'count': 2})
+        self.assertEqual(
+            stats['top_therapeutic_classes'],
+            [{'therapeutic_class': 'Opioid analgesic', 'count': 2}, {'therapeutic_class': 'Anticoagulant', 'count': 1}],
+        )
+
+    def test_cached_until_a_drug_changes(self):
+        self.assertEqual(DrugStatistics.get()['total_drugs'], 4)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(DrugStatistics.get()['total_drugs'], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            DrugClassification.objects.create(generic_name='Ibuprofen')
+
+        self.assertEqual(DrugStatistics.get()['total_drugs'], 5)
+
+    def test_invalidation_waits_for_commit(self):
+        DrugStatistics.get()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            DrugClassification.objects.filter(generic_name='Warfarin').delete()
+            self.assertEqual(DrugStatistics.get()['total_drugs'], 4)
+
+        self.assertEqual(len(callbacks), 1)
+
+
+class RegistryStatisticsTestCase(TestCase):
+    """Test the public registry stats endpoint"""
+
+    def setUp(self):
+        reset_versions(RegistryStatistics)
+        create_professional('Tunde', 'Adeyemi', professional_type='doctor', state='Lagos')
+        create_professional('Kemi', 'Adeyemo', professional_type='pharmacist', state='Lagos')
+        create_professional('Chidi', 'Okafor', professional_type='optometrist', state='FCT')
+        create_professional('Lapsed', 'Doctor', license_status='suspended', state='Kano')
+
+    def test_stats_endpoint(self):
+        client = APIClient()
+
+        with self.assertNumQueries(1):
+            response = client.get('/api/registry/stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_active_professionals'], 3)
+        self.assertEqual(response.data['by_type'], {'doctor': 1, 'pharmacist': 1, 'optometrist': 1})
+        self.assertEqual(response.data['by_state'], {'Lagos': 2, 'FCT': 1})
+
+        with self.assertNumQueries(0):
+            self.assertEqual(client.get('/api/registry/stats/').data, response.data)
+
+    def test_registry_change_expires_stats(self):
+        RegistryStatistics.get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            professional = PHBProfessionalRegistry.objects.get(first_name='Lapsed')
+            professional.license_status = 'active'
+            professional.save()
+
+        self.assertEqual(RegistryStatistics.get()['by_state'], {'Lagos': 2, 'FCT': 1, 'Kano': 1})
@@ -0,0 +1,158 @@
+# api/tests/test_integration_logs.py
+
+from datetime import date, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.models import Hospital
+from api.models.medical import (
+    BillingSystem,
+    HospitalBillingIntegration,
+    InsuranceProvider,
+    InsuranceVerificationAPICall,
+    InsuranceVerificationTask,
+    PatientInsurancePolicy,
+)
+
+User = get_user_model()
+
+
+def create_hospital():
+    return Hospital.objects.create(
+        name="Test Hospital",
+        address="123 Test St",
+        city="Test City",
+        state="Test State",
+        country="Test Country",
+        postal_code="12345",
+        phone="1234567890",
+        email="test@hospital.com",
+        registration_number="TEST001",
+        hospital_type="public",
+        bed_capacity=100
+    )
+
+
+class InsuranceVerificationAPICallTestCase(TestCase):
+    """Test the append-only verification API call log"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='clerk@example.com', password='testpass123', first_name='Cal', last_name='Clerk'
+        )
+        provider = InsuranceProvider.objects.create(
+            name="Test Insurer",
+            headquarters_address="1 Insurer Way",
+            phone_number="08000000000",
+            email="claims@insurer.com",
+        )
+        policy = PatientInsurancePolicy.objects.create(
+            patient=self.user,
+            insurance_provider=provider,
+            policy_number="POL-1",
+            member_id="MEM-1",
+            subscriber_name="Cal Clerk",
+            policy_effective_date=date.today(),
+            coverage_start_date=date.today(),
+        )
+        self.task = InsuranceVerificationTask.objects.create(
+            patient_policy=policy,
+            created_by=self.user,
+            due_date=timezone.now() + timedelta(days=1),
+        )
+
+    def test_log_call_inserts_a_row_without_rewriting_history(self):
+        for _ in range(20):
+            self.task.log_api_call('/eligibility', {}, {'status_code': 200}, duration_ms=120)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.task.log_api_call('/eligibility', {}, {'status_code': 503}, success=False, duration_ms=900)
+
+        inserts = [q['sql'] for q in queries if q['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertIn('insuranceverificationapicall', inserts[0])
+        self.assertEqual(self.task.api_calls.count(), 21)
+        self.assertTrue(self.task.automation_attempted)
+        self.assertIn('503', self.task.automation_failure_reason)
+        self.assertEqual(self.task.api_call_log[-1]['response_status'], 503)
+
+    def test_metrics_aggregate_in_sql(self):
+        InsuranceVerificationAPICall.log_calls(self.task, [
+            ('/eligibility', {'status_code': 200}, True, 100),
+            ('/eligibility', {'status_code': 200}, True, 300),
+            ('/eligibility', {'status_code': 500}, False, 500),
+            ('/claims', {'status_code': 200}, True, 50),
+        ])
+
+        metrics = InsuranceVerificationAPICall.get_metrics()
+
+        self.assertEqual(metrics['calls'], 4)
+        self.assertEqual(metrics['success_rate'], 75.0)
+        self.assertEqual(metrics['max_ms'], 500)
+        eligibility = next(row for row in metrics['by_endpoint'] if row['endpoint'] == '/eligibility')
+        self.assertEqual(eligibility['calls'], 3)
+        self.assertAlmostEqual(eligibility['avg_ms'], 300)
+        self.assertAlmostEqual(eligibility['p95_ms'], 480)
+
+
+class BillingIntegrationAuditTrailTestCase(TestCase):
+    """Test the append-only billing integration audit trail"""
+
+    def setUp(self):
+        self.integration = HospitalBillingIntegration.objects.create(
+            hospital=create_hospital(),
+            billing_system=BillingSystem.objects.create(name="Ledger", vendor_name="Ledger Inc"),
+            integration_name="Main billing",
+            api_endpoint="https://billing.example.com",
+        )
+
+    def test_status_change_recorded_on_save(self):
+        self.integration.integration_status = 'testing'
+        self.integration.save()
+
+        events = list(self.integration.audit_events.all())
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].event_type, 'status_change')
+        self.assertEqual(self.integration.audit_trail[0]['data']['to'], 'testing')
+
+    def test_buffered_events_bulk_inserted_on_save(self):
+        self.integration.add_to_audit_trail('note', {'n': 1})
+        self.integration.add_to_audit_trail('note', {'n': 2})
+        self.assertFalse(self.integration.audit_events.exists())
+
+        with CaptureQueriesContext(connection) as queries:
+            self.integration.flush_audit_trail()
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual([e['data']['n'] for e in self.integration.get_audit_trail()], [1, 2])
+
+    def test_trail_is_not_truncated(self):
+        self.integration.add_to_audit_trail('note', {})
+        for n in range(150):
+            self.integration.add_to_audit_trail('note', {'n': n})
+        self.integration.flush_audit_trail()
+
+        self.assertEqual(self.integration.audit_events.count(), 151)
+        self.assertEqual(len(self.integration.get_audit_trail()), 100)
+        self.assertEqual(self.integration.get_audit_trail()[-1]['data']['n'], 149)
+
+    def test_connection_tests_feed_latency_metrics(self):
+        response = mock.Mock(status_code=200)
+        with mock.patch('requests.get', return_value=response):
+            self.integration.test_connection()
+        with mock.patch('requests.get', return_value=mock.Mock(status_code=502)):
+            self.integration.test_connection()
+
+        metrics = HospitalBillingIntegration.get_api_metrics()
+
+        self.assertEqual(metrics['events'], 2)
+        self.assertEqual(metrics['success_rate'], 50.0)
+        row = metrics['by_integration'][0]
+        self.assertEqual(row['integration__integration_name'], 'Main billing')
+        self.assertEqual(row['event_type'], 'connection_test')
+        self.assertIsNotNone(row['p95_ms'])
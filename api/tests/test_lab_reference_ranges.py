@@ -0,0 +1,154 @@
+# api/tests/test_lab_reference_ranges.py
+
+from datetime import date, datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from api.models import MedicalRecord
+from api.models.medical import LaboratoryResult, LaboratoryTestType
+from api.services.lab_reference_ranges import LabReferenceRanges, parse_range
+
+User = get_user_model()
+
+HAEMOGLOBIN_RANGES = {
+    'default': '12.0-17.0',
+    'age_ranges': [
+        {'min_age': 0, 'max_age': 1, 'range': '10.0-14.0'},
+        {'min_age': 1, 'max_age': 12, 'range': '11.0-15.5'},
+        {'min_age': 10, 'max_age': 18, 'range': 'overlap, never reached for 10-12'},
+    ],
+    'male': {
+        'default': '13.5-17.5',
+        'age_ranges': [{'min_age': 60, 'max_age': 200, 'range': {'min': 12.5, 'max': 17.0}}],
+    },
+    'female': {'age_ranges': [{'min_age': 18, 'max_age': 50, 'range': [12.0, 15.5]}]},
+}
+
+
+def linear_lookup(reference_ranges, age=None, gender=None):
+    """The original nested-JSON walk (with age 0 treated as an age), as the oracle"""
+    def match(bands):
+        for band in bands:
+            if band.get('min_age', 0) <= age <= band.get('max_age', 200):
+                return True, band.get('range')
+        return False, None
+
+    if gender and gender in reference_ranges:
+        gender_range = reference_ranges[gender]
+        if age is not None and 'age_ranges' in gender_range:
+            found, value = match(gender_range['age_ranges'])
+            if found:
+                return value
+        if 'default' in gender_range:
+            return gender_range['default']
+    if age is not None and 'age_ranges' in reference_ranges:
+        found, value = match(reference_ranges['age_ranges'])
+        if found:
+            return value
+    return reference_ranges.get('default')
+
+
+class CompiledReferenceRangesTestCase(SimpleTestCase):
+    """Test the compiled band tables against a linear scan"""
+
+    def test_matches_linear_scan(self):
+        compiled = LabReferenceRanges.compile(HAEMOGLOBIN_RANGES)
+        ages = [None, 0, 0.5, 1, 5, 10, 11.5, 12, 12.5, 17, 18, 49, 50, 50.5, 59, 60, 85, 200, 250]
+        for gender in [None, 'male', 'female', 'other']:
+            for age in ages:
+                with self.subTest(gender=gender, age=age):
+                    self.assertEqual(
+                        compiled.lookup(age, gender), linear_lookup(HAEMOGLOBIN_RANGES, age, gender)
+                    )
+
+    def test_first_overlapping_band_wins(self):
+        compiled = LabReferenceRanges.compile(HAEMOGLOBIN_RANGES)
+
+        self.assertEqual(compiled.lookup(1), '10.0-14.0')
+        self.assertEqual(compiled.lookup(11), '11.0-15.5')
+        self.assertEqual(compiled.lookup(13), 'overlap, never reached for 10-12')
+
+    def test_bounds_parsed_once(self):
+        compiled = LabReferenceRanges.compile(HAEMOGLOBIN_RANGES)
+
+        self.assertEqual(compiled.resolve(65, 'male')[1:], (12.5, 17.0))
+        self.assertEqual(compiled.resolve(30, 'female')[1:], (12.0, 15.5))
+        self.assertIsNone(LabReferenceRanges.compile({}).resolve(30, 'male'))
+
+    def test_parse_range_formats(self):
+        self.assertEqual(parse_range('3.5 - 5.0'), (3.5, 5.0))
+        self.assertEqual(parse_range('< 200'), (None, 200.0))
+        self.assertEqual(parse_range('>=40'), (40.0, None))
+        self.assertEqual(parse_range({'low': 1, 'high': 2}), (1.0, 2.0))
+        self.assertEqual(parse_range('Negative'), (None, None))
+
+
+class LabResultFlaggingTestCase(TestCase):
+    """Test bulk flagging of a patient's lab history"""
+
+    def setUp(self):
+        LabReferenceRanges.clear()
+        self.user = User.objects.create_user(
+            email='lab.patient@example.com', password='testpass123', first_name='Lab', last_name='Patient',
+            date_of_birth=date(1990, 6, 15), gender='male',
+        )
+        self.record, _ = MedicalRecord.objects.get_or_create(user=self.user, defaults={'hpn': 'LAB-0001'})
+        self.haemoglobin = LaboratoryTestType.objects.create(
+            name='Haemoglobin', code='HB', category='Blood', description='Haemoglobin concentration',
+            sample_type='Blood', processing_time='1 hour', reference_ranges=HAEMOGLOBIN_RANGES, units='g/dL',
+            clinical_uses='Anaemia screening', result_interpretation='Low values suggest anaemia',
+        )
+        self.glucose = LaboratoryTestType.objects.create(
+            name='Fasting glucose', code='FBG', category='Blood', description='Fasting blood glucose',
+            sample_type='Blood', processing_time='1 hour', reference_ranges={'default': '70-100'}, units='mg/dL',
+            clinical_uses='Diabetes screening', result_interpretation='High values suggest diabetes',
+        )
+
+    def add_result(self, test_type, value, **fields):
+        when = fields.pop('test_date', datetime(2024, 1, 10, tzinfo=timezone.utc))
+        return LaboratoryResult.objects.create(
+            medical_record=self.record, test_type=test_type, test_date=when, result_date=when,
+            result_value=str(value), numeric_value=value, units=test_type.units, lab_facility='Central Lab', **fields
+        )
+
+    def test_history_flagged_from_compiled_ranges(self):
+        low = self.add_result(self.haemoglobin, 12.0)
+        high = self.add_result(self.glucose, 130)
+        normal = self.add_result(self.glucose, 90)
+        recorded = self.add_result(self.glucose, 130, reference_range_min=70, reference_range_max=140)
+        critical = self.add_result(self.haemoglobin, 5.0, abnormal_flags='C', is_abnormal=True)
+
+        with self.assertNumQueries(2):
+            results = {result.pk: result for result in LabReferenceRanges.flag_history(self.record, persist=True)}
+
+        self.assertEqual((results[low.pk].abnormal_flags, results[low.pk].reference_range_min), ('L', 13.5))
+        self.assertEqual(results[high.pk].abnormal_flags, 'H')
+        self.assertFalse(results[normal.pk].is_abnormal)
+        self.assertFalse(results[recorded.pk].is_abnormal)
+        self.assertEqual(results[critical.pk].abnormal_flags, 'C')
+
+        high.refresh_from_db()
+        self.assertEqual((high.is_abnormal, high.reference_range_max, high.reference_range_text), (True, 100.0, '70-100'))
+
+    def test_age_taken_at_test_date(self):
+        self.user.date_of_birth = date(1964, 6, 15)
+        self.user.save()
+        before_sixty = self.add_result(self.haemoglobin, 13.0, test_date=datetime(2024, 6, 14, tzinfo=timezone.utc))
+        after_sixty = self.add_result(self.haemoglobin, 13.0, test_date=datetime(2024, 6, 15, tzinfo=timezone.utc))
+
+        results = {result.pk: result for result in LabReferenceRanges.flag_history(self.record)}
+
+        self.assertEqual(results[before_sixty.pk].abnormal_flags, 'L')
+        self.assertIsNone(results[after_sixty.pk].abnormal_flags)
+
+    def test_model_lookup_uses_compiled_table(self):
+        self.assertEqual(self.haemoglobin.get_reference_range_for_patient(30, 'female'), [12.0, 15.5])
+        self.assertIs(
+            LabReferenceRanges.for_test_type(self.haemoglobin),
+            LabReferenceRanges.for_test_type(LaboratoryTestType.objects.get(pk=self.haemoglobin.pk)),
+        )
+
+        self.haemoglobin.reference_ranges = {'default': '1-2'}
+        self.haemoglobin.save()
+        self.assertEqual(self.haemoglobin.get_reference_range_for_patient(30, 'female'), '1-2')
@@ -0,0 +1,46 @@
+# api/tests/test_lazy_imports.py
+
+import sys
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.utils.lazy_imports import LazyModule, lazy_import, lazy_singleton
+
+
+class LazyImportTestCase(SimpleTestCase):
+    """Test deferred loading of heavy optional libraries"""
+
+    def test_module_imported_on_first_attribute_access(self):
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop('colorsys', None)
+            proxy = lazy_import('colorsys')
+            self.assertFalse(proxy.is_loaded)
+            self.assertNotIn('colorsys', sys.modules)
+
+            self.assertEqual(proxy.rgb_to_hsv(0, 0, 0), (0.0, 0.0, 0.0))
+            self.assertTrue(proxy.is_loaded)
+            self.assertIn('colorsys', sys.modules)
+
+    def test_missing_module_fails_on_use_not_on_import(self):
+        proxy = lazy_import('module_that_does_not_exist')
+        with self.assertRaises(ImportError):
+            proxy.anything
+
+    def test_singleton_built_on_first_use(self):
+        factory = mock.Mock(return_value=mock.Mock(assign_doctor=mock.Mock(return_value='doctor')))
+        instance = lazy_singleton(factory)
+        factory.assert_not_called()
+
+        self.assertEqual(instance.assign_doctor({}), 'doctor')
+        self.assertEqual(instance.assign_doctor({}), 'doctor')
+        factory.assert_called_once_with()
+
+    def test_heavy_modules_are_proxied(self):
+        from api.utils import location_utils
+        from api.models.medical import doctor_assignment
+        from api.services import vital_sign_ingestion
+
+        self.assertIsInstance(location_utils.geoip2_database, LazyModule)
+        self.assertIsInstance(doctor_assignment.joblib, LazyModule)
+        self.assertIsInstance(vital_sign_ingestion.np, LazyModule)
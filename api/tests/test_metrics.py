@@ -0,0 +1,138 @@
+# api/tests/test_metrics.py
+
+import uuid
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from api.models.payment_providers.http_client import get_provider_client, reset_provider_clients
+from api.services.metrics import MetricsService, ProcessMetrics, RedisMetricsStore
+
+
+@override_settings(METRICS_BACKEND='local', METRICS_PUBLISH_INTERVAL=0, METRICS_AUTH_TOKEN='scrape-secret')
+class MetricsEndpointTest(TestCase):
+
+    def setUp(self):
+        self.client = self.client_class(HTTP_AUTHORIZATION='Bearer scrape-secret')
+        MetricsService.reset()
+        self.addCleanup(MetricsService.reset)
+
+    def test_requests_recorded_by_route(self):
+        self.client.get('/metrics')
+        self.client.post('/metrics')
+        self.client.get('/no-such-page/')
+
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/metrics",status="200"} 1', body)
+        self.assertIn(
+            'http_request_duration_seconds_bucket{method="POST",route="/metrics",status="405",le="+Inf"} 1', body
+        )
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="unresolved",status="404"} 1', body)
+        self.assertIn('notification_queue_depth{state="due"} 0', body)
+        self.assertIn('analytics_cache_requests_total{outcome="hit"}', body)
+
+    def test_websocket_connections_gauge(self):
+        MetricsService.websocket_opened('ChatConsumer')
+        MetricsService.websocket_opened('ChatConsumer')
+        MetricsService.websocket_closed('ChatConsumer')
+
+        body = MetricsService.render()
+        self.assertIn('websocket_connections{consumer="ChatConsumer"} 1', body)
+        self.assertIn('websocket_connections_opened_total{consumer="ChatConsumer"} 2', body)
+
+    def test_payment_provider_calls(self):
+        client = get_provider_client('paystack')
+        self.addCleanup(reset_provider_clients)
+        client._record('refund', 0.25)
+        client._record('refund', 0.5, error=True, retries=2)
+
+        body = MetricsService.render()
+        series = '{operation="refund",provider="paystack"}'
+        self.assertIn(f'payment_provider_requests_total{series} 2', body)
+        self.assertIn(f'payment_provider_errors_total{series} 1', body)
+        self.assertIn(f'payment_provider_retries_total{series} 2', body)
+        self.assertIn(f'payment_provider_request_seconds_total{series} 0.75', body)
+
+    def test_access_control(self):
+        anonymous = self.client_class()
+        self.assertEqual(anonymous.get('/metrics').status_code, 403)
+        self.assertEqual(anonymous.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        response = anonymous.get('/metrics', REMOTE_ADDR='10.1.2.3', HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_AUTH_TOKEN='')
+    def test_no_token_only_allows_local_access_in_debug(self):
+        # Behind a reverse proxy every request arrives from 127.0.0.1
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='127.0.0.1').status_code, 403)
+        with self.settings(DEBUG=True):
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='127.0.0.1').status_code, 200)
+            self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.1.2.3').status_code, 403)
+
+
+class MetricsRenderingTest(SimpleTestCase):
+
+    def test_histogram_is_cumulative(self):
+        metrics = ProcessMetrics()
+        labels = {'method': 'GET', 'route': '/api/"quoted"/', 'status': '200'}
+        for seconds in (0.004, 0.02, 0.02, 30):
+            metrics.observe('http_request_duration_seconds', labels, seconds)
+
+        lines = MetricsService.render(metrics.samples()).splitlines()
+        series = 'method="GET",route="/api/\\"quoted\\"/",status="200"'
+        self.assertIn(f'http_request_duration_seconds_bucket{{{series},le="0.005"}} 1', lines)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{series},le="0.025"}} 3', lines)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{series},le="10"}} 3', lines)
+        self.assertIn(f'http_request_duration_seconds_bucket{{{series},le="+Inf"}} 4', lines)
+        self.assertIn(f'http_request_duration_seconds_count{{{series}}} 4', lines)
+        buckets = [line for line in lines if line.startswith('http_request_duration_seconds_bucket')]
+        self.assertTrue(buckets[-1].endswith('le="+Inf"} 4'))
+
+
+class RedisMetricsStoreTest(SimpleTestCase):
+
+    def setUp(self):
+        try:
+            self.store = RedisMetricsStore(settings.CACHES['default']['LOCATION'])
+            self.store.KEY_PREFIX = f'metrics-test-{uuid.uuid4().hex}'
+            self.store.registry_key = f'{self.store.KEY_PREFIX}:processes'
+            self.store.client.ping()
+        except Exception:
+            self.skipTest("Redis is not available")
+        self.addCleanup(self.cleanup)
+
+    def cleanup(self):
+        keys = list(self.store.client.scan_iter(f'{self.store.KEY_PREFIX}:*'))
+        if keys:
+            self.store.client.delete(*keys)
+
+    def publish_as(self, worker, metrics):
+        with mock.patch.object(self.store, 'process_key', return_value=f'{self.store.KEY_PREFIX}:process:{worker}'):
+            self.store.publish(metrics.samples(), 60)
+
+    def test_workers_are_summed(self):
+        labels = {'method': 'GET', 'route': '/api/login/', 'status': '200'}
+        first, second = ProcessMetrics(), ProcessMetrics()
+        first.observe('http_request_duration_seconds', labels, 0.01)
+        second.observe('http_request_duration_seconds', labels, 0.2)
+        second.inc('websocket_connections', {'consumer': 'ChatConsumer'})
+        self.publish_as('worker-1', first)
+        self.publish_as('worker-2', second)
+        first.observe('http_request_duration_seconds', labels, 0.01)
+        self.publish_as('worker-1', first)  # Republishing replaces, never double counts
+
+        totals = self.store.aggregate()
+        series = (('method', 'GET'), ('route', '/api/login/'), ('status', '200'))
+        self.assertEqual(totals[('http_request_duration_seconds', series, 'count')], 3)
+        self.assertEqual(totals[('http_request_duration_seconds', series, 0.01)], 2)
+        self.assertEqual(totals[('http_request_duration_seconds', series, '+Inf')], 3)
+        self.assertEqual(totals[('websocket_connections', (('consumer', 'ChatConsumer'),), 'value')], 1)
+
+        self.store.client.delete(f'{self.store.KEY_PREFIX}:process:worker-2')  # Expired
+        totals = self.store.aggregate()
+        self.assertEqual(totals[('http_request_duration_seconds', series, 'count')], 2)
+        self.assertEqual(self.store.client.scard(self.store.registry_key), 1)
@@ -0,0 +1,159 @@
+# api/tests/test_payment_webhook_inbox.py
+
+import hashlib
+import hmac
+import json
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import PaymentTransaction, PaymentWebhookEvent
+from api.models.payment_providers.paystack import PaystackProvider
+from api.services.payment_webhook_inbox import PaymentWebhookInbox
+
+User = get_user_model()
+
+WEBHOOK_SECRET = 'whsec_test'
+
+
+def paystack_settings():
+    paystack = dict(settings.PAYMENT_PROVIDERS['paystack'])
+    paystack['webhook_secret'] = WEBHOOK_SECRET
+    return {'paystack': paystack}
+
+
+def sign(body):
+    return hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha512).hexdigest()
+
+
+def webhook_body(event='charge.success', reference='REF-1', paystack_id=1001):
+    return json.dumps({
+        'event': event,
+        'data': {'id': paystack_id, 'reference': reference, 'status': 'success'},
+    }).encode()
+
+
+@override_settings(PAYMENTS_ENABLED=True, PAYMENT_PROVIDERS=paystack_settings())
+class PaymentWebhookViewTestCase(TestCase):
+    """Test webhook ingestion into the inbox"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def post(self, body, signature=None):
+        return self.client.generic(
+            'POST', '/api/payments/webhook/', body, content_type='application/json',
+            HTTP_X_PAYSTACK_SIGNATURE=signature if signature is not None else sign(body),
+        )
+
+    def test_valid_event_is_queued_without_processing(self):
+        with mock.patch.object(PaystackProvider, 'handle_webhook_event') as handle:
+            response = self.post(webhook_body())
+
+        self.assertEqual(response.status_code, 200)
+        handle.assert_not_called()
+        event = PaymentWebhookEvent.objects.get()
+        self.assertEqual(event.event_id, 'charge.success:1001')
+        self.assertEqual(event.reference, 'REF-1')
+        self.assertEqual(event.status, 'pending')
+
+    def test_duplicate_delivery_is_a_no_op(self):
+        body = webhook_body()
+        self.assertEqual(self.post(body).status_code, 200)
+        self.assertEqual(self.post(body).status_code, 200)
+
+        self.assertEqual(PaymentWebhookEvent.objects.count(), 1)
+
+    def test_invalid_signature_rejected(self):
+        response = self.post(webhook_body(), signature='0' * 128)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PaymentWebhookEvent.objects.exists())
+
+
+class PaymentWebhookWorkerTestCase(TestCase):
+    """Test applying inbox events to payment transactions"""
+
+    def setUp(self):
+        self.patient = User.objects.create_user(
+            email='patient@example.com', password='testpass123', first_name='Pat', last_name='Patient'
+        )
+        self.payment = PaymentTransaction(
+            patient=self.patient,
+            payment_method='card',
+            payment_provider='paystack',
+            provider_reference='REF-1',
+        )
+        self.payment.amount = 5000
+        self.payment.save(user=self.patient)
+
+    def queue(self, event, paystack_id, reference='REF-1'):
+        body = webhook_body(event, reference, paystack_id)
+        return PaymentWebhookInbox.record('paystack', json.loads(body), body)
+
+    def test_events_applied_in_arrival_order_per_reference(self):
+        self.queue('charge.failed', 1)
+        self.queue('charge.success', 2)
+        applied = []
+
+        with mock.patch.object(
+            PaystackProvider, 'handle_webhook_event',
+            autospec=True, side_effect=lambda provider, data: applied.append(data['event'])
+        ):
+            # Only the oldest event per reference is claimable in a batch
+            self.assertEqual(PaymentWebhookInbox.process_batch()['processed'], 1)
+            self.assertEqual(PaymentWebhookInbox.process_batch()['processed'], 1)
+
+        self.assertEqual(applied, ['charge.failed', 'charge.success'])
+        self.assertEqual(PaymentWebhookEvent.objects.filter(status='processed').count(), 2)
+
+    def test_failing_event_retried_then_marked_failed(self):
+        self.queue('charge.success', 1)
+
+        with mock.patch.object(PaystackProvider, 'handle_webhook_event', side_effect=ValidationError('mismatch')):
+            self.assertEqual(PaymentWebhookInbox.process_batch(max_attempts=2)['retry'], 1)
+            # Backing off: not retried on the next pass
+            self.assertEqual(PaymentWebhookInbox.process_batch(max_attempts=2)['retry'], 0)
+            PaymentWebhookEvent.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(PaymentWebhookInbox.process_batch(max_attempts=2)['failed'], 1)
+
+        event = PaymentWebhookEvent.objects.get()
+        self.assertEqual(event.status, 'failed')
+        self.assertEqual(event.attempts, 2)
+        self.assertIn('mismatch', event.last_error)
+
+    def test_retry_delay_doubles_up_to_the_cap(self):
+        delays = [PaymentWebhookInbox.retry_delay(attempts) for attempts in range(1, 10)]
+        self.assertEqual(delays[:4], [30, 60, 120, 240])
+        self.assertEqual(delays[-1], PaymentWebhookInbox.RETRY_MAX_DELAY)
+
+    def test_later_events_wait_for_a_backing_off_event(self):
+        self.queue('charge.failed', 1)
+        self.queue('charge.success', 2)
+
+        with mock.patch.object(PaystackProvider, 'handle_webhook_event', side_effect=ValidationError('mismatch')):
+            PaymentWebhookInbox.process_batch()
+        results = PaymentWebhookInbox.process_batch()
+
+        self.assertEqual(results, {'processed': 0, 'ignored': 0, 'retry': 0, 'failed': 0})
+        self.assertEqual(PaymentWebhookEvent.objects.filter(status='pending').count(), 2)
+
+    def test_unknown_reference_ignored(self):
+        self.queue('charge.success', 1, reference='NOPE')
+
+        results = PaymentWebhookInbox.process_batch()
+
+        self.assertEqual(results['ignored'], 1)
+        self.assertEqual(PaymentWebhookEvent.objects.get().status, 'ignored')
+
+    def test_duplicate_record_reports_not_created(self):
+        _, created = self.queue('charge.success', 1)
+        _, duplicate = self.queue('charge.success', 1)
+
+        self.assertTrue(created)
+        self.assertFalse(duplicate)
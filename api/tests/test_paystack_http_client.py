@@ -0,0 +1,174 @@
+# api/tests/test_paystack_http_client.py
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import requests
+from django.conf import settings
+from django.test import SimpleTestCase, override_settings
+
+from api.models.payment_providers.http_client import (
+    ProviderHTTPClient, get_provider_client, provider_metrics, reset_provider_clients
+)
+from api.models.payment_providers.paystack import PaystackProvider
+
+
+class StubPaystackHandler(BaseHTTPRequestHandler):
+    """Serves queued (status, body, delay) responses per path and records each call"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is observable
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        server = self.server
+        server.calls.append((self.command, self.path, self.client_address[1]))
+        queue = server.responses.get(self.path) or [(200, {'status': True, 'data': {}}, 0)]
+        status, body, delay = queue.pop(0) if len(queue) > 1 else queue[0]
+        if delay:
+            time.sleep(delay)
+        payload = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The client gave up (timeout tests)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServerMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubPaystackHandler)
+        cls.server.daemon_threads = True
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        self.server.calls = []
+        self.server.responses = {}
+
+
+class ProviderHTTPClientTestCase(StubServerMixin, SimpleTestCase):
+    """Test the shared provider client against a local stub server"""
+
+    def make_client(self, **options):
+        options.setdefault('backoff_base', 0.01)
+        return ProviderHTTPClient('stub', **options)
+
+    def test_connections_are_reused(self):
+        client = self.make_client()
+        for _ in range(5):
+            client.get(f"{self.base_url}/transaction/verify/ref", 'verify')
+
+        ports = {port for _, _, port in self.server.calls}
+        self.assertEqual(len(self.server.calls), 5)
+        self.assertEqual(len(ports), 1)
+
+    def test_idempotent_call_retried_on_server_error(self):
+        self.server.responses['/transaction/verify/ref'] = [
+            (503, {'status': False}, 0), (502, {'status': False}, 0), (200, {'status': True}, 0),
+        ]
+        client = self.make_client(max_retries=2)
+
+        response = client.get(f"{self.base_url}/transaction/verify/ref", 'verify')
+
+        self.assertEqual(response.json(), {'status': True})
+        self.assertEqual(len(self.server.calls), 3)
+        metrics = client.metrics()['verify']
+        self.assertEqual(metrics['count'], 1)
+        self.assertEqual(metrics['retries'], 2)
+        self.assertEqual(metrics['errors'], 0)
+
+    def test_non_idempotent_call_not_retried(self):
+        self.server.responses['/refund'] = [(503, {'status': False}, 0), (200, {'status': True}, 0)]
+        client = self.make_client(max_retries=2)
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            client.post(f"{self.base_url}/refund", 'refund', json={})
+
+        self.assertEqual(len(self.server.calls), 1)
+        self.assertEqual(client.metrics()['refund']['errors'], 1)
+
+    def test_read_timeout_bounds_a_hung_call(self):
+        self.server.responses['/refund'] = [(200, {'status': True}, 1.0)]
+        client = self.make_client(timeouts={'refund': (1, 0.2)})
+
+        started = time.perf_counter()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            client.post(f"{self.base_url}/refund", 'refund', json={})
+        self.assertLess(time.perf_counter() - started, 0.9)
+        self.assertEqual(len(self.server.calls), 1)
+
+    def test_connection_refused_is_retried_for_any_call(self):
+        client = self.make_client(max_retries=2)
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            # Port 9 (discard) on localhost refuses connections
+            client.post("http://127.0.0.1:9/refund", 'refund', json={})
+        self.assertEqual(client.metrics()['refund']['retries'], 2)
+
+
+class PaystackProviderHTTPTestCase(StubServerMixin, SimpleTestCase):
+    """Test PaystackProvider calls go through the shared client"""
+
+    def setUp(self):
+        super().setUp()
+        paystack = dict(settings.PAYMENT_PROVIDERS['paystack'])
+        paystack.update({
+            'secret_key': 'sk_test',
+            'urls': {
+                'initialize': f"{self.base_url}/transaction/initialize",
+                'verify': f"{self.base_url}/transaction/verify",
+                'refund': f"{self.base_url}/refund",
+            },
+            'http': {'timeouts': {'refund': (1, 0.2)}, 'max_retries': 1, 'backoff_base': 0.01},
+        })
+        self.settings_override = override_settings(PAYMENT_PROVIDERS={'paystack': paystack})
+        self.settings_override.enable()
+        reset_provider_clients()
+
+    def tearDown(self):
+        reset_provider_clients()
+        self.settings_override.disable()
+        super().tearDown()
+
+    def test_refund_uses_configured_url_and_shared_client(self):
+        transaction = SimpleNamespace(gateway_transaction_id='T123')
+        self.server.responses['/refund'] = [(200, {'status': True, 'data': {'status': 'pending'}}, 0)]
+
+        result = PaystackProvider(transaction).refund_payment(amount=50)
+        PaystackProvider(transaction).refund_payment(amount=50)
+
+        self.assertEqual(result['data']['status'], 'pending')
+        self.assertEqual([call[:2] for call in self.server.calls], [('POST', '/refund')] * 2)
+        self.assertEqual(len({call[2] for call in self.server.calls}), 1)
+        self.assertIs(PaystackProvider(transaction).http, get_provider_client('paystack'))
+        self.assertEqual(provider_metrics()['paystack']['refund']['count'], 2)
+
+    def test_hung_refund_times_out(self):
+        transaction = SimpleNamespace(gateway_transaction_id='T123')
+        self.server.responses['/refund'] = [(200, {'status': True}, 1.0)]
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            PaystackProvider(transaction).refund_payment(amount=50)
@@ -0,0 +1,97 @@
+# api/tests/test_pdf_rendering.py
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from api.services.pdf_rendering import (
+    PDFRenderError,
+    PDFRenderQueueFull,
+    PDFRenderingService,
+)
+
+
+class PDFRenderingServiceTestCase(SimpleTestCase):
+    """Test the PDF rendering service cache and queue bounds"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.settings_override = override_settings(PDF_RENDER_CACHE_DIR=self.cache_dir, PDF_RENDER_WORKERS=0)
+        self.settings_override.enable()
+        self.render = mock.patch(
+            'api.services.pdf_rendering.render_html_to_pdf',
+            side_effect=lambda html, stylesheets, base_url: b'%PDF-' + html.encode()
+        ).start()
+
+    def tearDown(self):
+        mock.patch.stopall()
+        PDFRenderingService.shutdown()
+        self.settings_override.disable()
+        shutil.rmtree(self.cache_dir)
+
+    def test_repeat_render_served_from_cache(self):
+        first = PDFRenderingService.render_html('hospital_certificate', '<p>St Nicholas</p>')
+        second = PDFRenderingService.render_html('hospital_certificate', '<p>St Nicholas</p>')
+
+        self.assertEqual(first, b'%PDF-<p>St Nicholas</p>')
+        self.assertEqual(second, first)
+        self.assertEqual(self.render.call_count, 1)
+
+    def test_cache_keyed_by_template_and_content(self):
+        PDFRenderingService.render_html('hospital_certificate', '<p>A</p>')
+        PDFRenderingService.render_html('hospital_certificate', '<p>B</p>')
+        PDFRenderingService.render_html('lab_report', '<p>A</p>')
+        PDFRenderingService.render_html('lab_report', '<p>A</p>', stylesheets=['p { color: red }'])
+        self.assertEqual(self.render.call_count, 4)
+
+    def test_render_failure_is_not_cached(self):
+        self.render.side_effect = RuntimeError('layout failed')
+        with self.assertRaises(PDFRenderError):
+            PDFRenderingService.render_html('hospital_certificate', '<p>A</p>')
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    @override_settings(PDF_RENDER_WORKERS=1, PDF_RENDER_QUEUE_SIZE=1, PDF_RENDER_QUEUE_TIMEOUT=0.01)
+    def test_full_queue_rejects_new_renders(self):
+        _, slots = PDFRenderingService._get_executor()
+        slots.acquire()
+        try:
+            with self.assertRaises(PDFRenderQueueFull):
+                PDFRenderingService.render_html('hospital_certificate', '<p>A</p>')
+        finally:
+            slots.release()
+
+    @override_settings(PDF_RENDER_WORKERS=1, PDF_RENDER_TIMEOUT=0.05, PDF_RENDER_QUEUE_TIMEOUT=0.01)
+    def test_timed_out_render_holds_its_slot_until_it_ends(self):
+        finish = threading.Event()
+        self.render.side_effect = lambda html, stylesheets, base_url: finish.wait(5) and b'%PDF-'
+        executor, slots = ThreadPoolExecutor(max_workers=1), threading.BoundedSemaphore(1)
+        self.addCleanup(executor.shutdown)
+        mock.patch.object(PDFRenderingService, '_get_executor', return_value=(executor, slots)).start()
+
+        with self.assertRaises(PDFRenderError):
+            PDFRenderingService.render_html('hospital_certificate', '<p>A</p>')
+        # Still rendering in the worker: no second render may start
+        with self.assertRaises(PDFRenderQueueFull):
+            PDFRenderingService.render_html('hospital_certificate', '<p>B</p>')
+
+        finish.set()
+        executor.shutdown(wait=True)
+        self.assertTrue(slots.acquire(blocking=False))
+
+    def test_prune_cache_removes_expired_files(self):
+        PDFRenderingService.render_html('hospital_certificate', '<p>old</p>')
+        PDFRenderingService.render_html('hospital_certificate', '<p>new</p>')
+        old_path = PDFRenderingService._cache_path(
+            PDFRenderingService.cache_key('hospital_certificate', '<p>old</p>')
+        )
+        expired = time.time() - 3600
+        os.utime(old_path, (expired, expired))
+
+        self.assertEqual(PDFRenderingService.prune_cache(max_age=60), 1)
+        self.assertFalse(os.path.exists(old_path))
@@ -0,0 +1,179 @@
+# api/tests/test_professional_search.py
+
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.models import PHBProfessionalRegistry, ProfessionalApplication
+from api.services.professional_search import InvalidCursor, ProfessionalRegistrySearch
+from api.views.professional_search_views import BurstSearchRateThrottle, SearchRateThrottle
+
+User = get_user_model()
+
+
+def create_professional(first_name, last_name, specialization='', issued=date(2024, 1, 1), **fields):
+    email = f"{first_name}.{last_name}.{issued.isoformat()}@example.com".lower()
+    user = User.objects.create_user(email=email, password='testpass123', first_name=first_name, last_name=last_name)
+    application = ProfessionalApplication.objects.create(
+        application_reference=f"APP-{user.pk}",
+        user=user,
+        professional_type=fields.get('professional_type', 'doctor'),
+        title='Dr.',
+        first_name=first_name,
+        last_name=last_name,
+        date_of_birth=date(1985, 1, 1),
+        gender='female',
+        nationality='Nigerian',
+        email=email,
+        phone='08000000000',
+        address_line_1='1 Clinic Road',
+        city='Lagos',
+        state='Lagos',
+        postcode='100001',
+        primary_qualification='MBBS',
+        qualification_institution='University of Lagos',
+        qualification_year=2010,
+        qualification_country='Nigeria',
+        specialization=specialization,
+    )
+    defaults = {
+        'professional_type': 'doctor',
+        'title': 'Dr.',
+        'primary_qualification': 'MBBS',
+        'qualification_year': 2010,
+        'license_expiry_date': date(2027, 1, 1),
+        'city': 'Lagos',
+        'state': 'Lagos',
+    }
+    defaults.update(fields)
+    return PHBProfessionalRegistry.objects.create(
+        user=user,
+        application=application,
+        phb_license_number=f"PHB-DOC-2024-{user.pk:05d}",
+        first_name=first_name,
+        last_name=last_name,
+        specialization=specialization,
+        license_issue_date=issued,
+        **defaults
+    )
+
+
+class RegistrySearchColumnsTestCase(TestCase):
+    """Test the trigger-maintained search columns"""
+
+    def test_trigger_fills_search_columns(self):
+        professional = create_professional('  Ada ', 'Lovelace  Byron', 'Clinical Pharmacy', city='Ikeja')
+        professional.refresh_from_db()
+
+        self.assertEqual(professional.search_name, 'ada lovelace byron')
+        self.assertIn("'clinical':1A", professional.search_vector)
+        self.assertIn("'ikeja'", professional.search_vector)
+
+    def test_bulk_updates_keep_columns_current(self):
+        professional = create_professional('Ada', 'Lovelace')
+
+        PHBProfessionalRegistry.objects.filter(pk=professional.pk).update(last_name='Okafor', specialization='Cardiology')
+        professional.refresh_from_db()
+
+        self.assertEqual(professional.search_name, 'ada okafor')
+        self.assertIn("'cardiology':1A", professional.search_vector)
+
+
+class ProfessionalRegistrySearchTestCase(TestCase):
+    """Test indexed registry search, ranking and keyset pagination"""
+
+    def setUp(self):
+        ProfessionalRegistrySearch.clear_keyword_vocabulary()
+        self.adeyemi = create_professional('Tunde', 'Adeyemi', 'Cardiology', issued=date(2024, 3, 1))
+        self.adeyemo = create_professional('Kemi', 'Adeyemo', 'Paediatrics', issued=date(2024, 2, 1))
+        self.okafor = create_professional('Chidi', 'Okafor', 'Cardiology', issued=date(2024, 1, 1), city='Abuja', state='FCT')
+        create_professional('Hidden', 'Adeyemi', 'Cardiology', is_searchable=False)
+        create_professional('Lapsed', 'Adeyemi', 'Cardiology', license_status='suspended')
+
+    def tearDown(self):
+        ProfessionalRegistrySearch.clear_keyword_vocabulary()
+
+    def search_ids(self, **params):
+        return [row.pk for row in ProfessionalRegistrySearch.search(**params)['results']]
+
+    def test_name_search_ranks_exact_match_first_and_tolerates_typos(self):
+        self.assertEqual(self.search_ids(query='adeyemi'), [self.adeyemi.pk, self.adeyemo.pk])
+        self.assertIn(self.adeyemi.pk, self.search_ids(query='Adeyemy'))
+        self.assertEqual(self.search_ids(query='yemo'), [self.adeyemo.pk])
+
+    def test_keyword_matches_follow_name_matches(self):
+        # "okafor" is a name; cardiology rows match the keyword stage in listing order
+        self.assertEqual(self.search_ids(query='cardio'), [self.adeyemi.pk, self.okafor.pk])
+        self.assertEqual(self.search_ids(query='abuja'), [self.okafor.pk])
+
+    def test_name_only_query_skips_keyword_stage(self):
+        stages = ProfessionalRegistrySearch.build_stages(query='okafor')
+
+        self.assertEqual([stage for stage, _, _ in stages], ['name'])
+
+    def test_filters(self):
+        self.assertEqual(self.search_ids(specialization='cardi'), [self.adeyemi.pk, self.okafor.pk])
+        self.assertEqual(self.search_ids(state='FCT'), [self.okafor.pk])
+        self.assertEqual(self.search_ids(query=self.okafor.phb_license_number.lower()), [self.okafor.pk])
+
+    def test_keyset_pages_cover_every_row_once(self):
+        for params, expected in [
+            ({}, [self.adeyemi.pk, self.adeyemo.pk, self.okafor.pk]),
+            ({'query': 'adeyemi'}, [self.adeyemi.pk, self.adeyemo.pk]),
+        ]:
+            seen, cursor = [], None
+            while True:
+                page = ProfessionalRegistrySearch.search(cursor=cursor, page_size=1, **params)
+                seen.extend(row.pk for row in page['results'])
+                cursor = page['next_cursor']
+                if not cursor:
+                    break
+            self.assertEqual(seen, expected)
+
+    def test_cursor_crosses_from_name_to_keyword_stage(self):
+        page = ProfessionalRegistrySearch.search(query='card', page_size=1)
+        self.assertEqual([row.pk for row in page['results']], [self.adeyemi.pk])
+
+        page = ProfessionalRegistrySearch.search(query='card', page_size=1, cursor=page['next_cursor'])
+        self.assertEqual([row.pk for row in page['results']], [self.okafor.pk])
+        self.assertIsNone(page['next_cursor'])
+
+    def test_invalid_cursor_rejected(self):
+        with self.assertRaises(InvalidCursor):
+            ProfessionalRegistrySearch.search(cursor='not-a-cursor!')
+
+        name_cursor = ProfessionalRegistrySearch.encode_cursor('name', [0.5, str(self.adeyemi.pk)])
+        with self.assertRaises(InvalidCursor):
+            ProfessionalRegistrySearch.search(cursor=name_cursor)
+
+
+@mock.patch.object(SearchRateThrottle, 'allow_request', return_value=True)
+@mock.patch.object(BurstSearchRateThrottle, 'allow_request', return_value=True)
+class SearchProfessionalsViewTestCase(TestCase):
+    """Test the public registry search endpoint"""
+
+    def setUp(self):
+        ProfessionalRegistrySearch.clear_keyword_vocabulary()
+        self.client = APIClient()
+        self.first = create_professional('Tunde', 'Adeyemi', issued=date(2024, 3, 1))
+        self.second = create_professional('Kemi', 'Adeyemo', issued=date(2024, 2, 1))
+
+    def test_search_returns_next_link_with_cursor(self, *mocks):
+        response = self.client.get('/api/registry/search/', {'query': 'adeyem', 'page_size': 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIn('cursor=', response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertIsNone(response.data['next'])
+
+    def test_bad_cursor_is_a_client_error(self, *mocks):
+        response = self.client.get('/api/registry/search/', {'cursor': 'garbage'})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,86 @@
+# api/tests/test_query_budget.py
+
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+
+from api.middleware.query_budget import QueryBudgetExceeded, normalize_sql, query_histograms
+from api.tests.query_budget import QueryBudgetMixin
+
+User = get_user_model()
+
+
+def users_one_by_one(request):
+    """N+1: one query per user"""
+    emails = [User.objects.filter(pk=pk).values_list('email', flat=True).first() for pk in range(1, 13)]
+    return JsonResponse({'emails': emails})
+
+
+def users_at_once(request):
+    return JsonResponse({'emails': list(User.objects.filter(pk__in=range(1, 13)).values_list('email', flat=True))})
+
+
+urlpatterns = [
+    path('one-by-one/', users_one_by_one, name='one-by-one'),
+    path('at-once/', users_at_once, name='at-once'),
+]
+
+
+class NormalizeSqlTest(SimpleTestCase):
+
+    def test_literals_and_in_lists_collapse(self):
+        self.assertEqual(
+            normalize_sql('SELECT "a"."id" FROM "a"  WHERE "a"."id" IN (%s, %s, %s) AND "a"."name" = \'x\' LIMIT 21'),
+            'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (...) AND "a"."name" = ? LIMIT ?'
+        )
+        self.assertEqual(normalize_sql('SELECT * FROM t2 WHERE id = 1'), normalize_sql('SELECT * FROM t2 WHERE id = 99'))
+
+
+@override_settings(ROOT_URLCONF='api.tests.test_query_budget', QUERY_BUDGET_DEFAULT=50, QUERY_BUDGETS={})
+class QueryBudgetMiddlewareTest(TestCase):
+
+    def setUp(self):
+        query_histograms.reset()
+
+    def test_repeated_statement_is_logged(self):
+        with self.assertLogs('api.middleware.query_budget', level='WARNING') as logs:
+            response = self.client.get('/one-by-one/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('(one-by-one)', logs.output[0])
+        self.assertIn('repeated 12x', logs.output[0])
+
+    def test_per_view_budget(self):
+        with self.settings(QUERY_BUDGETS={'at-once': 0}), self.assertLogs('api.middleware.query_budget') as logs:
+            self.client.get('/at-once/')
+        self.assertIn('1 queries (budget 0)', logs.output[0])
+
+    def test_histograms_per_view(self):
+        self.client.get('/at-once/')
+        self.client.get('/at-once/')
+
+        stats = query_histograms.snapshot()['at-once']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['queries']['sum'], 2)
+        self.assertEqual(stats['queries']['buckets'][0], (1, 2))  # Both requests ran <= 1 query
+        self.assertEqual(stats['db_time']['buckets'][-1], ('+Inf', 2))
+        self.assertGreater(stats['db_time']['sum'], 0)
+
+
+@override_settings(ROOT_URLCONF='api.tests.test_query_budget')
+class QueryBudgetMixinTest(QueryBudgetMixin, TestCase):
+
+    def test_n_plus_one_fails_in_tests(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/one-by-one/')
+        self.assertEqual(self.client.get('/at-once/').status_code, 200)
+
+    def test_assert_query_budget(self):
+        with self.assertQueryBudget(max_queries=1) as recorder:
+            list(User.objects.all())
+        self.assertEqual(recorder.count, 1)
+
+        with self.assertRaises(AssertionError):
+            with self.assertQueryBudget(repeat_threshold=3):
+                for pk in range(3):
+                    User.objects.filter(pk=pk).exists()
@@ -0,0 +1,180 @@
+# api/tests/test_secure_file_streaming.py
+
+import os
+import shutil
+import tempfile
+import uuid
+from datetime import timedelta
+
+from cryptography.fernet import Fernet
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models.secure_documents import SecureDocument, DocumentAccessLog
+from api.views.security.secure_file_manager import SecureDecryptionService
+from api.views.security.secure_stream import (
+    SegmentedVaultFile,
+    RangeNotSatisfiable,
+    encrypt_segmented,
+    parse_range_header,
+)
+
+User = get_user_model()
+
+
+class SegmentedVaultFormatTestCase(SimpleTestCase):
+    """Test the segmented vault format and Range parsing"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.fernet = Fernet(Fernet.generate_key())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, content, segment_size=64):
+        path = os.path.join(self.tmpdir, 'file.encrypted')
+        with open(path, 'wb') as f:
+            f.write(encrypt_segmented(self.fernet, content, segment_size=segment_size))
+        return SegmentedVaultFile(path, self.fernet)
+
+    def test_round_trip_and_ranges(self):
+        """Every byte range decrypts to the matching plaintext slice"""
+        content = os.urandom(1000)
+        vault_file = self._write(content)
+
+        self.assertEqual(vault_file.plaintext_size, 1000)
+        self.assertEqual(b''.join(vault_file.iter_range()), content)
+        for start, end in [(0, 0), (0, 63), (63, 64), (100, 500), (960, 999), (999, 999)]:
+            self.assertEqual(b''.join(vault_file.iter_range(start, end)), content[start:end + 1])
+
+    def test_only_needed_segments_are_decrypted(self):
+        """A small range decrypts a single segment"""
+        vault_file = self._write(os.urandom(1000))
+        calls = []
+        original = vault_file._decrypt_segment
+        vault_file._decrypt_segment = lambda f, index: calls.append(index) or original(f, index)
+
+        list(vault_file.iter_range(130, 140))
+        self.assertEqual(calls, [2])
+
+    def test_empty_file(self):
+        vault_file = self._write(b'')
+        self.assertEqual(b''.join(vault_file.iter_range()), b'')
+
+    def test_truncated_file_rejected(self):
+        path = os.path.join(self.tmpdir, 'file.encrypted')
+        with open(path, 'wb') as f:
+            f.write(encrypt_segmented(self.fernet, os.urandom(500), segment_size=64)[:-10])
+        with self.assertRaises(ValueError):
+            SegmentedVaultFile(path, self.fernet)
+
+    def test_parse_range_header(self):
+        self.assertIsNone(parse_range_header('', 100))
+        self.assertIsNone(parse_range_header('bytes=0-1,5-6', 100))
+        self.assertEqual(parse_range_header('bytes=0-', 100), (0, 99))
+        self.assertEqual(parse_range_header('bytes=10-19', 100), (10, 19))
+        self.assertEqual(parse_range_header('bytes=90-500', 100), (90, 99))
+        self.assertEqual(parse_range_header('bytes=-10', 100), (90, 99))
+        with self.assertRaises(RangeNotSatisfiable):
+            parse_range_header('bytes=100-', 100)
+
+
+class SecureFileStreamingViewTestCase(TestCase):
+    """Test Range-aware preview and download endpoints"""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+
+        self.user = User.objects.create_user(
+            email='vault@example.com',
+            password='testpass123',
+            first_name='Vault',
+            last_name='User'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+        self.content = b'%PDF-1.4\n' + os.urandom(200 * 1024)
+        cipher = SecureDecryptionService.get_user_encryption_key(self.user)
+        file_id = uuid.uuid4()
+        secure_filename = f'{file_id}.pdf.encrypted'
+        vault_dir = os.path.join(self.media_root, 'secure_medical_vault')
+        os.makedirs(vault_dir)
+        with open(os.path.join(vault_dir, secure_filename), 'wb') as f:
+            f.write(encrypt_segmented(cipher, self.content))
+
+        self.document = SecureDocument.objects.create(
+            file_id=file_id,
+            user=self.user,
+            original_filename='report.pdf',
+            secure_filename=secure_filename,
+            file_extension='.pdf',
+            file_type='document',
+            file_size=len(self.content),
+            encryption_key_id='test',
+            vault_path=f'secure_medical_vault/{secure_filename}'
+        )
+        self.url = f'/api/secure/files/{file_id}/preview/'
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_full_preview_streams_content(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    def test_range_request_returns_partial_content(self):
+        response = self.client.get(self.url, HTTP_RANGE='bytes=70000-70099')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 70000-70099/{len(self.content)}')
+        self.assertEqual(b''.join(response.streaming_content), self.content[70000:70100])
+
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+
+    def test_access_logged_once_per_download(self):
+        """Follow-up Range requests don't add audit rows"""
+        self.client.get(self.url, HTTP_RANGE='bytes=0-1023')
+        self.client.get(self.url, HTTP_RANGE='bytes=1024-2047')
+        self.client.get(self.url, HTTP_RANGE='bytes=2048-4095')
+
+        self.assertEqual(DocumentAccessLog.objects.filter(document=self.document).count(), 1)
+        self.document.refresh_from_db()
+        self.assertEqual(self.document.access_count, 1)
+
+    def test_access_logged_whatever_the_range(self):
+        """Ranges that don't start at byte 0 are still audited"""
+        self.client.get(self.url, HTTP_RANGE='bytes=1-')
+        self.client.get(self.url, HTTP_RANGE='bytes=-1')
+
+        self.assertEqual(DocumentAccessLog.objects.filter(document=self.document, action='view').count(), 1)
+
+    def test_access_logged_again_after_audit_window(self):
+        self.client.get(self.url, HTTP_RANGE='bytes=1024-2047')
+        DocumentAccessLog.objects.filter(document=self.document).update(
+            timestamp=timezone.now() - timedelta(seconds=301)
+        )
+        self.client.get(self.url, HTTP_RANGE='bytes=2048-4095')
+        with self.settings(VAULT_ACCESS_AUDIT_WINDOW=0):
+            self.client.get(self.url, HTTP_RANGE='bytes=2048-4095')
+
+        self.assertEqual(DocumentAccessLog.objects.filter(document=self.document).count(), 3)
+
+    def test_download_uses_attachment_disposition(self):
+        response = self.client.get(f'/api/secure/files/{self.document.file_id}/download/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Disposition'].startswith('attachment'))
+        self.assertEqual(
+            DocumentAccessLog.objects.get(document=self.document).action, 'download'
+        )
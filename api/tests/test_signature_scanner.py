@@ -0,0 +1,43 @@
+# api/tests/test_signature_scanner.py
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+
+from api.views.security.secure_upload import SecureVirusScanner
+from api.views.security.signature_scanner import (
+    SignatureTable,
+    StreamingSignatureScanner,
+)
+
+
+class StreamingSignatureScannerTestCase(SimpleTestCase):
+    """Test the single-pass streaming signature scanner"""
+
+    def test_table_is_shared_per_process(self):
+        self.assertIs(SignatureTable.get(), SignatureTable.get())
+
+    def test_match_straddling_chunk_boundary(self):
+        """A signature split across chunks is still found"""
+        scanner = StreamingSignatureScanner()
+        scanner.scan_chunks([b'%PDF header <scr', b'IPT>alert(1)'])
+        self.assertEqual(scanner.matched_signatures, [b'<script'])
+
+    def test_overlapping_and_contained_signatures(self):
+        table = SignatureTable([b'ab', b'abc', b'cde', b'b'])
+        scanner = StreamingSignatureScanner(table)
+        scanner.scan_chunks([b'xxA', b'BcD', b'E'])
+        self.assertEqual(scanner.matched_signatures, [b'ab', b'abc', b'cde', b'b'])
+
+    def test_clean_stream(self):
+        scanner = StreamingSignatureScanner()
+        scanner.scan_chunks([b'%PDF-1.4 plain document'] * 10)
+        self.assertEqual(scanner.matched_signatures, [])
+        self.assertEqual(scanner.bytes_scanned, 230)
+
+    def test_virus_scanner_reports_threats(self):
+        uploaded = SimpleUploadedFile('note.txt', b'hello <body onload=evil()>')
+        result = SecureVirusScanner.scan_file(uploaded)
+        self.assertFalse(result['is_clean'])
+        self.assertEqual(result['threats_found'], 1)
+        self.assertEqual(result['scan_details'], ['Suspicious pattern detected: onload='])
+        self.assertEqual(uploaded.tell(), 0)
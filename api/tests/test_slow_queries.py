@@ -0,0 +1,137 @@
+# api/tests/test_slow_queries.py
+
+import json
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.agent_modules.performance.slow_queries import (
+    IndexAdvisor, condition_columns, slow_query_recorder, summarize_plan,
+)
+from api.models import InAppNotification
+
+User = get_user_model()
+
+
+class PlanParsingTest(SimpleTestCase):
+
+    def test_condition_columns(self):
+        self.assertEqual(
+            condition_columns('((api_appointment.doctor_id = 7) AND (appointment_date >= \'2024-01-01\'::date))'),
+            (['doctor_id'], ['appointment_date'])
+        )
+        self.assertEqual(condition_columns('(NOT is_read)'), (['is_read'], []))
+
+    @override_settings(SLOW_QUERY_SEQ_SCAN_MIN_ROWS=1000)
+    def test_index_scan_with_filter_suggests_composite_index(self):
+        plan = summarize_plan({'Plan': {
+            'Node Type': 'Index Scan', 'Relation Name': 'api_appointment',
+            'Index Name': 'api_appointment_doctor_id_idx', 'Total Cost': 812.5,
+            'Index Cond': '(doctor_id = 7)',
+            'Filter': "((appointment_date >= '2024-01-01'::date) AND (appointment_date < '2024-02-01'::date))",
+            'Rows Removed by Filter': 48210,
+        }})
+        self.assertEqual(plan['node_types'], ['Index Scan'])
+
+        entry = {'fingerprint': 'f1', 'total_seconds': 1.5, 'plan': plan}
+        suggestions = IndexAdvisor().suggest([entry])
+        self.assertEqual(len(suggestions), 1)
+        self.assertEqual(suggestions[0]['model'], 'api.Appointment')
+        self.assertEqual(suggestions[0]['fields'], ['doctor', 'appointment_date'])
+        self.assertEqual(suggestions[0]['fingerprints'], ['f1'])
+
+        plan['filtered_scans'][0]['rows_removed_by_filter'] = 10  # Filter barely removes anything
+        self.assertEqual(IndexAdvisor().suggest([entry]), [])
+
+    @override_settings(SLOW_QUERY_SEQ_SCAN_MIN_ROWS=0)
+    def test_plan_conditions_drop_bound_values(self):
+        plan = summarize_plan({'Plan': {
+            'Node Type': 'Seq Scan', 'Relation Name': 'api_customuser', 'Total Cost': 40.0,
+            'Filter': "((hpn = 'UNK 244 494 5775'::text) AND (email = 'patient@example.com'::text))",
+            'Rows Removed by Filter': 999,
+        }})
+        scan = plan['filtered_scans'][0]
+        self.assertEqual(scan['filter'], "((hpn = ?::text) AND (email = ?::text))")
+
+        entry = {'fingerprint': 'f1', 'total_seconds': 1.5, 'plan': plan}
+        suggestions = IndexAdvisor().suggest([entry])
+        self.assertEqual(suggestions[0]['fields'], ['hpn', 'email'])
+        report = json.dumps(suggestions)
+        self.assertNotIn('patient@example.com', report)
+        self.assertNotIn('244 494', report)
+
+
+@override_settings(
+    SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_EXPLAIN_SAMPLE_RATE=1, SLOW_QUERY_SEQ_SCAN_MIN_ROWS=0,
+    SLOW_QUERY_BACKEND='local',
+)
+class SlowQueryRecorderTest(TestCase):
+
+    def setUp(self):
+        slow_query_recorder._client_resolved = False
+        slow_query_recorder.reset()
+        self.addCleanup(slow_query_recorder.reset)
+        self.user = User.objects.create_user(
+            email='slow@example.com', password='testpass123', first_name='Slow', last_name='Query'
+        )
+        for number in range(5):
+            InAppNotification.objects.create(
+                user=self.user, title=f'Notification {number}', message='-', notification_type='system'
+            )
+
+    def unread(self):
+        return list(InAppNotification.objects.filter(user=self.user, is_read=False).order_by('-created_at'))
+
+    def test_queries_fingerprinted_and_explained(self):
+        with slow_query_recorder.capture():
+            self.unread()
+            self.unread()
+
+        report = slow_query_recorder.report()
+        query = next(query for query in report['queries'] if 'api_inappnotification' in query['sql'])
+        self.assertEqual(query['calls'], 2)
+        self.assertNotIn(str(self.user.id), query['sql'])
+        self.assertTrue(query['plan']['filtered_scans'])
+
+        suggestion = next(s for s in report['index_suggestions'] if s['model'] == 'api.InAppNotification')
+        self.assertEqual(suggestion['fields'], ['user', 'is_read', '-created_at'])
+        self.assertIn(query['fingerprint'], suggestion['fingerprints'])
+
+    def test_fastest_fingerprint_evicted(self):
+        with self.settings(SLOW_QUERY_MAX_FINGERPRINTS=2):
+            slow_query_recorder.record('SELECT 1 FROM a WHERE id = 1', None, 0.5)
+            slow_query_recorder.record('SELECT 1 FROM b WHERE id = 1', None, 0.1)
+            slow_query_recorder.record('SELECT 1 FROM c WHERE id = 1', None, 0.3)
+            slow_query_recorder.record('SELECT 1 FROM a WHERE id = 2', None, 0.5)
+
+        queries = slow_query_recorder.report()['queries']
+        self.assertEqual([query['sql'] for query in queries], [
+            'SELECT ? FROM a WHERE id = ?', 'SELECT ? FROM c WHERE id = ?'
+        ])
+        self.assertEqual(queries[0]['calls'], 2)
+
+    def test_management_command(self):
+        with slow_query_recorder.capture():
+            self.unread()
+
+        out = StringIO()
+        call_command('slow_query_report', '--reset', stdout=out)
+        self.assertIn('api_inappnotification', out.getvalue())
+        self.assertIn("models.Index(fields=['user', 'is_read', '-created_at'])", out.getvalue())
+        self.assertEqual(slow_query_recorder.report()['queries'], [])
+
+    def test_endpoint_is_staff_only(self):
+        slow_query_recorder.record('SELECT 1 FROM a WHERE id = 1', None, 0.5)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get('/api/agents/performance/slow-queries/').status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = client.get('/api/agents/performance/slow-queries/?limit=5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['queries'][0]['sql'], 'SELECT ? FROM a WHERE id = ?')
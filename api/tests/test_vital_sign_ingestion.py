@@ -0,0 +1,157 @@
+# api/tests/test_vital_sign_ingestion.py
+
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from api.models import Hospital, HospitalRegistration
+from api.models.medical import VitalSign
+from api.services.vital_sign_ingestion import VitalSignIngestion, abnormal_vitals_recorded
+
+User = get_user_model()
+
+RECORDED_AT = datetime(2024, 5, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def random_reading(rng):
+    reading = {
+        'systolic_bp': rng.choice([None, 89, 90, 120, 140, 141]),
+        'diastolic_bp': rng.choice([None, 59, 60, 80, 90, 91]),
+        'heart_rate': rng.choice([None, 59, 60, 80, 100, 101]),
+        'respiratory_rate': rng.choice([None, 11, 12, 16, 20, 21]),
+        'oxygen_saturation': rng.choice([None, '94.99', '95.00', '98.50']),
+        'temperature': rng.choice([None, '36.09', '36.10', '37.00', '37.80', '37.81', '96.99', '100.00', '100.01']),
+        'temperature_unit': rng.choice(['C', 'F']),
+        'blood_glucose': rng.choice([None, '3.80', '3.90', '5.60', '5.70', '69.00', '100.00', '140.00', '140.01']),
+        'glucose_unit': rng.choice(['mg/dL', 'mmol/L']),
+        'glucose_timing': rng.choice([None, 'fasting', 'random', 'post_meal']),
+        'weight': rng.choice([None, '70.00', '154.30']),
+        'weight_unit': rng.choice(['kg', 'lb']),
+        'height': rng.choice([None, '175.00', '68.90']),
+        'height_unit': rng.choice(['cm', 'in']),
+    }
+    return reading
+
+
+class VectorizedChecksTestCase(SimpleTestCase):
+    """Test the vectorized checks against VitalSign's per-row logic"""
+
+    def test_abnormal_mask_and_bmi_match_model(self):
+        rng = random.Random(7)
+        readings = [random_reading(rng) for _ in range(2000)]
+        columns, errors = VitalSignIngestion.build_columns(
+            [dict(reading, recorded_at=RECORDED_AT.isoformat()) for reading in readings]
+        )
+        self.assertEqual(errors, {})
+
+        abnormal = VitalSignIngestion.abnormal_mask(columns)
+        bmi = VitalSignIngestion.compute_bmi(columns)
+
+        for index, reading in enumerate(readings):
+            fields = {
+                name: Decimal(value) if name in VitalSignIngestion.DECIMAL_FIELDS and value else value
+                for name, value in reading.items()
+            }
+            vital_sign = VitalSign(**fields)
+            with mock.patch('django.db.models.Model.save'):
+                vital_sign.save()
+            with self.subTest(reading=reading):
+                self.assertEqual(bool(abnormal[index]), vital_sign.is_abnormal)
+                expected_bmi = float(vital_sign.bmi) if vital_sign.bmi is not None else None
+                self.assertEqual(None if np.isnan(bmi[index]) else float(bmi[index]), expected_bmi)
+
+    def test_validation_errors_by_index(self):
+        columns, errors = VitalSignIngestion.build_columns([
+            {'recorded_at': RECORDED_AT.isoformat(), 'heart_rate': 72},
+            {'recorded_at': 'yesterday', 'heart_rate': 'fast'},
+            {'recorded_at': RECORDED_AT.isoformat(), 'systolic_bp': 350, 'respiratory_rate': 12.5},
+            {'recorded_at': RECORDED_AT.isoformat(), 'temperature_unit': 'K', 'weight': '1000000'},
+        ])
+
+        self.assertNotIn(0, errors)
+        self.assertEqual(set(errors[1]), {'recorded_at', 'heart_rate'})
+        self.assertEqual(set(errors[2]), {'systolic_bp', 'respiratory_rate'})
+        self.assertEqual(set(errors[3]), {'temperature_unit', 'weight'})
+
+
+class VitalSignIngestionTestCase(TestCase):
+    """Test bulk storage, per-patient alerts and the upload endpoint"""
+
+    def setUp(self):
+        self.hospital = Hospital.objects.create(
+            name="Test Hospital", address="123 Test St", city="Test City", state="Test State",
+            country="Test Country", postal_code="12345", phone="1234567890", email="test@hospital.com",
+            registration_number="TEST001", hospital_type="public", bed_capacity=100
+        )
+        self.nurse = User.objects.create_user(
+            email='nurse@example.com', password='testpass123', first_name='Ward', last_name='Nurse', role='nurse'
+        )
+        HospitalRegistration.objects.create(user=self.nurse, hospital=self.hospital, status='approved')
+        self.patients = []
+        for index in range(2):
+            patient = User.objects.create_user(
+                email=f'patient{index}@example.com', password='testpass123', first_name='Ward', last_name=f'Patient{index}'
+            )
+            HospitalRegistration.objects.create(user=patient, hospital=self.hospital, status='approved')
+            self.patients.append(patient)
+        self.outsider = User.objects.create_user(
+            email='outsider@example.com', password='testpass123', first_name='Other', last_name='Patient'
+        )
+
+    def readings(self, patient, values):
+        return [
+            dict(hpn=patient.hpn, recorded_at=(RECORDED_AT + timedelta(minutes=index)).isoformat(), **reading)
+            for index, reading in enumerate(values)
+        ]
+
+    def test_batch_stored_with_one_alert_per_patient(self):
+        received = []
+        abnormal_vitals_recorded.connect(lambda **kwargs: received.append(kwargs), weak=False, dispatch_uid='test')
+        self.addCleanup(abnormal_vitals_recorded.disconnect, dispatch_uid='test')
+        first, second = self.patients
+        readings = (
+            self.readings(first, [{'heart_rate': 120}, {'heart_rate': 130}, {'heart_rate': 72}])
+            + self.readings(second, [{'heart_rate': 72, 'weight': '70', 'height': '175'}])
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = VitalSignIngestion.ingest(readings, recorded_by=self.nurse)
+
+        self.assertEqual(len(result['created']), 4)
+        self.assertEqual(result['rejected'], [])
+        self.assertEqual(VitalSign.objects.filter(is_abnormal=True).count(), 2)
+        self.assertEqual(VitalSign.objects.get(medical_record__user=second).bmi, Decimal('22.86'))
+        self.assertEqual(len(received), 1)
+        self.assertEqual(received[0]['medical_record_id'], first.medical_record.pk)
+        self.assertEqual(len(received[0]['vital_sign_ids']), 2)
+        self.assertEqual(received[0]['latest'].heart_rate, 130)
+
+    def test_endpoint_rejects_unknown_and_invalid_readings(self):
+        client = APIClient()
+        client.force_authenticate(self.nurse)
+        readings = (
+            self.readings(self.patients[0], [{'heart_rate': 72}, {'heart_rate': 500}])
+            + self.readings(self.outsider, [{'heart_rate': 72}])
+        )
+
+        response = client.post('/api/vitals/bulk/', {'readings': readings}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([item['index'] for item in response.data['rejected']], [1, 2])
+        self.assertIn('hpn', response.data['rejected'][1]['errors'])
+        self.assertFalse(VitalSign.objects.filter(medical_record__user=self.outsider).exists())
+
+    def test_endpoint_requires_hospital_staff(self):
+        client = APIClient()
+        client.force_authenticate(self.outsider)
+
+        response = client.post('/api/vitals/bulk/', {'readings': self.readings(self.outsider, [{}])}, format='json')
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,45 @@
+# api/tests/test_websocket_load.py
+
+from django.contrib.auth import get_user_model
+from django.test import TransactionTestCase
+
+from api.models.messaging import Conversation
+from api.services.websocket_load import WebSocketLoadTest
+
+
+# Channels closes the database connection around every consumer query, which
+# a TestCase transaction does not survive; the harness commits and cleans up.
+class WebSocketLoadTestTest(TransactionTestCase):
+
+    def test_small_run(self):
+        load_test = WebSocketLoadTest(
+            conversations=2, group_size=3, duration=1.0, message_rate=10, typing_rate=10, presence_rate=2,
+            drain_timeout=5.0,
+        )
+        report = load_test.execute()
+
+        for consumer in ('ChatConsumer', 'TypingIndicatorConsumer', 'PresenceConsumer'):
+            self.assertEqual(report['connections'][consumer]['failed'], 0)
+            self.assertGreaterEqual(report['connections'][consumer]['connected'], 6)
+        chat = report['events']['chat']
+        self.assertGreater(chat['sent'], 0)
+        self.assertEqual(chat['expected_deliveries'], 2 * chat['sent'])
+        self.assertEqual(chat['dropped'], 0)
+        self.assertEqual(chat['fanout']['count'], chat['delivered'])
+        self.assertIsNotNone(chat['fanout']['p95_ms'])
+        self.assertEqual(report['events']['typing']['dropped'], 0)
+        self.assertGreater(report['events']['presence']['reconnects'], 0)
+        self.assertEqual(report['server_errors'], 0)
+        self.assertGreater(report['queries']['per_message'], 0)
+        self.assertGreater(report['queries']['per_connection'], 0)
+
+        self.assertFalse(Conversation.objects.filter(id__in=list(load_test.members)).exists())
+        self.assertFalse(get_user_model().objects.filter(id__in=list(load_test.tokens)).exists())
+
+    def test_single_consumer(self):
+        report = WebSocketLoadTest(conversations=1, group_size=2, consumers=['typing'], duration=0.5).execute()
+
+        self.assertEqual(list(report['connections']), ['TypingIndicatorConsumer'])
+        self.assertEqual(list(report['events']), ['typing'])
+        self.assertEqual(report['events']['typing']['dropped'], 0)
+        self.assertIsNone(report['queries']['per_message'])
@@ -0,0 +1,139 @@
+# api/tests/test_womens_health_summary.py
+
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+
+from api.models import DailyHealthLog, HealthGoal, MenstrualCycle, WomensHealthProfile, WomensHealthSummary
+from api.services.womens_health_summary import WomensHealthSummaryService
+
+User = get_user_model()
+
+SUMMARY_FIELDS = [
+    field.name for field in WomensHealthSummary._meta.concrete_fields
+    if field.name not in ('id', 'created_at', 'updated_at')
+]
+
+
+class WomensHealthSummaryTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='summary@example.com', password='testpass123', first_name='Sum', last_name='Mary'
+        )
+        self.profile = WomensHealthProfile.objects.create(user=self.user)
+        self.today = timezone.now().date()
+
+    def log(self, days_ago, **fields):
+        fields.setdefault('mood', 'good')
+        return DailyHealthLog.objects.create(
+            womens_health_profile=self.profile, date=self.today - timedelta(days=days_ago), **fields
+        )
+
+    def summary(self):
+        return WomensHealthSummary.objects.get(womens_health_profile=self.profile)
+
+    def assertMatchesRebuild(self):
+        stored = self.summary()
+        rebuilt = WomensHealthSummaryService.rebuild(self.profile, save=False)
+        for field in SUMMARY_FIELDS:
+            self.assertEqual(getattr(stored, field), getattr(rebuilt, field), field)
+
+    def test_incremental_updates_match_rebuild(self):
+        for days_ago in (40, 12, 6, 5, 4, 2, 1, 0):
+            self.log(days_ago, sleep_duration_hours=Decimal('7.50'), exercise_performed=days_ago % 2 == 0)
+        self.log(3, mood='low', weight_kg=Decimal('61.20'))       # back-filled day joins the runs
+        edited = DailyHealthLog.objects.get(womens_health_profile=self.profile, date=self.today)
+        edited.mood = 'excellent'
+        edited.save()
+
+        MenstrualCycle.objects.create(womens_health_profile=self.profile, cycle_start_date=date(2024, 1, 1), cycle_length=27)
+        MenstrualCycle.objects.create(womens_health_profile=self.profile, cycle_start_date=date(2024, 1, 28), cycle_length=31)
+        goal = HealthGoal.objects.create(
+            womens_health_profile=self.profile, title='Water', goal_type='numeric', target_value=8, start_date=self.today
+        )
+        goal.update_progress(4)
+
+        self.assertMatchesRebuild()
+        summary = self.summary()
+        self.assertEqual(summary.total_logs, 9)
+        self.assertEqual(summary.current_logging_streak, 7)
+        self.assertEqual(summary.longest_logging_streak, 7)
+        self.assertEqual(summary.total_cycles, 2)
+        self.assertEqual(summary.average_cycle_length, 29.0)
+        self.assertEqual((summary.active_goals, summary.average_goal_progress), (1, 50.0))
+        self.assertEqual(summary.rolling_averages['7_days']['logged_days'], 7)
+        self.assertEqual(summary.rolling_averages['30_days']['logged_days'], 8)
+        self.assertEqual(summary.rolling_averages['7_days']['average_weight_kg'], 61.2)
+
+    def test_streak_breaks_after_a_gap(self):
+        self.log(10)
+        self.log(9)
+        self.log(8)
+        self.log(2)
+
+        summary = self.summary()
+        self.assertEqual((summary.logging_streak, summary.longest_logging_streak), (1, 3))
+        self.assertEqual(summary.current_logging_streak, 0)
+
+    def test_deleting_a_log_updates_summary(self):
+        self.log(1)
+        self.log(0).delete()
+
+        self.assertMatchesRebuild()
+        self.assertEqual(self.summary().total_logs, 1)
+
+    def test_moving_a_log_to_another_date(self):
+        self.log(2)
+        self.log(1)
+        moved = self.log(0, mood='low')
+        moved.date = self.today - timedelta(days=45)
+        moved.save()
+
+        self.assertMatchesRebuild()
+        summary = self.summary()
+        self.assertNotIn(self.today.isoformat(), summary.recent_days)
+        self.assertEqual(summary.first_log_date, self.today - timedelta(days=45))
+        self.assertEqual(summary.last_log_date, self.today - timedelta(days=1))
+        self.assertEqual((summary.logging_streak, summary.longest_logging_streak), (2, 2))
+
+    def test_weekly_trends_from_summary_match_query(self):
+        for days_ago in range(9):
+            self.log(days_ago, sleep_duration_hours=Decimal('6.25'), weight_kg=Decimal('60.10'), pain_level=days_ago)
+        latest = DailyHealthLog.objects.get(womens_health_profile=self.profile, date=self.today)
+
+        with self.assertNumQueries(1):
+            from_summary = latest.get_weekly_trends()
+        WomensHealthSummary.objects.filter(womens_health_profile=self.profile).delete()
+        self.assertEqual(latest.get_weekly_trends(), from_summary)
+
+    def test_get_summary_slides_stale_window(self):
+        self.log(3)
+        WomensHealthSummary.objects.filter(womens_health_profile=self.profile).update(
+            window_end_date=self.today - timedelta(days=10)
+        )
+
+        summary = WomensHealthSummaryService.get_summary(self.profile)
+        self.assertEqual(summary.window_end_date, self.today)
+        self.assertEqual(summary.rolling_averages['7_days']['logged_days'], 1)
+
+    def test_rebuild_command_check(self):
+        self.log(1)
+        call_command('rebuild_womens_health_summaries', '--check', stdout=StringIO())
+
+        # bulk_create bypasses save(), so the summary falls behind until rebuilt
+        DailyHealthLog.objects.bulk_create([
+            DailyHealthLog(womens_health_profile=self.profile, date=self.today, mood='good')
+        ])
+        with self.assertRaises(CommandError):
+            call_command('rebuild_womens_health_summaries', '--check', stdout=StringIO())
+
+        call_command('rebuild_womens_health_summaries', '--profile', str(self.profile.pk), stdout=StringIO())
+        call_command('rebuild_womens_health_summaries', '--check', stdout=StringIO())
+        self.assertEqual(self.summary().total_logs, 2)
@@ -96,6 +96,9 @@ from api.views.hospital.admission_views import PatientAdmissionViewSet
 # Patient search views
 from api.views.hospital.patient_views import search_patients
 
+# Vital sign views
+from api.views.medical.vital_signs_views import bulk_ingest_vital_signs
+
 # Doctor views  
 from api.views.medical_staff.doctor_views import DoctorListView
 from api.views.medical_staff.staff_views import StaffManagementView
@@ -198,6 +201,7 @@ from api.views.agent_views import (
     optimize_database_queries,
     refresh_cache_layer,
     monitor_system_performance,
+    slow_query_report,
     
     # Clinical Agent endpoints
     clinical_agent_status,
@@ -504,6 +508,9 @@ urlpatterns = [
 
     # Patient search endpoint
     path('patients/search/', search_patients, name='patient-search'),
+
+    # Bulk vital sign upload (ward devices, charting sessions)
+    path('vitals/bulk/', bulk_ingest_vital_signs, name='vital-signs-bulk'),
     
     # Doctors endpoint
     path('doctors/', DoctorListView.as_view(), name='doctor-list'),
@@ -602,6 +609,7 @@ urlpatterns = [
     path('agents/performance/optimize-database/', optimize_database_queries, name='optimize_database'),
     path('agents/performance/refresh-cache/', refresh_cache_layer, name='refresh_cache'),
     path('agents/performance/monitor-performance/', monitor_system_performance, name='monitor_performance'),
+    path('agents/performance/slow-queries/', slow_query_report, name='slow_query_report'),
     
     # Clinical Agent URLs
     path('agents/clinical/status/', clinical_agent_status, name='clinical_status'),
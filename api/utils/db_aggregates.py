@@ -0,0 +1,20 @@
+from django.db.models import Aggregate, FloatField
+
+
+class PercentileCont(Aggregate):
+    """
+    PostgreSQL percentile_cont ordered-set aggregate, e.g.
+
+        PercentileCont('duration_ms', percentile=0.95)
+
+    renders percentile_cont(0.95) WITHIN GROUP (ORDER BY duration_ms).
+    """
+    function = 'percentile_cont'
+    name = 'PercentileCont'
+    output_field = FloatField()
+    template = '%(function)s(%(percentile)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+
+    def __init__(self, expression, percentile, **extra):
+        if not 0 <= percentile <= 1:
+            raise ValueError("percentile must be between 0 and 1")
+        super().__init__(expression, percentile=float(percentile), **extra)
@@ -9,7 +9,6 @@ import base64
 from .calendar import generate_ics_for_appointment
 from django.utils import timezone
 from io import BytesIO
-from weasyprint import HTML, CSS
 
 logger = logging.getLogger(__name__)
 
@@ -3187,11 +3186,10 @@ def generate_hospital_certificate_pdf(hospital):
 </html>
 """
 
-        # Generate PDF using WeasyPrint for better font support
-        pdf_buffer = BytesIO()
-        HTML(string=certificate_html).write_pdf(pdf_buffer)
-        
-        pdf_buffer.seek(0)
+        # Generate PDF using WeasyPrint for better font support (rendered in the
+        # PDF worker pool; identical certificates are served from its cache)
+        from api.services.pdf_rendering import PDFRenderingService
+        pdf_buffer = BytesIO(PDFRenderingService.render_html('hospital_certificate', certificate_html))
         logger.info(f"✅ PDF certificate generated for {hospital.name}")
         return pdf_buffer
 
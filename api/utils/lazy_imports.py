@@ -0,0 +1,85 @@
+"""
+Lazy loading for heavy optional libraries.
+
+WeasyPrint, scikit-learn, joblib, geoip2, twilio and xhtml2pdf each pull in
+tens of megabytes of native code and take hundreds of milliseconds to
+import. Most requests never touch them, so importing them at module level
+makes every Gunicorn/Daphne worker pay that cost at boot and keep it
+resident. Modules that need them bind a proxy instead:
+
+    weasyprint = lazy_import('weasyprint')
+    ...
+    weasyprint.HTML(string=html).write_pdf(buffer)
+
+The real import happens on first attribute access and is cached in
+sys.modules as usual.
+"""
+
+import importlib
+import threading
+
+from django.utils.functional import SimpleLazyObject
+
+# Libraries that must not be imported while a worker boots; checked by the
+# profile_startup management command
+HEAVY_MODULES = (
+    'weasyprint',
+    'sklearn',
+    'joblib',
+    'numpy',
+    'pandas',
+    'geoip2',
+    'twilio',
+    'xhtml2pdf',
+)
+
+
+class LazyModule:
+    """Module proxy that imports the real module on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+        self.__dict__['_lock'] = threading.Lock()
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with self.__dict__['_lock']:
+                module = self.__dict__['_module']
+                if module is None:
+                    module = importlib.import_module(self.__dict__['_name'])
+                    self.__dict__['_module'] = module
+        return module
+
+    @property
+    def is_loaded(self):
+        return self.__dict__['_module'] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    """Return a proxy for module `name` that defers the import until first use"""
+    return LazyModule(name)
+
+
+def lazy_singleton(factory):
+    """
+    Defer building a module-level singleton until it is first used.
+
+    Wraps Django's SimpleLazyObject, so existing `from x import instance`
+    call sites keep working unchanged.
+    """
+    return SimpleLazyObject(factory)
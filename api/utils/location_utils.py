@@ -1,33 +1,194 @@
-import geoip2.database
+import logging
 import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
 from django.conf import settings
+from api.utils.lazy_imports import lazy_import
+
+# geoip2 (and maxminddb) load on the first lookup
+geoip2_database = lazy_import('geoip2.database')
+
+logger = logging.getLogger(__name__)
+
+EMPTY_LOCATION = {'country': None, 'city': None, 'state': None}
+
+# Live resolvers, reset in forked children (gunicorn --preload, multiprocessing)
+_resolvers = weakref.WeakSet()
+
+
+class GeoIPResolver:
+    """
+    Process-wide GeoLite2 City reader with an LRU cache of recent lookups.
+
+    The database is opened once per process, on first use, in MODE_MMAP:
+    lookups read straight from the page cache, which every worker on the
+    host shares, instead of re-opening and re-mapping the file per call.
+    After a fork the child drops the inherited reader (and lock) and opens
+    its own.
+
+    Results, including misses for private/unknown addresses, are kept in a
+    bounded LRU with a TTL, since login flows resolve the same handful of
+    addresses over and over.
+    """
+
+    def __init__(self, db_path=None, cache_size=None, ttl=None):
+        self._db_path = db_path
+        self._cache_size = cache_size
+        self._ttl = ttl
+        self._reader = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        _resolvers.add(self)
+
+    @property
+    def db_path(self):
+        return self._db_path or getattr(
+            settings, 'GEOIP_DATABASE_PATH', os.path.join(settings.BASE_DIR, 'geoip2', 'GeoLite2-City.mmdb')
+        )
+
+    @property
+    def cache_size(self):
+        return self._cache_size if self._cache_size is not None else getattr(settings, 'GEOIP_CACHE_SIZE', 4096)
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else getattr(settings, 'GEOIP_CACHE_TTL', 3600)
+
+    def _after_fork(self):
+        # The parent's lock may have been held mid-fork; the mapping is reopened lazily
+        self._lock = threading.Lock()
+        self._reader = None
+        self._pid = None
+
+    def reader(self):
+        """The shared reader, opened on first use (raises if the database is missing or corrupt)"""
+        reader = self._reader
+        if reader is None or self._pid != os.getpid():
+            with self._lock:
+                if self._reader is None or self._pid != os.getpid():
+                    self._reader = geoip2_database.Reader(self.db_path, mode=geoip2_database.MODE_MMAP)
+                    self._pid = os.getpid()
+                reader = self._reader
+        return reader
+
+    def close(self):
+        with self._lock:
+            if self._reader is not None and self._pid == os.getpid():
+                self._reader.close()
+            self._reader = None
+            self._pid = None
+
+    # ----- cache -----
+
+    def _cached(self, ip_address, now):
+        with self._lock:
+            entry = self._cache.get(ip_address)
+            if entry is None or entry[0] <= now:
+                return None
+            self._cache.move_to_end(ip_address)
+            return entry[1]
+
+    def _store(self, ip_address, location, now):
+        with self._lock:
+            self._cache[ip_address] = (now + self.ttl, location)
+            self._cache.move_to_end(ip_address)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+            self.hits = self.misses = 0
+
+    def cache_info(self):
+        return {'size': len(self._cache), 'max_size': self.cache_size, 'hits': self.hits, 'misses': self.misses}
+
+    # ----- lookups -----
+
+    @staticmethod
+    def _resolve(reader, ip_address):
+        try:
+            response = reader.city(ip_address)
+        except Exception as e:
+            # AddressNotFoundError for private/unknown ranges, ValueError for malformed input
+            logger.debug(f"No GeoIP location for {ip_address!r}: {str(e)}")
+            return dict(EMPTY_LOCATION)
+        return {
+            'country': response.country.name,
+            'city': response.city.name,
+            'state': response.subdivisions.most_specific.name if response.subdivisions.most_specific else None
+        }
+
+    def lookup(self, ip_address):
+        """Location dict for one address (all None when it cannot be resolved)"""
+        return self.lookup_many([ip_address])[ip_address]
+
+    def lookup_many(self, ip_addresses):
+        """
+        {ip: location} for many addresses (e.g. an analytics job over login
+        history); each distinct address is resolved at most once.
+        """
+        now = time.monotonic()
+        results = {}
+        pending = []
+        for ip_address in dict.fromkeys(ip_addresses):
+            location = self._cached(ip_address, now)
+            if location is None:
+                pending.append(ip_address)
+            else:
+                results[ip_address] = dict(location)
+        self.hits += len(results)
+        self.misses += len(pending)
+
+        if pending:
+            try:
+                reader = self.reader()
+            except Exception as e:
+                # Missing/corrupt database (maxminddb.InvalidDatabaseError is a RuntimeError): never fail
+                # the login that asked; don't cache, so installing it takes effect without a restart
+                logger.warning(f"GeoIP database unavailable at {self.db_path}: {str(e)}")
+                results.update((ip_address, dict(EMPTY_LOCATION)) for ip_address in pending)
+                return results
+
+            for ip_address in pending:
+                location = self._resolve(reader, ip_address)
+                self._store(ip_address, location, now)
+                results[ip_address] = dict(location)
+        return results
+
+
+def _reset_resolvers_after_fork():
+    for resolver in list(_resolvers):
+        resolver._after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_resolvers_after_fork)
+
+geoip_resolver = GeoIPResolver()
+
 
 def get_location_from_ip(ip_address):
     """
     Get location information from an IP address using MaxMind GeoIP2 database.
     Returns a dictionary containing country, city, and state information.
     """
-    try:
-        # Path to the GeoIP2 database file
-        db_path = os.path.join(settings.BASE_DIR, 'geoip2', 'GeoLite2-City.mmdb')
-        
-        # Create a reader object
-        with geoip2.database.Reader(db_path) as reader:
-            # Get the location information
-            response = reader.city(ip_address)
-            
-            return {
-                'country': response.country.name,
-                'city': response.city.name,
-                'state': response.subdivisions.most_specific.name if response.subdivisions.most_specific else None
-            }
-    except Exception as e:
-        # If there's any error, return None for all fields
-        return {
-            'country': None,
-            'city': None,
-            'state': None
-        } 
+    return geoip_resolver.lookup(ip_address)
+
+
+def get_locations_from_ips(ip_addresses):
+    """
+    Bulk variant of get_location_from_ip for analytics jobs.
+    Returns {ip_address: {'country', 'city', 'state'}}.
+    """
+    return geoip_resolver.lookup_many(ip_addresses)
+
 
 def get_client_ip(request):
     """
@@ -39,4 +200,4 @@ def get_client_ip(request):
         ip = x_forwarded_for.split(',')[0]
     else:
         ip = request.META.get('REMOTE_ADDR')
-    return ip 
\ No newline at end of file
+    return ip
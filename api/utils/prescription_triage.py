@@ -753,66 +753,14 @@ def get_triage_statistics(hospital=None, pharmacist=None, date_from=None, date_t
         date_to: Optional end date
 
     Returns:
-        dict with triage statistics
+        dict with triage statistics (one grouped query, cached until a
+        prescription request changes)
     """
-    from api.models import PrescriptionRequest
-    from django.db.models import Count, Avg, Q
-
-    # Build query
-    query = Q()
-    if hospital:
-        query &= Q(hospital=hospital)
-    if pharmacist:
-        query &= Q(assigned_to_pharmacist=pharmacist)
-    if date_from:
-        query &= Q(request_date__gte=date_from)
-    if date_to:
-        query &= Q(request_date__lte=date_to)
-
-    requests = PrescriptionRequest.objects.filter(query)
-
-    # Category distribution
-    category_stats = requests.values('triage_category').annotate(
-        count=Count('id')
-    ).order_by('-count')
-
-    # Role assignment distribution
-    role_stats = requests.values('assigned_to_role').annotate(
-        count=Count('id')
-    )
+    from api.services.grouped_stats import TriageStatistics
 
-    # Pharmacist action distribution
-    pharmacist_action_stats = requests.filter(
-        pharmacist_reviewed_by__isnull=False
-    ).values('pharmacist_review_action').annotate(
-        count=Count('id')
+    return TriageStatistics.get(
+        hospital=hospital,
+        pharmacist=pharmacist,
+        date_from=date_from,
+        date_to=date_to,
     )
-
-    # Average review times
-    avg_pharmacist_review_time = requests.filter(
-        pharmacist_review_time_minutes__isnull=False
-    ).aggregate(
-        avg_time=Avg('pharmacist_review_time_minutes')
-    )['avg_time'] or 0.0
-
-    # Escalation rate
-    total_pharmacist_reviewed = requests.filter(pharmacist_reviewed_by__isnull=False).count()
-    escalated_count = requests.filter(pharmacist_review_action='escalated').count()
-    escalation_rate = (escalated_count / total_pharmacist_reviewed * 100) if total_pharmacist_reviewed > 0 else 0.0
-
-    # Clinical intervention rate
-    intervention_count = requests.filter(had_clinical_intervention=True).count()
-    intervention_rate = (intervention_count / total_pharmacist_reviewed * 100) if total_pharmacist_reviewed > 0 else 0.0
-
-    return {
-        'total_requests': requests.count(),
-        'category_distribution': list(category_stats),
-        'role_distribution': list(role_stats),
-        'pharmacist_action_distribution': list(pharmacist_action_stats),
-        'average_pharmacist_review_time_minutes': round(avg_pharmacist_review_time, 2),
-        'total_pharmacist_reviewed': total_pharmacist_reviewed,
-        'escalation_count': escalated_count,
-        'escalation_rate_percent': round(escalation_rate, 2),
-        'clinical_intervention_count': intervention_count,
-        'clinical_intervention_rate_percent': round(intervention_rate, 2),
-    }
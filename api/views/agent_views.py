@@ -428,6 +428,35 @@ def monitor_system_performance(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def slow_query_report(request):
+    """Slowest recorded queries across workers, with EXPLAIN summaries and suggested indexes."""
+    try:
+        from api.agent_modules.performance.slow_queries import slow_query_recorder
+        
+        # Only allow staff users to see query text and plans
+        if not request.user.is_staff:
+            return Response({
+                'error': 'Unauthorized access'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            limit = max(1, min(int(request.GET.get('limit', 50)), 200))
+        except ValueError:
+            return Response({
+                'error': 'limit must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(slow_query_recorder.report(limit), status=status.HTTP_200_OK)
+        
+    except Exception as e:
+        logger.error(f"Error building slow query report: {e}")
+        return Response({
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 # Clinical Agent Endpoints
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
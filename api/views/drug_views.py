@@ -167,40 +167,9 @@ def get_drug_statistics(request):
     - Total drug count
     - Breakdown by category
     - Controlled substances count
-    """
-    from django.db.models import Count
-
-    total_drugs = DrugClassification.objects.filter(is_active=True).count()
-    controlled_drugs = DrugClassification.objects.filter(
-        is_controlled=True,
-        is_active=True
-    ).count()
-    high_risk_drugs = DrugClassification.objects.filter(
-        is_high_risk=True,
-        is_active=True
-    ).count()
-
-    # Count by NAFDAC schedule
-    schedule_counts = DrugClassification.objects.filter(
-        is_active=True
-    ).values('nafdac_schedule').annotate(
-        count=Count('id')
-    ).order_by('-count')
 
-    # Count by therapeutic class (top 10)
-    therapeutic_counts = DrugClassification.objects.filter(
-        is_active=True
-    ).exclude(
-        therapeutic_class=''
-    ).values('therapeutic_class').annotate(
-        count=Count('id')
-    ).order_by('-count')[:10]
+    Computed in one grouped query and cached until a drug changes.
+    """
+    from api.services.grouped_stats import DrugStatistics
 
-    return Response({
-        'total_drugs': total_drugs,
-        'controlled_substances': controlled_drugs,
-        'high_risk_medications': high_risk_drugs,
-        'nafdac_compliant': total_drugs,  # All drugs in DB are NAFDAC compliant
-        'by_schedule': list(schedule_counts),
-        'top_therapeutic_classes': list(therapeutic_counts)
-    })
+    return Response(DrugStatistics.get())
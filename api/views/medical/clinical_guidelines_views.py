@@ -365,7 +365,7 @@ class ClinicalGuidelineViewSet(viewsets.ModelViewSet):
         if most_accessed:
             stats['most_accessed'] = {
                 'title': most_accessed.title,
-                'access_count': most_accessed.access_count
+                'access_count': most_accessed.current_access_count
             }
         
         # Categories count
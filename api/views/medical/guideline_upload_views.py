@@ -8,11 +8,11 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import MultiPartParser, FormParser
-from django.db import transaction
 
 from api.models.medical.clinical_guideline import ClinicalGuideline
 from api.serializers import ClinicalGuidelineCreateSerializer, ClinicalGuidelineSerializer
 from api.permissions import IsHospitalAdmin
+from api.services.content_addressed_storage import ContentAddressedStorage
 
 logger = logging.getLogger(__name__)
 
@@ -87,8 +87,8 @@ class GuidelineFileUploadView(APIView):
                     'details': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Use transaction to ensure data consistency
-            with transaction.atomic():
+            # Use transaction to ensure data consistency (and drop blob files on rollback)
+            with ContentAddressedStorage.atomic():
                 # Create the clinical guideline first
                 guideline = serializer.save()
                 
@@ -97,7 +97,7 @@ class GuidelineFileUploadView(APIView):
                     # Save file to a simple guidelines directory
                     file_path = self._save_guideline_file(uploaded_file, guideline)
                     guideline.file_path = file_path
-                    guideline.save(update_fields=['file_path'])
+                    guideline.save(update_fields=['file_path', 'file_blob'])
                 
                 logger.info(f"Clinical guideline uploaded successfully: {guideline.title} by {request.user.email}")
                 
@@ -195,26 +195,18 @@ class GuidelineFileUploadView(APIView):
     def _save_guideline_file(self, uploaded_file, guideline):
         """
         Save a clinical guideline file to the media directory.
+        Sets guideline.file_blob; the caller saves the guideline.
         """
-        import os
-        from django.conf import settings
-        from django.core.files.storage import default_storage
-        
         try:
-            # Create guidelines directory
-            upload_dir = os.path.join('clinical_guidelines', str(guideline.organization.id))
-            
-            # Generate a safe filename
-            file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-            safe_filename = f"{guideline.guideline_id}{file_extension}"
+            # Content-addressed: re-uploads of the same guideline PDF share one stored copy
+            digest, size = ContentAddressedStorage.hash_upload(uploaded_file)
+            blob, created = ContentAddressedStorage.store_guideline_upload(uploaded_file, digest, size)
+            guideline.file_blob = blob
             
-            # Full path for storage
-            file_path = os.path.join(upload_dir, safe_filename)
+            if not created:
+                logger.info(f"Guideline file deduplicated against existing blob {digest[:12]}")
             
-            # Save file using Django's default storage
-            saved_path = default_storage.save(file_path, uploaded_file)
-            
-            return saved_path
+            return blob.storage_path
             
         except Exception as e:
             logger.error(f"File save error: {str(e)}")
@@ -274,21 +266,27 @@ class GuidelineFileUpdateView(APIView):
                     'error': validation_result['error']
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            with transaction.atomic():
-                # Remove old file if exists
-                if guideline.file_path:
-                    # Delete old file using Django's default storage
+            with ContentAddressedStorage.atomic():
+                old_blob = guideline.file_blob
+                old_file_path = guideline.file_path
+                
+                # Save new file (takes its blob reference before the old one is dropped,
+                # so re-uploading identical content keeps the blob alive)
+                file_path = self._save_guideline_file(uploaded_file, guideline)
+                guideline.file_path = file_path
+                guideline.save(update_fields=['file_path', 'file_blob'])
+                
+                # Release old file
+                if old_blob is not None:
+                    ContentAddressedStorage.release(old_blob)
+                elif old_file_path:
+                    # Legacy per-guideline file: delete using Django's default storage
                     from django.core.files.storage import default_storage
                     try:
-                        default_storage.delete(guideline.file_path)
+                        default_storage.delete(old_file_path)
                     except Exception as e:
                         logger.warning(f"Could not delete old file: {str(e)}")
                 
-                # Save new file
-                file_path = self._save_guideline_file(uploaded_file, guideline)
-                guideline.file_path = file_path
-                guideline.save(update_fields=['file_path'])
-                
                 logger.info(f"Clinical guideline file updated: {guideline.title} by {request.user.email}")
                 
                 # Return updated guideline
@@ -341,26 +339,18 @@ class GuidelineFileUpdateView(APIView):
     def _save_guideline_file(self, uploaded_file, guideline):
         """
         Save a clinical guideline file to the media directory.
+        Sets guideline.file_blob; the caller saves the guideline.
         """
-        import os
-        from django.conf import settings
-        from django.core.files.storage import default_storage
-        
         try:
-            # Create guidelines directory
-            upload_dir = os.path.join('clinical_guidelines', str(guideline.organization.id))
-            
-            # Generate a safe filename
-            file_extension = os.path.splitext(uploaded_file.name)[1].lower()
-            safe_filename = f"{guideline.guideline_id}{file_extension}"
-            
-            # Full path for storage
-            file_path = os.path.join(upload_dir, safe_filename)
+            # Content-addressed: re-uploads of the same guideline PDF share one stored copy
+            digest, size = ContentAddressedStorage.hash_upload(uploaded_file)
+            blob, created = ContentAddressedStorage.store_guideline_upload(uploaded_file, digest, size)
+            guideline.file_blob = blob
             
-            # Save file using Django's default storage
-            saved_path = default_storage.save(file_path, uploaded_file)
+            if not created:
+                logger.info(f"Guideline file deduplicated against existing blob {digest[:12]}")
             
-            return saved_path
+            return blob.storage_path
             
         except Exception as e:
             logger.error(f"File save error: {str(e)}")
@@ -0,0 +1,75 @@
+# api/views/medical/vital_signs_views.py
+
+import logging
+
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from api.models import HospitalRegistration, MedicalRecord
+from api.services.vital_sign_ingestion import VitalSignIngestion
+
+logger = logging.getLogger(__name__)
+
+RECORDING_ROLES = ['doctor', 'nurse', 'staff', 'hospital_admin']
+
+
+def get_recording_hospital(user):
+    """Hospital whose patients the user may record vitals for (None if not hospital staff)"""
+    if hasattr(user, 'hospital_admin_profile'):
+        return user.hospital_admin_profile.hospital
+    if user.role in RECORDING_ROLES:
+        registration = HospitalRegistration.objects.filter(user=user, status='approved').select_related('hospital').first()
+        if registration:
+            return registration.hospital
+    return None
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_ingest_vital_signs(request):
+    """
+    Record a batch of vital-sign readings (ward devices, charting sessions).
+
+    Body: {"readings": [{"hpn": "...", "recorded_at": "...", "heart_rate": 72, ...}, ...]}
+    Readings for patients outside the recorder's hospital, or that fail
+    validation, are returned under "rejected" with their index; the rest
+    are stored.
+    """
+    hospital = get_recording_hospital(request.user)
+    if not hospital:
+        return Response({
+            'error': 'User is not associated with any hospital'
+        }, status=status.HTTP_403_FORBIDDEN)
+
+    readings = request.data.get('readings') if isinstance(request.data, dict) else None
+    if not isinstance(readings, list) or not readings:
+        return Response({
+            'error': 'readings must be a non-empty list'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    if len(readings) > VitalSignIngestion.MAX_BATCH:
+        return Response({
+            'error': f'At most {VitalSignIngestion.MAX_BATCH} readings can be sent at once'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    patients = MedicalRecord.objects.filter(
+        user__hospital_registrations__hospital=hospital,
+        user__hospital_registrations__status='approved',
+    )
+
+    try:
+        result = VitalSignIngestion.ingest(readings, recorded_by=request.user, medical_records=patients)
+    except Exception as e:
+        logger.exception(f"Error ingesting vital signs: {str(e)}")
+        return Response({
+            'error': 'Failed to record vital signs'
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    created = result['created']
+    return Response({
+        'created': len(created),
+        'abnormal': sum(1 for vital_sign in created if vital_sign.is_abnormal),
+        'ids': [vital_sign.pk for vital_sign in created],
+        'rejected': result['rejected'],
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
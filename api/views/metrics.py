@@ -0,0 +1,34 @@
+# api/views/metrics.py
+
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from api.services.metrics import MetricsService
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _authorized(request):
+    """
+    Bearer METRICS_AUTH_TOKEN when set. Without a token, only in DEBUG and
+    only from METRICS_ALLOWED_IPS: behind a reverse proxy on the same host
+    every request comes from 127.0.0.1, so the address alone proves nothing.
+    """
+    token = getattr(settings, 'METRICS_AUTH_TOKEN', '')
+    if token:
+        header = request.headers.get('Authorization', '')
+        return hmac.compare_digest(header, f'Bearer {token}')
+    if not settings.DEBUG:
+        return False
+    return request.META.get('REMOTE_ADDR') in getattr(settings, 'METRICS_ALLOWED_IPS', ('127.0.0.1', '::1'))
+
+
+@require_GET
+def metrics(request):
+    """Prometheus scrape endpoint, aggregated over every worker process"""
+    if not _authorized(request):
+        return HttpResponseForbidden('Metrics access denied')
+    return HttpResponse(MetricsService.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -558,7 +558,12 @@ class PaymentHistoryView(APIView):
 
 
 class PaymentWebhookView(APIView):
-    """Handle payment provider webhooks"""
+    """
+    Handle payment provider webhooks.
+
+    Verifies the signature and stores the raw event in the webhook inbox;
+    the process_payment_webhooks worker applies it to the transaction.
+    """
     permission_classes = []  # No authentication for webhooks
     
     def post(self, request):
@@ -571,6 +576,8 @@ class PaymentWebhookView(APIView):
                     'message': 'Webhook received but payments are disabled'
                 }, status=status.HTTP_200_OK)
             
+            from api.services.payment_webhook_inbox import PaymentWebhookInbox
+            
             # Get webhook signature
             signature = request.META.get('HTTP_X_PAYSTACK_SIGNATURE')
             if not signature:
@@ -578,56 +585,29 @@ class PaymentWebhookView(APIView):
                     'error': 'Missing webhook signature'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Get webhook data
-            webhook_data = request.data
-            
-            # Find payment by reference
-            reference = webhook_data.get('data', {}).get('reference')
-            if not reference:
+            # Signature covers the raw body exactly as sent
+            raw_body = request.body
+            if not PaymentWebhookInbox.verify_signature('paystack', signature, raw_body):
+                logger.warning("Webhook rejected: invalid signature")
                 return Response({
-                    'error': 'Missing payment reference'
+                    'error': 'Invalid webhook signature'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            payment = get_object_or_404(
-                PaymentTransaction,
-                provider_reference=reference
-            )
-            
-            # Process webhook with payment provider
-            provider = payment.get_payment_provider()
-            if not provider:
+            webhook_data = request.data
+            if not webhook_data.get('data', {}).get('reference'):
                 return Response({
-                    'error': 'Payment provider not found'
+                    'error': 'Missing payment reference'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # Process webhook
-            provider.process_webhook(webhook_data, signature)
-            
-            # 🚀 Send payment confirmation email if payment is now completed
-            payment.refresh_from_db()  # Refresh to get updated status
-            if payment.payment_status == 'completed':
-                from api.utils.email import send_payment_confirmation_email
-                email_result = send_payment_confirmation_email(payment)
-                logger.info(f"Webhook payment confirmation email result: {email_result}")
-            
-            logger.info(f"Webhook processed successfully for payment {payment.transaction_id}")
+            event_id, created = PaymentWebhookInbox.record('paystack', dict(webhook_data), raw_body)
+            logger.info(f"Webhook {event_id} {'queued' if created else 'already received'}")
             
             return Response({
                 'success': True
             }, status=status.HTTP_200_OK)
             
-        except PaymentTransaction.DoesNotExist:
-            logger.error(f"Webhook received for unknown payment reference: {reference}")
-            return Response({
-                'error': 'Payment not found'
-            }, status=status.HTTP_404_NOT_FOUND)
-        except ValidationError as e:
-            logger.error(f"Webhook validation error: {str(e)}")
-            return Response({
-                'error': str(e)
-            }, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
-            logger.error(f"Webhook processing error: {str(e)}")
+            logger.error(f"Webhook ingestion error: {str(e)}")
             return Response({
                 'error': 'Webhook processing failed'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
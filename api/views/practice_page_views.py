@@ -494,7 +494,7 @@ def page_analytics(request):
 
     # For now, return basic stats
     return Response({
-        'view_count': page.view_count,
+        'view_count': page.current_view_count,
         'nomination_count': page.nomination_count,
         'is_published': page.is_published,
         'verification_status': page.verification_status,
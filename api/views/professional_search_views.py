@@ -16,15 +16,19 @@ from rest_framework.decorators import api_view, permission_classes, throttle_cla
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.throttling import AnonRateThrottle
-from rest_framework.pagination import PageNumberPagination
 from rest_framework import status
-from django.db.models import Q
+from rest_framework.utils.urls import replace_query_param
 from django.core.exceptions import ValidationError
 from django.utils.html import escape
+import logging
 import re
 
 from api.models import PHBProfessionalRegistry
 from api.professional_application_serializers import PHBProfessionalRegistryPublicSerializer
+from api.services.grouped_stats import RegistryStatistics
+from api.services.professional_search import InvalidCursor, ProfessionalRegistrySearch
+
+logger = logging.getLogger(__name__)
 
 
 # Custom throttle classes for rate limiting
@@ -119,18 +123,6 @@ def validate_state(state):
     return None
 
 
-class SearchResultsPagination(PageNumberPagination):
-    """
-    Custom pagination for search results.
-
-    - 20 results per page (reasonable for search)
-    - Max 100 per page (prevent abuse)
-    """
-    page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
-
-
 @api_view(['GET'])
 @permission_classes([AllowAny])
 @throttle_classes([SearchRateThrottle, BurstSearchRateThrottle])
@@ -139,13 +131,18 @@ def search_professionals(request):
     Public API endpoint for searching verified healthcare professionals.
 
     Query Parameters:
-    - query (string): Search by name or PHB license number
+    - query (string): Search by name (typo tolerant), PHB license number,
+      or specialization/location keywords
     - professional_type (string): Filter by professional type
     - specialization (string): Filter by specialization
     - state (string): Filter by state/location
-    - page (int): Page number for pagination (default: 1)
+    - cursor (string): Opaque cursor from the previous page's "next" link
     - page_size (int): Results per page (default: 20, max: 100)
 
+    Search runs on trigram and full-text GIN indexes (see
+    api/services/professional_search.py); name searches are ranked by
+    relevance, listings by most recently licensed.
+
     Security:
     - Rate limited: 20/min, 100/hour
     - All inputs sanitized and validated
@@ -155,8 +152,7 @@ def search_professionals(request):
 
     Returns:
     {
-        "count": 150,
-        "next": "http://api.phb.ng/registry/search/?page=2",
+        "next": "http://api.phb.ng/registry/search/?query=doe&cursor=WzAuOCwi...",
         "previous": null,
         "results": [
             {
@@ -179,65 +175,37 @@ def search_professionals(request):
         professional_type = validate_professional_type(request.GET.get('professional_type', ''))
         specialization = sanitize_search_query(request.GET.get('specialization', ''))
         state = validate_state(request.GET.get('state', ''))
-
-        # Start with active licenses only (public should only see active professionals)
-        professionals = PHBProfessionalRegistry.objects.filter(
-            license_status='active'
-        ).select_related('user')  # Optimize query
-
-        # Apply search query (name OR license number)
-        if query:
-            # Check if query looks like a license number (starts with PHB-)
-            if query.upper().startswith('PHB-'):
-                # Exact license number search
-                professionals = professionals.filter(
-                    phb_license_number__iexact=query
-                )
-            else:
-                # Name search (first name OR last name OR middle name)
-                # Using Q objects for complex queries (safe from SQL injection)
-                professionals = professionals.filter(
-                    Q(first_name__icontains=query) |
-                    Q(last_name__icontains=query) |
-                    Q(middle_name__icontains=query)
-                )
-
-        # Apply professional type filter
-        if professional_type:
-            professionals = professionals.filter(
-                professional_type=professional_type
-            )
-
-        # Apply specialization filter
-        if specialization:
-            professionals = professionals.filter(
-                specialization__icontains=specialization
-            )
-
-        # Apply state filter
-        if state:
-            professionals = professionals.filter(
-                state=state
-            )
-
-        # Order by most recently licensed first
-        professionals = professionals.order_by('-license_issue_date', 'last_name', 'first_name')
-
-        # Apply pagination
-        paginator = SearchResultsPagination()
-        result_page = paginator.paginate_queryset(professionals, request)
+        page_size = request.GET.get('page_size') or None
+        if page_size is not None and not page_size.isdigit():
+            raise ValidationError('page_size must be a positive integer')
+
+        page = ProfessionalRegistrySearch.search(
+            query=query,
+            professional_type=professional_type,
+            specialization=specialization,
+            state=state,
+            cursor=request.GET.get('cursor') or None,
+            page_size=page_size,
+        )
 
         # Serialize with public serializer (limited fields only)
         serializer = PHBProfessionalRegistryPublicSerializer(
-            result_page,
+            page['results'],
             many=True,
             context={'request': request}
         )
 
-        # Return paginated response
-        return paginator.get_paginated_response(serializer.data)
+        next_url = None
+        if page['next_cursor']:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', page['next_cursor'])
+
+        return Response({
+            'next': next_url,
+            'previous': None,
+            'results': serializer.data,
+        })
 
-    except ValidationError as e:
+    except (ValidationError, InvalidCursor) as e:
         return Response(
             {
                 'error': 'Invalid input parameters',
@@ -246,8 +214,7 @@ def search_professionals(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     except Exception as e:
-        # Log error (in production, use proper logging)
-        print(f"Search error: {str(e)}")
+        logger.exception(f"Search error: {str(e)}")
 
         return Response(
             {
@@ -346,45 +313,16 @@ def search_stats(request):
             "Lagos": 420,
             "Abuja": 180,
             ...
-        }
+        },
+        "last_updated": "2025-01-01T12:00:00+00:00"
     }
     """
     try:
-        # Count active professionals only
-        active_professionals = PHBProfessionalRegistry.objects.filter(
-            license_status='active'
-        )
-
-        total = active_professionals.count()
-
-        # Count by professional type
-        by_type = {}
-        for prof_type in ['pharmacist', 'doctor', 'nurse', 'midwife', 'dentist',
-                          'physiotherapist', 'lab_technician', 'radiographer']:
-            count = active_professionals.filter(professional_type=prof_type).count()
-            if count > 0:
-                by_type[prof_type] = count
-
-        # Count by state (top 10 states only)
-        by_state = {}
-        from django.db.models import Count
-        top_states = active_professionals.values('state').annotate(
-            count=Count('state')
-        ).order_by('-count')[:10]
-
-        for state_data in top_states:
-            if state_data['state']:
-                by_state[state_data['state']] = state_data['count']
-
-        return Response({
-            'total_active_professionals': total,
-            'by_type': by_type,
-            'by_state': by_state,
-            'last_updated': 'real-time'
-        })
+        # One grouped query, cached until a registry entry changes
+        return Response(RegistryStatistics.get())
 
     except Exception as e:
-        print(f"Stats error: {str(e)}")
+        logger.error(f"Stats error: {str(e)}")
 
         return Response(
             {'error': 'Unable to retrieve statistics'},
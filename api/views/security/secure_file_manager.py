@@ -6,9 +6,10 @@ Missing Bridge: List, Download, and Decrypt Medical Files - DRF Edition
 import os
 import json
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from django.conf import settings
-from django.http import HttpResponse
+from django.utils import timezone
+from django.http import HttpResponse, StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -20,6 +21,14 @@ import hashlib
 
 # Import our secure document models
 from api.models.secure_documents import SecureDocument, DocumentAccessLog
+from api.views.security.secure_stream import (
+    SegmentedVaultFile,
+    RangeNotSatisfiable,
+    is_segmented_file,
+    parse_range_header,
+    iter_bytes,
+)
+from api.services.content_addressed_storage import ContentAddressedStorage
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -54,7 +63,8 @@ class SecureFileManager:
                         'created_at': doc.created_at.isoformat(),
                         'modified_at': doc.updated_at.isoformat(),
                         'is_encrypted': doc.is_encrypted,
-                        'vault_location': doc.vault_path,
+                        # A shared blob's path names its digest; only legacy per-user files show theirs
+                        'vault_location': 'secure_medical_vault' if doc.blob_id else doc.vault_path,
                         'display_name': doc.display_name,
                         'size_display': doc.size_display,
                         'security_level': 'AES-256 Encrypted',
@@ -109,8 +119,21 @@ class SecureFileManager:
         return type_mapping.get(extension, 'unknown')
     
     @classmethod
-    def get_file_metadata(cls, file_id, user=None):
-        """📋 Get detailed metadata for a specific file owned by user"""
+    def get_file_metadata(cls, file_id, user=None, log_access=True, action='view', ip_address='0.0.0.0',
+                          audit_window=0, include_storage=False):
+        """📋 Get detailed metadata for a specific file owned by user
+        
+        With audit_window (seconds), an access is not logged again while the
+        access log already has the same user and action on the document within
+        that window, so lazy PDF viewers fetching page by page don't write an
+        audit row per Range request. The check is on the server's own log,
+        never on the client's Range header.
+        
+        include_storage adds where and how the file is stored (full_path,
+        blob_digest, blob_key_id) for decryption. Never return those to the
+        client: a shared blob's digest and key id reveal that another user
+        holds the same content.
+        """
         try:
             if user and user.is_authenticated:
                 # Get file only if owned by this user
@@ -120,32 +143,49 @@ class SecureFileManager:
                     is_active=True
                 )
                 
-                # Mark as accessed
-                document.mark_accessed()
+                if log_access and audit_window:
+                    log_access = not DocumentAccessLog.objects.filter(
+                        document=document,
+                        user=user,
+                        action=action,
+                        success=True,
+                        timestamp__gte=timezone.now() - timedelta(seconds=audit_window)
+                    ).exists()
                 
-                # Log access
-                DocumentAccessLog.objects.create(
-                    document=document,
-                    user=user,
-                    action='view',
-                    ip_address='0.0.0.0',  # Will be updated by view
-                    success=True
-                )
+                if log_access:
+                    # Mark as accessed
+                    document.mark_accessed()
+                    
+                    # Log access
+                    DocumentAccessLog.objects.create(
+                        document=document,
+                        user=user,
+                        action=action,
+                        ip_address=ip_address,
+                        success=True
+                    )
                 
-                return {
+                result = {
                     'success': True,
                     'file_id': str(document.file_id),
                     'secure_filename': document.secure_filename,
                     'original_filename': document.original_filename,
-                    'full_path': document.full_vault_path,
                     'size': document.file_size,
                     'created_at': document.created_at.isoformat(),
                     'modified_at': document.updated_at.isoformat(),
                     'is_encrypted': document.is_encrypted,
                     'security_score': document.security_score,
                     'access_count': document.access_count,
-                    'last_accessed': document.last_accessed.isoformat() if document.last_accessed else None
+                    'last_accessed': document.last_accessed.isoformat() if document.last_accessed else None,
+                    'access_logged': log_access
                 }
+                if include_storage:
+                    result.update({
+                        'full_path': document.full_vault_path,
+                        'blob_digest': document.blob.digest if document.blob_id else None,
+                        'blob_key_id': document.blob.key_id if document.blob_id else None,
+                    })
+                return result
             else:
                 return {
                     'success': False,
@@ -188,8 +228,12 @@ class SecureDecryptionService:
             return None
     
     @classmethod
-    def decrypt_file_for_preview(cls, file_path, user=None):
-        """🔓 SECURE DECRYPT: File for preview with ZERO-COMPROMISE security + BACKWARD COMPATIBILITY"""
+    def decrypt_file_for_preview(cls, file_path, user=None, cipher=None):
+        """🔓 SECURE DECRYPT: File for preview with ZERO-COMPROMISE security + BACKWARD COMPATIBILITY
+        
+        cipher overrides the user-specific key (deduplicated blobs use a
+        content-derived key, see ContentAddressedStorage.get_blob_cipher).
+        """
         try:
             # SECURITY CHECK: Verify user authentication
             if not user or not user.is_authenticated:
@@ -205,14 +249,41 @@ class SecureDecryptionService:
                     'error': 'File not found'
                 }
             
+            logger.info(f"🔐 Attempting SECURE decryption for user {user.id}")
+            
+            # STRATEGY 0: Segmented vault format (files uploaded since streaming support)
+            if is_segmented_file(file_path):
+                cipher = cipher or cls.get_user_encryption_key(user)
+                if cipher:
+                    try:
+                        vault_file = SegmentedVaultFile(file_path, cipher)
+                        decrypted_content = b''.join(vault_file.iter_range())
+                        content_type = cls._detect_content_type(file_path, decrypted_content[:1024])
+                        
+                        logger.info(f"✅ SECURE decryption successful (segmented) - {len(decrypted_content)} bytes")
+                        
+                        return {
+                            'success': True,
+                            'decrypted_content': decrypted_content,
+                            'preview_available': True,
+                            'content_type': content_type,
+                            'size': len(decrypted_content),
+                            'security_status': 'Decrypted with User Key',
+                            'method': 'user_specific_key_segmented'
+                        }
+                    except Exception as segmented_error:
+                        logger.error(f"🚨 Segmented decryption failed: {str(segmented_error)}")
+                return {
+                    'success': False,
+                    'error': 'File decryption failed'
+                }
+            
             # Read encrypted file
             with open(file_path, 'rb') as f:
                 encrypted_content = f.read()
             
-            logger.info(f"🔐 Attempting SECURE decryption for user {user.id}")
-            
             # STRATEGY 1: Try user-specific key (for new files)
-            cipher = cls.get_user_encryption_key(user)
+            cipher = cipher or cls.get_user_encryption_key(user)
             if cipher:
                 try:
                     decrypted_content = cipher.decrypt(encrypted_content)
@@ -272,6 +343,80 @@ class SecureDecryptionService:
                 'error': 'Decryption service unavailable'
             }
     
+    @classmethod
+    def open_decrypted_stream(cls, file_path, user=None, range_header=None, filename=None, cipher=None):
+        """🔓 STREAMING DECRYPT: Decrypt only the byte range a request asks for
+        
+        Segmented vault files are decrypted segment by segment as the response
+        is consumed. Legacy files fall back to decrypt_file_for_preview and are
+        sliced in memory, so the response shape is the same for both.
+        """
+        try:
+            if not user or not user.is_authenticated:
+                return {
+                    'success': False,
+                    'error': 'Authentication required for decryption'
+                }
+            
+            if not os.path.exists(file_path):
+                return {
+                    'success': False,
+                    'error': 'File not found'
+                }
+            
+            name_for_type = filename or file_path
+            
+            if is_segmented_file(file_path):
+                cipher = cipher or cls.get_user_encryption_key(user)
+                if not cipher:
+                    return {
+                        'success': False,
+                        'error': 'Key generation failed'
+                    }
+                vault_file = SegmentedVaultFile(file_path, cipher)
+                size = vault_file.plaintext_size
+                byte_range = parse_range_header(range_header, size)
+                start, end = byte_range if byte_range else (0, size - 1)
+                content_type = cls._detect_content_type(name_for_type, vault_file.read_head())
+                chunks = vault_file.iter_range(start, end)
+                method = 'segmented_stream'
+            else:
+                decrypt_result = cls.decrypt_file_for_preview(file_path, user, cipher=cipher)
+                if not decrypt_result['success']:
+                    return decrypt_result
+                content = decrypt_result['decrypted_content']
+                size = len(content)
+                byte_range = parse_range_header(range_header, size)
+                start, end = byte_range if byte_range else (0, size - 1)
+                content_type = cls._detect_content_type(name_for_type, content[:1024])
+                chunks = iter_bytes(content, start, end)
+                method = decrypt_result.get('method', 'legacy')
+            
+            return {
+                'success': True,
+                'chunks': chunks,
+                'content_type': content_type,
+                'size': size,
+                'start': start,
+                'end': end,
+                'partial': byte_range is not None,
+                'method': method
+            }
+            
+        except RangeNotSatisfiable:
+            return {
+                'success': False,
+                'error': 'Requested range not satisfiable',
+                'range_not_satisfiable': True,
+                'size': size
+            }
+        except Exception as e:
+            logger.error(f"🚨 CRITICAL: Streaming decryption error: {str(e)}")
+            return {
+                'success': False,
+                'error': 'Decryption service unavailable'
+            }
+    
     @classmethod
     def _detect_content_type(cls, file_path, content_sample):
         """🔍 SECURE: Detect content type from file and content"""
@@ -393,19 +538,30 @@ class SecureFileDetailView(APIView):
                 'details': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-class SecureFilePreviewView(APIView):
-    """👁️ FORTRESS-LEVEL Secure File Preview Endpoint - DRF Edition"""
+class SecureFileStreamMixin:
+    """📡 Shared Range-aware streaming response for preview and download"""
     
-    permission_classes = [IsAuthenticated]
+    disposition = 'inline'
+    access_action = 'view'
     
-    def get(self, request, file_id):
+    def stream_file(self, request, file_id):
         """🔓 SECURE DECRYPT AND STREAM: Zero-compromise file viewing"""
         
         user = request.user
+        range_header = request.META.get('HTTP_RANGE', '')
         
         try:
-            # SECURITY: Get file metadata with ownership verification
-            metadata_result = SecureFileManager.get_file_metadata(file_id, user)
+            # SECURITY: Get file metadata with ownership verification; every
+            # request is audited unless this user's same access was already
+            # recorded within VAULT_ACCESS_AUDIT_WINDOW (follow-up Range requests)
+            metadata_result = SecureFileManager.get_file_metadata(
+                file_id,
+                user,
+                action=self.access_action,
+                ip_address=request.META.get('REMOTE_ADDR', '0.0.0.0'),
+                audit_window=getattr(settings, 'VAULT_ACCESS_AUDIT_WINDOW', 300),
+                include_storage=True
+            )
             
             if not metadata_result['success']:
                 logger.warning(f"🚨 SECURITY: Unauthorized access attempt to file {file_id} by user {user.id}")
@@ -415,25 +571,36 @@ class SecureFilePreviewView(APIView):
                 }, status=status.HTTP_404_NOT_FOUND)
             
             file_path = metadata_result['full_path']
+            filename = metadata_result.get('original_filename', f'document_{file_id}')
             
-            # SECURE DECRYPTION: Decrypt with user-specific key
-            decrypt_result = SecureDecryptionService.decrypt_file_for_preview(file_path, user)
+            # SECURE DECRYPTION: Decrypt only the requested segments
+            # (deduplicated blobs use their content-derived key, legacy files the user key)
+            cipher = None
+            if metadata_result.get('blob_digest'):
+                cipher = ContentAddressedStorage.get_blob_cipher(
+                    metadata_result['blob_digest'], metadata_result['blob_key_id']
+                )
+            stream_result = SecureDecryptionService.open_decrypted_stream(
+                file_path, user, range_header=range_header, filename=filename, cipher=cipher
+            )
             
-            if decrypt_result['success'] and decrypt_result.get('preview_available'):
-                
-                # SECURITY LOG: Record successful access
-                logger.info(f"✅ SECURE FILE ACCESS: User {user.id} viewing file {file_id}")
+            if stream_result.get('range_not_satisfiable'):
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f"bytes */{stream_result['size']}"
+                return response
+            
+            if stream_result['success']:
                 
-                # ZERO-COMPROMISE STREAMING: Return decrypted content directly
-                from django.http import HttpResponse
+                if metadata_result['access_logged']:
+                    # SECURITY LOG: Record successful access once per audit window
+                    logger.info(f"✅ SECURE FILE ACCESS: User {user.id} {self.access_action} file {file_id}")
                 
-                decrypted_content = decrypt_result['decrypted_content']
-                content_type = decrypt_result['content_type']
+                start, end, size = stream_result['start'], stream_result['end'], stream_result['size']
                 
-                # Create secure response with proper headers
-                response = HttpResponse(
-                    decrypted_content,
-                    content_type=content_type
+                response = StreamingHttpResponse(
+                    stream_result['chunks'],
+                    content_type=stream_result['content_type'],
+                    status=206 if stream_result['partial'] else 200
                 )
                 
                 # SECURITY HEADERS: Prevent caching and add security
@@ -443,19 +610,17 @@ class SecureFilePreviewView(APIView):
                 response['X-Content-Type-Options'] = 'nosniff'
                 response['X-Frame-Options'] = 'DENY'
                 
-                # Set appropriate content disposition
-                filename = metadata_result.get('original_filename', f'document_{file_id}')
-                response['Content-Disposition'] = f'inline; filename="{filename}"'
-                response['Content-Length'] = len(decrypted_content)
-                
-                # SECURITY: Memory cleanup happens automatically when response is sent
-                logger.info(f"🛡️ SECURE STREAM: Delivered {len(decrypted_content)} bytes to user {user.id}")
+                response['Content-Disposition'] = f'{self.disposition}; filename="{filename}"'
+                response['Accept-Ranges'] = 'bytes'
+                response['Content-Length'] = max(end - start + 1, 0)
+                if stream_result['partial']:
+                    response['Content-Range'] = f'bytes {start}-{end}/{size}'
                 
                 return response
                 
             else:
                 # Decryption failed or not available
-                error_msg = decrypt_result.get('error', 'Preview not available')
+                error_msg = stream_result.get('error', 'Preview not available')
                 logger.error(f"🚨 DECRYPTION FAILED: {error_msg} for file {file_id}")
                 
                 return Response({
@@ -466,13 +631,35 @@ class SecureFilePreviewView(APIView):
                 }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
                 
         except Exception as e:
-            logger.error(f"🚨 CRITICAL ERROR: Preview service failure: {str(e)}")
+            logger.error(f"🚨 CRITICAL ERROR: Stream service failure: {str(e)}")
             return Response({
                 'success': False,
                 'error': 'Preview service unavailable',
                 'details': 'System security protocols engaged'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class SecureFilePreviewView(SecureFileStreamMixin, APIView):
+    """👁️ FORTRESS-LEVEL Secure File Preview Endpoint - DRF Edition"""
+    
+    permission_classes = [IsAuthenticated]
+    disposition = 'inline'
+    access_action = 'view'
+    
+    def get(self, request, file_id):
+        """🔓 Stream decrypted file inline (supports HTTP Range)"""
+        return self.stream_file(request, file_id)
+
+class SecureFileDownloadView(SecureFileStreamMixin, APIView):
+    """⬇️ Secure File Download Endpoint - DRF Edition"""
+    
+    permission_classes = [IsAuthenticated]
+    disposition = 'attachment'
+    access_action = 'download'
+    
+    def get(self, request, file_id):
+        """🔓 Stream decrypted file as attachment (supports HTTP Range)"""
+        return self.stream_file(request, file_id)
+
 class SecureFileDeleteView(APIView):
     """🗑️ NUCLEAR DELETE: Secure File Deletion Endpoint - DRF Edition"""
     
@@ -485,7 +672,7 @@ class SecureFileDeleteView(APIView):
         
         try:
             # SECURITY: Get file metadata with ownership verification
-            metadata_result = SecureFileManager.get_file_metadata(file_id, user)
+            metadata_result = SecureFileManager.get_file_metadata(file_id, user, include_storage=True)
             
             if not metadata_result['success']:
                 logger.warning(f"🚨 SECURITY: Unauthorized delete attempt for file {file_id} by user {user.id}")
@@ -521,7 +708,11 @@ class SecureFileDeleteView(APIView):
                 )
                 
                 # Step 3: Secure file deletion
-                if os.path.exists(file_path):
+                # Deduplicated blobs are reference counted and removed by the
+                # post_delete signal once no document points at them
+                if document.blob_id:
+                    logger.info(f"🗑️ SECURE DELETE: Releasing shared blob reference for {file_id}")
+                elif os.path.exists(file_path):
                     os.remove(file_path)
                     logger.info(f"🗑️ SECURE DELETE: Physical file removed: {file_path}")
                 else:
@@ -20,6 +20,9 @@ import logging
 
 # Import our new secure document models
 from api.models.secure_documents import SecureDocument, DocumentAccessLog
+from api.views.security.secure_stream import encrypt_segmented
+from api.views.security.signature_scanner import SignatureTable, scan_file_object
+from api.services.content_addressed_storage import ContentAddressedStorage
 
 # Try to import magic, fallback gracefully if not available
 try:
@@ -125,42 +128,30 @@ class SecureFileValidator:
         return validation_result
 
 class SecureVirusScanner:
-    """🦠 Virus Scanning Service (Simulation)"""
+    """🦠 Virus Scanning Service (Streaming Signature Scan)"""
     
     @classmethod
     def scan_file(cls, uploaded_file):
-        """🔍 Simulate virus scanning"""
+        """🔍 Scan the upload chunk by chunk against all signatures in one pass"""
         scan_result = {
             'is_clean': True,
             'threats_found': 0,
-            'scan_time': 0.8,
-            'engine_version': 'PHB-Scanner-v1.0',
-            'signatures_count': 847293,
+            'scan_time': 0.0,
+            'engine_version': 'PHB-Scanner-v2.0',
+            'signatures_count': len(SignatureTable.get().signatures),
             'scan_details': []
         }
         
         try:
-            # Reset file pointer
-            uploaded_file.seek(0)
-            file_content = uploaded_file.read()
-            uploaded_file.seek(0)
+            matched, bytes_scanned, elapsed = scan_file_object(uploaded_file)
             
-            # Simulate threat detection patterns
-            threat_patterns = [
-                b'<script',
-                b'javascript:',
-                b'vbscript:',
-                b'onload=',
-                b'onerror=',
-                b'eval(',
-                b'document.write'
-            ]
+            for pattern in matched:
+                scan_result['is_clean'] = False
+                scan_result['threats_found'] += 1
+                scan_result['scan_details'].append(f'Suspicious pattern detected: {pattern.decode()}')
             
-            for pattern in threat_patterns:
-                if pattern in file_content.lower():
-                    scan_result['is_clean'] = False
-                    scan_result['threats_found'] += 1
-                    scan_result['scan_details'].append(f'Suspicious pattern detected: {pattern.decode()}')
+            scan_result['scan_time'] = round(elapsed, 4)
+            scan_result['bytes_scanned'] = bytes_scanned
                     
             # Log scan
             logger.info(f"Virus scan completed for {uploaded_file.name}: {'CLEAN' if scan_result['is_clean'] else 'THREATS FOUND'}")
@@ -198,8 +189,12 @@ class SecureEncryptionService:
             return None
     
     @classmethod
-    def encrypt_file(cls, file_content, user=None):
-        """🔒 SECURE ENCRYPT: File content with user-specific key"""
+    def encrypt_file(cls, file_content, user=None, segmented=False):
+        """🔒 SECURE ENCRYPT: File content with user-specific key
+        
+        segmented=True writes the Range-capable vault format (see secure_stream)
+        so previews and downloads can decrypt only the bytes they serve.
+        """
         try:
             # Use user-specific key for encryption
             if user:
@@ -208,7 +203,10 @@ class SecureEncryptionService:
                     return {'success': False, 'error': 'Key generation failed'}
                 
                 # Encrypt with user-specific cipher
-                encrypted_content = fernet.encrypt(file_content)
+                if segmented:
+                    encrypted_content = encrypt_segmented(fernet, file_content)
+                else:
+                    encrypted_content = fernet.encrypt(file_content)
                 
                 # Generate key ID for storage (hash of user info)
                 import hashlib
@@ -227,7 +225,8 @@ class SecureEncryptionService:
                 'encrypted_content': encrypted_content,
                 'algorithm': 'AES-256 (Fernet)',
                 'key_id': key_id,
-                'user_specific': user is not None
+                'user_specific': user is not None,
+                'segmented': segmented and user is not None
             }
         except Exception as e:
             logger.error(f"Encryption error: {str(e)}")
@@ -340,7 +339,13 @@ class SecureFileUploadView(APIView):
                     })
                     continue
                     
-                # PHASE 2: VIRUS SCANNING 🦠
+                # PHASE 2: CONTENT DIGEST 🧬
+                # Identical bytes already in the vault share one stored blob
+                digest, content_size = ContentAddressedStorage.hash_upload(uploaded_file)
+                
+                # PHASE 3: VIRUS SCANNING 🦠
+                # Every upload is scanned, even when its content is already stored:
+                # another user's earlier scan is never trusted
                 scan_result = SecureVirusScanner.scan_file(uploaded_file)
                 
                 if not scan_result['is_clean']:
@@ -358,81 +363,56 @@ class SecureFileUploadView(APIView):
                     })
                     continue
                     
-                # PHASE 3: ENCRYPTION 🔒
-                uploaded_file.seek(0)
-                file_content = uploaded_file.read()
-                
-                # 🔑 SECURITY FIX: Use user-specific encryption key!
-                logger.info(f"🔐 Encrypting file {uploaded_file.name} for user {user.id}")
-                encryption_result = SecureEncryptionService.encrypt_file(file_content, user)
-                
-                if not encryption_result['success']:
-                    logger.error(f"🚨 ENCRYPTION FAILED: {encryption_result.get('error')}")
-                else:
-                    logger.info(f"✅ Encryption successful for {uploaded_file.name}")
-                
-                
-                if not encryption_result['success']:
-                    # Log encryption failure
-                    SecureAuditLogger.log_upload_attempt(
-                        user, uploaded_file.name, ip_address, 'ENCRYPTION_FAILED'
-                    )
-                    
-                    results.append({
-                        'file_name': uploaded_file.name,
-                        'success': False,
-                        'phase': 'encryption',
-                        'error': 'Encryption failed',
-                        'details': [encryption_result['error']]
-                    })
-                    continue
-                    
-                # PHASE 4: SECURE STORAGE & DATABASE RECORD 💾
+                # PHASE 4: ENCRYPTED CONTENT-ADDRESSED STORAGE & DATABASE RECORD 💾
                 try:
                     # Generate secure filename
                     file_id = str(uuid.uuid4())
                     file_ext = os.path.splitext(uploaded_file.name)[1]
                     secure_filename = f"{file_id}{file_ext}.encrypted"
                     
-                    # Create secure storage directory
-                    storage_dir = os.path.join(settings.MEDIA_ROOT, 'secure_medical_vault')
-                    os.makedirs(storage_dir, exist_ok=True)
-                    
-                    # Save encrypted file
-                    file_path = os.path.join(storage_dir, secure_filename)
-                    with open(file_path, 'wb') as f:
-                        f.write(encryption_result['encrypted_content'])
-                    
-                    # 🆕 SAVE TO DATABASE WITH USER OWNERSHIP
-                    secure_doc = SecureDocument.objects.create(
-                        file_id=file_id,
-                        user=user,  # DRF-authenticated user
-                        original_filename=uploaded_file.name,
-                        secure_filename=secure_filename,
-                        file_extension=file_ext,
-                        file_type=self._get_simple_file_type(validation_result['file_info'].get('mime_type', 'unknown')),
-                        file_size=len(file_content),
-                        encryption_key_id=encryption_result['key_id'],
-                        is_encrypted=True,
-                        virus_scanned=scan_result['is_clean'],
-                        security_score=validation_result['security_score'],
-                        vault_path=f'secure_medical_vault/{secure_filename}',
-                        uploaded_from_ip=ip_address
-                    )
-                    
-                    # 🆕 LOG THE UPLOAD ACTION
-                    DocumentAccessLog.objects.create(
-                        document=secure_doc,
-                        user=user,  # DRF-authenticated user
-                        action='upload',
-                        ip_address=ip_address,
-                        success=True,
-                        additional_data={
-                            'file_size': len(file_content),
-                            'security_score': validation_result['security_score'],
-                            'virus_clean': scan_result['is_clean']
-                        }
-                    )
+                    # Also removes a newly written blob file if the document insert rolls back
+                    with ContentAddressedStorage.atomic():
+                        # Encrypts and writes only when the digest is new
+                        blob, blob_created = ContentAddressedStorage.store_vault_upload(
+                            uploaded_file, digest, content_size, virus_scanned=scan_result['is_clean']
+                        )
+                        logger.info(
+                            f"🔐 {'Encrypted new' if blob_created else 'Deduplicated'} blob for "
+                            f"{uploaded_file.name} (user {user.id})"
+                        )
+                        
+                        # 🆕 SAVE TO DATABASE WITH USER OWNERSHIP
+                        secure_doc = SecureDocument.objects.create(
+                            file_id=file_id,
+                            user=user,  # DRF-authenticated user
+                            original_filename=uploaded_file.name,
+                            secure_filename=secure_filename,
+                            file_extension=file_ext,
+                            file_type=self._get_simple_file_type(validation_result['file_info'].get('mime_type', 'unknown')),
+                            file_size=content_size,
+                            encryption_key_id=blob.key_id,
+                            is_encrypted=True,
+                            virus_scanned=scan_result['is_clean'],
+                            security_score=validation_result['security_score'],
+                            vault_path=blob.storage_path,
+                            blob=blob,
+                            uploaded_from_ip=ip_address
+                        )
+                        
+                        # 🆕 LOG THE UPLOAD ACTION
+                        DocumentAccessLog.objects.create(
+                            document=secure_doc,
+                            user=user,  # DRF-authenticated user
+                            action='upload',
+                            ip_address=ip_address,
+                            success=True,
+                            additional_data={
+                                'file_size': content_size,
+                                'security_score': validation_result['security_score'],
+                                'virus_clean': scan_result['is_clean'],
+                                'deduplicated': not blob_created
+                            }
+                        )
                     
                     # Log successful upload
                     SecureAuditLogger.log_upload_attempt(
@@ -444,9 +424,9 @@ class SecureFileUploadView(APIView):
                         'success': True,
                         'file_id': file_id,
                         'secure_filename': secure_filename,
-                        'storage_path': f'secure_medical_vault/{secure_filename}',
-                        'encryption_key': encryption_result['key_id'],
-                        'size': len(file_content),
+                        # Blob path, key id and dedup status stay server-side: they would
+                        # tell the user whether someone else stored the same content
+                        'size': content_size,
                         'validation_score': validation_result['security_score'],
                         'scan_clean': scan_result['is_clean'],
                         'phases_completed': ['validation', 'virus_scan', 'encryption', 'storage', 'database'],
@@ -0,0 +1,146 @@
+"""
+🛡️ MEDICAL VAULT 3.0 - STREAMING SIGNATURE SCANNER
+Single-pass multi-pattern matching for uploaded files
+
+All threat signatures are compiled once per process into a single regex
+whose alternation is factored as a prefix trie (``on(?:error=|load=)``), so
+the C regex engine walks one trie branch per offset - a regex form of an
+Aho-Corasick automaton whose cost doesn't grow with the number of signatures
+the way one substring search per signature does. Signatures contained in a
+longer signature are reported with it, and the search restarts one byte
+after each hit, so overlapping matches are found too.
+
+Files are scanned chunk by chunk; the last ``longest signature - 1`` bytes of
+each chunk are carried into the next one so matches that straddle a chunk
+boundary are still found.
+"""
+
+import re
+import time
+import threading
+
+# Signatures are matched case-insensitively (chunks are lowercased)
+THREAT_SIGNATURES = (
+    b'<script',
+    b'javascript:',
+    b'vbscript:',
+    b'onload=',
+    b'onerror=',
+    b'eval(',
+    b'document.write',
+)
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+
+
+class SignatureTable:
+    """📚 Compiled signature set, built once per process"""
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self, signatures):
+        self.signatures = tuple(dict.fromkeys(sig.lower() for sig in signatures))
+        self.max_length = max(len(sig) for sig in self.signatures)
+        self.pattern = re.compile(self._trie_pattern(self.signatures))
+        # A match on a signature implies every signature it contains
+        self.implied = {
+            sig: {other for other in self.signatures if other in sig}
+            for sig in self.signatures
+        }
+
+    @staticmethod
+    def _trie_pattern(signatures):
+        """Build a regex alternation factored by common prefixes"""
+        trie = {}
+        for sig in signatures:
+            node = trie
+            for byte in sig:
+                node = node.setdefault(byte, {})
+            node[None] = True
+
+        def build(node):
+            branches = [
+                re.escape(bytes([byte])) + build(child)
+                for byte, child in sorted((k, v) for k, v in node.items() if k is not None)
+            ]
+            if not branches:
+                return b''
+            body = branches[0] if len(branches) == 1 else b'(?:' + b'|'.join(branches) + b')'
+            if None in node:
+                # A signature ends here and longer ones continue; prefer the longer
+                body = b'(?:' + body + b')?'
+            return body
+
+        return build(trie)
+
+    @classmethod
+    def get(cls):
+        """Return the process-wide table, compiling it on first use"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls(THREAT_SIGNATURES)
+        return cls._instance
+
+
+class StreamingSignatureScanner:
+    """🔍 Scan a stream of chunks against every signature in one pass"""
+
+    def __init__(self, table=None):
+        self.table = table or SignatureTable.get()
+        self.found = set()
+        self.bytes_scanned = 0
+        self._carry = b''
+
+    def feed(self, chunk):
+        """Scan the next chunk of the stream"""
+        if not chunk:
+            return
+        self.bytes_scanned += len(chunk)
+        window = self._carry + chunk.lower()
+
+        search = self.table.pattern.search
+        match = search(window)
+        while match and len(self.found) < len(self.table.signatures):
+            self.found |= self.table.implied[match.group(0)]
+            match = search(window, match.start() + 1)
+
+        keep = self.table.max_length - 1
+        self._carry = window[-keep:] if keep else b''
+
+    def scan_chunks(self, chunks):
+        """Scan an iterable of chunks and return the matched signatures"""
+        for chunk in chunks:
+            self.feed(chunk)
+        return self.matched_signatures
+
+    @property
+    def matched_signatures(self):
+        """Matched signatures in signature-table order"""
+        return [sig for sig in self.table.signatures if sig in self.found]
+
+
+def iter_file_chunks(uploaded_file, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield chunks from a Django UploadedFile or any binary file object"""
+    uploaded_file.seek(0)
+    if hasattr(uploaded_file, 'chunks'):
+        yield from uploaded_file.chunks(chunk_size)
+        return
+    while True:
+        chunk = uploaded_file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def scan_file_object(uploaded_file, chunk_size=DEFAULT_CHUNK_SIZE, table=None):
+    """
+    Scan a file object and return ``(matched_signatures, bytes_scanned,
+    elapsed_seconds)``. The file pointer is reset to the start afterwards.
+    """
+    started = time.perf_counter()
+    scanner = StreamingSignatureScanner(table)
+    matched = scanner.scan_chunks(iter_file_chunks(uploaded_file, chunk_size))
+    uploaded_file.seek(0)
+    return matched, scanner.bytes_scanned, time.perf_counter() - started
@@ -25,6 +25,7 @@ from api.services.womens_health_verification import (
     WomensHealthVerificationService,
     WomensHealthPermissionMixin
 )
+from api.services.womens_health_summary import WomensHealthSummaryService
 from api.serializers import (
     WomensHealthProfileSerializer,
     MenstrualCycleSerializer,
@@ -796,6 +797,9 @@ def womens_health_dashboard_data(request):
             womens_health_profile=profile
         ).order_by('-date')[:7]
         
+        # Rolling summary (kept current as logs, cycles and goals are saved)
+        health_summary = WomensHealthSummaryService.get_summary(profile)
+        
         dashboard_data = {
             'profile': WomensHealthProfileSerializer(profile).data,
             'current_cycle': MenstrualCycleSerializer(current_cycle).data if current_cycle else None,
@@ -805,11 +809,12 @@ def womens_health_dashboard_data(request):
             'upcoming_screenings': HealthScreeningSerializer(upcoming_screenings, many=True).data,
             'recent_health_logs': DailyHealthLogSerializer(recent_logs, many=True).data,
             'summary': {
-                'total_cycles': MenstrualCycle.objects.filter(womens_health_profile=profile).count(),
+                'total_cycles': health_summary.total_cycles,
                 'total_pregnancies': PregnancyRecord.objects.filter(womens_health_profile=profile).count(),
-                'active_goals_count': active_goals.count(),
+                'active_goals_count': health_summary.active_goals,
                 'profile_completion': profile.profile_completion_percentage
-            }
+            },
+            'health_summary': health_summary.get_summary()
         }
         
         return Response({
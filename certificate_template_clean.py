@@ -4,7 +4,6 @@ This is the updated elegant design with ornate decorative corners
 """
 
 from io import BytesIO
-from xhtml2pdf import pisa
 from django.utils import timezone
 import logging
 
@@ -413,6 +412,7 @@ def generate_hospital_certificate_pdf(hospital):
 
         # Generate PDF
         pdf_buffer = BytesIO()
+        from xhtml2pdf import pisa  # heavy; only needed when rendering
         pisa_status = pisa.CreatePDF(
             certificate_html,
             dest=pdf_buffer
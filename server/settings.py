@@ -64,6 +64,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",  # Trigram / full-text lookups for registry search
     "channels",  # Add Channels for WebSocket support
     "api",
     "rest_framework",
@@ -73,7 +74,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.metrics.RequestMetricsMiddleware",  # Outermost: request latency for /metrics
     "corsheaders.middleware.CorsMiddleware",  # Move CORS to the top
+    "api.middleware.query_budget.QueryBudgetMiddleware",  # Per-request query counts / N+1 detection
+    "api.middleware.slow_queries.SlowQueryMiddleware",  # Slow statement fingerprints / EXPLAIN samples
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -299,6 +303,18 @@ PAYMENT_PROVIDERS = {
             'initialize': 'https://api.paystack.co/transaction/initialize',
             'verify': 'https://api.paystack.co/transaction/verify',
             'refund': 'https://api.paystack.co/refund'
+        },
+        # Shared keep-alive session: (connect, read) timeouts per operation and
+        # retries with jittered backoff (verify only; charges/refunds are retried
+        # only when the connection was never made)
+        'http': {
+            'timeouts': {
+                'initialize': (3.05, 15),
+                'verify': (3.05, 10),
+                'refund': (3.05, 20),
+            },
+            'max_retries': int(os.environ.get('PAYSTACK_MAX_RETRIES', 2)),
+            'pool_maxsize': int(os.environ.get('PAYSTACK_POOL_MAXSIZE', 32)),
         }
     }
 }
@@ -379,6 +395,26 @@ AUTO_SCALE_MAX_MESSAGE_RATE = int(os.environ.get('AUTO_SCALE_MAX_MESSAGE_RATE',
 # Message encryption (REQUIRED for HIPAA compliance)
 MESSAGE_ENCRYPTION_KEY = os.environ.get('MESSAGE_ENCRYPTION_KEY', 'QME1DW6ZZYBZvmzhKQ9c2XHiryHSscw0vocaENbOYkA=')
 
+# Repeat previews/downloads of a vault file by the same user within this many seconds
+# (e.g. a PDF viewer's Range requests) share one access-log entry
+VAULT_ACCESS_AUDIT_WINDOW = int(os.environ.get('VAULT_ACCESS_AUDIT_WINDOW', '300'))
+
+# Deduplicated secure vault blobs are encrypted with a key derived from a vault secret and the
+# content digest. Each blob records the id of the secret it was written with, so a new secret can
+# be added and made current (VAULT_BLOB_KEY_ID) while older blobs stay readable:
+#   VAULT_BLOB_KEYS="2026-01:<secret>,2026-10:<secret>"   (id:secret, comma separated)
+# Without VAULT_BLOB_KEYS the deployment's SECRET_KEY is used under the id "default". Before
+# rotating SECRET_KEY, pin it with VAULT_BLOB_KEYS="default:<current SECRET_KEY>" (and add any
+# new secret after it), otherwise blobs written so far can no longer be decrypted.
+VAULT_BLOB_KEYS = {
+    key_id.strip(): secret.strip()
+    for key_id, _, secret in (entry.partition(':') for entry in os.environ.get('VAULT_BLOB_KEYS', '').split(','))
+    if key_id.strip() and secret.strip()
+} or {'default': SECRET_KEY}
+VAULT_BLOB_KEY_ID = os.environ.get('VAULT_BLOB_KEY_ID') or list(VAULT_BLOB_KEYS)[-1]
+if VAULT_BLOB_KEY_ID not in VAULT_BLOB_KEYS:
+    raise Exception(f"VAULT_BLOB_KEY_ID '{VAULT_BLOB_KEY_ID}' has no secret in VAULT_BLOB_KEYS")
+
 # Hybrid strategy settings
 MESSAGE_LOCAL_RETENTION_DAYS = int(os.environ.get('MESSAGE_LOCAL_RETENTION_DAYS', '30'))
 
@@ -423,4 +459,75 @@ STREAM_ALLOWED_FILE_TYPES = [
     'application/pdf', 'application/msword',
     'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
     'text/plain'
-]
\ No newline at end of file
+]
+
+# ============= PDF RENDERING CONFIGURATION =============
+# HTML→PDF rendering runs in a pool of worker processes (0 renders in-process)
+PDF_RENDER_WORKERS = int(os.getenv('PDF_RENDER_WORKERS', 2))
+PDF_RENDER_QUEUE_SIZE = int(os.getenv('PDF_RENDER_QUEUE_SIZE', 8))  # Max renders in flight per web worker
+PDF_RENDER_QUEUE_TIMEOUT = 5  # Seconds to wait for a free render slot
+PDF_RENDER_TIMEOUT = 60  # Seconds before a single render is abandoned
+PDF_RENDER_SHARED_STYLESHEETS = []  # CSS strings parsed once per worker
+# Rendered PDFs cached by (template, content hash); kept out of MEDIA_ROOT
+PDF_RENDER_CACHE_DIR = os.getenv('PDF_RENDER_CACHE_DIR', os.path.join(BASE_DIR, 'pdf_cache'))
+PDF_RENDER_CACHE_TTL = 30 * 24 * 3600  # 30 days
+
+# ============= BUFFERED COUNTERS =============
+# Page view / guideline access counters are buffered (Redis when the cache is
+# Redis, otherwise in-process) and flushed to the database in batches
+BUFFERED_COUNTER_BACKEND = os.getenv('BUFFERED_COUNTER_BACKEND', 'auto')  # 'auto', 'redis' or 'local'
+BUFFERED_COUNTER_FLUSH_INTERVAL = int(os.getenv('BUFFERED_COUNTER_FLUSH_INTERVAL', 30))  # Seconds; 0 disables the background flusher
+
+# ============= GEOIP =============
+# GeoLite2 City database, opened once per process (memory-mapped) by api.utils.location_utils
+GEOIP_DATABASE_PATH = os.getenv('GEOIP_DATABASE_PATH', os.path.join(BASE_DIR, 'geoip2', 'GeoLite2-City.mmdb'))
+GEOIP_CACHE_SIZE = int(os.getenv('GEOIP_CACHE_SIZE', 4096))  # Recent IP -> location results kept per process
+GEOIP_CACHE_TTL = int(os.getenv('GEOIP_CACHE_TTL', 3600))  # Seconds
+
+# ============= ANALYTICS RESULT CACHE =============
+# Women's health analytics results, cached per user and input version (api.agent_modules.analytics.result_cache)
+ANALYTICS_CACHE_TTL = int(os.getenv('ANALYTICS_CACHE_TTL', 15 * 60))  # Seconds an entry is served as fresh
+ANALYTICS_CACHE_STALE_TTL = int(os.getenv('ANALYTICS_CACHE_STALE_TTL', 60 * 60))  # Further seconds served stale while it is refreshed
+ANALYTICS_CACHE_BETA = float(os.getenv('ANALYTICS_CACHE_BETA', 1.0))  # Early refresh eagerness (XFetch); 0 disables
+ANALYTICS_CACHE_LOCK_TIMEOUT = 30  # Seconds a recompute lock is held at most
+ANALYTICS_CACHE_LOCK_WAIT = 5  # Seconds a reader waits for another process's recompute
+ANALYTICS_CACHE_BACKGROUND_REFRESH = True  # Refresh stale entries in a background thread
+
+# ============= QUERY BUDGETS =============
+# Per-request query recording (api.middleware.query_budget): requests over budget or
+# repeating a statement are logged (raised in tests using api.tests.query_budget)
+QUERY_BUDGET_ENABLED = os.getenv('QUERY_BUDGET_ENABLED', 'True').lower() == 'true'
+QUERY_BUDGET_DEFAULT = int(os.getenv('QUERY_BUDGET_DEFAULT', 50))  # Queries per request, for views not in QUERY_BUDGETS
+QUERY_BUDGETS = {}  # URL name (with namespace) -> queries per request
+QUERY_BUDGET_REPEAT_THRESHOLD = 10  # Same normalized statement this many times in one request = N+1
+QUERY_BUDGET_STRICT = False  # Raise QueryBudgetExceeded instead of logging
+QUERY_BUDGET_EXEMPT_PATHS = ('/static/', '/media/', '/admin/')
+
+# ============= METRICS =============
+# Prometheus /metrics (api.services.metrics); each worker publishes its totals to Redis
+# when the cache is Redis, and a scrape sums every live worker
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+METRICS_BACKEND = os.getenv('METRICS_BACKEND', 'auto')  # 'auto', 'redis' or 'local' (serving process only)
+METRICS_PUBLISH_INTERVAL = int(os.getenv('METRICS_PUBLISH_INTERVAL', 15))  # Seconds; 0 publishes only when scraped
+METRICS_AUTH_TOKEN = os.getenv('METRICS_AUTH_TOKEN', '')  # Scrapers send "Authorization: Bearer <token>"
+METRICS_ALLOWED_IPS = ('127.0.0.1', '::1')  # Allowed without a token only in DEBUG; production needs the token
+
+# ============= SLOW QUERIES =============
+# Statements slower than the threshold are fingerprinted per process and shared through
+# Redis (api.agent_modules.performance.slow_queries); report: manage.py slow_query_report
+SLOW_QUERY_ENABLED = os.getenv('SLOW_QUERY_ENABLED', 'True').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = int(os.getenv('SLOW_QUERY_THRESHOLD_MS', 200))
+SLOW_QUERY_MAX_FINGERPRINTS = 200  # Per process; the least total time is evicted first
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.getenv('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', 0.0))  # Share of slow SELECTs to EXPLAIN
+SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv('SLOW_QUERY_EXPLAIN_ANALYZE', 'False').lower() == 'true'  # ANALYZE, BUFFERS (runs the query again)
+SLOW_QUERY_SEQ_SCAN_MIN_ROWS = 1000  # Analyzed scans removing fewer rows than this get no index suggestion
+SLOW_QUERY_PUBLISH_INTERVAL = 10  # Seconds between a process's publishes
+SLOW_QUERY_RETENTION = 24 * 3600  # Seconds a silent process's entries stay in the report
+SLOW_QUERY_BACKEND = os.getenv('SLOW_QUERY_BACKEND', 'auto')  # 'auto', 'redis' or 'local'
+
+# ============= BENCHMARKS =============
+# manage.py run_benchmarks compares against this file; record it with --save-baseline on the
+# machine that runs the comparison (api.services.benchmark_suite)
+BENCHMARK_BASELINE_PATH = os.getenv('BENCHMARK_BASELINE_PATH', str(BASE_DIR / 'benchmarks' / 'baseline.json'))
+BENCHMARK_TOLERANCE = float(os.getenv('BENCHMARK_TOLERANCE', 0.25))  # Allowed p50 / p95 slowdown (fraction)
+BENCHMARK_MIN_DELTA_MS = 2.0  # Slowdowns smaller than this are noise, whatever the percentage
@@ -9,6 +9,7 @@ from api.views.auth.authentication import (
     CustomTokenObtainPairView
 )
 from api.views.auth.authentication import LoginView
+from api.views.metrics import metrics
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -22,6 +23,7 @@ urlpatterns = [
     path('api/email/verify/<uuid:email_verification_token>/', VerifyEmailToken.as_view(), name='verify-email'),
     path('api/verify-login-otp/', VerifyLoginOTPView.as_view(), name='verify-otp'),  # Keep only one
     path('api/login/', LoginView.as_view(), name='login'),
+    path('metrics', metrics, name='metrics'),  # Prometheus scrape target
 ]
 
 if settings.DEBUG: